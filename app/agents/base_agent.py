@@ -6,8 +6,11 @@ from typing import Any
 from langchain.agents import AgentExecutor, create_openai_tools_agent
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.tools import BaseTool
-from langchain_openai import ChatOpenAI
 
+from app.agents.concurrent_executor import build_agent_executor
+from app.agents.llm_cache import cache_for_agent
+from app.agents.llm_pool import get_chat_model
+from app.utils import langchain_tracing  # noqa: F401  (registers the span callback)
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -37,7 +40,12 @@ class BaseAgent(ABC):
         self.model = model
         self.tools = tools
         self.system_prompt = system_prompt
-        self._llm = ChatOpenAI(model=model, temperature=0)
+        # Shared per (model, params) across agents; see app.agents.llm_pool
+        llm_params: dict[str, Any] = {}
+        cache = cache_for_agent(name)
+        if cache is not None:
+            llm_params["cache"] = cache
+        self._llm = get_chat_model(model, temperature=0, **llm_params)
         self._executor: AgentExecutor | None = None
 
     def build_executor(self) -> AgentExecutor:
@@ -55,7 +63,7 @@ class BaseAgent(ABC):
             ]
         )
         agent = create_openai_tools_agent(self._llm, self.tools, prompt)
-        return AgentExecutor(agent=agent, tools=self.tools, verbose=False)
+        return build_agent_executor(agent, self.tools, verbose=False)
 
     @property
     def executor(self) -> AgentExecutor:
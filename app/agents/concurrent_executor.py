@@ -0,0 +1,173 @@
+"""AgentExecutor that runs the tool calls of one agent step concurrently.
+
+The OpenAI tools agent often answers with several tool calls in a single step
+(e.g. ``get_crm_lead`` for three ids).  LangChain's ``AgentExecutor`` runs
+them one after another, each blocking on an Odoo round-trip.
+:class:`ConcurrentAgentExecutor` dispatches them on a bounded, shared thread
+pool instead, applies a per-call timeout, and hands the observations back in
+the order the model emitted the calls, so the scratchpad is unchanged.
+
+The async path (``ainvoke``) already gathers the calls of a step; here it
+only gains the same per-call timeout.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from langchain.agents import AgentExecutor
+from langchain_core.agents import AgentAction, AgentFinish, AgentStep
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForChainRun,
+    CallbackManagerForChainRun,
+)
+from langchain_core.tools import BaseTool
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _tool_pool() -> ThreadPoolExecutor:
+    """Return the process-wide thread pool used for tool calls."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=settings.agent_tool_max_workers,
+                    thread_name_prefix="agent-tool",
+                )
+    return _pool
+
+
+class _StepToolMap(dict):
+    """``name_to_tool_map`` carrying the tool calls of the current step.
+
+    ``AgentExecutor._iter_next_step`` yields every action of a step before it
+    performs the first one and passes ``name_to_tool_map`` through to
+    ``_perform_agent_action`` unchanged, so the map is where the step's
+    actions and their futures can travel without shared executor state.
+    """
+
+    def __init__(self, tools: dict) -> None:
+        super().__init__(tools)
+        self.actions: list[AgentAction] = []
+        self.futures: dict[int, Future] = {}
+
+
+class ConcurrentAgentExecutor(AgentExecutor):
+    """``AgentExecutor`` that runs a step's tool calls in parallel.
+
+    Attributes:
+        tool_timeout: Seconds to wait for each tool call; a call that times
+            out yields an error observation for the model instead of failing
+            the turn.  Defaults to ``settings.agent_tool_timeout_seconds``.
+    """
+
+    tool_timeout: float | None = None
+
+    def _timeout(self) -> float:
+        return self.tool_timeout or settings.agent_tool_timeout_seconds
+
+    def _iter_next_step(
+        self,
+        name_to_tool_map: dict[str, BaseTool],
+        color_mapping: dict[str, str],
+        inputs: dict[str, str],
+        intermediate_steps: list[tuple[AgentAction, str]],
+        run_manager: CallbackManagerForChainRun | None = None,
+    ) -> Iterator[AgentFinish | AgentAction | AgentStep]:
+        step_map = _StepToolMap(name_to_tool_map)
+        for item in super()._iter_next_step(
+            step_map, color_mapping, inputs, intermediate_steps, run_manager
+        ):
+            if isinstance(item, AgentAction):
+                step_map.actions.append(item)
+            yield item
+
+    def _perform_agent_action(
+        self,
+        name_to_tool_map: dict[str, BaseTool],
+        color_mapping: dict[str, str],
+        agent_action: AgentAction,
+        run_manager: CallbackManagerForChainRun | None = None,
+    ) -> AgentStep:
+        if not isinstance(name_to_tool_map, _StepToolMap) or len(name_to_tool_map.actions) < 2:
+            return super()._perform_agent_action(
+                name_to_tool_map, color_mapping, agent_action, run_manager
+            )
+        step_map = name_to_tool_map
+        if not step_map.futures:
+            tools = dict(step_map)
+            pool = _tool_pool()
+            for action in step_map.actions:
+                # One context copy per call: a Context cannot be entered by two threads.
+                ctx = contextvars.copy_context()
+                step_map.futures[id(action)] = pool.submit(
+                    ctx.run,
+                    super()._perform_agent_action,
+                    tools,
+                    color_mapping,
+                    action,
+                    run_manager,
+                )
+            logger.debug("agent_parallel_tools", calls=len(step_map.actions))
+        future = step_map.futures[id(agent_action)]
+        timeout = self._timeout()
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()
+            logger.warning("agent_tool_timeout", tool=agent_action.tool, timeout=timeout)
+            return AgentStep(
+                action=agent_action,
+                observation=f"Tool '{agent_action.tool}' timed out after {timeout:g}s.",
+            )
+
+    async def _aperform_agent_action(
+        self,
+        name_to_tool_map: dict[str, BaseTool],
+        color_mapping: dict[str, str],
+        agent_action: AgentAction,
+        run_manager: AsyncCallbackManagerForChainRun | None = None,
+    ) -> AgentStep:
+        timeout = self._timeout()
+        try:
+            return await asyncio.wait_for(
+                super()._aperform_agent_action(
+                    name_to_tool_map, color_mapping, agent_action, run_manager
+                ),
+                timeout=timeout,
+            )
+        except TimeoutError:
+            logger.warning("agent_tool_timeout", tool=agent_action.tool, timeout=timeout)
+            return AgentStep(
+                action=agent_action,
+                observation=f"Tool '{agent_action.tool}' timed out after {timeout:g}s.",
+            )
+
+
+def build_agent_executor(agent: Any, tools: list, **kwargs: Any) -> AgentExecutor:
+    """Return a concurrent or sequential executor depending on settings.
+
+    Args:
+        agent: The agent runnable.
+        tools: Tools available to the agent.
+        **kwargs: Extra ``AgentExecutor`` arguments.
+
+    Returns:
+        AgentExecutor: :class:`ConcurrentAgentExecutor` when
+            ``settings.agent_parallel_tools`` is enabled.
+    """
+    executor_cls = ConcurrentAgentExecutor if settings.agent_parallel_tools else AgentExecutor
+    return executor_cls(agent=agent, tools=tools, **kwargs)
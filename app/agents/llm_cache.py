@@ -0,0 +1,364 @@
+"""Persistent exact-match cache for deterministic LLM calls.
+
+Agents call their chat models with ``temperature=0``, so an identical prompt
+(same messages, same tool results, same bound tools) yields an equivalent
+answer.  :class:`SQLiteLLMCache` is a LangChain ``BaseCache`` that stores
+those answers in SQLite, keyed by the model name, the normalized messages
+and a hash of the call parameters (bound tool schemas, stop words, model
+configuration).  Normalization drops per-run noise — message ids, response
+and usage metadata — and renumbers tool-call ids in order of appearance, so
+a repeated agent step with the same tool outputs hits the cache.
+
+Entries expire after ``llm_cache_ttl_seconds`` and the least recently used
+entries are evicted beyond ``llm_cache_max_entries``.  The cache is opt-in
+per agent: only agents listed in ``llm_cache_agents`` get it (see
+:func:`cache_for_agent`).  When ``settings.cache_backends`` configures a
+``response`` cache, :class:`BackendLLMCache` stores the entries in that
+backend (:mod:`app.utils.cache`) instead of the dedicated SQLite table.
+:func:`llm_cache_stats` reports hit rate and the LLM latency saved by hits.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+import warnings
+from typing import Any
+
+import sqlalchemy as sa
+from langchain_core._api import LangChainBetaWarning
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+from app.config import settings
+from app.utils.cache import Cache, get_cache
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_VOLATILE_KEYS = {"response_metadata", "usage_metadata"}
+_TOOL_CALL_ID_KEYS = {"tool_call_id"}
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Return a canonical form of a serialized message list.
+
+    Args:
+        prompt: ``langchain_core.load.dumps`` of the messages.
+
+    Returns:
+        str: Canonical JSON without ids/metadata that vary between runs.
+    """
+    try:
+        data = json.loads(prompt)
+    except ValueError:
+        return prompt.strip()
+    call_ids: dict[str, str] = {}
+
+    def canonical(value: Any) -> Any:
+        if isinstance(value, dict):
+            result = {}
+            for key, item in value.items():
+                if key in _VOLATILE_KEYS:
+                    continue
+                if key == "id" and isinstance(item, str):
+                    # message / tool-call ids: keep only their position
+                    result[key] = call_ids.setdefault(item, f"#{len(call_ids)}")
+                    continue
+                if key in _TOOL_CALL_ID_KEYS and isinstance(item, str):
+                    result[key] = call_ids.setdefault(item, f"#{len(call_ids)}")
+                    continue
+                result[key] = canonical(item)
+            return result
+        if isinstance(value, list):
+            return [canonical(item) for item in value]
+        if isinstance(value, str):
+            return value.strip()
+        return value
+
+    return json.dumps(canonical(data), sort_keys=True, separators=(",", ":"))
+
+
+def _model_name(llm_string: str) -> str:
+    config = llm_string.split("---", 1)[0]
+    try:
+        kwargs = json.loads(config).get("kwargs", {})
+    except (ValueError, AttributeError):
+        return "unknown"
+    return str(kwargs.get("model_name") or kwargs.get("model") or "unknown")
+
+
+def cache_key(prompt: str, llm_string: str) -> tuple[str, str]:
+    """Return ``(key, model)`` for a prompt and LangChain ``llm_string``.
+
+    Args:
+        prompt: Serialized messages.
+        llm_string: Serialized model configuration plus call parameters
+            (including bound tool schemas).
+
+    Returns:
+        tuple[str, str]: SHA-256 cache key and the model name.
+    """
+    model = _model_name(llm_string)
+    params_hash = hashlib.sha256(llm_string.encode()).hexdigest()
+    material = "\0".join([model, params_hash, normalize_prompt(prompt)])
+    return hashlib.sha256(material.encode()).hexdigest(), model
+
+
+class SQLiteLLMCache(BaseCache):
+    """LangChain cache persisting generations in a SQLite table.
+
+    Args:
+        database_url: SQLAlchemy URL of the cache database.
+        ttl_seconds: Entry lifetime; 0 disables expiry.
+        max_entries: Maximum number of entries kept (least recently used
+            entries are evicted first).
+    """
+
+    def __init__(self, database_url: str, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._engine = sa.create_engine(database_url)
+        self._lock = threading.Lock()
+        self._pending: dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_latency_ms = 0.0
+        with self._engine.begin() as conn:
+            conn.execute(
+                sa.text(
+                    """
+                    CREATE TABLE IF NOT EXISTS llm_cache (
+                        key TEXT PRIMARY KEY,
+                        model TEXT NOT NULL,
+                        value TEXT NOT NULL,
+                        latency_ms REAL NOT NULL DEFAULT 0,
+                        created_at REAL NOT NULL,
+                        last_used_at REAL NOT NULL,
+                        hits INTEGER NOT NULL DEFAULT 0
+                    )
+                    """
+                )
+            )
+            conn.execute(
+                sa.text(
+                    "CREATE INDEX IF NOT EXISTS ix_llm_cache_last_used ON llm_cache (last_used_at)"
+                )
+            )
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        """Return cached generations, or None (and start timing the LLM call)."""
+        key, model = cache_key(prompt, llm_string)
+        now = time.time()
+        with self._engine.begin() as conn:
+            row = conn.execute(
+                sa.text("SELECT value, latency_ms, created_at FROM llm_cache WHERE key = :key"),
+                {"key": key},
+            ).first()
+            if row is not None and self.ttl_seconds and now - row.created_at > self.ttl_seconds:
+                conn.execute(sa.text("DELETE FROM llm_cache WHERE key = :key"), {"key": key})
+                row = None
+            if row is not None:
+                conn.execute(
+                    sa.text(
+                        "UPDATE llm_cache SET hits = hits + 1, last_used_at = :now WHERE key = :key"
+                    ),
+                    {"key": key, "now": now},
+                )
+        if row is None:
+            with self._lock:
+                self.misses += 1
+                if len(self._pending) > 10_000:  # calls that failed never reach update()
+                    self._pending.clear()
+                self._pending[key] = time.perf_counter()
+            return None
+        with self._lock:
+            self.hits += 1
+            self.saved_latency_ms += row.latency_ms
+        logger.debug("llm_cache_hit", model=model, saved_ms=round(row.latency_ms, 1))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", LangChainBetaWarning)
+            return [loads(item, allowed_objects="core") for item in json.loads(row.value)]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store generations and evict expired / least recently used entries."""
+        key, model = cache_key(prompt, llm_string)
+        with self._lock:
+            started = self._pending.pop(key, None)
+        latency_ms = (time.perf_counter() - started) * 1000 if started else 0.0
+        now = time.time()
+        with self._engine.begin() as conn:
+            conn.execute(
+                sa.text(
+                    """
+                    INSERT OR REPLACE INTO llm_cache
+                        (key, model, value, latency_ms, created_at, last_used_at, hits)
+                    VALUES (:key, :model, :value, :latency_ms, :now, :now, 0)
+                    """
+                ),
+                {
+                    "key": key,
+                    "model": model,
+                    "value": json.dumps([dumps(generation) for generation in return_val]),
+                    "latency_ms": latency_ms,
+                    "now": now,
+                },
+            )
+            evicted = 0
+            if self.ttl_seconds:
+                evicted += conn.execute(
+                    sa.text("DELETE FROM llm_cache WHERE created_at < :cutoff"),
+                    {"cutoff": now - self.ttl_seconds},
+                ).rowcount
+            evicted += conn.execute(
+                sa.text(
+                    """
+                    DELETE FROM llm_cache WHERE key IN (
+                        SELECT key FROM llm_cache ORDER BY last_used_at ASC
+                        LIMIT MAX(0, (SELECT COUNT(*) FROM llm_cache) - :max_entries)
+                    )
+                    """
+                ),
+                {"max_entries": self.max_entries},
+            ).rowcount
+        if evicted:
+            with self._lock:
+                self.evictions += evicted
+
+    def clear(self, **kwargs: Any) -> None:
+        """Delete every cached entry."""
+        with self._engine.begin() as conn:
+            conn.execute(sa.text("DELETE FROM llm_cache"))
+
+    def stats(self) -> dict:
+        """Return hit/miss counters, hit rate, saved latency and entry count."""
+        with self._engine.connect() as conn:
+            entries = conn.execute(sa.text("SELECT COUNT(*) FROM llm_cache")).scalar_one()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "saved_latency_ms": round(self.saved_latency_ms, 1),
+                "evictions": self.evictions,
+                "entries": entries,
+            }
+
+
+class BackendLLMCache(BaseCache):
+    """LangChain cache storing generations in a :mod:`app.utils.cache` backend.
+
+    Args:
+        cache: Namespaced cache (the ``response`` cache).
+    """
+
+    def __init__(self, cache: Cache) -> None:
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._pending: dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.saved_latency_ms = 0.0
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        """Return cached generations, or None (and start timing the LLM call)."""
+        key, model = cache_key(prompt, llm_string)
+        value = self.cache.get(key)
+        if value is None:
+            with self._lock:
+                self.misses += 1
+                if len(self._pending) > 10_000:  # calls that failed never reach update()
+                    self._pending.clear()
+                self._pending[key] = time.perf_counter()
+            return None
+        latency_ms = value["latency_ms"]
+        with self._lock:
+            self.hits += 1
+            self.saved_latency_ms += latency_ms
+        logger.debug("llm_cache_hit", model=model, saved_ms=round(latency_ms, 1))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", LangChainBetaWarning)
+            return [loads(item, allowed_objects="core") for item in value["generations"]]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store generations and the call latency for ``llm_cache_ttl_seconds``."""
+        key, _ = cache_key(prompt, llm_string)
+        with self._lock:
+            started = self._pending.pop(key, None)
+        latency_ms = (time.perf_counter() - started) * 1000 if started else 0.0
+        self.cache.set(
+            key,
+            {
+                "generations": [dumps(generation) for generation in return_val],
+                "latency_ms": latency_ms,
+            },
+        )
+
+    def clear(self, **kwargs: Any) -> None:
+        """Invalidate every cached response in all workers."""
+        self.cache.invalidate()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters, hit rate, saved latency and the backend in use."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": type(self.cache.backend).__name__,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "saved_latency_ms": round(self.saved_latency_ms, 1),
+            }
+
+
+_cache: SQLiteLLMCache | BackendLLMCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> SQLiteLLMCache | BackendLLMCache:
+    """Return the process-wide LLM cache configured by the ``llm_cache_*`` settings.
+
+    Uses the ``response`` cache backend when one is configured, otherwise the
+    dedicated SQLite table.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                response_cache = get_cache("response", settings.llm_cache_ttl_seconds)
+                if response_cache is not None:
+                    _cache = BackendLLMCache(response_cache)
+                else:
+                    _cache = SQLiteLLMCache(
+                        settings.llm_cache_url,
+                        ttl_seconds=settings.llm_cache_ttl_seconds,
+                        max_entries=settings.llm_cache_max_entries,
+                    )
+    return _cache
+
+
+def cache_for_agent(agent_name: str) -> SQLiteLLMCache | BackendLLMCache | None:
+    """Return the LLM cache if it is enabled for ``agent_name``.
+
+    Args:
+        agent_name: Agent name (e.g. ``"supervisor"``, ``"kb_agent"``).
+
+    Returns:
+        SQLiteLLMCache | BackendLLMCache | None: The cache, or None when the agent is not
+            listed in ``settings.llm_cache_agents`` (``"*"`` enables all).
+    """
+    enabled = {name.strip() for name in settings.llm_cache_agents.split(",") if name.strip()}
+    if "*" in enabled or agent_name in enabled:
+        return get_llm_cache()
+    return None
+
+
+def llm_cache_stats() -> dict:
+    """Return the cache counters, or ``{"enabled": False}`` if never used."""
+    if _cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **_cache.stats()}
@@ -0,0 +1,261 @@
+"""Shared LLM client registry and HTTP connection pool.
+
+Every agent used to build its own ``ChatOpenAI``, and each of those owned a
+private HTTP connection pool, so a worker opened (and TLS-negotiated) one
+connection per agent instance.  :func:`get_chat_model` instead returns one
+``ChatOpenAI`` per ``(model, parameters)`` combination, and all of them send
+their requests through a single keep-alive ``httpx.Client`` /
+``httpx.AsyncClient`` pair tuned by the ``llm_*`` settings.
+
+Request hooks record per-request latency (time until response headers) and
+whether the request opened a new connection, exposed by :func:`llm_pool_stats`.
+
+Usage::
+
+    from app.agents.llm_pool import get_chat_model
+
+    llm = get_chat_model("gpt-4o-mini", temperature=0)
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+logger = get_logger(__name__)
+
+_START_KEY = "llm_pool_start"
+
+
+@dataclass
+class LLMPoolStats:
+    """Counters collected from the shared LLM HTTP pool."""
+
+    requests: int = 0
+    connections_opened: int = 0
+    tls_handshakes: int = 0
+    errors: int = 0
+    total_latency_ms: float = 0.0
+    max_latency_ms: float = 0.0
+
+    def snapshot(self) -> dict:
+        """Return the counters plus derived reuse and latency figures.
+
+        Returns:
+            dict: Counters, ``reused_connections``, ``reuse_ratio`` and
+                ``avg_latency_ms``.
+        """
+        reused = max(self.requests - self.connections_opened, 0)
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "tls_handshakes": self.tls_handshakes,
+            "reused_connections": reused,
+            "reuse_ratio": round(reused / self.requests, 3) if self.requests else 0.0,
+            "errors": self.errors,
+            "avg_latency_ms": (
+                round(self.total_latency_ms / self.requests, 1) if self.requests else 0.0
+            ),
+            "max_latency_ms": round(self.max_latency_ms, 1),
+        }
+
+
+_stats = LLMPoolStats()
+_lock = threading.Lock()
+_models: dict[tuple, ChatOpenAI] = {}
+_http_client: httpx.Client | None = None
+_async_http_client: httpx.AsyncClient | None = None
+
+
+# ----------------------------------------------------------------------
+# httpx hooks
+# ----------------------------------------------------------------------
+
+
+def _record_trace(event_name: str) -> None:
+    if event_name == "connection.connect_tcp.complete":
+        with _lock:
+            _stats.connections_opened += 1
+    elif event_name == "connection.start_tls.complete":
+        with _lock:
+            _stats.tls_handshakes += 1
+
+
+def _record_response(response: httpx.Response) -> None:
+    started = response.request.extensions.get(_START_KEY)
+    elapsed_ms = (time.perf_counter() - started) * 1000 if started else 0.0
+    with _lock:
+        _stats.requests += 1
+        _stats.total_latency_ms += elapsed_ms
+        _stats.max_latency_ms = max(_stats.max_latency_ms, elapsed_ms)
+        if response.status_code >= 400:
+            _stats.errors += 1
+
+
+def _trace(event_name: str, info: dict) -> None:
+    _record_trace(event_name)
+
+
+async def _async_trace(event_name: str, info: dict) -> None:
+    _record_trace(event_name)
+
+
+def _on_request(request: httpx.Request) -> None:
+    request.extensions = {**request.extensions, "trace": _trace, _START_KEY: time.perf_counter()}
+
+
+async def _on_async_request(request: httpx.Request) -> None:
+    request.extensions = {
+        **request.extensions,
+        "trace": _async_trace,
+        _START_KEY: time.perf_counter(),
+    }
+
+
+def _on_response(response: httpx.Response) -> None:
+    _record_response(response)
+
+
+async def _on_async_response(response: httpx.Response) -> None:
+    _record_response(response)
+
+
+# ----------------------------------------------------------------------
+# Shared clients
+# ----------------------------------------------------------------------
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.llm_max_connections,
+        max_keepalive_connections=settings.llm_max_keepalive_connections,
+        keepalive_expiry=settings.llm_keepalive_expiry_seconds,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(settings.llm_timeout_seconds, connect=10.0)
+
+
+def llm_http_client() -> httpx.Client:
+    """Return the shared synchronous HTTP client used for LLM requests.
+
+    Returns:
+        httpx.Client: Keep-alive client created on first use.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        with _lock:
+            if _http_client is None or _http_client.is_closed:
+                _http_client = httpx.Client(
+                    limits=_limits(),
+                    timeout=_timeout(),
+                    event_hooks={"request": [_on_request], "response": [_on_response]},
+                )
+    return _http_client
+
+
+def llm_async_http_client() -> httpx.AsyncClient:
+    """Return the shared asynchronous HTTP client used for LLM requests.
+
+    Returns:
+        httpx.AsyncClient: Keep-alive client created on first use.
+    """
+    global _async_http_client
+    if _async_http_client is None or _async_http_client.is_closed:
+        with _lock:
+            if _async_http_client is None or _async_http_client.is_closed:
+                _async_http_client = httpx.AsyncClient(
+                    limits=_limits(),
+                    timeout=_timeout(),
+                    event_hooks={
+                        "request": [_on_async_request],
+                        "response": [_on_async_response],
+                    },
+                )
+    return _async_http_client
+
+
+def _chat_openai() -> type[ChatOpenAI]:
+    """Return ``ChatOpenAI``, importing ``langchain_openai`` on first use (~1.5 s)."""
+    chat_openai = globals().get("ChatOpenAI")
+    if chat_openai is None:
+        from langchain_openai import ChatOpenAI as chat_openai
+
+        globals()["ChatOpenAI"] = chat_openai
+    return chat_openai
+
+
+def __getattr__(name: str):
+    if name == "ChatOpenAI":
+        return _chat_openai()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_chat_model(model: str, temperature: float = 0, **params: Any) -> ChatOpenAI:
+    """Return the shared ``ChatOpenAI`` for a model and parameter set.
+
+    Args:
+        model: OpenAI model identifier (e.g. ``"gpt-4o"``).
+        temperature: Sampling temperature.
+        **params: Extra ``ChatOpenAI`` keyword arguments; part of the key.
+
+    Returns:
+        ChatOpenAI: A chat model bound to the shared HTTP pool.
+    """
+    key = (model, temperature, tuple(sorted(params.items())))
+    llm = _models.get(key)
+    if llm is None:
+        chat_openai = _chat_openai()
+        http_client = llm_http_client()
+        http_async_client = llm_async_http_client()
+        with _lock:
+            llm = _models.get(key)
+            if llm is None:
+                llm = chat_openai(
+                    model=model,
+                    temperature=temperature,
+                    http_client=http_client,
+                    http_async_client=http_async_client,
+                    **params,
+                )
+                _models[key] = llm
+                logger.debug("llm_client_created", model=model, clients=len(_models))
+    return llm
+
+
+def llm_pool_stats() -> dict:
+    """Return connection-reuse and latency statistics of the shared pool.
+
+    Returns:
+        dict: See :meth:`LLMPoolStats.snapshot`, plus the number of shared
+            chat models.
+    """
+    with _lock:
+        snapshot = _stats.snapshot()
+        snapshot["chat_models"] = len(_models)
+    return snapshot
+
+
+async def close_llm_clients() -> None:
+    """Close the shared HTTP clients and forget the cached chat models."""
+    global _http_client, _async_http_client
+    with _lock:
+        http_client, async_http_client = _http_client, _async_http_client
+        _http_client = _async_http_client = None
+        _models.clear()
+    if http_client is not None:
+        http_client.close()
+    if async_http_client is not None:
+        await async_http_client.aclose()
+    logger.info("llm_pool_closed", **_stats.snapshot())
@@ -3,6 +3,7 @@
 from app.agents.base_agent import BaseAgent
 from app.config import settings
 from app.tools.odoo_activity_tools import (
+    get_activity_digest,
     get_overdue_activities_tool,
     list_lead_activities,
     mark_activity_done,
@@ -10,8 +11,12 @@ from app.tools.odoo_activity_tools import (
 )
 from app.tools.odoo_crm_tools import (
     add_note_to_crm_lead,
+    bulk_mark_leads_lost,
+    bulk_mark_leads_won,
+    bulk_update_crm_leads,
     convert_lead_to_opportunity,
     create_crm_lead,
+    find_duplicate_records,
     get_crm_lead,
     mark_lead_lost,
     mark_lead_won,
@@ -24,6 +29,8 @@ from app.tools.odoo_partner_tools import (
     search_partners_tool,
 )
 from app.tools.odoo_pipeline_tools import (
+    bulk_move_leads_to_stage,
+    get_pipeline_analytics,
     get_pipeline_stages,
     get_pipeline_summary,
     move_lead_to_stage,
@@ -36,6 +43,8 @@ _SYSTEM_PROMPT = """You are a precise Odoo 16 CRM data operations agent.
 Execute CRUD operations on Odoo using the available tools.
 Always confirm operation results and return structured information.
 Never invent data — only use what the tools return.
+When several leads need the same change, use one bulk_* tool call instead of
+calling the single-lead tool once per lead.
 Respond in the same language (English or PT-BR) as the user's instruction.
 
 # TODO: v18 - update tool set if Odoo 18 REST API tools are added
@@ -56,9 +65,13 @@ class OdooAPIAgent(BaseAgent):
                 search_crm_leads,
                 get_crm_lead,
                 create_crm_lead,
+                find_duplicate_records,
                 update_crm_lead,
+                bulk_update_crm_leads,
                 mark_lead_won,
                 mark_lead_lost,
+                bulk_mark_leads_won,
+                bulk_mark_leads_lost,
                 convert_lead_to_opportunity,
                 search_partners_tool,
                 get_partner_tool,
@@ -67,9 +80,12 @@ class OdooAPIAgent(BaseAgent):
                 mark_activity_done,
                 list_lead_activities,
                 get_overdue_activities_tool,
+                get_activity_digest,
                 get_pipeline_stages,
                 move_lead_to_stage,
+                bulk_move_leads_to_stage,
                 get_pipeline_summary,
+                get_pipeline_analytics,
                 add_note_to_crm_lead,
             ],
             system_prompt=_SYSTEM_PROMPT,
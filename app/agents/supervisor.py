@@ -14,6 +14,7 @@ from app.agents.workflow_agent import WorkflowAgent
 from app.config import settings
 from app.memory.session_store import get_session_history
 from app.utils.logger import get_logger
+from app.utils.tracing import span, traced
 from langgraph.graph import END, START, StateGraph
 
 logger = get_logger(__name__)
@@ -64,12 +65,16 @@ class SupervisorAgent(BaseAgent):
 
     def _build_graph(self):
         graph = StateGraph(SupervisorState)
-        graph.add_node("classify_intent", self._classify_intent)
-        graph.add_node("kb_agent", self._run_kb_agent)
-        graph.add_node("odoo_api_agent", self._run_odoo_agent)
-        graph.add_node("workflow_agent", self._run_workflow_agent)
-        graph.add_node("supervisor", self._run_supervisor)
-        graph.add_node("persist_history", self._persist_history)
+        nodes = {
+            "classify_intent": self._classify_intent,
+            "kb_agent": self._run_kb_agent,
+            "odoo_api_agent": self._run_odoo_agent,
+            "workflow_agent": self._run_workflow_agent,
+            "supervisor": self._run_supervisor,
+            "persist_history": self._persist_history,
+        }
+        for name, node in nodes.items():
+            graph.add_node(name, traced(f"supervisor.{name}")(node))
         graph.add_edge(START, "classify_intent")
         graph.add_conditional_edges(
             "classify_intent",
@@ -133,9 +138,10 @@ class SupervisorAgent(BaseAgent):
 
     @staticmethod
     def _persist_history(state: SupervisorState) -> SupervisorState:
-        history = get_session_history(state["session_id"])
-        history.add_user_message(state["message"])
-        history.add_ai_message(state["response"])
+        with span("db.chat_history.write", **{"session.id": state["session_id"]}):
+            history = get_session_history(state["session_id"])
+            history.add_user_message(state["message"])
+            history.add_ai_message(state["response"])
         return {}
 
     def route(self, message: str, session_id: str) -> tuple[str, str]:
@@ -1,6 +1,6 @@
 """API package."""
 
 from app.api import schemas
-from app.api.routes import chat, kb, webhooks, workflows
+from app.api.routes import activities, analytics, chat, kb, leads, webhooks, workflows
 
-__all__ = ["schemas", "chat", "kb", "webhooks", "workflows"]
+__all__ = ["schemas", "activities", "analytics", "chat", "kb", "leads", "webhooks", "workflows"]
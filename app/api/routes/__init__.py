@@ -1,5 +1,5 @@
 """API routes package."""
 
-from app.api.routes import chat, kb, webhooks, workflows
+from app.api.routes import activities, analytics, chat, health, kb, leads, webhooks, workflows
 
-__all__ = ["chat", "kb", "webhooks", "workflows"]
+__all__ = ["activities", "analytics", "chat", "health", "kb", "leads", "webhooks", "workflows"]
@@ -0,0 +1,36 @@
+"""Activity API routes — GET /activities/digest."""
+
+import asyncio
+
+from fastapi import APIRouter, Query
+
+from app.utils.logger import get_logger
+
+router = APIRouter()
+logger = get_logger(__name__)
+
+
+@router.get("/digest")
+async def activities_digest(
+    user_id: int | None = Query(None, ge=1),
+    res_model: str | None = None,
+    top_n: int | None = Query(None, ge=0, le=50),
+) -> dict:
+    """Return overdue / today / planned activity counts per user, team and type.
+
+    Args:
+        user_id: Restrict to one assigned user.
+        res_model: Restrict to activities on one model (e.g. ``crm.lead``).
+        top_n: Most overdue activities detailed per user.
+
+    Returns:
+        dict: ``date``, ``totals``, ``users``, ``teams`` and ``types`` (see
+            :func:`app.odoo.models.mail_activity.activity_digest`).
+    """
+    from app.odoo.models.mail_activity import activity_digest
+
+    digest = await asyncio.to_thread(
+        activity_digest, user_id=user_id, res_model=res_model, top_n=top_n
+    )
+    logger.info("activity_digest", users=len(digest["users"]), **digest["totals"])
+    return digest
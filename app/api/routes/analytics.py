@@ -0,0 +1,33 @@
+"""Analytics API route — GET /analytics."""
+
+import asyncio
+from typing import Literal
+
+from fastapi import APIRouter, Query
+
+from app.utils.logger import get_logger
+
+router = APIRouter()
+logger = get_logger(__name__)
+
+
+@router.get("")
+async def pipeline_analytics(
+    group_by: Literal["stage", "team", "user"] = "team",
+    months: int = Query(3, ge=1, le=24),
+) -> dict:
+    """Return vectorized pipeline analytics over every lead of the active tenant.
+
+    Args:
+        group_by: Grouping of the totals and win rates.
+        months: Forecast horizon in months.
+
+    Returns:
+        dict: ``leads``, ``totals``, ``by_month``, ``win_rates``, ``forecast``
+            and ``funnel`` sections (see :func:`app.odoo.analytics.pipeline_report`).
+    """
+    from app.odoo.analytics import pipeline_report
+
+    report = await asyncio.to_thread(pipeline_report, group_by, months)
+    logger.info("pipeline_analytics", group_by=group_by, leads=report["leads"]["total"])
+    return report
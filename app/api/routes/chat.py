@@ -1,12 +1,20 @@
 """Chat API route — POST /chat."""
 
+from __future__ import annotations
+
 from threading import Lock
+from typing import TYPE_CHECKING
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 
-from app.agents.supervisor import SupervisorAgent
 from app.api.schemas import ChatRequest, ChatResponse
+from app.odoo.tenants import TenantMismatchError, session_tenant
+from app.odoo.unit_of_work import unit_of_work
 from app.utils.logger import get_logger
+from app.utils.tracing import request_span
+
+if TYPE_CHECKING:
+    from app.agents.supervisor import SupervisorAgent
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -16,11 +24,17 @@ _supervisor_lock = Lock()
 
 
 def _get_supervisor() -> SupervisorAgent:
-    """Return a lazily initialized SupervisorAgent instance."""
+    """Return a lazily initialized SupervisorAgent instance.
+
+    The agents (and LangChain) are imported on the first chat request rather
+    than when the app starts.
+    """
     global _supervisor
     if _supervisor is None:
         with _supervisor_lock:
             if _supervisor is None:
+                from app.agents.supervisor import SupervisorAgent
+
                 _supervisor = SupervisorAgent()
     return _supervisor
 
@@ -30,7 +44,10 @@ async def chat(request: ChatRequest) -> ChatResponse:
     """Process a user chat message and return the agent's response.
 
     Routes the message through the Supervisor Agent which determines intent
-    and delegates to the appropriate sub-agent.
+    and delegates to the appropriate sub-agent.  Odoo records read during the
+    turn are shared through a request-scoped identity map, and the turn is
+    traced with a per-request timing breakdown.  A session is pinned to the
+    Odoo tenant it was first used with.
 
     Args:
         request: Chat request containing ``session_id`` and ``message``.
@@ -38,9 +55,20 @@ async def chat(request: ChatRequest) -> ChatResponse:
     Returns:
         ChatResponse: The response with ``session_id``, ``response``, and
             ``agent_used``.
+
+    Raises:
+        HTTPException: 409 if the session belongs to another tenant.
     """
     logger.info("chat_request", session_id=request.session_id)
-    response, agent_used = _get_supervisor().route(request.message, request.session_id)
+    try:
+        with (
+            session_tenant(request.session_id),
+            request_span("http.chat", **{"session.id": request.session_id}),
+            unit_of_work("chat"),
+        ):
+            response, agent_used = _get_supervisor().route(request.message, request.session_id)
+    except TenantMismatchError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
     return ChatResponse(
         session_id=request.session_id,
         response=response,
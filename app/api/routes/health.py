@@ -0,0 +1,29 @@
+"""Health API routes — GET /health/live, GET /health/ready."""
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.utils.health import health_monitor
+
+router = APIRouter()
+
+
+@router.get("/live")
+async def live() -> dict:
+    """Return 200 while the process is serving requests.
+
+    Returns:
+        dict: ``{"status": "ok", "uptime_seconds": N}``.
+    """
+    return health_monitor.liveness()
+
+
+@router.get("/ready")
+async def ready() -> JSONResponse:
+    """Return the cached dependency status; 503 until required dependencies are healthy.
+
+    Returns:
+        JSONResponse: Readiness payload (see :meth:`HealthMonitor.readiness`).
+    """
+    payload = health_monitor.readiness()
+    return JSONResponse(payload, status_code=200 if payload["status"] == "ready" else 503)
@@ -3,8 +3,6 @@
 from fastapi import APIRouter, HTTPException
 
 from app.api.schemas import KBIngestResponse
-from app.knowledge_base.ingestor import ingest_knowledge_base
-from app.knowledge_base.vector_store import get_vector_store
 from app.utils.logger import get_logger
 
 router = APIRouter()
@@ -21,6 +19,8 @@ async def ingest_kb() -> KBIngestResponse:
     Raises:
         HTTPException: 500 on ingest error.
     """
+    from app.knowledge_base.ingestor import ingest_knowledge_base
+
     try:
         chunks = ingest_knowledge_base()
         logger.info("kb_ingest_complete", chunks=chunks)
@@ -37,6 +37,8 @@ async def kb_status() -> dict:
     Returns:
         dict: ``{"status": "ok", "chunks": N}`` or an error status.
     """
+    from app.knowledge_base.vector_store import get_vector_store
+
     try:
         store = get_vector_store()
         count = store._collection.count()
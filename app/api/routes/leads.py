@@ -0,0 +1,163 @@
+"""Lead API routes — POST /leads/import and POST /leads/bulk."""
+
+from __future__ import annotations
+
+import asyncio
+import queue
+import time
+from collections.abc import Iterator
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from app.api.schemas import BulkLeadRequest
+from app.utils.logger import get_logger
+
+router = APIRouter()
+logger = get_logger(__name__)
+
+_PROGRESS_LOG_SECONDS = 5.0
+_BODY_QUEUE_CHUNKS = 16
+_ABORTED = object()
+
+
+class UploadAbortedError(RuntimeError):
+    """The request body ended (client disconnect) before the upload was complete."""
+
+
+@router.post("/import")
+async def import_leads(
+    request: Request,
+    format: Literal["csv", "ndjson"] | None = None,
+    batch_size: int | None = Query(None, ge=1, le=5000),
+    concurrency: int | None = Query(None, ge=1, le=32),
+) -> dict:
+    """Stream CSV or NDJSON leads from the request body into Odoo.
+
+    The body is consumed as it arrives and handed to a worker thread through
+    a small bounded queue, so memory stays flat however large the upload.
+    Without ``format``, ``application/x-ndjson`` / ``application/jsonl``
+    bodies are read as NDJSON and everything else as CSV with a header row.
+    If the client disconnects mid-upload the import stops: batches already
+    sent to Odoo stay created, the rows after them are dropped.
+
+    Args:
+        request: The raw request (body = the file).
+        format: ``csv`` or ``ndjson``.
+        batch_size: Leads per Odoo ``create`` call.
+        concurrency: Batches created concurrently.
+
+    Returns:
+        dict: ``rows``, ``created``, ``failed``, ``elapsed_seconds``,
+            ``rows_per_second``, per-row ``errors`` and ``error`` when the
+            import stopped early.
+    """
+    from app.odoo.lead_import import LeadImporter, decode_lines, iter_rows
+
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "ndjson" if "ndjson" in content_type or "jsonl" in content_type else "csv"
+    chunks: queue.Queue[bytes | object | None] = queue.Queue(maxsize=_BODY_QUEUE_CHUNKS)
+
+    def body() -> Iterator[bytes]:
+        while (chunk := chunks.get()) is not None:
+            if chunk is _ABORTED:
+                raise UploadAbortedError("the request body was not received completely")
+            yield chunk
+
+    last_log = time.monotonic()
+
+    def progress(report) -> None:
+        nonlocal last_log
+        if time.monotonic() - last_log >= _PROGRESS_LOG_SECONDS:
+            last_log = time.monotonic()
+            logger.info(
+                "lead_import_progress",
+                rows=report.rows,
+                created=report.created,
+                failed=report.failed,
+                rows_per_second=round(report.rows_per_second, 1),
+            )
+
+    importer = LeadImporter(batch_size, concurrency, on_progress=progress)
+    task = asyncio.ensure_future(
+        asyncio.to_thread(importer.run, iter_rows(decode_lines(body()), format))
+    )
+
+    async def feed(chunk: bytes | object | None) -> None:
+        while not task.done():
+            try:
+                chunks.put_nowait(chunk)
+                return
+            except queue.Full:
+                await asyncio.sleep(0.005)
+
+    try:
+        async for chunk in request.stream():
+            if chunk:
+                await feed(chunk)
+    except BaseException:
+        # A disconnect is not the end of the file: stop the import so the rows
+        # still being batched, and a cut-off last line, are never created.
+        await feed(_ABORTED)
+        await asyncio.gather(task, return_exceptions=True)
+        raise
+    await feed(None)
+    report = await task
+    return report.as_dict()
+
+
+def _run_bulk(body: BulkLeadRequest) -> dict:
+    from app.odoo.models.crm_lead import (
+        bulk_mark_lost,
+        bulk_mark_won,
+        bulk_update_leads,
+        bulk_write_leads,
+    )
+    from app.odoo.models.crm_stage import get_stage_by_name
+
+    target = {"lead_ids": body.ids, "domain": body.domain}
+    if body.action == "won":
+        return bulk_mark_won(**target)
+    if body.action == "lost":
+        return bulk_mark_lost(**target, lost_reason_id=body.lost_reason_id)
+    if body.action == "stage":
+        stage = get_stage_by_name(body.stage) if body.stage else None
+        if not stage:
+            raise ValueError(f"Stage '{body.stage}' not found")
+        return {"stage_id": stage["id"], **bulk_update_leads({"stage_id": stage["id"]}, **target)}
+    if body.updates:
+        return bulk_write_leads(body.updates)
+    if not body.values:
+        raise ValueError("Give values or per-lead updates to write")
+    return bulk_update_leads(body.values, **target)
+
+
+@router.post("/bulk")
+async def bulk_leads(body: BulkLeadRequest) -> dict:
+    """Apply one change to many leads with as few Odoo calls as possible.
+
+    Leads receiving identical values share one ``write``; Won / Lost go
+    through a single ``action_set_won`` / ``action_set_lost`` over all ids.
+
+    Args:
+        body: Action, target leads (ids or domain) and values.
+
+    Returns:
+        dict: ``matched``, ``updated``, ``failed``, ``calls`` and ``errors``.
+
+    Raises:
+        HTTPException: 400 for a missing target, unknown stage or too many leads.
+    """
+    try:
+        summary = await asyncio.to_thread(_run_bulk, body)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    logger.info(
+        "leads_bulk_action",
+        action=body.action,
+        matched=summary["matched"],
+        failed=summary["failed"],
+        calls=summary["calls"],
+    )
+    return summary
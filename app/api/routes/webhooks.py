@@ -1,12 +1,22 @@
 """Webhook API route — POST /webhooks/odoo."""
 
+from __future__ import annotations
+
 from threading import Lock
+from typing import TYPE_CHECKING
 
 from fastapi import APIRouter, BackgroundTasks
 
-from app.agents.workflow_agent import WorkflowAgent
 from app.api.schemas import WebhookPayload
+from app.config import settings
+from app.odoo.client import odoo_client
+from app.odoo.dedup import BUILD_ERRORS, DEDUP_SPECS, loaded_index
+from app.odoo.mirror import MIRROR_SPECS, SYNC_ERRORS, get_mirror
 from app.utils.logger import get_logger
+from app.workflows.registry import EVENT_WORKFLOW_MAP
+
+if TYPE_CHECKING:
+    from app.agents.workflow_agent import WorkflowAgent
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -21,26 +31,68 @@ def _get_workflow_agent() -> WorkflowAgent:
     if _workflow_agent is None:
         with _workflow_agent_lock:
             if _workflow_agent is None:
+                from app.agents.workflow_agent import WorkflowAgent
+
                 _workflow_agent = WorkflowAgent()
     return _workflow_agent
 
+
 # Mapping of Odoo webhook events to workflow names
-_EVENT_WORKFLOW_MAP: dict[str, str] = {
-    "lead.won": "customer_onboarding",
-    "lead.lost": "lost_lead_recovery",
-    "lead.created": "lead_qualification",
-}
+_EVENT_WORKFLOW_MAP: dict[str, str] = EVENT_WORKFLOW_MAP
+
+
+def _refresh_mirror(model: str, record_id: int) -> None:
+    """Re-read a changed (or deleted) record into the active tenant's search mirror."""
+    mirror = get_mirror()
+    if mirror is None:
+        return
+    try:
+        mirror.refresh(model, [record_id])
+    except SYNC_ERRORS as exc:
+        logger.warning(
+            "odoo_mirror_refresh_failed", model=model, record_id=record_id, error=str(exc)
+        )
+
+
+def _update_dedup_index(model: str, record_id: int) -> None:
+    """Re-index a changed record if the duplicate index is loaded; log its duplicates."""
+    index = loaded_index(model)
+    if index is None:
+        return
+    try:
+        records = odoo_client.search_read(
+            model,
+            [["id", "=", record_id], ["active", "in", [True, False]]],
+            index.spec.fields,
+            limit=1,
+        )
+    except BUILD_ERRORS as exc:
+        logger.warning(
+            "dedup_index_update_failed", model=model, record_id=record_id, error=str(exc)
+        )
+        return
+    if not records:
+        index.remove(record_id)
+        return
+    index.add(records[0])
+    matches = index.candidates(records[0])
+    if matches:
+        logger.warning(
+            "duplicate_record_detected",
+            model=model,
+            record_id=record_id,
+            duplicates=[m.record_id for m in matches],
+        )
 
 
 # TODO: add webhook signature verification for production
 @router.post("/odoo")
-async def odoo_webhook(
-    payload: WebhookPayload, background_tasks: BackgroundTasks
-) -> dict:
+async def odoo_webhook(payload: WebhookPayload, background_tasks: BackgroundTasks) -> dict:
     """Receive and process an Odoo webhook event.
 
     Maps the incoming event to a registered workflow and executes it as a
-    background task.
+    background task; changes to leads and partners also refresh the local
+    search mirror and the duplicate index.
 
     Args:
         payload: Webhook event payload from Odoo.
@@ -51,16 +103,20 @@ async def odoo_webhook(
     """
     logger.info(
         "webhook_received",
-        event=payload.event,
+        event_type=payload.event,
         model=payload.model,
         record_id=payload.record_id,
     )
 
+    if settings.mirror_sync_interval_seconds > 0 and payload.model in MIRROR_SPECS:
+        background_tasks.add_task(_refresh_mirror, payload.model, payload.record_id)
+
+    if payload.model in DEDUP_SPECS:
+        background_tasks.add_task(_update_dedup_index, payload.model, payload.record_id)
+
     workflow_name = _EVENT_WORKFLOW_MAP.get(payload.event)
     if workflow_name:
         context = {"lead_id": payload.record_id, **payload.data}
-        background_tasks.add_task(
-            _get_workflow_agent().execute, workflow_name, context, "webhook"
-        )
+        background_tasks.add_task(_get_workflow_agent().execute, workflow_name, context, "webhook")
 
     return {"status": "accepted", "event": payload.event}
@@ -5,6 +5,7 @@ from fastapi import APIRouter, HTTPException
 from app.api.schemas import WorkflowRunRequest, WorkflowRunResponse
 from app.workflows.registry import workflow_registry
 from app.utils.logger import get_logger
+from app.utils.tracing import request_span
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -42,9 +43,11 @@ async def run_workflow(request: WorkflowRunRequest) -> WorkflowRunResponse:
             detail=f"Workflow '{request.workflow_name}' not found",
         )
     logger.info("workflow_run_request", name=request.workflow_name)
-    result = await workflow.execute(request.context)
+    with request_span("http.workflows.run", **{"workflow.name": request.workflow_name}):
+        result = await workflow.execute(request.context)
     return WorkflowRunResponse(
         success=result.success,
         message=result.message,
         steps=result.steps_executed,
+        step_details=result.step_details,
     )
@@ -1,5 +1,7 @@
 """API schemas — Pydantic models for request/response validation."""
 
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -33,6 +35,9 @@ class WorkflowRunResponse(BaseModel):
     success: bool
     message: str
     steps: list[str] = Field(default_factory=list)
+    step_details: list[dict] = Field(
+        default_factory=list, description="Per-step status and duration_ms"
+    )
 
 
 class WebhookPayload(BaseModel):
@@ -49,3 +54,19 @@ class KBIngestResponse(BaseModel):
 
     chunks_ingested: int
     status: str
+
+
+class BulkLeadRequest(BaseModel):
+    """Request body for POST /leads/bulk."""
+
+    action: Literal["write", "stage", "won", "lost"] = Field(
+        "write", description="Write values, move to a stage, or mark Won / Lost"
+    )
+    ids: list[int] = Field(default_factory=list, description="Lead ids to change")
+    domain: list | None = Field(None, description="Odoo domain selecting leads when no ids")
+    values: dict = Field(default_factory=dict, description="Fields written by 'write'")
+    updates: dict[int, dict] = Field(
+        default_factory=dict, description="Per-lead values for 'write', keyed by lead id"
+    )
+    stage: str = Field("", description="Stage name for 'stage'")
+    lost_reason_id: int | None = Field(None, description="crm.lost.reason id for 'lost'")
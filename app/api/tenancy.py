@@ -0,0 +1,46 @@
+"""ASGI middleware that selects the Odoo tenant of each request."""
+
+from __future__ import annotations
+
+from contextlib import ExitStack
+
+import structlog
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from app.odoo.tenants import DEFAULT_TENANT, UnknownTenantError, use_tenant
+
+
+class TenantMiddleware:
+    """Route ``odoo_client`` to the tenant named in ``settings.odoo_tenant_header``.
+
+    Requests without the header use the default tenant (the ``ODOO_*``
+    settings); an unknown tenant name is rejected with 400.  This is a plain
+    ASGI middleware so the tenant's context variable is set in the task that
+    runs the endpoint.
+
+    Args:
+        app: The wrapped ASGI application.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.header = settings.odoo_tenant_header.lower().encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        name = DEFAULT_TENANT
+        for key, value in scope["headers"]:
+            if key == self.header and value.strip():
+                name = value.decode("latin-1").strip()
+        stack = ExitStack()
+        try:
+            stack.enter_context(use_tenant(name))
+        except UnknownTenantError as exc:
+            await JSONResponse({"detail": str(exc)}, status_code=400)(scope, receive, send)
+            return
+        with stack, structlog.contextvars.bound_contextvars(tenant=name):
+            await self.app(scope, receive, send)
@@ -15,6 +15,75 @@ class Settings(BaseSettings):
     odoo_user: str = Field("admin@example.com", description="Odoo login e-mail")
     odoo_api_key: str = Field("", description="Odoo API Key")
     odoo_version: int = Field(16, description="Odoo major version number")
+    odoo_slow_call_ms: float = Field(
+        1000, description="Odoo RPCs slower than this are logged as slow calls (0 disables)"
+    )
+    odoo_max_connections: int = Field(
+        20, description="Max connections in each Odoo client's connection pool"
+    )
+    odoo_max_keepalive_connections: int = Field(
+        10, description="Idle keep-alive connections kept per Odoo client"
+    )
+    odoo_keepalive_expiry_seconds: float = Field(
+        60, description="Seconds an idle Odoo connection is kept open"
+    )
+    odoo_tenants_file: str = Field(
+        "", description="JSON file of extra Odoo tenants: {name: {url, db, user, api_key}}"
+    )
+    odoo_tenant_header: str = Field(
+        "X-Odoo-Tenant", description="Request header that selects the Odoo tenant"
+    )
+    odoo_tenant_max_clients: int = Field(
+        100, description="Tenant clients (pools) kept open; least recently used are closed"
+    )
+    odoo_tenant_idle_seconds: float = Field(
+        600, description="Tenant clients unused for this long are closed"
+    )
+    odoo_retry_attempts: int = Field(
+        3, description="Attempts per Odoo call for transient failures (idempotent calls only)"
+    )
+    odoo_retry_base_delay_ms: float = Field(
+        100, description="Base of the jittered exponential backoff between Odoo retries"
+    )
+    odoo_retry_max_delay_ms: float = Field(2000, description="Cap of one Odoo retry backoff")
+    odoo_hedge_reads: bool = Field(
+        False, description="Hedge slow search_read/read/search_count calls with a second request"
+    )
+    odoo_hedge_min_samples: int = Field(
+        20, description="Recent calls of a read needed before it is hedged at their p95"
+    )
+    odoo_hedge_min_delay_ms: float = Field(50, description="Lower bound of the hedge delay")
+    odoo_hedge_max_workers: int = Field(16, description="Thread pool size for hedged reads")
+    odoo_concurrency_initial: int = Field(8, description="Initial adaptive Odoo concurrency limit")
+    odoo_concurrency_min: int = Field(1, description="Lowest adaptive Odoo concurrency limit")
+    odoo_concurrency_max: int = Field(32, description="Highest adaptive Odoo concurrency limit")
+    odoo_latency_target_ms: float = Field(
+        2000, description="Odoo RPCs slower than this shrink the concurrency limit"
+    )
+    odoo_queue_timeout_seconds: float = Field(
+        10, description="Seconds an Odoo call waits for a concurrency slot before failing"
+    )
+    odoo_breaker_error_rate: float = Field(
+        0.5, description="Share of failed Odoo calls in the window that opens the breaker"
+    )
+    odoo_breaker_slow_call_ms: float = Field(
+        5000, description="Odoo calls slower than this count as slow for the breaker"
+    )
+    odoo_breaker_slow_rate: float = Field(
+        0.8, description="Share of slow Odoo calls in the window that opens the breaker"
+    )
+    odoo_breaker_min_calls: int = Field(
+        10, description="Calls needed in the window before the breaker may open"
+    )
+    odoo_breaker_window_seconds: float = Field(
+        30, description="Rolling window of the breaker's error and slow-call rates"
+    )
+    odoo_breaker_open_seconds: float = Field(
+        15, description="Seconds the breaker stays open before half-open probes"
+    )
+    odoo_breaker_half_open_probes: int = Field(
+        2, description="Successful half-open probe calls needed to close the breaker"
+    )
 
     # LLM (OpenAI)
     openai_api_key: str = Field("", description="OpenAI API key")
@@ -22,6 +91,55 @@ class Settings(BaseSettings):
     kb_agent_model: str = Field("gpt-4o-mini", description="LLM model for KB Agent")
     workflow_agent_model: str = Field("gpt-4o", description="LLM model for Workflow Agent")
     odoo_api_agent_model: str = Field("gpt-4o-mini", description="LLM model for Odoo API Agent")
+    llm_max_connections: int = Field(20, description="Max connections in the shared LLM pool")
+    llm_max_keepalive_connections: int = Field(
+        10, description="Idle keep-alive connections kept in the shared LLM pool"
+    )
+    llm_keepalive_expiry_seconds: float = Field(
+        120, description="Seconds an idle LLM connection is kept open"
+    )
+    llm_timeout_seconds: float = Field(120, description="LLM HTTP read timeout in seconds")
+    agent_parallel_tools: bool = Field(
+        True, description="Run the tool calls of one agent step concurrently"
+    )
+    agent_tool_max_workers: int = Field(8, description="Thread pool size for agent tool calls")
+    agent_tool_timeout_seconds: float = Field(30, description="Timeout for a single tool call")
+    tool_output_max_tokens: int = Field(
+        1500, description="Hard token cap for the text a single tool call returns"
+    )
+    llm_cache_agents: str = Field(
+        "", description="Comma-separated agents whose LLM calls are cached ('*' for all)"
+    )
+    llm_cache_url: str = Field(
+        "sqlite:///./storage/llm_cache.db", description="SQLAlchemy URL of the LLM cache"
+    )
+    llm_cache_ttl_seconds: float = Field(86400, description="LLM cache entry lifetime")
+    llm_cache_max_entries: int = Field(5000, description="Max LLM cache entries (LRU eviction)")
+
+    # Caches
+    cache_backends: str = Field(
+        "",
+        description=(
+            "Cache backend per cache, e.g. 'reference=shared,retrieval=shared,response=memory' "
+            "(memory = per worker, shared = SQLite file shared by the host's workers)"
+        ),
+    )
+    cache_shared_path: str = Field(
+        "./storage/shared_cache.db", description="SQLite file of the shared cache backend"
+    )
+    cache_max_entries: int = Field(10000, description="Max entries of the in-process cache")
+    cache_local_ttl_seconds: float = Field(
+        5, description="Seconds a shared-cache value is also kept in worker memory"
+    )
+    cache_invalidation_poll_seconds: float = Field(
+        1, description="How often workers check for invalidations broadcast by other workers"
+    )
+    reference_cache_ttl_seconds: float = Field(
+        300, description="Lifetime of cached Odoo reference data (stages, teams)"
+    )
+    retrieval_cache_ttl_seconds: float = Field(
+        600, description="Lifetime of cached knowledge base search results"
+    )
 
     # Storage
     database_url: str = Field(
@@ -32,9 +150,82 @@ class Settings(BaseSettings):
     )
     chroma_collection: str = Field("odoo_crm_kb", description="ChromaDB collection name")
 
+    # Health checks
+    health_check_interval_seconds: float = Field(
+        30, description="Seconds between background dependency probes (0 probes once at startup)"
+    )
+    health_check_timeout_seconds: float = Field(
+        5, description="Seconds a dependency probe may take before it counts as failed"
+    )
+    health_ready_dependencies: str = Field(
+        "odoo,sqlite",
+        description="Dependencies (odoo, sqlite, chroma, llm) required by /health/ready",
+    )
+
+    # Workflows
+    workflow_checkpoint_ttl_seconds: int = Field(
+        3600, description="Max age of step checkpoints a failed workflow run may resume from"
+    )
+    cdc_poll_interval_seconds: float = Field(
+        0, description="Odoo change-data-capture poll interval (0 disables the poller)"
+    )
+    cdc_page_size: int = Field(200, description="Records fetched per CDC keyset page")
+    cdc_initial_lookback_minutes: int = Field(
+        60, description="How far back the CDC poller starts when no watermark is stored"
+    )
+    mirror_sync_interval_seconds: float = Field(
+        0, description="Seconds between syncs of the local Odoo search mirror (0 disables it)"
+    )
+    mirror_path: str = Field(
+        "./storage/odoo_mirror.db", description="SQLite file of the default tenant's mirror"
+    )
+    mirror_tenants: str = Field("default", description="Comma-separated tenants to mirror")
+    mirror_max_staleness_seconds: float = Field(
+        600, description="Searches fall back to Odoo when the mirror's last sync is older"
+    )
+    dedup_threshold: float = Field(
+        0.6, description="Minimum similarity (0-1) for two leads or partners to be duplicates"
+    )
+    dedup_check_on_create: bool = Field(
+        False, description="Refuse to create leads that duplicate existing ones"
+    )
+    dedup_max_block_size: int = Field(
+        500, description="Blocking keys shared by more records are ignored as too common"
+    )
+    dedup_refresh_seconds: float = Field(
+        60, description="Seconds before the duplicate index pulls changes from Odoo again"
+    )
+    lead_import_batch_size: int = Field(200, description="Leads per Odoo create call on import")
+    lead_import_concurrency: int = Field(4, description="Import batches created concurrently")
+    lead_import_max_errors: int = Field(
+        1000, description="Row errors kept in an import report (the count is always exact)"
+    )
+    bulk_update_max_records: int = Field(
+        1000, description="Most leads a single bulk update, won or lost call may touch"
+    )
+    activity_digest_top_n: int = Field(
+        3, description="Most urgent activities detailed per user in the activity digest"
+    )
+    activity_digest_concurrency: int = Field(
+        4, description="Per-user detail reads run concurrently when building the digest"
+    )
+
     # Application
     app_env: str = Field("development", description="Application environment")
     log_level: str = Field("INFO", description="Log level")
+    log_sample_rates: str = Field(
+        "agent_invoke=0.1,odoo_authenticated=0.01",
+        description="Kept fraction per event name in production logging (event=rate,...)",
+    )
+    log_queue_size: int = Field(
+        10000, description="Log lines buffered for the production writer thread before dropping"
+    )
+    tracing_exporter: str = Field(
+        "none", description="Span exporter: none (timing breakdown only), console or file"
+    )
+    tracing_file: str = Field(
+        "./storage/traces.jsonl", description="JSON-lines span file for the 'file' exporter"
+    )
     webhook_secret: str = Field("change_me_in_production", description="Webhook HMAC secret")
 
     @property
@@ -2,19 +2,47 @@
 
 from functools import lru_cache
 
+from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings
 
+from app.agents.llm_pool import llm_async_http_client, llm_http_client
 from app.config import settings
+from app.utils.tracing import span
 
 
 @lru_cache
 def get_embeddings() -> OpenAIEmbeddings:
     """Return a cached OpenAIEmbeddings instance using text-embedding-3-small.
 
+    Requests go through the shared LLM HTTP pool (:mod:`app.agents.llm_pool`).
+
     Returns:
         OpenAIEmbeddings: Configured embeddings object.
     """
     return OpenAIEmbeddings(
         model="text-embedding-3-small",
         openai_api_key=settings.openai_api_key,
+        http_client=llm_http_client(),
+        http_async_client=llm_async_http_client(),
     )
+
+
+class TracedEmbeddings(Embeddings):
+    """Embeddings wrapper opening an ``embeddings.*`` span per call.
+
+    Args:
+        embeddings: The embeddings model to delegate to.
+    """
+
+    def __init__(self, embeddings: Embeddings) -> None:
+        self.embeddings = embeddings
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Embed documents inside an ``embeddings.documents`` span."""
+        with span("embeddings.documents", **{"embeddings.count": len(texts)}):
+            return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        """Embed a query inside an ``embeddings.query`` span."""
+        with span("embeddings.query"):
+            return self.embeddings.embed_query(text)
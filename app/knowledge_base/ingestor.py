@@ -11,7 +11,8 @@ from langchain_community.document_loaders import DirectoryLoader, TextLoader
 from langchain_community.vectorstores import Chroma
 
 from app.config import settings
-from app.knowledge_base.embeddings import get_embeddings
+from app.knowledge_base.embeddings import TracedEmbeddings, get_embeddings
+from app.utils.cache import invalidate
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -53,7 +54,7 @@ def ingest_knowledge_base(
     chunks = splitter.split_documents(documents)
     logger.info("chunks_created", count=len(chunks))
 
-    embeddings = get_embeddings()
+    embeddings = TracedEmbeddings(get_embeddings())
     Chroma.from_documents(
         documents=chunks,
         embedding=embeddings,
@@ -61,5 +62,6 @@ def ingest_knowledge_base(
         persist_directory=persist_path,
     )
 
+    invalidate("retrieval")  # cached search results may predate the new chunks
     logger.info("ingest_complete", chunks=len(chunks))
     return len(chunks)
@@ -2,10 +2,21 @@
 
 from functools import lru_cache
 
+import chromadb
 from langchain_community.vectorstores import Chroma
 
 from app.config import settings
-from app.knowledge_base.embeddings import get_embeddings
+from app.knowledge_base.embeddings import TracedEmbeddings, get_embeddings
+
+
+@lru_cache
+def get_chroma_client() -> chromadb.ClientAPI:
+    """Return the process-wide persistent ChromaDB client.
+
+    Returns:
+        chromadb.ClientAPI: Client of ``settings.chroma_persist_dir``.
+    """
+    return chromadb.PersistentClient(path=settings.chroma_persist_dir)
 
 
 @lru_cache
@@ -17,6 +28,7 @@ def get_vector_store() -> Chroma:
     """
     return Chroma(
         collection_name=settings.chroma_collection,
-        embedding_function=get_embeddings(),
+        embedding_function=TracedEmbeddings(get_embeddings()),
         persist_directory=settings.chroma_persist_dir,
+        client=get_chroma_client(),
     )
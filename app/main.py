@@ -1,28 +1,81 @@
 """FastAPI application entry point for langchain-poc."""
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 
-from app.api.routes import chat, kb, webhooks, workflows
-from app.odoo.auth import test_connection
-from app.utils.logger import get_logger
+from app.agents.llm_pool import close_llm_clients
+from app.api.routes import activities, analytics, chat, health, kb, leads, webhooks, workflows
+from app.api.tenancy import TenantMiddleware
+from app.config import settings
+from app.memory.session_store import init_db
+from app.odoo.client import default_odoo_client
+from app.odoo.metrics import slow_call_report
+from app.odoo.tenants import tenant_registry
+from app.utils.health import health_monitor
+from app.utils.logger import configure_logging, get_logger
+from app.utils.metrics import CONTENT_TYPE, render_prometheus
+from app.utils.tracing import configure_tracing, shutdown_tracing
+from app.workflows.cdc import default_change_feed
 
+configure_logging(
+    settings.log_level,
+    settings.app_env,
+    sample_rates=settings.log_sample_rates,
+    queue_size=settings.log_queue_size,
+)
 logger = get_logger(__name__)
 
 
+def _load_tokenizer() -> None:
+    """Import the tool formatter and load its token encoding (runs in a worker thread)."""
+    from app.tools.formatting import load_encoding
+
+    load_encoding()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan: run startup tasks, then yield."""
     logger.info("Starting langchain-poc application")
-    ok = test_connection()
-    if ok:
-        logger.info("odoo_connection", status="ok")
-    else:
-        logger.warning("odoo_connection", status="failed — check .env settings")
+    configure_tracing()
+    init_db()
+    # The tokenizer may need a download: load it off the event loop, never in a tool call.
+    encoding_task = asyncio.create_task(asyncio.to_thread(_load_tokenizer))
+    # Dependency probes run in the background; /health/ready reports their results.
+    health_task = asyncio.create_task(
+        health_monitor.run_forever(settings.health_check_interval_seconds)
+    )
+    cdc_task = None
+    if settings.cdc_poll_interval_seconds > 0:
+        cdc_task = asyncio.create_task(
+            default_change_feed().run_forever(settings.cdc_poll_interval_seconds)
+        )
+    mirror_task = None
+    if settings.mirror_sync_interval_seconds > 0:
+        from app.odoo.mirror import run_sync_forever
+
+        mirror_task = asyncio.create_task(run_sync_forever(settings.mirror_sync_interval_seconds))
+    if settings.dedup_check_on_create:
+        from app.odoo.dedup import build_in_background
+
+        # Index every lead now so the first create_lead does not wait for it.
+        build_in_background("crm.lead")
     yield
+    encoding_task.cancel()
+    health_task.cancel()
+    if cdc_task is not None:
+        cdc_task.cancel()
+    if mirror_task is not None:
+        mirror_task.cancel()
+    await close_llm_clients()
+    tenant_registry.close_all()
+    default_odoo_client.close()
+    shutdown_tracing()
     logger.info("Shutting down langchain-poc application")
 
 
@@ -41,12 +94,31 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Odoo tenant per request (settings.odoo_tenant_header)
+app.add_middleware(TenantMiddleware)
 
 # Include API routers
+app.include_router(health.router, prefix="/health", tags=["health"])
 app.include_router(chat.router, prefix="/chat", tags=["chat"])
 app.include_router(workflows.router, prefix="/workflows", tags=["workflows"])
 app.include_router(kb.router, prefix="/kb", tags=["knowledge_base"])
 app.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"])
+app.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
+app.include_router(leads.router, prefix="/leads", tags=["leads"])
+app.include_router(activities.router, prefix="/activities", tags=["activities"])
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Expose Odoo RPC and process metrics in Prometheus text format."""
+    return PlainTextResponse(render_prometheus(), media_type=CONTENT_TYPE)
+
+
+@app.get("/metrics/odoo/slow-calls", tags=["metrics"])
+async def odoo_slow_calls(limit: int = 20) -> dict:
+    """Return the slowest Odoo query shapes (by domain fingerprint) and recent slow calls."""
+    return slow_call_report(limit)
+
 
 # Serve static frontend
 app.mount("/static", StaticFiles(directory="frontend"), name="static")
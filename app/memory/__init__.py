@@ -2,9 +2,12 @@
 
 from app.memory.session_store import get_session_history, init_db
 from app.memory.workflow_log import (
+    clear_checkpoints,
     get_workflow_history,
+    load_checkpoints,
     log_workflow_complete,
     log_workflow_start,
+    save_checkpoint,
 )
 
 __all__ = [
@@ -13,4 +16,7 @@ __all__ = [
     "log_workflow_start",
     "log_workflow_complete",
     "get_workflow_history",
+    "load_checkpoints",
+    "save_checkpoint",
+    "clear_checkpoints",
 ]
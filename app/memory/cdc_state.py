@@ -0,0 +1,110 @@
+"""SQLite persistence for change-data-capture watermarks and record states."""
+
+from datetime import datetime
+
+import sqlalchemy as sa
+
+from app.config import settings
+from app.utils.logger import get_logger
+from app.utils.tracing import traced
+
+logger = get_logger(__name__)
+
+_engine: sa.Engine | None = None
+
+
+def _get_engine() -> sa.Engine:
+    """Return the module engine, created on first use rather than at import."""
+    global _engine
+    if _engine is None:
+        _engine = sa.create_engine(settings.database_url)
+    return _engine
+
+
+def get_watermark(name: str) -> tuple[str, int] | None:
+    """Return the stored ``(write_date, id)`` watermark for a feed.
+
+    Args:
+        name: Watermark name (e.g. ``"cdc:crm.lead"``).
+
+    Returns:
+        tuple[str, int] | None: The watermark, or None if never stored.
+    """
+    with _get_engine().connect() as conn:
+        row = conn.execute(
+            sa.text("SELECT write_date, record_id FROM cdc_watermark WHERE name = :name"),
+            {"name": name},
+        ).first()
+    return (row.write_date, row.record_id) if row else None
+
+
+@traced("db.cdc.set_watermark")
+def set_watermark(name: str, write_date: str, record_id: int = 0) -> None:
+    """Store the ``(write_date, id)`` watermark for a feed.
+
+    Args:
+        name: Watermark name.
+        write_date: Odoo ``write_date`` (``YYYY-MM-DD HH:MM:SS``) of the last
+            processed record.
+        record_id: Id of the last processed record with that ``write_date``.
+    """
+    with _get_engine().begin() as conn:
+        conn.execute(
+            sa.text(
+                """
+                INSERT OR REPLACE INTO cdc_watermark (name, write_date, record_id, updated_at)
+                VALUES (:name, :write_date, :record_id, :now)
+                """
+            ),
+            {
+                "name": name,
+                "write_date": write_date,
+                "record_id": record_id,
+                "now": datetime.utcnow().isoformat(),
+            },
+        )
+    logger.debug("cdc_watermark_set", name=name, write_date=write_date, record_id=record_id)
+
+
+def get_record_states(model: str, record_ids: list[int]) -> dict[int, str]:
+    """Return the last seen state of records, keyed by id.
+
+    Args:
+        model: Odoo model name.
+        record_ids: Record ids to look up.
+
+    Returns:
+        dict[int, str]: States for the ids that have been seen before.
+    """
+    if not record_ids:
+        return {}
+    query = sa.text(
+        "SELECT record_id, state FROM cdc_record_state "
+        "WHERE model = :model AND record_id IN :ids"
+    ).bindparams(sa.bindparam("ids", expanding=True))
+    with _get_engine().connect() as conn:
+        rows = conn.execute(query, {"model": model, "ids": list(record_ids)})
+        return {row.record_id: row.state for row in rows}
+
+
+@traced("db.cdc.set_record_states")
+def set_record_states(model: str, states: dict[int, str]) -> None:
+    """Store the current state of records.
+
+    Args:
+        model: Odoo model name.
+        states: Record id → state.
+    """
+    if not states:
+        return
+    with _get_engine().begin() as conn:
+        conn.execute(
+            sa.text(
+                "INSERT OR REPLACE INTO cdc_record_state (model, record_id, state) "
+                "VALUES (:model, :record_id, :state)"
+            ),
+            [
+                {"model": model, "record_id": record_id, "state": state}
+                for record_id, state in states.items()
+            ],
+        )
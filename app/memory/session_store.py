@@ -1,18 +1,26 @@
 """SQLite-backed session memory for conversation history."""
 
-from langchain_community.chat_message_histories import SQLChatMessageHistory
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 
 from app.config import settings
 from app.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from langchain_community.chat_message_histories import SQLChatMessageHistory
+
 logger = get_logger(__name__)
 
 
 def init_db() -> None:
     """Ensure all required SQLite tables exist.
 
-    Creates the ``chat_history`` table (managed by LangChain) and the
-    ``workflow_log`` table used for workflow audit logging.
+    Creates the ``chat_history`` table (managed by LangChain), the
+    ``workflow_log`` table used for workflow audit logging, and the
+    ``workflow_checkpoint`` table used to resume failed workflow runs, and
+    the ``cdc_watermark`` / ``cdc_record_state`` tables used by the Odoo
+    change-data-capture poller.
     """
     import sqlalchemy as sa
 
@@ -34,6 +42,44 @@ def init_db() -> None:
                 """
             )
         )
+        conn.execute(
+            sa.text(
+                """
+                CREATE TABLE IF NOT EXISTS workflow_checkpoint (
+                    workflow_name TEXT NOT NULL,
+                    run_key TEXT NOT NULL,
+                    step_name TEXT NOT NULL,
+                    output_json TEXT,
+                    completed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (workflow_name, run_key, step_name)
+                )
+                """
+            )
+        )
+        conn.execute(
+            sa.text(
+                """
+                CREATE TABLE IF NOT EXISTS cdc_watermark (
+                    name TEXT PRIMARY KEY,
+                    write_date TEXT NOT NULL,
+                    record_id INTEGER NOT NULL DEFAULT 0,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+        )
+        conn.execute(
+            sa.text(
+                """
+                CREATE TABLE IF NOT EXISTS cdc_record_state (
+                    model TEXT NOT NULL,
+                    record_id INTEGER NOT NULL,
+                    state TEXT NOT NULL,
+                    PRIMARY KEY (model, record_id)
+                )
+                """
+            )
+        )
     logger.info("db_init_complete")
 
 
@@ -46,6 +92,8 @@ def get_session_history(session_id: str) -> SQLChatMessageHistory:
     Returns:
         SQLChatMessageHistory: LangChain message history backed by SQLite.
     """
+    from langchain_community.chat_message_histories import SQLChatMessageHistory
+
     return SQLChatMessageHistory(
         session_id=session_id,
         connection_string=settings.database_url,
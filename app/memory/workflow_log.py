@@ -1,18 +1,29 @@
-"""SQLite workflow execution log."""
+"""SQLite workflow execution log and step checkpoints."""
 
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Any
 
 import sqlalchemy as sa
 
 from app.config import settings
 from app.utils.logger import get_logger
+from app.utils.tracing import traced
 
 logger = get_logger(__name__)
 
-_engine = sa.create_engine(settings.database_url)
+_engine: sa.Engine | None = None
 
 
+def _get_engine() -> sa.Engine:
+    """Return the module engine, created on first use rather than at import."""
+    global _engine
+    if _engine is None:
+        _engine = sa.create_engine(settings.database_url)
+    return _engine
+
+
+@traced("db.workflow_log.start")
 def log_workflow_start(workflow_name: str, trigger: str, context: dict) -> int:
     """Insert a new workflow_log row and return the new row id.
 
@@ -25,7 +36,7 @@ def log_workflow_start(workflow_name: str, trigger: str, context: dict) -> int:
     Returns:
         int: The id of the new log row.
     """
-    with _engine.begin() as conn:
+    with _get_engine().begin() as conn:
         result = conn.execute(
             sa.text(
                 """
@@ -45,15 +56,17 @@ def log_workflow_start(workflow_name: str, trigger: str, context: dict) -> int:
     return log_id
 
 
+@traced("db.workflow_log.complete")
 def log_workflow_complete(log_id: int, steps: list, status: str = "success") -> None:
     """Update an existing workflow_log row with completion data.
 
     Args:
         log_id: The row id returned by :func:`log_workflow_start`.
-        steps: List of executed step names.
+        steps: Executed step names, or per-step records (dicts with
+            ``name``, ``status``, ``duration_ms`` and ``error``).
         status: Final status string (``"success"`` or ``"failed"``).
     """
-    with _engine.begin() as conn:
+    with _get_engine().begin() as conn:
         conn.execute(
             sa.text(
                 """
@@ -84,7 +97,7 @@ def get_workflow_history(
     Returns:
         list[dict]: Log rows as dictionaries.
     """
-    with _engine.connect() as conn:
+    with _get_engine().connect() as conn:
         if workflow_name:
             rows = conn.execute(
                 sa.text(
@@ -101,3 +114,75 @@ def get_workflow_history(
                 {"limit": limit},
             )
         return [dict(row._mapping) for row in rows]
+
+
+def load_checkpoints(
+    workflow_name: str, run_key: str, max_age_seconds: int | None = None
+) -> dict[str, Any]:
+    """Return the checkpointed step outputs of an unfinished workflow run.
+
+    Args:
+        workflow_name: Name of the workflow.
+        run_key: Stable key identifying the run (derived from its context).
+        max_age_seconds: Ignore checkpoints older than this many seconds.
+
+    Returns:
+        dict[str, Any]: Step name → decoded step output.
+    """
+    params: dict[str, Any] = {"name": workflow_name, "key": run_key}
+    query = (
+        "SELECT step_name, output_json FROM workflow_checkpoint "
+        "WHERE workflow_name = :name AND run_key = :key"
+    )
+    if max_age_seconds is not None:
+        query += " AND completed_at >= :since"
+        params["since"] = (datetime.utcnow() - timedelta(seconds=max_age_seconds)).isoformat()
+    with _get_engine().connect() as conn:
+        rows = conn.execute(sa.text(query), params)
+        return {row.step_name: json.loads(row.output_json) for row in rows}
+
+
+@traced("db.checkpoint.save")
+def save_checkpoint(workflow_name: str, run_key: str, step_name: str, output: Any) -> None:
+    """Persist the output of a completed workflow step.
+
+    Args:
+        workflow_name: Name of the workflow.
+        run_key: Stable key identifying the run.
+        step_name: Name of the completed step.
+        output: JSON-serializable step output.
+    """
+    with _get_engine().begin() as conn:
+        conn.execute(
+            sa.text(
+                """
+                INSERT OR REPLACE INTO workflow_checkpoint
+                    (workflow_name, run_key, step_name, output_json, completed_at)
+                VALUES (:name, :key, :step, :output, :now)
+                """
+            ),
+            {
+                "name": workflow_name,
+                "key": run_key,
+                "step": step_name,
+                "output": json.dumps(output, default=str),
+                "now": datetime.utcnow().isoformat(),
+            },
+        )
+
+
+@traced("db.checkpoint.clear")
+def clear_checkpoints(workflow_name: str, run_key: str) -> None:
+    """Delete all checkpoints of a workflow run once it has finished.
+
+    Args:
+        workflow_name: Name of the workflow.
+        run_key: Stable key identifying the run.
+    """
+    with _get_engine().begin() as conn:
+        conn.execute(
+            sa.text(
+                "DELETE FROM workflow_checkpoint WHERE workflow_name = :name AND run_key = :key"
+            ),
+            {"name": workflow_name, "key": run_key},
+        )
@@ -1,5 +1,14 @@
 """Odoo JSON-RPC integration package."""
 
 from app.odoo.client import OdooClient, odoo_client
+from app.odoo.resilience import OdooCircuitOpenError, OdooOverloadedError, OdooUnavailableError
+from app.odoo.unit_of_work import unit_of_work
 
-__all__ = ["OdooClient", "odoo_client"]
+__all__ = [
+    "OdooCircuitOpenError",
+    "OdooClient",
+    "OdooOverloadedError",
+    "OdooUnavailableError",
+    "odoo_client",
+    "unit_of_work",
+]
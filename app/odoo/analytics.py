@@ -0,0 +1,388 @@
+"""Vectorized CRM pipeline analytics.
+
+Lead snapshots are loaded once into a columnar :class:`LeadFrame` (one NumPy
+array per field) and every report is a handful of whole-array passes —
+``np.unique`` to group, ``np.bincount`` to aggregate — instead of a Python
+loop (or an agent tool call) per record:
+
+* :func:`group_totals` — count, revenue and probability-weighted revenue per
+  stage, team or salesperson;
+* :func:`weighted_pipeline_by_month` — open weighted pipeline by deadline month;
+* :func:`win_rates` — won / (won + lost) per group;
+* :func:`forecast` — expected revenue for the coming months, weighted by the
+  lead probability and, alternatively, by the team's historical win rate;
+* :func:`conversion_funnel` — leads reaching each stage and the step conversion.
+
+:func:`pipeline_report` bundles them for the ``get_pipeline_analytics`` tool
+and the ``GET /analytics`` endpoint.
+
+Outcomes follow Odoo 16: a lead is *won* when it is active with probability
+100, *lost* when it is archived, and *open* otherwise.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+
+from app.odoo.models.crm_lead import iter_lead_batches
+from app.odoo.models.crm_stage import get_all_stages
+
+ANALYTICS_FIELDS = [
+    "id",
+    "type",
+    "stage_id",
+    "team_id",
+    "user_id",
+    "expected_revenue",
+    "probability",
+    "date_deadline",
+    "create_date",
+    "date_closed",
+    "active",
+]
+
+GROUP_BY = ("stage", "team", "user")
+
+_NO_DATE = np.datetime64("NaT", "D")
+
+
+def _many2one(records: list[dict], name: str) -> tuple[np.ndarray, dict[int, str]]:
+    """Split a many2one column into an id array (0 = empty) and an id → name map."""
+    ids = np.zeros(len(records), dtype=np.int64)
+    labels: dict[int, str] = {0: "None"}
+    for row, record in enumerate(records):
+        value = record.get(name)
+        if value:
+            ids[row] = value[0]
+            labels[value[0]] = value[1]
+    return ids, labels
+
+
+def _dates(records: list[dict], name: str) -> np.ndarray:
+    """Parse an Odoo date/datetime column to ``datetime64[D]`` (NaT when empty)."""
+    return np.array([(record.get(name) or "NaT")[:10] for record in records], dtype="datetime64[D]")
+
+
+@dataclass
+class LeadFrame:
+    """Columnar snapshot of ``crm.lead`` records.
+
+    Attributes:
+        ids: Lead ids.
+        stage / team / user: Many2one ids (0 when empty).
+        labels: Display names per many2one column (``{"stage": {id: name}}``).
+        revenue: ``expected_revenue``.
+        probability: ``probability`` (0–100).
+        opportunity: True for opportunities, False for leads.
+        active: False for archived (lost) records.
+        deadline / created / closed: ``date_deadline``, ``create_date`` and
+            ``date_closed`` as ``datetime64[D]`` (NaT when empty).
+    """
+
+    ids: np.ndarray
+    stage: np.ndarray
+    team: np.ndarray
+    user: np.ndarray
+    labels: dict[str, dict[int, str]]
+    revenue: np.ndarray
+    probability: np.ndarray
+    opportunity: np.ndarray
+    active: np.ndarray
+    deadline: np.ndarray
+    created: np.ndarray
+    closed: np.ndarray
+
+    @classmethod
+    def from_records(cls, records: list[dict]) -> LeadFrame:
+        """Build a frame from lead records read with :data:`ANALYTICS_FIELDS`."""
+        count = len(records)
+        stage, stage_labels = _many2one(records, "stage_id")
+        team, team_labels = _many2one(records, "team_id")
+        user, user_labels = _many2one(records, "user_id")
+        return cls(
+            ids=np.fromiter((r["id"] for r in records), dtype=np.int64, count=count),
+            stage=stage,
+            team=team,
+            user=user,
+            labels={"stage": stage_labels, "team": team_labels, "user": user_labels},
+            revenue=np.fromiter(
+                (r.get("expected_revenue") or 0.0 for r in records), dtype=np.float64, count=count
+            ),
+            probability=np.fromiter(
+                (r.get("probability") or 0.0 for r in records), dtype=np.float64, count=count
+            ),
+            opportunity=np.fromiter(
+                (r.get("type") == "opportunity" for r in records), dtype=bool, count=count
+            ),
+            active=np.fromiter((r.get("active", True) for r in records), dtype=bool, count=count),
+            deadline=_dates(records, "date_deadline"),
+            created=_dates(records, "create_date"),
+            closed=_dates(records, "date_closed"),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def won(self) -> np.ndarray:
+        """Mask of won leads (active, probability 100)."""
+        return self.active & (self.probability >= 100)
+
+    @property
+    def lost(self) -> np.ndarray:
+        """Mask of lost (archived) leads."""
+        return ~self.active
+
+    @property
+    def open(self) -> np.ndarray:
+        """Mask of leads neither won nor lost."""
+        return self.active & (self.probability < 100)
+
+    @property
+    def weighted(self) -> np.ndarray:
+        """Probability-weighted expected revenue per lead."""
+        return self.revenue * self.probability / 100.0
+
+    def column(self, by: str) -> np.ndarray:
+        """Return the many2one id column named ``by`` (``stage``, ``team`` or ``user``)."""
+        if by not in GROUP_BY:
+            raise ValueError(f"group_by must be one of {', '.join(GROUP_BY)}, not {by!r}")
+        return getattr(self, by)
+
+
+def load_frame(domain: list | None = None, batch_size: int = 2000) -> LeadFrame:
+    """Read leads (including archived ones) from Odoo into a :class:`LeadFrame`.
+
+    Args:
+        domain: Extra Odoo domain terms (e.g. ``[["team_id", "=", 3]]``).
+        batch_size: Records per ``read`` call.
+
+    Returns:
+        LeadFrame: The snapshot.
+    """
+    domain = [["active", "in", [True, False]], *(domain or [])]
+    records: list[dict] = []
+    for batch in iter_lead_batches(domain, fields=ANALYTICS_FIELDS, batch_size=batch_size):
+        records.extend(batch)
+    return LeadFrame.from_records(records)
+
+
+def _grouped(keys: np.ndarray, *weights: np.ndarray) -> tuple[np.ndarray, list[np.ndarray]]:
+    """Return the distinct keys and, per weight array, its sum for each key."""
+    unique, inverse = np.unique(keys, return_inverse=True)
+    sums = [np.bincount(inverse, weights=w, minlength=len(unique)) for w in weights]
+    return unique, sums
+
+
+def group_totals(frame: LeadFrame, by: str = "stage", mask: np.ndarray | None = None) -> list[dict]:
+    """Count, revenue and weighted revenue per group, largest weighted revenue first.
+
+    Args:
+        frame: Lead snapshot.
+        by: ``"stage"``, ``"team"`` or ``"user"``.
+        mask: Leads to include (default: open opportunities).
+
+    Returns:
+        list[dict]: ``{"id", "name", "count", "revenue", "weighted"}`` per group.
+    """
+    keys = frame.column(by)
+    mask = frame.open & frame.opportunity if mask is None else mask
+    unique, (count, revenue, weighted) = _grouped(
+        keys[mask], np.ones(int(mask.sum())), frame.revenue[mask], frame.weighted[mask]
+    )
+    labels = frame.labels[by]
+    order = np.argsort(-weighted, kind="stable")
+    return [
+        {
+            "id": int(unique[i]),
+            "name": labels.get(int(unique[i]), str(unique[i])),
+            "count": int(count[i]),
+            "revenue": round(float(revenue[i]), 2),
+            "weighted": round(float(weighted[i]), 2),
+        }
+        for i in order
+    ]
+
+
+def weighted_pipeline_by_month(frame: LeadFrame) -> list[dict]:
+    """Open opportunity revenue by deadline month (``"none"`` for no deadline).
+
+    Returns:
+        list[dict]: ``{"month", "count", "revenue", "weighted"}``, months ascending.
+    """
+    mask = frame.open & frame.opportunity
+    months = frame.deadline[mask].astype("datetime64[M]")
+    # NaT sorts last in np.unique, so the "none" bucket ends the list.
+    unique, (count, revenue, weighted) = _grouped(
+        months, np.ones(len(months)), frame.revenue[mask], frame.weighted[mask]
+    )
+    return [
+        {
+            "month": "none" if np.isnat(month) else str(month),
+            "count": int(count[i]),
+            "revenue": round(float(revenue[i]), 2),
+            "weighted": round(float(weighted[i]), 2),
+        }
+        for i, month in enumerate(unique)
+    ]
+
+
+def win_rates(frame: LeadFrame, by: str = "team") -> list[dict]:
+    """Win rate (won / closed) per group, for groups with closed leads.
+
+    Returns:
+        list[dict]: ``{"id", "name", "won", "lost", "win_rate"}`` per group.
+    """
+    keys = frame.column(by)
+    closed = frame.won | frame.lost
+    unique, (won, total) = _grouped(
+        keys[closed], frame.won[closed].astype(np.float64), np.ones(int(closed.sum()))
+    )
+    labels = frame.labels[by]
+    return [
+        {
+            "id": int(key),
+            "name": labels.get(int(key), str(key)),
+            "won": int(won[i]),
+            "lost": int(total[i] - won[i]),
+            "win_rate": round(float(won[i] / total[i]), 4),
+        }
+        for i, key in enumerate(unique)
+    ]
+
+
+def forecast(frame: LeadFrame, months: int = 3, today: date | None = None) -> list[dict]:
+    """Expected revenue of open opportunities for the current and coming months.
+
+    Overdue opportunities count towards the current month; opportunities
+    without a deadline are left out.  ``weighted`` uses each lead's
+    probability, ``historical`` its team's win rate (overall win rate for
+    teams without closed leads).
+
+    Args:
+        frame: Lead snapshot.
+        months: Number of months, starting with the current one.
+        today: Reference date (default: today).
+
+    Returns:
+        list[dict]: ``{"month", "count", "pipeline", "weighted", "historical"}``.
+    """
+    current = np.datetime64(today or date.today(), "M")
+    horizon = np.arange(current, current + max(months, 1))
+    mask = frame.open & frame.opportunity & ~np.isnat(frame.deadline)
+    month = np.maximum(frame.deadline[mask].astype("datetime64[M]"), current)
+    slot = (month - current).astype(np.int64)
+    inside = slot < len(horizon)
+    slot = slot[inside]
+
+    closed = frame.won | frame.lost
+    overall = frame.won.sum() / closed.sum() if closed.any() else 0.0
+    teams, (team_won, team_closed) = _grouped(
+        frame.team[closed], frame.won[closed].astype(np.float64), np.ones(int(closed.sum()))
+    )
+    team = frame.team[mask][inside]
+    position = np.clip(np.searchsorted(teams, team), 0, max(len(teams) - 1, 0))
+    known = (teams[position] == team) if len(teams) else np.zeros(len(team), dtype=bool)
+    rate = np.full(len(team), overall, dtype=np.float64)
+    if len(teams):
+        rate[known] = (team_won / team_closed)[position[known]]
+
+    revenue = frame.revenue[mask][inside]
+    sums = [
+        np.bincount(slot, weights=w, minlength=len(horizon))
+        for w in (np.ones(len(slot)), revenue, frame.weighted[mask][inside], revenue * rate)
+    ]
+    count, pipeline, weighted, historical = sums
+    return [
+        {
+            "month": str(horizon[i]),
+            "count": int(count[i]),
+            "pipeline": round(float(pipeline[i]), 2),
+            "weighted": round(float(weighted[i]), 2),
+            "historical": round(float(historical[i]), 2),
+        }
+        for i in range(len(horizon))
+    ]
+
+
+def conversion_funnel(frame: LeadFrame, stages: list[dict]) -> list[dict]:
+    """Leads that reached each stage, in stage sequence order.
+
+    A lead has reached every stage up to its current one; won leads have
+    reached them all.  ``conversion`` is the share of the previous stage's
+    leads that got this far.
+
+    Args:
+        frame: Lead snapshot.
+        stages: ``crm.stage`` records with ``id``, ``name`` and ``sequence``.
+
+    Returns:
+        list[dict]: ``{"id", "name", "reached", "conversion"}`` per stage.
+    """
+    ordered = sorted(stages, key=lambda s: (s.get("sequence") or 0, s["id"]))
+    if not ordered:
+        return []
+    stage_ids = np.array([s["id"] for s in ordered], dtype=np.int64)
+    order = np.argsort(stage_ids)
+    position = np.searchsorted(stage_ids[order], frame.stage)
+    position = np.clip(position, 0, len(stage_ids) - 1)
+    known = stage_ids[order][position] == frame.stage
+    depth = np.where(known, order[position], 0)
+    depth[frame.won] = len(stage_ids) - 1
+    # reached[i] = leads whose depth is >= i
+    reached = np.bincount(depth, minlength=len(stage_ids))[::-1].cumsum()[::-1]
+    previous = np.concatenate(([reached[0]], reached[:-1]))
+    conversion = np.divide(
+        reached, previous, out=np.zeros(len(reached), dtype=np.float64), where=previous > 0
+    )
+    return [
+        {
+            "id": stage["id"],
+            "name": stage["name"],
+            "reached": int(reached[i]),
+            "conversion": round(float(conversion[i]), 4),
+        }
+        for i, stage in enumerate(ordered)
+    ]
+
+
+def pipeline_report(
+    group_by: str = "team",
+    months: int = 3,
+    frame: LeadFrame | None = None,
+    stages: list[dict] | None = None,
+    today: date | None = None,
+) -> dict:
+    """Build every analytics section in one pass over a snapshot.
+
+    Args:
+        group_by: Grouping of the totals and win rates (``stage``, ``team``, ``user``).
+        months: Forecast horizon in months.
+        frame: Snapshot to analyse (default: :func:`load_frame`).
+        stages: Pipeline stages for the funnel (default: all Odoo stages).
+        today: Reference date of the forecast.
+
+    Returns:
+        dict: ``leads``, ``totals``, ``by_month``, ``win_rates``, ``forecast``
+            and ``funnel`` sections.
+    """
+    if group_by not in GROUP_BY:
+        raise ValueError(f"group_by must be one of {', '.join(GROUP_BY)}, not {group_by!r}")
+    frame = load_frame() if frame is None else frame
+    stages = get_all_stages() if stages is None else stages
+    return {
+        "leads": {
+            "total": len(frame),
+            "open": int(frame.open.sum()),
+            "won": int(frame.won.sum()),
+            "lost": int(frame.lost.sum()),
+        },
+        "totals": group_totals(frame, group_by),
+        "by_month": weighted_pipeline_by_month(frame),
+        "win_rates": win_rates(frame, group_by),
+        "forecast": forecast(frame, months, today),
+        "funnel": conversion_funnel(frame, stages),
+    }
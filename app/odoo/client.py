@@ -1,18 +1,47 @@
 """Odoo 16 JSON-RPC client.
 
 Provides a thin wrapper around Odoo's JSON-RPC endpoint (``/jsonrpc``) for
-authentication, metadata, and CRUD operations via ``execute_kw``.
+authentication, metadata, and CRUD operations via ``execute_kw``.  Transient
+failures are retried, expired sessions re-authenticated and slow reads
+hedged as described in :mod:`app.odoo.retry`.
+
+Each :class:`OdooClient` keeps its own keep-alive connection pool, uid and
+concurrency guard.  ``odoo_client`` is a :class:`RoutedOdooClient`: it
+forwards to the client made active with :func:`use_client` for the current
+request or task (see :mod:`app.odoo.tenants`), or to the default client
+configured from settings, so the model helpers and tools follow the tenant
+of the request without taking a client argument.
 """
 
 from __future__ import annotations
 
+import threading
+import time
 import uuid
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
 from typing import Any
 
 import httpx
 
 from app.config import settings
+from app.odoo.metrics import observe_rpc
+from app.odoo.resilience import CallGuard, register_guard
+from app.odoo.retry import (
+    HEDGED_METHODS,
+    RPC_REAUTHENTICATIONS,
+    RPC_RETRIES,
+    backoff_delay,
+    hedged,
+    is_idempotent,
+    is_retryable,
+    is_session_error,
+    read_latencies,
+)
 from app.utils.logger import get_logger
+from app.utils.tracing import span
 
 logger = get_logger(__name__)
 
@@ -70,16 +99,57 @@ class OdooClient:
 
         uid = odoo_client.authenticate()
         leads = odoo_client.search_read("crm.lead", [], ["name", "email_from"])
+
+    Args:
+        guard: Concurrency limiter and circuit breaker for this client's calls;
+            defaults to a fresh one built from settings.
+        url: Odoo base URL (default ``settings.odoo_url``).
+        db: Database name (default ``settings.odoo_db``).
+        user: Login (default ``settings.odoo_user``).
+        api_key: API key (default ``settings.odoo_api_key``).
     """
 
-    def __init__(self) -> None:
-        self._url = _normalize_odoo_url(settings.odoo_url)
-        self._db = settings.odoo_db
-        self._user = settings.odoo_user
-        self._api_key = settings.odoo_api_key
+    _guard: CallGuard | None = None
+    _http: httpx.Client | None = None
+
+    def __init__(
+        self,
+        guard: CallGuard | None = None,
+        *,
+        url: str | None = None,
+        db: str | None = None,
+        user: str | None = None,
+        api_key: str | None = None,
+    ) -> None:
+        self._guard = guard or CallGuard.from_settings()
+        self._url = _normalize_odoo_url(settings.odoo_url if url is None else url)
+        self._db = settings.odoo_db if db is None else db
+        self._user = settings.odoo_user if user is None else user
+        self._api_key = settings.odoo_api_key if api_key is None else api_key
         self._uid: int | None = None
         self._jsonrpc_endpoint = f"{self._url}/jsonrpc"
 
+    def _http_client(self) -> httpx.Client:
+        """Return this client's keep-alive connection pool, creating it on first use."""
+        if self._http is None:
+            with _http_lock:
+                if self._http is None:
+                    self._http = httpx.Client(
+                        timeout=JSONRPC_TIMEOUT,
+                        limits=httpx.Limits(
+                            max_connections=settings.odoo_max_connections,
+                            max_keepalive_connections=settings.odoo_max_keepalive_connections,
+                            keepalive_expiry=settings.odoo_keepalive_expiry_seconds,
+                        ),
+                    )
+        return self._http
+
+    def close(self) -> None:
+        """Close the connection pool (it is recreated if the client is used again)."""
+        http, self._http = self._http, None
+        if http is not None:
+            http.close()
+
     def _decode_json_response(self, response: httpx.Response) -> dict[str, Any]:
         """Decode a JSON response and raise a typed error if parsing fails."""
         try:
@@ -104,6 +174,8 @@ class OdooClient:
 
         Raises:
             OdooJSONRPCError: If the response contains a JSON-RPC error.
+            OdooUnavailableError: If the circuit breaker is open or no
+                concurrency slot frees up (see :mod:`app.odoo.resilience`).
             httpx.HTTPError: If the HTTP request fails.
         """
         payload = {
@@ -112,28 +184,104 @@ class OdooClient:
             "params": {"service": service, "method": method, "args": args},
             "id": uuid.uuid4().hex,
         }
-        response = httpx.post(
-            self._jsonrpc_endpoint,
-            json=payload,
-            timeout=JSONRPC_TIMEOUT,
-        )
-        response.raise_for_status()
-        data = self._decode_json_response(response)
-        if "error" in data:
-            error = data.get("error") or {}
-            raise OdooJSONRPCError(
-                error.get("message", "JSON-RPC error"),
-                code=error.get("code"),
-                data=error.get("data"),
-                http_status=response.status_code,
+        if service == "object" and len(args) >= 5:
+            model, model_method = args[3], args[4]
+            span_name = f"odoo.{model}.{model_method}"
+        else:
+            model, model_method = None, None
+            span_name = f"odoo.{service}.{method}"
+        if self._guard is None:
+            self._guard = CallGuard.from_settings()
+        with (
+            self._guard.call(),
+            span(
+                span_name,
+                **{
+                    "rpc.system": "jsonrpc",
+                    "rpc.service": service,
+                    "rpc.method": method,
+                    "odoo.model": model,
+                    "odoo.method": model_method,
+                },
+            ) as rpc_span,
+            observe_rpc(service, method, args) as observed,
+        ):
+            response = self._http_client().post(
+                self._jsonrpc_endpoint,
+                json=payload,
+                timeout=JSONRPC_TIMEOUT,
             )
-        if "result" not in data:
-            raise OdooJSONRPCError(
-                "Malformed JSON-RPC response",
-                http_status=response.status_code,
-                data=data,
-            )
-        return data["result"]
+            observed.request_bytes = len(response.request.content)
+            observed.response_bytes = len(response.content)
+            rpc_span.set_attribute("http.status_code", response.status_code)
+            response.raise_for_status()
+            data = self._decode_json_response(response)
+            if "error" in data:
+                error = data.get("error") or {}
+                raise OdooJSONRPCError(
+                    error.get("message", "JSON-RPC error"),
+                    code=error.get("code"),
+                    data=error.get("data"),
+                    http_status=response.status_code,
+                )
+            if "result" not in data:
+                raise OdooJSONRPCError(
+                    "Malformed JSON-RPC response",
+                    http_status=response.status_code,
+                    data=data,
+                )
+            return data["result"]
+
+    def _call(self, service: str, method: str, args: list[Any]) -> Any:
+        """Call :meth:`_jsonrpc_call`, retrying transient failures with backoff.
+
+        Reads listed in :data:`~app.odoo.retry.HEDGED_METHODS` are hedged when
+        ``settings.odoo_hedge_reads`` is enabled.
+        """
+        idempotent = is_idempotent(service, method, args)
+        rpc_method = args[4] if service == "object" and len(args) >= 5 else method
+        hedge = idempotent and settings.odoo_hedge_reads and rpc_method in HEDGED_METHODS
+        attempts = max(1, settings.odoo_retry_attempts)
+        attempt = 0
+        while True:
+            try:
+                if hedge:
+                    return self._hedged_call(service, method, args)
+                return self._jsonrpc_call(service, method, args)
+            except Exception as exc:
+                attempt += 1
+                if attempt >= attempts or not is_retryable(exc, idempotent):
+                    raise
+                delay = backoff_delay(
+                    attempt - 1,
+                    settings.odoo_retry_base_delay_ms / 1000,
+                    settings.odoo_retry_max_delay_ms / 1000,
+                )
+                RPC_RETRIES.labels(kind=type(exc).__name__).inc()
+                logger.info(
+                    "odoo_retry",
+                    service=service,
+                    method=rpc_method,
+                    attempt=attempt,
+                    error_type=type(exc).__name__,
+                    delay_ms=round(delay * 1000, 1),
+                )
+                time.sleep(delay)
+
+    def _hedged_call(self, service: str, method: str, args: list[Any]) -> Any:
+        """Send a read, racing a second copy if it outlasts the recent p95 latency."""
+        key = (self._jsonrpc_endpoint, args[3], args[4])
+        p95 = read_latencies.percentile(key, 0.95, settings.odoo_hedge_min_samples)
+
+        def send() -> Any:
+            started = time.perf_counter()
+            result = self._jsonrpc_call(service, method, args)
+            read_latencies.record(key, time.perf_counter() - started)
+            return result
+
+        if p95 is None:
+            return send()
+        return hedged(send, max(p95, settings.odoo_hedge_min_delay_ms / 1000))
 
     # ------------------------------------------------------------------
     # Authentication
@@ -150,7 +298,7 @@ class OdooClient:
         """
         if self._uid is not None:
             return self._uid
-        uid = self._jsonrpc_call(
+        uid = self._call(
             "common",
             "login",
             [self._db, self._user, self._api_key],
@@ -171,7 +319,7 @@ class OdooClient:
 
     def get_version(self) -> dict:
         """Return the Odoo server version information."""
-        return self._jsonrpc_call("common", "version", [])
+        return self._call("common", "version", [])
 
     # ------------------------------------------------------------------
     # Generic execute
@@ -180,6 +328,9 @@ class OdooClient:
     def execute(self, model: str, method: str, *args: Any, **kwargs: Any) -> Any:
         """Execute an arbitrary method on an Odoo model.
 
+        If Odoo rejects the session (``AccessDenied``), the client logs in
+        again and replays the call once.
+
         Args:
             model: Odoo model technical name (e.g. ``"crm.lead"``).
             method: Method name (e.g. ``"search_read"``, ``"write"``).
@@ -190,11 +341,24 @@ class OdooClient:
             Any: The return value of the Odoo method.
         """
         uid = self.authenticate()
-        return self._jsonrpc_call(
-            "object",
-            "execute_kw",
-            [self._db, uid, self._api_key, model, method, list(args), kwargs],
-        )
+        try:
+            return self._call(
+                "object",
+                "execute_kw",
+                [self._db, uid, self._api_key, model, method, list(args), kwargs],
+            )
+        except OdooJSONRPCError as exc:
+            if not is_session_error(exc):
+                raise
+            logger.info("odoo_reauthenticating", model=model, method=method)
+            RPC_REAUTHENTICATIONS.inc()
+            self.reset_auth()
+            uid = self.authenticate()
+            return self._call(
+                "object",
+                "execute_kw",
+                [self._db, uid, self._api_key, model, method, list(args), kwargs],
+            )
 
     # ------------------------------------------------------------------
     # Convenience helpers
@@ -207,6 +371,7 @@ class OdooClient:
         fields: list[str],
         limit: int = 50,
         offset: int = 0,
+        order: str | None = None,
     ) -> list[dict]:
         """Search for records and return selected fields.
 
@@ -216,18 +381,78 @@ class OdooClient:
             fields: Field names to return.
             limit: Maximum number of records.
             offset: Number of records to skip.
+            order: Optional SQL-style sort specification (e.g. ``"id asc"``).
 
         Returns:
             list[dict]: Matching records with requested fields.
         """
-        return self.execute(
-            model,
-            "search_read",
-            domain,
-            fields=fields,
-            limit=limit,
-            offset=offset,
-        )
+        kwargs: dict[str, Any] = {"fields": fields, "limit": limit, "offset": offset}
+        if order:
+            kwargs["order"] = order
+        return self.execute(model, "search_read", domain, **kwargs)
+
+    def search(
+        self,
+        model: str,
+        domain: list,
+        limit: int | None = None,
+        offset: int = 0,
+        order: str | None = None,
+    ) -> list[int]:
+        """Search for record ids matching a domain.
+
+        Args:
+            model: Odoo model name.
+            domain: Search domain (list of tuples).
+            limit: Maximum number of ids, or None for all matches.
+            offset: Number of records to skip.
+            order: Optional SQL-style sort specification (e.g. ``"id asc"``).
+
+        Returns:
+            list[int]: Matching record ids.
+        """
+        kwargs: dict[str, Any] = {"offset": offset}
+        if limit is not None:
+            kwargs["limit"] = limit
+        if order:
+            kwargs["order"] = order
+        return self.execute(model, "search", domain, **kwargs)
+
+    def read(self, model: str, ids: list[int], fields: list[str]) -> list[dict]:
+        """Read selected fields of records by id.
+
+        Args:
+            model: Odoo model name.
+            ids: Record ids to read.
+            fields: Field names to return.
+
+        Returns:
+            list[dict]: The requested records (missing ids are omitted by Odoo).
+        """
+        return self.execute(model, "read", ids, fields=fields)
+
+    def read_group(
+        self,
+        model: str,
+        domain: list,
+        fields: list[str],
+        groupby: list[str],
+        lazy: bool = False,
+    ) -> list[dict]:
+        """Aggregate matching records server-side.
+
+        Args:
+            model: Odoo model name.
+            domain: Search domain (list of tuples).
+            fields: Aggregates to compute (e.g. ``["expected_revenue:sum"]``).
+            groupby: Fields to group by.
+            lazy: Group by the first field only (Odoo's default); when False,
+                each group carries its size in ``__count``.
+
+        Returns:
+            list[dict]: One dict per group.
+        """
+        return self.execute(model, "read_group", domain, fields=fields, groupby=groupby, lazy=lazy)
 
     def create(self, model: str, values: dict) -> int:
         """Create a new record.
@@ -267,5 +492,60 @@ class OdooClient:
         return self.execute(model, "unlink", ids)
 
 
-# Module-level singleton
-odoo_client = OdooClient()
+_http_lock = threading.Lock()
+
+_active_client: ContextVar[OdooClient | None] = ContextVar("odoo_client", default=None)
+
+
+def current_odoo_client() -> OdooClient:
+    """Return the client active in this context, or the default client."""
+    return _active_client.get() or default_odoo_client
+
+
+@contextmanager
+def use_client(client: OdooClient) -> Iterator[OdooClient]:
+    """Route ``odoo_client`` to ``client`` for the duration of the block.
+
+    The choice is held in a :class:`~contextvars.ContextVar`, so it follows
+    the request into ``asyncio`` tasks and into threads started with a copied
+    context (e.g. the parallel tool executor).
+    """
+    token = _active_client.set(client)
+    try:
+        yield client
+    finally:
+        _active_client.reset(token)
+
+
+def submit_routed(executor: Executor, fn: Callable[..., Any], *args: Any) -> Future:
+    """Submit ``fn(*args)`` to ``executor`` in a copy of the caller's context.
+
+    Worker threads otherwise start with an empty context and would talk to
+    the default tenant instead of the client chosen with :func:`use_client`.
+    """
+    return executor.submit(copy_context().run, fn, *args)
+
+
+class RoutedOdooClient:
+    """Stand-in for an :class:`OdooClient` that forwards to :func:`current_odoo_client`.
+
+    Attribute reads and writes go to the client active in the calling
+    context, so code written against the old module-level singleton keeps
+    working unchanged.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(current_odoo_client(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(current_odoo_client(), name, value)
+
+    def __repr__(self) -> str:
+        return f"<RoutedOdooClient -> {current_odoo_client()._jsonrpc_endpoint}>"
+
+
+# Client of the Odoo database configured in settings; used outside tenant scopes.
+default_odoo_client = OdooClient()
+register_guard("default", default_odoo_client._guard)
+
+odoo_client: OdooClient = RoutedOdooClient()  # type: ignore[assignment]
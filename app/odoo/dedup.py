@@ -0,0 +1,529 @@
+"""Duplicate detection for ``crm.lead`` and ``res.partner``.
+
+Comparing every pair of records is quadratic, so :class:`DedupIndex` uses
+*blocking*: each record is filed under a few keys, and only records sharing
+a key are compared.  The keys are:
+
+* ``email:`` the normalized address, and ``domain:`` its domain unless it is
+  a public mail provider (``gmail.com``, ...);
+* ``phone:`` the last 9 digits of each phone number;
+* ``tri:`` the character trigrams of the normalized name (accents, case,
+  punctuation and legal suffixes such as *Ltda* or *Inc.* removed).
+
+Blocks larger than ``settings.dedup_max_block_size`` (a trigram like
+``"lea"``, a domain shared by thousands of records) are skipped when looking
+for candidates; a name candidate must also share a good part of the probe's
+trigrams.  Candidates are scored from the trigram Dice coefficient of the
+names and exact e-mail / phone matches (see :func:`score_pair`); pairs
+scoring at least ``settings.dedup_threshold`` are duplicates.
+
+The index is incremental: :meth:`DedupIndex.add` / :meth:`DedupIndex.remove`
+update only the record's own keys.  :func:`get_index` builds it per tenant
+and model on first use and pulls changes since the last ``write_date``
+watermark every ``settings.dedup_refresh_seconds``; webhooks and
+:func:`~app.odoo.models.crm_lead.create_lead` update it in between.  Reading
+Odoo never holds the index lock, so lookups keep answering during a refresh.
+:func:`ready_index` never reads Odoo: it returns the index once built and
+leaves building and refreshing to a background thread
+(:func:`build_in_background`).
+"""
+
+from __future__ import annotations
+
+import contextvars
+import gc
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import httpx
+
+from app.config import settings
+from app.odoo.client import OdooJSONRPCError
+from app.odoo.resilience import OdooUnavailableError
+from app.odoo.tenants import current_tenant
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PUBLIC_EMAIL_DOMAINS = frozenset(
+    {
+        "aol.com",
+        "bol.com.br",
+        "gmail.com",
+        "googlemail.com",
+        "hotmail.com",
+        "icloud.com",
+        "live.com",
+        "me.com",
+        "msn.com",
+        "outlook.com",
+        "protonmail.com",
+        "terra.com.br",
+        "uol.com.br",
+        "yahoo.com",
+        "yahoo.com.br",
+    }
+)
+
+LEGAL_SUFFIXES = frozenset(
+    {"co", "corp", "gmbh", "inc", "llc", "ltd", "ltda", "me", "plc", "sa", "srl", "the"}
+)
+
+# Evidence of each signal, combined as 1 - prod(1 - evidence): a name alone
+# never reaches the default threshold, a shared e-mail or phone does.
+NAME_EVIDENCE = 0.5  # scaled by the trigram similarity of the names
+EMAIL_EVIDENCE = 0.8
+DOMAIN_EVIDENCE = 0.2
+PHONE_EVIDENCE = 0.7
+PHONE_DIGITS = 9
+MIN_TRIGRAM_SHARE = 0.4
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_NON_DIGIT = re.compile(r"\D+")
+
+
+class DuplicateRecordError(ValueError):
+    """A record about to be created matches existing records.
+
+    Attributes:
+        model: Odoo model name.
+        matches: The matching records, best first.
+    """
+
+    def __init__(self, model: str, matches: list[Match]) -> None:
+        self.model = model
+        self.matches = matches
+        ids = ", ".join(str(m.record_id) for m in matches)
+        super().__init__(f"Possible duplicate of {model} {ids}")
+
+
+@dataclass(frozen=True)
+class DedupSpec:
+    """Which fields of a model identify a person or company.
+
+    Attributes:
+        model: Odoo model name.
+        name_fields: Fields of the compared name: the first two joined, or the
+            last one when both are empty (for leads: contact and company, else
+            the lead title).
+        email_field: E-mail field.
+        phone_fields: Phone fields.
+    """
+
+    model: str
+    name_fields: tuple[str, ...]
+    email_field: str
+    phone_fields: tuple[str, ...]
+
+    @property
+    def fields(self) -> list[str]:
+        """Fields to read from Odoo."""
+        return [
+            "id",
+            *self.name_fields,
+            self.email_field,
+            *self.phone_fields,
+            "active",
+            "write_date",
+        ]
+
+
+DEDUP_SPECS = {
+    "crm.lead": DedupSpec(
+        "crm.lead", ("contact_name", "partner_name", "name"), "email_from", ("phone", "mobile")
+    ),
+    "res.partner": DedupSpec("res.partner", ("name",), "email", ("phone", "mobile")),
+}
+
+
+def normalize_name(value: str) -> str:
+    """Lowercase, strip accents, punctuation and legal suffixes (``"Açme Ltda."`` → ``"acme"``)."""
+    text = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode().lower()
+    words = [w for w in _NON_ALNUM.split(text) if w and w not in LEGAL_SUFFIXES]
+    return " ".join(words)
+
+
+def trigrams(name: str) -> frozenset[str]:
+    """Character trigrams of a normalized name, padded so short names still have some."""
+    if not name:
+        return frozenset()
+    padded = f"  {name} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def normalize_email(value: str) -> str:
+    """Lowercase and trim an e-mail address (empty if it has no ``@``)."""
+    value = (value or "").strip().lower()
+    return value if "@" in value else ""
+
+
+def phone_key(value: str) -> str:
+    """Last :data:`PHONE_DIGITS` digits of a phone number (empty if too short)."""
+    digits = _NON_DIGIT.sub("", value or "")
+    return digits[-PHONE_DIGITS:] if len(digits) >= 7 else ""
+
+
+@dataclass(frozen=True)
+class Features:
+    """Normalized identity of one record."""
+
+    record_id: int
+    name: str
+    trigrams: frozenset[str]
+    email: str
+    phones: frozenset[str]
+
+    @property
+    def domain(self) -> str:
+        """E-mail domain, empty for public providers."""
+        domain = self.email.rpartition("@")[2]
+        return "" if domain in PUBLIC_EMAIL_DOMAINS else domain
+
+    @property
+    def exact_keys(self) -> list[str]:
+        """Blocking keys other than the name trigrams."""
+        keys = [f"phone:{p}" for p in self.phones]
+        if self.email:
+            keys.append(f"email:{self.email}")
+            if self.domain:
+                keys.append(f"domain:{self.domain}")
+        return keys
+
+
+def extract_features(spec: DedupSpec, record: dict, record_id: int = 0) -> Features:
+    """Normalize a record (or the values of a record to create) for matching."""
+    names = [record.get(name) for name in spec.name_fields]
+    name = normalize_name(" ".join(str(n) for n in names[:2] if n) or str(names[-1] or ""))
+    phones = {phone_key(str(record.get(f) or "")) for f in spec.phone_fields}
+    return Features(
+        record_id=record.get("id", record_id),
+        name=name,
+        trigrams=trigrams(name),
+        email=normalize_email(str(record.get(spec.email_field) or "")),
+        phones=frozenset(p for p in phones if p),
+    )
+
+
+@dataclass(frozen=True)
+class Match:
+    """A candidate duplicate and why it matched.
+
+    Attributes:
+        record_id: Id of the matching record.
+        score: Similarity in [0, 1].
+        reasons: Matching signals (``"email"``, ``"phone"``, ``"domain"``,
+            ``"name:0.87"``).
+    """
+
+    record_id: int
+    score: float
+    reasons: tuple[str, ...]
+
+
+def score_pair(a: Features, b: Features) -> tuple[float, tuple[str, ...]]:
+    """Score two records from name trigram similarity and e-mail / phone matches.
+
+    Each signal contributes independent evidence (see :data:`NAME_EVIDENCE`
+    and friends); the score is the probability that at least one holds.
+    """
+    reasons: list[str] = []
+    miss = 1.0
+    if a.trigrams and b.trigrams:
+        name = 2 * len(a.trigrams & b.trigrams) / (len(a.trigrams) + len(b.trigrams))
+        if name:
+            miss *= 1 - NAME_EVIDENCE * name
+            reasons.append(f"name:{name:.2f}")
+    if a.email and a.email == b.email:
+        miss *= 1 - EMAIL_EVIDENCE
+        reasons.append("email")
+    elif a.domain and a.domain == b.domain:
+        miss *= 1 - DOMAIN_EVIDENCE
+        reasons.append("domain")
+    if a.phones & b.phones:
+        miss *= 1 - PHONE_EVIDENCE
+        reasons.append("phone")
+    return round(1 - miss, 4), tuple(reasons)
+
+
+class DedupIndex:
+    """Incremental blocking index of one model.
+
+    Args:
+        spec: Fields to match on.
+        max_block_size: Blocks larger than this are skipped when looking for
+            candidates (default ``settings.dedup_max_block_size``).
+    """
+
+    def __init__(self, spec: DedupSpec, max_block_size: int | None = None) -> None:
+        self.spec = spec
+        self.max_block_size = (
+            settings.dedup_max_block_size if max_block_size is None else max_block_size
+        )
+        self.watermark: tuple[str, int] = ("1970-01-01 00:00:00", 0)
+        self.refreshed_at = 0.0
+        self._blocks: dict[str, set[int]] = {}
+        self._trigram_blocks: dict[str, set[int]] = {}
+        self._records: dict[int, Features] = {}
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def add(self, record: dict) -> None:
+        """Index a record, replacing its previous version; archived records are removed."""
+        if not record.get("active", True):
+            self.remove(record["id"])
+            return
+        features = extract_features(self.spec, record)
+        record_id = features.record_id
+        with self._lock:
+            self._remove_locked(record_id)
+            self._records[record_id] = features
+            for blocks, keys in (
+                (self._trigram_blocks, features.trigrams),
+                (self._blocks, features.exact_keys),
+            ):
+                for key in keys:
+                    block = blocks.get(key)
+                    if block is None:
+                        blocks[key] = {record_id}
+                    else:
+                        block.add(record_id)
+
+    def add_many(self, records: Iterable[dict]) -> None:
+        """Index several records."""
+        # Bulk loads allocate millions of small sets that never form cycles;
+        # pausing the cyclic GC roughly halves the time of a full build.
+        paused = gc.isenabled()
+        gc.disable()
+        try:
+            for record in records:
+                self.add(record)
+        finally:
+            if paused:
+                gc.enable()
+
+    def remove(self, record_id: int) -> None:
+        """Drop a record from the index."""
+        with self._lock:
+            self._remove_locked(record_id)
+
+    def _remove_locked(self, record_id: int) -> None:
+        features = self._records.pop(record_id, None)
+        if features is None:
+            return
+        for blocks, keys in (
+            (self._trigram_blocks, features.trigrams),
+            (self._blocks, features.exact_keys),
+        ):
+            for key in keys:
+                block = blocks.get(key)
+                if block is not None:
+                    block.discard(record_id)
+                    if not block:
+                        del blocks[key]
+
+    def features(self, record_id: int) -> Features | None:
+        """Return the indexed features of a record (None if not indexed)."""
+        return self._records.get(record_id)
+
+    def candidates(
+        self, record: dict | Features, threshold: float | None = None, limit: int = 10
+    ) -> list[Match]:
+        """Return indexed records similar to ``record``, best first.
+
+        Args:
+            record: A record (or the values of a record to create), or its
+                :class:`Features`.
+            threshold: Minimum score (default ``settings.dedup_threshold``).
+            limit: Maximum matches.
+
+        Returns:
+            list[Match]: Matches other than the record itself.
+        """
+        probe = record if isinstance(record, Features) else extract_features(self.spec, record)
+        threshold = settings.dedup_threshold if threshold is None else threshold
+        with self._lock:
+            ids = self._candidate_ids(probe)
+            matches = []
+            for record_id in ids:
+                score, reasons = score_pair(probe, self._records[record_id])
+                if score >= threshold:
+                    matches.append(Match(record_id, score, reasons))
+        matches.sort(key=lambda m: (-m.score, m.record_id))
+        return matches[:limit]
+
+    def _candidate_ids(self, probe: Features) -> set[int]:
+        """Ids sharing an e-mail, domain or phone block, or enough name trigrams (lock held)."""
+        ids: set[int] = set()
+        for key in probe.exact_keys:
+            block = self._blocks.get(key)
+            if block and len(block) <= self.max_block_size:
+                ids |= block
+        shared: Counter[int] = Counter()
+        for key in probe.trigrams:
+            block = self._trigram_blocks.get(key)
+            if block and len(block) <= self.max_block_size:
+                shared.update(block)
+        needed = max(2, int(len(probe.trigrams) * MIN_TRIGRAM_SHARE))
+        ids.update(record_id for record_id, count in shared.items() if count >= needed)
+        ids.discard(probe.record_id)
+        return ids
+
+    def duplicate_pairs(self, threshold: float | None = None, limit: int = 50) -> list[dict]:
+        """Return the best-scoring duplicate pairs in the whole index.
+
+        Each record is only compared with its blocking candidates, so the cost
+        grows with the block sizes rather than with the square of the records.
+
+        Returns:
+            list[dict]: ``{"ids": [a, b], "score", "reasons"}``, best first.
+        """
+        threshold = settings.dedup_threshold if threshold is None else threshold
+        pairs = []
+        with self._lock:
+            for record_id, features in self._records.items():
+                for other in self._candidate_ids(features):
+                    if other <= record_id:
+                        continue
+                    score, reasons = score_pair(features, self._records[other])
+                    if score >= threshold:
+                        pairs.append((score, record_id, other, reasons))
+        pairs.sort(key=lambda p: (-p[0], p[1], p[2]))
+        return [
+            {"ids": [a, b], "score": score, "reasons": list(reasons)}
+            for score, a, b, reasons in pairs[:limit]
+        ]
+
+    def refresh(self, page_size: int | None = None) -> int:
+        """Pull records written since the watermark from Odoo (everything the first time).
+
+        The index lock is only taken per record, so lookups are not blocked
+        while pages are read.
+
+        Returns:
+            int: Number of records read.
+        """
+        from app.workflows.cdc import iter_keyset_pages
+
+        read = 0
+        for page in iter_keyset_pages(
+            self.spec.model,
+            [["active", "in", [True, False]]],
+            self.spec.fields,
+            self.watermark,
+            page_size or settings.cdc_page_size,
+        ):
+            self.add_many(page)
+            read += len(page)
+            self.watermark = (page[-1]["write_date"], page[-1]["id"])
+        self.refreshed_at = time.monotonic()
+        if read:
+            logger.info(
+                "dedup_index_refreshed", model=self.spec.model, records=read, size=len(self)
+            )
+        return read
+
+    @property
+    def stale(self) -> bool:
+        """Whether the last refresh is older than ``settings.dedup_refresh_seconds``."""
+        return time.monotonic() - self.refreshed_at >= settings.dedup_refresh_seconds
+
+
+BUILD_ERRORS = (OdooJSONRPCError, OdooUnavailableError, httpx.HTTPError)
+
+_indexes: dict[tuple[str, str], DedupIndex] = {}
+_indexes_lock = threading.Lock()
+_building: set[tuple[str, str]] = set()
+
+
+def get_index(model: str, refresh: bool = True) -> DedupIndex:
+    """Return the active tenant's index of ``model``, built or refreshed as needed.
+
+    Args:
+        model: ``crm.lead`` or ``res.partner``.
+        refresh: Pull changes from Odoo when the last refresh is older than
+            ``settings.dedup_refresh_seconds``.
+
+    Raises:
+        ValueError: If the model has no dedup spec.
+    """
+    if model not in DEDUP_SPECS:
+        raise ValueError(f"Duplicate detection is not available for {model}")
+    key = (current_tenant(), model)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = DedupIndex(DEDUP_SPECS[model])
+    if refresh and index.stale:
+        with index._refresh_lock:
+            if index.stale:
+                index.refresh()
+    return index
+
+
+def loaded_index(model: str) -> DedupIndex | None:
+    """Return the active tenant's index of ``model`` if it was already created."""
+    return _indexes.get((current_tenant(), model))
+
+
+def ready_index(model: str) -> DedupIndex | None:
+    """Return the active tenant's built index of ``model`` without reading Odoo.
+
+    A missing or stale index is built or refreshed by
+    :func:`build_in_background`; until its first build completes this
+    returns None.
+    """
+    index = loaded_index(model)
+    if index is None or index.stale:
+        build_in_background(model)
+    if index is None or not index.refreshed_at:
+        logger.info("dedup_index_not_ready", model=model)
+        return None
+    return index
+
+
+def build_in_background(model: str) -> threading.Thread | None:
+    """Build or refresh the active tenant's index of ``model`` in a daemon thread.
+
+    Returns:
+        threading.Thread | None: The started thread, or None if a build of
+            this tenant's index is already running.
+    """
+    key = (current_tenant(), model)
+    with _indexes_lock:
+        if key in _building:
+            return None
+        _building.add(key)
+    thread = threading.Thread(
+        target=contextvars.copy_context().run,
+        args=(_build, key),
+        name=f"dedup-index-{model}",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def _build(key: tuple[str, str]) -> None:
+    tenant, model = key
+    try:
+        get_index(model)
+    except BUILD_ERRORS as exc:
+        logger.warning("dedup_index_build_failed", tenant=tenant, model=model, error=str(exc))
+    finally:
+        with _indexes_lock:
+            _building.discard(key)
+
+
+def find_duplicates(
+    model: str, values: dict | Features, threshold: float | None = None, limit: int = 10
+) -> list[Match]:
+    """Return existing records that ``values`` (a record, one to create, or features) duplicates."""
+    return get_index(model).candidates(values, threshold, limit)
@@ -0,0 +1,453 @@
+"""Streaming bulk import of ``crm.lead`` records.
+
+Rows arrive as CSV or NDJSON and are validated one at a time, so an import
+of a few hundred thousand leads never holds the whole file in memory.  Stage,
+team and tag names are resolved through maps loaded once per import, and
+partners through a cache filled by one ``search_read`` per batch of e-mails.
+Valid rows are created with Odoo's multi-record ``create`` (a list of value
+dicts per RPC) in batches of ``settings.lead_import_batch_size``, with at
+most ``settings.lead_import_concurrency`` batches in flight.
+
+Invalid rows are reported with their row number and skipped.  When Odoo
+rejects a batch, it is split in halves until the offending rows are
+isolated, so one bad row does not cost its whole batch; transport failures
+(Odoo down, circuit open) fail the batch without retrying row by row.  If
+the stage, team or tag names cannot be read, the import stops reading rows
+and returns a partial report with ``error`` set.
+
+Used by ``POST /leads/import`` and ``scripts/import_leads.py``.
+"""
+
+from __future__ import annotations
+
+import codecs
+import csv
+import re
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import date
+
+import httpx
+import orjson
+
+from app.config import settings
+from app.odoo.client import OdooJSONRPCError, odoo_client, submit_routed
+from app.odoo.resilience import OdooUnavailableError, is_transport_failure
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FORMATS = ("csv", "ndjson")
+
+TEXT_FIELDS = (
+    "name",
+    "contact_name",
+    "partner_name",
+    "email_from",
+    "phone",
+    "mobile",
+    "street",
+    "city",
+    "zip",
+    "website",
+    "description",
+)
+FLOAT_FIELDS = ("expected_revenue", "probability")
+COLUMN_ALIASES = {"email": "email_from", "revenue": "expected_revenue", "deadline": "date_deadline"}
+LEAD_TYPES = ("lead", "opportunity")
+PRIORITIES = ("0", "1", "2", "3")
+
+ODOO_ERRORS = (OdooJSONRPCError, OdooUnavailableError, httpx.HTTPError)
+
+_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+_TAG_SEPARATOR = re.compile(r"\s*[,;|]\s*")
+
+
+class RowError(ValueError):
+    """A row cannot be imported."""
+
+
+@dataclass
+class ImportReport:
+    """Progress and outcome of an import.
+
+    Attributes:
+        rows: Rows read so far.
+        created: Leads created.
+        failed: Rows rejected (invalid or refused by Odoo).
+        errors: ``{"row", "error"}`` per failed row, up to
+            ``settings.lead_import_max_errors``.
+        error: Why the import stopped early, if it did.
+    """
+
+    rows: int = 0
+    created: int = 0
+    failed: int = 0
+    errors: list[dict] = field(default_factory=list)
+    error: str | None = None
+    started: float = field(default_factory=time.monotonic)
+    finished: float | None = None
+
+    def fail(self, row: int, error: str) -> None:
+        """Record a failed row."""
+        self.failed += 1
+        if len(self.errors) < settings.lead_import_max_errors:
+            self.errors.append({"row": row, "error": error})
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the import started (until it finished)."""
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        """Processed (created or failed) rows per second."""
+        return (self.created + self.failed) / self.elapsed if self.elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        """Return the report as a JSON-serializable dict."""
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "failed": self.failed,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+            "error": self.error,
+        }
+
+
+def decode_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Decode a UTF-8 byte stream (BOM allowed) into lines, keeping line endings."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.splitlines(keepends=True)
+        pending = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        yield from lines
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def iter_rows(lines: Iterable[str], fmt: str) -> Iterator[tuple[int, dict | RowError]]:
+    """Parse CSV (with a header row) or NDJSON lines into numbered rows.
+
+    Args:
+        lines: Text lines.
+        fmt: ``"csv"`` or ``"ndjson"``.
+
+    Yields:
+        tuple[int, dict | RowError]: 1-based data row number and the row, or
+            the error for a line that cannot be parsed.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for number, row in enumerate(reader, start=1):
+            if None in row:
+                yield number, RowError("more values than header columns")
+            else:
+                yield number, row
+    elif fmt == "ndjson":
+        number = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                row = orjson.loads(line)
+            except orjson.JSONDecodeError as exc:
+                yield number, RowError(f"invalid JSON: {exc}")
+                continue
+            yield number, row if isinstance(row, dict) else RowError("expected a JSON object")
+    else:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}, not {fmt!r}")
+
+
+def _name_map(records: list[dict]) -> dict[str, int]:
+    return {record["name"].strip().lower(): record["id"] for record in records}
+
+
+class ReferenceMaps:
+    """Name → id maps of stages, teams and tags, plus an e-mail → partner cache.
+
+    Stages, teams and tags are read once, on first use; partners are looked
+    up per batch and cached (misses included).
+    """
+
+    def __init__(self) -> None:
+        self._maps: dict[str, dict[str, int]] = {}
+        self._partners: dict[str, int | None] = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, kind: str, name: str) -> int:
+        if kind not in self._maps:
+            if kind == "stage":
+                from app.odoo.models.crm_stage import get_all_stages
+
+                records = get_all_stages()
+            elif kind == "team":
+                from app.odoo.models.crm_team import get_all_teams
+
+                records = get_all_teams()
+            else:
+                records = odoo_client.search_read("crm.tag", [], ["id", "name"], limit=0)
+            self._maps[kind] = _name_map(records)
+        try:
+            return self._maps[kind][name.strip().lower()]
+        except KeyError:
+            raise RowError(f"unknown {kind} {name!r}") from None
+
+    def stage(self, name: str) -> int:
+        """Return the id of a stage by (case-insensitive) name."""
+        return self._lookup("stage", name)
+
+    def team(self, name: str) -> int:
+        """Return the id of a sales team by name."""
+        return self._lookup("team", name)
+
+    def tag(self, name: str) -> int:
+        """Return the id of a CRM tag by name."""
+        return self._lookup("tag", name)
+
+    def partners(self, emails: Iterable[str]) -> dict[str, int | None]:
+        """Return partner ids by e-mail (None when no partner has it), one RPC for misses.
+
+        Matching is case-insensitive: the lowercased e-mails are compared with
+        Odoo's ``email_normalized``.
+        """
+        wanted = {email.strip().lower() for email in emails}
+        with self._lock:
+            missing = sorted(wanted - self._partners.keys())
+        if missing:
+            found = odoo_client.search_read(
+                "res.partner",
+                [["email_normalized", "in", missing]],
+                ["id", "email_normalized"],
+                limit=0,
+            )
+            with self._lock:
+                for email in missing:
+                    self._partners.setdefault(email, None)
+                for partner in found:
+                    email = partner.get("email_normalized") or ""
+                    if self._partners.get(email) is None:
+                        self._partners[email] = partner["id"]
+        with self._lock:
+            return {email: self._partners.get(email) for email in wanted}
+
+
+def _text(name: str, value: object) -> str:
+    """Return a scalar column value as stripped text."""
+    if isinstance(value, bool) or not isinstance(value, str | int | float):
+        raise RowError(f"{name} must be text, not {type(value).__name__}")
+    return str(value).strip()
+
+
+def validate_row(row: dict, refs: ReferenceMaps) -> tuple[dict, str | None]:
+    """Turn an input row into ``crm.lead`` values.
+
+    Recognized columns are the text fields (``name``, ``contact_name``,
+    ``partner_name``, ``email_from`` / ``email``, ``phone``, ...),
+    ``expected_revenue``, ``probability``, ``date_deadline``, ``type``,
+    ``priority``, ``stage``, ``team``, ``tags`` (comma-separated names) and
+    ``partner_email`` (links an existing partner); others are ignored.
+
+    Args:
+        row: Parsed CSV or NDJSON row.
+        refs: Reference maps for stage/team/tag names.
+
+    Returns:
+        tuple[dict, str | None]: The lead values and the partner e-mail to
+            resolve, if any.
+
+    Raises:
+        RowError: If the row is invalid.
+        OdooJSONRPCError: If the stage, team or tag names cannot be read
+            (transport failures raise ``httpx.HTTPError`` or
+            :class:`OdooUnavailableError`).
+    """
+    row = {
+        COLUMN_ALIASES.get(key.strip().lower(), key.strip().lower()): value
+        for key, value in row.items()
+        if key and value not in (None, "")
+    }
+    values: dict = {}
+    for name in TEXT_FIELDS:
+        if name in row:
+            values[name] = _text(name, row[name])
+    values["name"] = (
+        values.get("name") or values.get("partner_name") or values.get("contact_name") or ""
+    )
+    if not values["name"]:
+        raise RowError("name (or partner_name / contact_name) is required")
+    if "email_from" in values and not _EMAIL.match(values["email_from"]):
+        raise RowError(f"invalid email {values['email_from']!r}")
+    for name in FLOAT_FIELDS:
+        if name in row:
+            if isinstance(row[name], bool):
+                raise RowError(f"{name} must be a number, not {row[name]!r}")
+            try:
+                values[name] = float(row[name])
+            except (TypeError, ValueError):
+                raise RowError(f"{name} must be a number, not {row[name]!r}") from None
+    if not 0 <= values.get("probability", 0) <= 100:
+        raise RowError("probability must be between 0 and 100")
+    if "date_deadline" in row:
+        try:
+            deadline = _text("date_deadline", row["date_deadline"])
+            values["date_deadline"] = date.fromisoformat(deadline).isoformat()
+        except ValueError:
+            raise RowError(
+                f"date_deadline must be YYYY-MM-DD, not {row['date_deadline']!r}"
+            ) from None
+    values["type"] = _text("type", row.get("type", "lead")).lower()
+    if values["type"] not in LEAD_TYPES:
+        raise RowError(f"type must be one of {', '.join(LEAD_TYPES)}")
+    if "priority" in row:
+        values["priority"] = _text("priority", row["priority"])
+        if values["priority"] not in PRIORITIES:
+            raise RowError(f"priority must be one of {', '.join(PRIORITIES)}")
+    if "stage" in row:
+        values["stage_id"] = refs.stage(_text("stage", row["stage"]))
+    if "team" in row:
+        values["team_id"] = refs.team(_text("team", row["team"]))
+    if "tags" in row:
+        tags = row["tags"]
+        if isinstance(tags, str):
+            tags = _TAG_SEPARATOR.split(tags)
+        elif not isinstance(tags, list):
+            raise RowError(f"tags must be text or a list, not {type(tags).__name__}")
+        tag_ids = [refs.tag(tag) for tag in (_text("tags", t) for t in tags) if tag]
+        if tag_ids:
+            values["tag_ids"] = [(6, 0, tag_ids)]
+    partner_email = _text("partner_email", row.get("partner_email", "")).lower() or None
+    return values, partner_email
+
+
+Batch = list[tuple[int, dict, str | None]]
+
+
+class LeadImporter:
+    """Validate rows and create leads in concurrent multi-record batches.
+
+    Args:
+        batch_size: Leads per ``create`` call (default ``settings.lead_import_batch_size``).
+        concurrency: Batches in flight (default ``settings.lead_import_concurrency``).
+        on_progress: Called with the report after every finished batch.
+    """
+
+    def __init__(
+        self,
+        batch_size: int | None = None,
+        concurrency: int | None = None,
+        on_progress: Callable[[ImportReport], None] | None = None,
+    ) -> None:
+        self.batch_size = max(1, batch_size or settings.lead_import_batch_size)
+        self.concurrency = max(1, concurrency or settings.lead_import_concurrency)
+        self.on_progress = on_progress
+        self.refs = ReferenceMaps()
+
+    def run(self, rows: Iterable[tuple[int, dict | RowError]]) -> ImportReport:
+        """Import numbered rows (see :func:`iter_rows`) and return the report.
+
+        Rows already validated are still created when a reference lookup
+        fails; the rows after it are not read.
+        """
+        report = ImportReport()
+        batch: Batch = []
+        in_flight: set[Future] = set()
+        with ThreadPoolExecutor(self.concurrency, thread_name_prefix="lead-import") as pool:
+            for number, row in rows:
+                report.rows += 1
+                try:
+                    if isinstance(row, RowError):
+                        raise row
+                    values, partner_email = validate_row(row, self.refs)
+                except RowError as exc:
+                    report.fail(number, str(exc))
+                    continue
+                except ODOO_ERRORS as exc:
+                    report.fail(number, str(exc))
+                    report.error = f"reference lookup failed at row {number}: {exc}"
+                    logger.warning("lead_import_aborted", row=number, error=str(exc))
+                    break
+                batch.append((number, values, partner_email))
+                if len(batch) >= self.batch_size:
+                    in_flight.add(self._submit(pool, batch))
+                    batch = []
+                    while len(in_flight) >= self.concurrency:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        self._collect(done, report)
+            if batch:
+                in_flight.add(self._submit(pool, batch))
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                self._collect(done, report)
+        report.finished = time.monotonic()
+        logger.info(
+            "lead_import_finished",
+            rows=report.rows,
+            created=report.created,
+            failed=report.failed,
+            rows_per_second=round(report.rows_per_second, 1),
+        )
+        return report
+
+    def _submit(self, pool: ThreadPoolExecutor, batch: Batch) -> Future:
+        return submit_routed(pool, self._import_batch, batch)
+
+    def _collect(self, done: set[Future], report: ImportReport) -> None:
+        from app.odoo.dedup import loaded_index
+
+        for future in done:
+            created, errors = future.result()
+            report.created += len(created)
+            for number, error in errors:
+                report.fail(number, error)
+            index = loaded_index("crm.lead")
+            if index is not None and created:
+                index.add_many({**values, "id": lead_id} for values, lead_id in created)
+        if self.on_progress is not None:
+            self.on_progress(report)
+
+    def _import_batch(self, batch: Batch) -> tuple[list[tuple[dict, int]], list[tuple[int, str]]]:
+        """Resolve partners and create the batch; return created (values, id) and row errors."""
+        emails = {email for _, _, email in batch if email}
+        try:
+            partners = self.refs.partners(emails) if emails else {}
+        except ODOO_ERRORS as exc:
+            return [], [(number, f"partner lookup failed: {exc}") for number, _, _ in batch]
+        rows = []
+        for number, values, email in batch:
+            if email and partners.get(email):
+                values = {**values, "partner_id": partners[email]}
+            rows.append((number, values))
+        created: list[tuple[dict, int]] = []
+        errors: list[tuple[int, str]] = []
+        self._create(rows, created, errors)
+        return created, errors
+
+    def _create(
+        self,
+        rows: list[tuple[int, dict]],
+        created: list[tuple[dict, int]],
+        errors: list[tuple[int, str]],
+    ) -> None:
+        """Create rows in one RPC; on a rejection, bisect to isolate the bad rows."""
+        try:
+            ids = odoo_client.execute("crm.lead", "create", [values for _, values in rows])
+        except ODOO_ERRORS as exc:
+            if len(rows) == 1 or isinstance(exc, OdooUnavailableError) or is_transport_failure(exc):
+                errors.extend((number, str(exc)) for number, _ in rows)
+                return
+            middle = len(rows) // 2
+            self._create(rows[:middle], created, errors)
+            self._create(rows[middle:], created, errors)
+            return
+        created.extend((values, lead_id) for (_, values), lead_id in zip(rows, ids, strict=True))
@@ -0,0 +1,237 @@
+"""Odoo JSON-RPC call metrics and slow-call log.
+
+:func:`observe_rpc` wraps every ``OdooClient._jsonrpc_call`` and records,
+labelled by ``service`` / ``model`` / ``method``:
+
+* ``odoo_rpc_duration_seconds`` — latency histogram;
+* ``odoo_rpc_request_bytes_total`` / ``odoo_rpc_response_bytes_total``;
+* ``odoo_rpc_errors_total`` — failures by error kind;
+* ``odoo_rpc_in_flight`` — concurrent calls (for sizing connection pools).
+
+Calls slower than ``settings.odoo_slow_call_ms`` are logged with a
+fingerprint of their normalized domain (field names and operators, values
+replaced by ``?``), so the same query shape with different values groups
+together; :func:`slow_call_report` ranks the fingerprints by total time.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.config import settings
+from app.utils.logger import get_logger
+from app.utils.metrics import counter, gauge, histogram
+
+logger = get_logger(__name__)
+
+_LABELS = ("service", "model", "method")
+_DOMAIN_METHODS = {"search", "search_read", "search_count", "read_group"}
+
+RPC_DURATION = histogram(
+    "odoo_rpc_duration_seconds",
+    "Odoo JSON-RPC call latency in seconds",
+    _LABELS,
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+RPC_REQUEST_BYTES = counter(
+    "odoo_rpc_request_bytes_total", "Bytes sent in Odoo JSON-RPC requests", _LABELS
+)
+RPC_RESPONSE_BYTES = counter(
+    "odoo_rpc_response_bytes_total", "Bytes received in Odoo JSON-RPC responses", _LABELS
+)
+RPC_ERRORS = counter(
+    "odoo_rpc_errors_total", "Failed Odoo JSON-RPC calls by error kind", (*_LABELS, "kind")
+)
+RPC_IN_FLIGHT = gauge("odoo_rpc_in_flight", "Odoo JSON-RPC calls currently in flight")
+RPC_SLOW_CALLS = counter(
+    "odoo_rpc_slow_calls_total",
+    "Odoo JSON-RPC calls slower than ODOO_SLOW_CALL_MS, by query fingerprint",
+    ("model", "method", "fingerprint"),
+)
+
+
+def normalize_domain(domain: Any) -> list:
+    """Replace the values of an Odoo domain with placeholders.
+
+    Args:
+        domain: Odoo domain (list of ``[field, operator, value]`` terms and
+            ``"&"`` / ``"|"`` / ``"!"`` operators).
+
+    Returns:
+        list: The domain with values replaced by ``"?"`` (``["?"]`` for
+            list values), keeping field names and operators.
+    """
+    if not isinstance(domain, (list, tuple)):
+        return []
+    normalized: list = []
+    for term in domain:
+        if isinstance(term, (list, tuple)) and len(term) == 3:
+            value = ["?"] if isinstance(term[2], (list, tuple)) else "?"
+            normalized.append([term[0], term[1], value])
+        else:
+            normalized.append(term)
+    return normalized
+
+
+def rpc_labels(service: str, method: str, args: list[Any]) -> tuple[str, str]:
+    """Return the ``(model, method)`` labels of a JSON-RPC call."""
+    if service == "object" and len(args) >= 5:
+        return str(args[3]), str(args[4])
+    return "", method
+
+
+def query_shape(service: str, method: str, args: list[Any]) -> tuple[str, list | None]:
+    """Return the fingerprint and normalized domain of a call.
+
+    Args:
+        service: JSON-RPC service.
+        method: Service method.
+        args: Service arguments (``execute_kw`` layout for ``object``).
+
+    Returns:
+        tuple[str, list | None]: 12-character fingerprint and the normalized
+            domain (None for calls without a domain).
+    """
+    model, model_method = rpc_labels(service, method, args)
+    domain = None
+    if model_method in _DOMAIN_METHODS:
+        positional = args[5] if len(args) > 5 else []
+        keywords = args[6] if len(args) > 6 and isinstance(args[6], dict) else {}
+        domain = normalize_domain(positional[0] if positional else keywords.get("domain", []))
+    material = json.dumps([service, model, model_method, domain], separators=(",", ":"))
+    return hashlib.sha1(material.encode()).hexdigest()[:12], domain
+
+
+@dataclass
+class _ShapeStats:
+    model: str
+    method: str
+    domain: list | None
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+@dataclass
+class SlowCallLog:
+    """Recent slow calls and per-fingerprint totals.
+
+    Attributes:
+        max_entries: Number of recent slow calls kept.
+    """
+
+    max_entries: int = 200
+    recent: deque = field(init=False)
+    shapes: dict[str, _ShapeStats] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.recent = deque(maxlen=self.max_entries)
+        self._lock = threading.Lock()
+
+    def record(self, fingerprint: str, entry: dict) -> None:
+        """Add a slow call."""
+        with self._lock:
+            self.recent.append(entry)
+            stats = self.shapes.get(fingerprint)
+            if stats is None:
+                if len(self.shapes) >= 1000:  # bound memory on pathological cardinality
+                    self.shapes.pop(min(self.shapes, key=lambda k: self.shapes[k].total_ms))
+                stats = self.shapes[fingerprint] = _ShapeStats(
+                    entry["model"], entry["method"], entry["domain"]
+                )
+            stats.count += 1
+            stats.total_ms += entry["duration_ms"]
+            stats.max_ms = max(stats.max_ms, entry["duration_ms"])
+
+    def report(self, limit: int = 20) -> dict:
+        """Return the slowest fingerprints by total time and the latest calls."""
+        with self._lock:
+            shapes = sorted(self.shapes.items(), key=lambda item: item[1].total_ms, reverse=True)
+            recent = list(self.recent)[-limit:]
+        return {
+            "threshold_ms": settings.odoo_slow_call_ms,
+            "worst": [
+                {
+                    "fingerprint": fingerprint,
+                    "model": stats.model,
+                    "method": stats.method,
+                    "domain": stats.domain,
+                    "count": stats.count,
+                    "total_ms": round(stats.total_ms, 1),
+                    "avg_ms": round(stats.total_ms / stats.count, 1),
+                    "max_ms": round(stats.max_ms, 1),
+                }
+                for fingerprint, stats in shapes[:limit]
+            ],
+            "recent": recent,
+        }
+
+
+slow_calls = SlowCallLog()
+
+
+@dataclass
+class RPCObservation:
+    """Sizes filled in by the caller while a call is observed."""
+
+    request_bytes: int = 0
+    response_bytes: int = 0
+
+
+@contextmanager
+def observe_rpc(service: str, method: str, args: list[Any]) -> Iterator[RPCObservation]:
+    """Record latency, sizes, errors and slow calls of one JSON-RPC call.
+
+    Args:
+        service: JSON-RPC service.
+        method: Service method.
+        args: Service arguments.
+
+    Yields:
+        RPCObservation: Set ``request_bytes`` / ``response_bytes`` on it.
+    """
+    model, model_method = rpc_labels(service, method, args)
+    labels = {"service": service, "model": model, "method": model_method}
+    observation = RPCObservation()
+    RPC_IN_FLIGHT.inc()
+    started = time.perf_counter()
+    try:
+        yield observation
+    except Exception as exc:
+        RPC_ERRORS.labels(**labels, kind=type(exc).__name__).inc()
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        RPC_IN_FLIGHT.dec()
+        RPC_DURATION.labels(**labels).observe(elapsed)
+        RPC_REQUEST_BYTES.labels(**labels).inc(observation.request_bytes)
+        RPC_RESPONSE_BYTES.labels(**labels).inc(observation.response_bytes)
+        duration_ms = elapsed * 1000
+        if settings.odoo_slow_call_ms and duration_ms >= settings.odoo_slow_call_ms:
+            fingerprint, domain = query_shape(service, method, args)
+            RPC_SLOW_CALLS.labels(model=model, method=model_method, fingerprint=fingerprint).inc()
+            entry = {
+                "at": round(time.time(), 3),
+                "model": model,
+                "method": model_method or method,
+                "fingerprint": fingerprint,
+                "domain": domain,
+                "duration_ms": round(duration_ms, 1),
+                "request_bytes": observation.request_bytes,
+                "response_bytes": observation.response_bytes,
+            }
+            slow_calls.record(fingerprint, entry)
+            logger.warning("odoo_slow_call", **entry)
+
+
+def slow_call_report(limit: int = 20) -> dict:
+    """Return the slow-call report (see :meth:`SlowCallLog.report`)."""
+    return slow_calls.report(limit)
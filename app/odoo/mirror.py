@@ -0,0 +1,410 @@
+"""Local SQLite mirror of ``crm.lead`` and ``res.partner`` with FTS5 search.
+
+Odoo's ``ilike`` searches scan the table and only look at one or two
+columns.  :class:`RecordMirror` keeps a copy of the mirrored models in a
+SQLite file and indexes names, e-mails, descriptions and contact fields in
+FTS5, so text searches return BM25-ranked matches in milliseconds.
+
+The mirror is kept current by :meth:`RecordMirror.sync`, an incremental
+keyset sync on ``(write_date, id)`` (the same pagination the CDC poller
+uses), run every ``settings.mirror_sync_interval_seconds`` in the
+background, and by :meth:`RecordMirror.refresh` when an Odoo webhook reports
+a change (which also catches deletions, invisible to ``write_date``).
+
+Searches only answer from the mirror while its last completed sync of the
+model is younger than ``settings.mirror_max_staleness_seconds``;
+:meth:`RecordMirror.search` returns None otherwise and the callers fall back
+to Odoo.  Each tenant listed in ``settings.mirror_tenants`` gets its own
+file (``storage/odoo_mirror.db``, ``storage/odoo_mirror.<tenant>.db``).
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+
+from app.config import settings
+from app.odoo.client import OdooJSONRPCError, odoo_client
+from app.odoo.models import crm_lead, res_partner
+from app.odoo.resilience import OdooUnavailableError
+from app.odoo.tenants import DEFAULT_TENANT, UnknownTenantError, current_tenant, use_tenant
+from app.utils.logger import get_logger
+from app.utils.metrics import counter
+
+logger = get_logger(__name__)
+
+MIRROR_SEARCHES = counter(
+    "odoo_mirror_searches_total",
+    "Text searches by model and source (mirror, or odoo when the mirror is stale)",
+    ("model", "source"),
+)
+
+SYNC_ERRORS = (
+    OdooJSONRPCError,
+    OdooUnavailableError,
+    UnknownTenantError,
+    httpx.HTTPError,
+    sqlite3.Error,
+    OSError,
+    ValueError,
+)
+
+
+@dataclass(frozen=True)
+class MirrorSpec:
+    """What to mirror of one model.
+
+    Attributes:
+        model: Odoo model name.
+        fields: Fields stored per record (must include ``id``, ``write_date``
+            and ``active``).
+        text_fields: Fields indexed for full-text search.
+    """
+
+    model: str
+    fields: tuple[str, ...]
+    text_fields: tuple[str, ...]
+
+    @property
+    def table(self) -> str:
+        """SQLite table name of the records (``crm.lead`` → ``mirror_crm_lead``)."""
+        return "mirror_" + self.model.replace(".", "_")
+
+
+MIRROR_SPECS = {
+    "crm.lead": MirrorSpec(
+        "crm.lead",
+        tuple(crm_lead.FIELDS),
+        ("name", "partner_name", "contact_name", "email_from", "phone", "city", "description"),
+    ),
+    "res.partner": MirrorSpec(
+        "res.partner",
+        (*res_partner.FIELDS, "write_date"),
+        ("name", "email", "phone", "mobile", "street", "city"),
+    ),
+}
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_query(text: str) -> str | None:
+    """Turn free text into an FTS5 query: every word must match as a prefix.
+
+    Args:
+        text: User search text.
+
+    Returns:
+        str | None: The MATCH expression, or None if ``text`` has no words.
+    """
+    words = _TOKEN.findall(text)
+    return " ".join(f'"{word}"*' for word in words) or None
+
+
+def _text(value: object) -> str:
+    """Flatten an Odoo field value for indexing (many2one → its display name)."""
+    if value is False or value is None:
+        return ""
+    if isinstance(value, list) and len(value) == 2 and isinstance(value[1], str):
+        return value[1]
+    return str(value)
+
+
+class RecordMirror:
+    """SQLite copy of the mirrored models with FTS5 indexes.
+
+    Args:
+        path: SQLite file (created if missing).
+        specs: Models to mirror; defaults to :data:`MIRROR_SPECS`.
+    """
+
+    def __init__(self, path: str, specs: dict[str, MirrorSpec] | None = None) -> None:
+        self.path = path
+        self.specs = dict(MIRROR_SPECS if specs is None else specs)
+        self._threads = threading.local()
+        self._sync_lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS mirror_state ("
+            "model TEXT PRIMARY KEY, write_date TEXT NOT NULL, record_id INTEGER NOT NULL, "
+            "synced_at REAL NOT NULL)"
+        )
+        for spec in self.specs.values():
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {spec.table} ("
+                "id INTEGER PRIMARY KEY, write_date TEXT, active INTEGER NOT NULL, data TEXT)"
+            )
+            columns = ", ".join(spec.text_fields)
+            conn.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {spec.table}_fts USING fts5("
+                f"{columns}, tokenize='unicode61 remove_diacritics 2')"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._threads, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._threads.conn = conn
+        return conn
+
+    def _spec(self, model: str) -> MirrorSpec:
+        try:
+            return self.specs[model]
+        except KeyError:
+            raise ValueError(f"{model} is not mirrored") from None
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def upsert(self, model: str, records: list[dict]) -> None:
+        """Store records and re-index their text fields."""
+        spec = self._spec(model)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for record in records:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {spec.table} (id, write_date, active, data) "
+                    "VALUES (?, ?, ?, ?)",
+                    (
+                        record["id"],
+                        record.get("write_date") or "",
+                        1 if record.get("active", True) else 0,
+                        json.dumps(record, ensure_ascii=False),
+                    ),
+                )
+                conn.execute(f"DELETE FROM {spec.table}_fts WHERE rowid = ?", (record["id"],))
+                conn.execute(
+                    f"INSERT INTO {spec.table}_fts (rowid, {', '.join(spec.text_fields)}) "
+                    f"VALUES (?, {', '.join('?' for _ in spec.text_fields)})",
+                    (record["id"], *(_text(record.get(name)) for name in spec.text_fields)),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete(self, model: str, record_ids: list[int]) -> None:
+        """Remove records (deleted in Odoo) from the mirror."""
+        spec = self._spec(model)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for record_id in record_ids:
+                conn.execute(f"DELETE FROM {spec.table} WHERE id = ?", (record_id,))
+                conn.execute(f"DELETE FROM {spec.table}_fts WHERE rowid = ?", (record_id,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    def watermark(self, model: str) -> tuple[str, int, float] | None:
+        """Return ``(write_date, id, synced_at)`` of the model's sync cursor.
+
+        ``synced_at`` is the end of the last completed sync (0 until the first
+        one completes); the cursor itself advances after every page.
+        """
+        row = (
+            self._conn()
+            .execute(
+                "SELECT write_date, record_id, synced_at FROM mirror_state WHERE model = ?",
+                (model,),
+            )
+            .fetchone()
+        )
+        return tuple(row) if row else None
+
+    def sync(self, model: str, page_size: int | None = None) -> int:
+        """Copy records changed since the last sync (all records the first time).
+
+        Reads through ``odoo_client``, so it syncs the tenant active in the
+        calling context.  The cursor is saved after every page, so an
+        interrupted sync resumes where it stopped, but ``synced_at`` only
+        moves once the last page is copied.
+
+        Args:
+            model: Mirrored model name.
+            page_size: Records per keyset page (default ``settings.cdc_page_size``).
+
+        Returns:
+            int: Number of records copied.
+        """
+        from app.workflows.cdc import iter_keyset_pages
+
+        spec = self._spec(model)
+        with self._sync_lock:
+            previous = self.watermark(model)
+            after = (previous[0], previous[1]) if previous else ("1970-01-01 00:00:00", 0)
+            synced_at = previous[2] if previous else 0.0
+            copied = 0
+            for page in iter_keyset_pages(
+                model,
+                [["active", "in", [True, False]]],
+                list(spec.fields),
+                after,
+                page_size or settings.cdc_page_size,
+            ):
+                self.upsert(model, page)
+                copied += len(page)
+                after = (page[-1]["write_date"], page[-1]["id"])
+                self._set_watermark(model, after, synced_at)
+            self._set_watermark(model, after, time.time())
+        if copied:
+            logger.info("odoo_mirror_synced", model=model, records=copied)
+        return copied
+
+    def _set_watermark(self, model: str, after: tuple[str, int], synced_at: float) -> None:
+        self._conn().execute(
+            "INSERT OR REPLACE INTO mirror_state (model, write_date, record_id, synced_at) "
+            "VALUES (?, ?, ?, ?)",
+            (model, after[0], after[1], synced_at),
+        )
+
+    def refresh(self, model: str, record_ids: list[int]) -> None:
+        """Re-read records from Odoo (e.g. after a webhook); drop the deleted ones."""
+        spec = self._spec(model)
+        records = odoo_client.search_read(
+            model,
+            [["id", "in", list(record_ids)], ["active", "in", [True, False]]],
+            list(spec.fields),
+            limit=len(record_ids),
+        )
+        self.upsert(model, records)
+        found = {record["id"] for record in records}
+        self.delete(model, [record_id for record_id in record_ids if record_id not in found])
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def is_fresh(self, model: str, max_age: float | None = None) -> bool:
+        """Whether the model's last completed sync is recent enough to answer searches."""
+        state = self.watermark(model)
+        max_age = settings.mirror_max_staleness_seconds if max_age is None else max_age
+        return state is not None and time.time() - state[2] <= max_age
+
+    def search(self, model: str, text: str, limit: int = 20) -> list[dict] | None:
+        """Return active records matching ``text``, best BM25 rank first.
+
+        Every word of ``text`` must match (as a prefix) in one of the indexed
+        fields; text without words returns the most recently changed records.
+
+        Args:
+            model: Mirrored model name.
+            text: Free-text query.
+            limit: Maximum records.
+
+        Returns:
+            list[dict] | None: Matching records, or None when the mirror is
+                stale (the caller should ask Odoo).
+        """
+        if model not in self.specs or not self.is_fresh(model):
+            return None
+        spec = self.specs[model]
+        query = fts_query(text)
+        if query is None:
+            # Like ``ilike ''`` in Odoo: everything, most recently changed first.
+            sql = (
+                f"SELECT data FROM {spec.table} WHERE active = 1 "
+                "ORDER BY write_date DESC, id DESC LIMIT ?"
+            )
+            params: tuple = (limit,)
+        else:
+            sql = (
+                f"SELECT r.data FROM {spec.table}_fts f JOIN {spec.table} r ON r.id = f.rowid "
+                f"WHERE {spec.table}_fts MATCH ? AND r.active = 1 "
+                f"ORDER BY bm25({spec.table}_fts) LIMIT ?"
+            )
+            params = (query, limit)
+        rows = self._conn().execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self, model: str) -> int:
+        """Number of mirrored records of a model (including archived)."""
+        table = self._spec(model).table
+        return self._conn().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+_mirrors: dict[str, RecordMirror] = {}
+_mirrors_lock = threading.Lock()
+
+
+def mirrored_tenants() -> list[str]:
+    """Tenants with a mirror (``settings.mirror_tenants``)."""
+    return [name.strip() for name in settings.mirror_tenants.split(",") if name.strip()]
+
+
+def get_mirror(tenant: str | None = None) -> RecordMirror | None:
+    """Return the mirror of a tenant (default: the active one), or None if not mirrored."""
+    tenant = tenant or current_tenant()
+    if tenant not in mirrored_tenants():
+        return None
+    mirror = _mirrors.get(tenant)
+    if mirror is None:
+        with _mirrors_lock:
+            mirror = _mirrors.get(tenant)
+            if mirror is None:
+                path = settings.mirror_path
+                if tenant != DEFAULT_TENANT:
+                    stem = Path(path)
+                    path = str(stem.with_name(f"{stem.stem}.{tenant}{stem.suffix}"))
+                mirror = _mirrors[tenant] = RecordMirror(path)
+    return mirror
+
+
+def mirror_search(model: str, text: str, limit: int) -> list[dict] | None:
+    """Search the active tenant's mirror; None (and a metric) when Odoo must answer."""
+    mirror = get_mirror()
+    results = mirror.search(model, text, limit) if mirror is not None else None
+    MIRROR_SEARCHES.labels(model=model, source="odoo" if results is None else "mirror").inc()
+    return results
+
+
+def sync_all() -> int:
+    """Sync every mirrored model of every mirrored tenant; return records copied.
+
+    A failing model or tenant is logged and skipped; the others still sync.
+    """
+    copied = 0
+    for tenant in mirrored_tenants():
+        try:
+            mirror = get_mirror(tenant)
+            with use_tenant(tenant):
+                for model in mirror.specs:
+                    try:
+                        copied += mirror.sync(model)
+                    except SYNC_ERRORS as exc:
+                        logger.warning(
+                            "odoo_mirror_sync_failed", tenant=tenant, model=model, error=str(exc)
+                        )
+        except SYNC_ERRORS as exc:
+            logger.warning("odoo_mirror_tenant_failed", tenant=tenant, error=str(exc))
+    return copied
+
+
+async def run_sync_forever(interval: float) -> None:
+    """Run :func:`sync_all` in a worker thread every ``interval`` seconds until cancelled."""
+    import asyncio
+
+    logger.info("odoo_mirror_started", interval=interval, tenants=mirrored_tenants())
+    try:
+        while True:
+            await asyncio.to_thread(sync_all)
+            await asyncio.sleep(interval)
+    except Exception:
+        logger.exception("odoo_mirror_stopped")
+        raise
@@ -1,17 +1,24 @@
 """Odoo model helpers package."""
 
 from app.odoo.models.crm_lead import (
+    bulk_mark_lost,
+    bulk_mark_won,
+    bulk_update_leads,
+    bulk_write_leads,
     convert_to_opportunity,
     create_lead,
     get_lead,
+    iter_lead_batches,
     mark_lost,
     mark_won,
     search_leads,
     update_lead,
+    write_leads,
 )
 from app.odoo.models.crm_stage import get_all_stages, get_stage_by_name
-from app.odoo.models.crm_team import get_all_teams, get_team_members
+from app.odoo.models.crm_team import get_all_teams, get_team, get_team_members
 from app.odoo.models.mail_activity import (
+    activity_digest,
     create_activity,
     get_overdue_activities,
     list_activities,
@@ -30,6 +37,12 @@ __all__ = [
     "get_lead",
     "create_lead",
     "update_lead",
+    "write_leads",
+    "bulk_write_leads",
+    "bulk_update_leads",
+    "bulk_mark_won",
+    "bulk_mark_lost",
+    "iter_lead_batches",
     "convert_to_opportunity",
     "mark_won",
     "mark_lost",
@@ -38,6 +51,7 @@ __all__ = [
     "get_stage_by_name",
     # crm_team
     "get_all_teams",
+    "get_team",
     "get_team_members",
     # res_partner
     "search_partners",
@@ -49,4 +63,5 @@ __all__ = [
     "mark_done",
     "list_activities",
     "get_overdue_activities",
+    "activity_digest",
 ]
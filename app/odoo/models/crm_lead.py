@@ -7,7 +7,16 @@ Both leads and opportunities share this model in Odoo 16 — the
 # TODO: v18 - verify field names remain compatible with Odoo 18 crm.lead
 """
 
-from app.odoo.client import odoo_client
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+
+import httpx
+import orjson
+
+from app.config import settings
+from app.odoo.client import OdooJSONRPCError, odoo_client
+from app.odoo.resilience import OdooUnavailableError, is_transport_failure
+from app.odoo.unit_of_work import cached_record, forget, record_write, remember
 
 # Important crm.lead fields for Odoo 16
 FIELDS = [
@@ -43,6 +52,19 @@ FIELDS = [
     "write_date",
 ]
 
+# Ids listed per failed group in a bulk summary
+BULK_ERROR_IDS = 20
+
+# Minimal field set needed to compute a BANT score
+SCORING_FIELDS = [
+    "id",
+    "name",
+    "expected_revenue",
+    "partner_id",
+    "description",
+    "date_deadline",
+]
+
 
 def search_leads(domain: list | None = None, limit: int = 20) -> list[dict]:
     """Search for CRM leads/opportunities.
@@ -54,7 +76,39 @@ def search_leads(domain: list | None = None, limit: int = 20) -> list[dict]:
     Returns:
         list[dict]: Matching lead records with :data:`FIELDS`.
     """
-    return odoo_client.search_read("crm.lead", domain or [], FIELDS, limit=limit)
+    leads = odoo_client.search_read("crm.lead", domain or [], FIELDS, limit=limit)
+    return remember("crm.lead", leads)
+
+
+def search_leads_text(query: str, limit: int = 20) -> list[dict]:
+    """Full-text search of leads by name, company, contact, e-mail, phone or description.
+
+    Answers from the local mirror (BM25-ranked) while it is fresh, otherwise
+    from Odoo with an ``ilike`` on the main text fields. Mirror hits may lag
+    Odoo, so they are not added to the request's identity map.
+
+    Args:
+        query: Free-text search string.
+        limit: Maximum number of records to return.
+
+    Returns:
+        list[dict]: Matching lead records with :data:`FIELDS`.
+    """
+    from app.odoo.mirror import mirror_search
+
+    leads = mirror_search("crm.lead", query, limit)
+    if leads is not None:
+        return leads
+    domain = [
+        "|",
+        "|",
+        "|",
+        ["name", "ilike", query],
+        ["partner_name", "ilike", query],
+        ["contact_name", "ilike", query],
+        ["email_from", "ilike", query],
+    ]
+    return search_leads(domain=domain, limit=limit)
 
 
 def get_lead(lead_id: int) -> dict:
@@ -66,20 +120,73 @@ def get_lead(lead_id: int) -> dict:
     Returns:
         dict: The lead record, or an empty dict if not found.
     """
+    cached = cached_record("crm.lead", lead_id, FIELDS)
+    if cached is not None:
+        return cached
     results = odoo_client.search_read("crm.lead", [["id", "=", lead_id]], FIELDS, limit=1)
+    remember("crm.lead", results)
     return results[0] if results else {}
 
 
-def create_lead(values: dict) -> int:
+def iter_lead_batches(
+    domain: list | None = None,
+    ids: list[int] | None = None,
+    fields: list[str] | None = None,
+    batch_size: int = 500,
+) -> Iterator[list[dict]]:
+    """Yield leads in pages of at most ``batch_size`` records.
+
+    The matching ids are resolved once up front and then read page by page,
+    so writes made while iterating cannot shift later pages.
+
+    Args:
+        domain: Odoo search domain. Ignored when ``ids`` is given.
+        ids: Explicit lead ids to read.
+        fields: Field names to read. Defaults to :data:`FIELDS`.
+        batch_size: Maximum number of records per ``read`` call.
+
+    Yields:
+        list[dict]: One page of lead records.
+    """
+    if ids is None:
+        ids = odoo_client.search("crm.lead", domain or [], order="id asc")
+    for start in range(0, len(ids), batch_size):
+        yield remember(
+            "crm.lead",
+            odoo_client.read("crm.lead", ids[start : start + batch_size], fields or FIELDS),
+        )
+
+
+def create_lead(values: dict, allow_duplicate: bool = False) -> int:
     """Create a new lead.
 
+    With ``settings.dedup_check_on_create`` on and ``allow_duplicate``
+    unset, the values are first matched against the duplicate index.  The
+    check never reads Odoo: until the index is built in the background
+    (:func:`~app.odoo.dedup.ready_index`) the lead is created unchecked.
+
     Args:
         values: Field values for the new lead.
+        allow_duplicate: Skip the duplicate check.
 
     Returns:
         int: The id of the new record.
+
+    Raises:
+        DuplicateRecordError: If existing leads match the values.
     """
-    return odoo_client.create("crm.lead", values)
+    from app.odoo import dedup
+
+    if settings.dedup_check_on_create and not allow_duplicate:
+        index = dedup.ready_index("crm.lead")
+        matches = index.candidates(values) if index is not None else []
+        if matches:
+            raise dedup.DuplicateRecordError("crm.lead", matches)
+    lead_id = odoo_client.create("crm.lead", values)
+    index = dedup.loaded_index("crm.lead")
+    if index is not None:
+        index.add({**values, "id": lead_id})
+    return lead_id
 
 
 def update_lead(lead_id: int, values: dict) -> bool:
@@ -92,7 +199,210 @@ def update_lead(lead_id: int, values: dict) -> bool:
     Returns:
         bool: True on success.
     """
-    return odoo_client.write("crm.lead", [lead_id], values)
+    result = odoo_client.write("crm.lead", [lead_id], values)
+    record_write("crm.lead", [lead_id], values)
+    return result
+
+
+def write_leads(lead_ids: list[int], values: dict) -> bool:
+    """Write the same values to many leads in a single RPC.
+
+    Args:
+        lead_ids: Record ids to update.
+        values: Fields to write.
+
+    Returns:
+        bool: True on success.
+    """
+    result = odoo_client.write("crm.lead", list(lead_ids), values)
+    record_write("crm.lead", lead_ids, values)
+    return result
+
+
+def resolve_lead_ids(
+    lead_ids: Iterable[int] | None = None, domain: list | None = None
+) -> list[int]:
+    """Return the leads a bulk operation applies to.
+
+    Args:
+        lead_ids: Explicit lead ids. Take precedence over ``domain``.
+        domain: Odoo search domain (``[]`` matches every active lead).
+
+    Returns:
+        list[int]: Distinct lead ids, in the given or ascending order.
+
+    Raises:
+        ValueError: If neither argument is given, or more leads match than
+            ``settings.bulk_update_max_records``.
+    """
+    limit = settings.bulk_update_max_records
+    if lead_ids:
+        ids = list(dict.fromkeys(int(lead_id) for lead_id in lead_ids))
+    elif domain is not None:
+        ids = odoo_client.search("crm.lead", domain, limit=limit + 1, order="id asc")
+    else:
+        raise ValueError("Give lead ids or a domain")
+    if len(ids) > limit:
+        raise ValueError(f"More than {limit} leads match; narrow the ids or the domain")
+    return ids
+
+
+_BULK_ERRORS = (OdooJSONRPCError, OdooUnavailableError, httpx.HTTPError)
+
+
+def _is_missing_method(exc: OdooJSONRPCError) -> bool:
+    """Whether Odoo rejected a call because the model has no such method."""
+    data = exc.data if isinstance(exc.data, dict) else {}
+    return data.get("name") == "builtins.AttributeError"
+
+
+@dataclass
+class _BulkSummary:
+    """Counts of a bulk operation; stops calling Odoo once it is unreachable."""
+
+    matched: int
+    updated: int = 0
+    calls: int = 0
+    errors: list[dict] = field(default_factory=list)
+    _unreachable: Exception | None = None
+
+    def run(self, ids: list[int], call: Callable[[], object]) -> None:
+        error = self._unreachable
+        if error is None:
+            self.calls += 1
+            try:
+                call()
+                self.updated += len(ids)
+                return
+            except _BULK_ERRORS as exc:
+                if isinstance(exc, OdooUnavailableError) or is_transport_failure(exc):
+                    self._unreachable = exc
+                error = exc
+        self.errors.append({"ids": ids[:BULK_ERROR_IDS], "count": len(ids), "error": str(error)})
+
+    def as_dict(self) -> dict:
+        return {
+            "matched": self.matched,
+            "updated": self.updated,
+            "failed": sum(e["count"] for e in self.errors),
+            "calls": self.calls,
+            "errors": self.errors,
+        }
+
+
+def bulk_write_leads(updates: Mapping[int, dict]) -> dict:
+    """Write per-lead values with one ``write`` per distinct set of values.
+
+    Leads that receive identical values share a single RPC, so moving 300
+    leads to two stages costs two calls. A failed group does not stop the
+    others, unless Odoo is unreachable.
+
+    Args:
+        updates: Values to write, keyed by lead id. Empty values are skipped.
+
+    Returns:
+        dict: ``matched``, ``updated``, ``failed``, ``calls`` and ``errors``
+            (``{"ids", "count", "error"}`` per failed group, ids truncated).
+
+    Raises:
+        ValueError: If more than ``settings.bulk_update_max_records`` leads
+            are given.
+    """
+    limit = settings.bulk_update_max_records
+    if len(updates) > limit:
+        raise ValueError(f"More than {limit} leads to update; split the request")
+    groups: dict[bytes, tuple[dict, list[int]]] = {}
+    for lead_id, values in updates.items():
+        if values:
+            key = orjson.dumps(values, option=orjson.OPT_SORT_KEYS)
+            groups.setdefault(key, (values, []))[1].append(lead_id)
+    summary = _BulkSummary(matched=len(updates))
+    for values, ids in groups.values():
+        summary.run(ids, lambda ids=ids, values=values: write_leads(ids, values))
+    return summary.as_dict()
+
+
+def bulk_update_leads(
+    values: dict, lead_ids: Iterable[int] | None = None, domain: list | None = None
+) -> dict:
+    """Write the same values to every lead matched by ids or a domain.
+
+    Args:
+        values: Fields to write.
+        lead_ids: Explicit lead ids.
+        domain: Odoo search domain, used when no ids are given.
+
+    Returns:
+        dict: The :func:`bulk_write_leads` summary.
+    """
+    return bulk_write_leads(dict.fromkeys(resolve_lead_ids(lead_ids, domain), values))
+
+
+def bulk_mark_won(lead_ids: Iterable[int] | None = None, domain: list | None = None) -> dict:
+    """Mark many leads as Won with one ``action_set_won`` call.
+
+    Falls back to writing ``probability`` only when the model has no
+    ``action_set_won``; other errors are reported in the summary.
+
+    Args:
+        lead_ids: Explicit lead ids.
+        domain: Odoo search domain, used when no ids are given.
+
+    Returns:
+        dict: The :func:`bulk_write_leads` summary.
+    """
+    ids = resolve_lead_ids(lead_ids, domain)
+    forget("crm.lead", ids)
+
+    def set_won() -> None:
+        try:
+            odoo_client.execute("crm.lead", "action_set_won", ids)
+        except OdooJSONRPCError as exc:
+            if not _is_missing_method(exc):
+                raise
+            odoo_client.write("crm.lead", ids, {"probability": 100})
+
+    summary = _BulkSummary(matched=len(ids))
+    if ids:
+        summary.run(ids, set_won)
+    return summary.as_dict()
+
+
+def bulk_mark_lost(
+    lead_ids: Iterable[int] | None = None,
+    domain: list | None = None,
+    lost_reason_id: int | None = None,
+) -> dict:
+    """Mark many leads as Lost with one ``action_set_lost`` call.
+
+    The lost reason is passed to ``action_set_lost``, which writes it in the
+    same transaction.  Falls back to archiving with a plain ``write`` only
+    when the model has no ``action_set_lost``.
+
+    Args:
+        lead_ids: Explicit lead ids.
+        domain: Odoo search domain, used when no ids are given.
+        lost_reason_id: Optional crm.lost.reason record id.
+
+    Returns:
+        dict: The :func:`bulk_write_leads` summary.
+    """
+    ids = resolve_lead_ids(lead_ids, domain)
+    extra = {"lost_reason_id": lost_reason_id} if lost_reason_id else {}
+    forget("crm.lead", ids)
+
+    def set_lost() -> None:
+        try:
+            odoo_client.execute("crm.lead", "action_set_lost", ids, **extra)
+        except OdooJSONRPCError as exc:
+            if not _is_missing_method(exc):
+                raise
+            odoo_client.write("crm.lead", ids, {"active": False, **extra})
+
+    summary = _BulkSummary(matched=len(ids))
+    if ids:
+        summary.run(ids, set_lost)
+    return summary.as_dict()
 
 
 def convert_to_opportunity(
@@ -115,7 +425,9 @@ def convert_to_opportunity(
         values["partner_id"] = partner_id
     if team_id:
         values["team_id"] = team_id
-    return odoo_client.write("crm.lead", [lead_id], values)
+    result = odoo_client.write("crm.lead", [lead_id], values)
+    record_write("crm.lead", [lead_id], values)
+    return result
 
 
 def mark_won(lead_id: int) -> bool:
@@ -127,6 +439,8 @@ def mark_won(lead_id: int) -> bool:
     Returns:
         bool: True on success.
     """
+    # action_set_won changes stage and probability server-side
+    forget("crm.lead", [lead_id])
     try:
         odoo_client.execute("crm.lead", "action_set_won", [lead_id])
         return True
@@ -148,6 +462,7 @@ def mark_lost(lead_id: int, lost_reason_id: int | None = None) -> bool:
     values: dict = {"active": False}
     if lost_reason_id:
         values["lost_reason_id"] = lost_reason_id
+    forget("crm.lead", [lead_id])
     try:
         odoo_client.execute("crm.lead", "action_set_lost", [lead_id])
         if lost_reason_id:
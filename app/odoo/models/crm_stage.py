@@ -1,6 +1,12 @@
-"""Odoo 16 crm.stage model helpers."""
+"""Odoo 16 crm.stage model helpers.
+
+Stages are reference data: reads go through the ``reference`` cache when it
+is enabled in ``settings.cache_backends``, keyed per Odoo tenant.
+"""
 
 from app.odoo.client import odoo_client
+from app.odoo.tenants import current_tenant
+from app.utils.cache import cached
 
 FIELDS = ["id", "name", "sequence", "probability", "fold", "team_id", "requirements"]
 
@@ -17,7 +23,11 @@ def get_all_stages(team_id: int | None = None) -> list[dict]:
     domain: list = []
     if team_id:
         domain = [["team_id", "=", team_id]]
-    return odoo_client.search_read("crm.stage", domain, FIELDS)
+    return cached(
+        "reference",
+        f"{current_tenant()}:crm.stage:all:{team_id or 0}",
+        lambda: odoo_client.search_read("crm.stage", domain, FIELDS),
+    )
 
 
 def get_stage_by_name(name: str) -> dict | None:
@@ -29,7 +39,11 @@ def get_stage_by_name(name: str) -> dict | None:
     Returns:
         dict | None: The matching stage record, or None if not found.
     """
-    results = odoo_client.search_read(
-        "crm.stage", [["name", "ilike", name]], FIELDS, limit=1
-    )
-    return results[0] if results else None
+
+    def load() -> dict | None:
+        results = odoo_client.search_read(
+            "crm.stage", [["name", "ilike", name]], FIELDS, limit=1
+        )
+        return results[0] if results else None
+
+    return cached("reference", f"{current_tenant()}:crm.stage:name:{name.strip().lower()}", load)
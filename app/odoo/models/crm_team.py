@@ -1,6 +1,9 @@
-"""Odoo 16 crm.team model helpers."""
+"""Odoo 16 crm.team model helpers (teams are cached as ``reference`` data when enabled)."""
 
 from app.odoo.client import odoo_client
+from app.odoo.tenants import current_tenant
+from app.odoo.unit_of_work import cached_record, remember
+from app.utils.cache import cached
 
 TEAM_FIELDS = ["id", "name", "user_id", "member_ids", "alias_email", "active"]
 MEMBER_FIELDS = ["id", "name", "email", "login"]
@@ -12,7 +15,35 @@ def get_all_teams() -> list[dict]:
     Returns:
         list[dict]: Sales team records.
     """
-    return odoo_client.search_read("crm.team", [["active", "=", True]], TEAM_FIELDS)
+    teams = cached(
+        "reference",
+        f"{current_tenant()}:crm.team:active",
+        lambda: odoo_client.search_read("crm.team", [["active", "=", True]], TEAM_FIELDS),
+    )
+    return remember("crm.team", teams)
+
+
+def get_team(team_id: int) -> dict:
+    """Return a single sales team by id.
+
+    Args:
+        team_id: The sales team record id.
+
+    Returns:
+        dict: Team record, or empty dict if not found.
+    """
+    record = cached_record("crm.team", team_id, TEAM_FIELDS)
+    if record is not None:
+        return record
+    results = cached(
+        "reference",
+        f"{current_tenant()}:crm.team:{team_id}",
+        lambda: odoo_client.search_read(
+            "crm.team", [["id", "=", team_id]], TEAM_FIELDS, limit=1
+        ),
+    )
+    remember("crm.team", results)
+    return results[0] if results else {}
 
 
 def get_team_members(team_id: int) -> list[dict]:
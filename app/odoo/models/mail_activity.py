@@ -5,7 +5,11 @@ Odoo record.  The ``mail.activity`` model is used across many modules but is
 especially important in CRM for follow-up tracking.
 """
 
-from app.odoo.client import odoo_client
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from app.config import settings
+from app.odoo.client import odoo_client, submit_routed
 
 FIELDS = [
     "id",
@@ -21,6 +25,20 @@ FIELDS = [
     "state",  # "overdue", "today", "planned"
 ]
 
+# Deadline buckets of the activity digest, most urgent first
+DIGEST_STATES = ("overdue", "today", "planned")
+
+# Fields read for the activities detailed in the digest
+DIGEST_FIELDS = [
+    "id",
+    "res_model",
+    "res_id",
+    "res_name",
+    "activity_type_id",
+    "summary",
+    "date_deadline",
+]
+
 
 def create_activity(
     res_model: str,
@@ -102,3 +120,141 @@ def get_overdue_activities(user_id: int | None = None) -> list[dict]:
     if user_id:
         domain.append(["user_id", "=", user_id])
     return odoo_client.search_read("mail.activity", domain, FIELDS)
+
+
+def _deadline_domains(today: date) -> dict[str, list]:
+    """Domains of the digest buckets.
+
+    ``state`` is computed and not stored in Odoo, so it can be neither
+    grouped nor reliably searched; the buckets compare ``date_deadline``
+    with ``today`` instead, which is what ``state`` is derived from.
+    """
+    day = today.isoformat()
+    return {
+        "overdue": [["date_deadline", "<", day]],
+        "today": [["date_deadline", "=", day]],
+        "planned": [["date_deadline", ">", day]],
+    }
+
+
+def _many2one(value: object, default: str) -> tuple[int, str]:
+    """Return ``(id, name)`` of a many2one group value, ``(0, default)`` when unset."""
+    if isinstance(value, list | tuple) and value:
+        return int(value[0]), str(value[1]) if len(value) > 1 else default
+    return 0, default
+
+
+def _tally(table: dict[int, dict], key: tuple[int, str], state: str, count: int) -> dict:
+    row = table.get(key[0])
+    if row is None:
+        row = table[key[0]] = {"id": key[0], "name": key[1], **dict.fromkeys(DIGEST_STATES, 0)}
+    row[state] += count
+    return row
+
+
+def _by_urgency(rows: dict[int, dict]) -> list[dict]:
+    return sorted(rows.values(), key=lambda r: (*(-r[s] for s in DIGEST_STATES), r["name"]))
+
+
+def _user_teams() -> dict[int, tuple[int, str]]:
+    """Map user ids to the first sales team (by id) that they lead or belong to."""
+    from app.odoo.models.crm_team import get_all_teams
+
+    teams: dict[int, tuple[int, str]] = {}
+    for team in sorted(get_all_teams(), key=lambda t: t["id"]):
+        leader = _many2one(team.get("user_id"), "")[0]
+        for user_id in [leader, *(team.get("member_ids") or [])]:
+            if user_id:
+                teams.setdefault(user_id, (team["id"], team["name"]))
+    return teams
+
+
+def _top_activities(base: list, user_id: int, today: date, limit: int) -> list[dict]:
+    """Return a user's ``limit`` most overdue activities due today or earlier."""
+    domain = [*base, ["user_id", "=", user_id or False], ["date_deadline", "<=", today.isoformat()]]
+    records = odoo_client.search_read(
+        "mail.activity", domain, DIGEST_FIELDS, limit=limit, order="date_deadline asc, id asc"
+    )
+    return [
+        {
+            "id": record["id"],
+            "record": f"{record.get('res_model')},{record.get('res_id')}",
+            "name": record.get("res_name") or "",
+            "type": _many2one(record.get("activity_type_id"), "")[1],
+            "summary": record.get("summary") or "",
+            "due": record.get("date_deadline"),
+        }
+        for record in records
+    ]
+
+
+def activity_digest(
+    user_id: int | None = None,
+    res_model: str | None = None,
+    top_n: int | None = None,
+    today: date | None = None,
+) -> dict:
+    """Summarize open activities per user, sales team and activity type.
+
+    Counts come from one ``read_group`` per deadline bucket (grouped by user
+    and activity type), so the cost does not grow with the number of
+    activities. Details are read only for each user's ``top_n`` most overdue
+    activities, and only for users with something overdue or due today.
+
+    Args:
+        user_id: Restrict the digest to one assigned user.
+        res_model: Restrict to activities on one model (e.g. ``"crm.lead"``).
+        top_n: Activities detailed per user. Defaults to
+            ``settings.activity_digest_top_n``; 0 skips the details.
+        today: Reference date of the buckets. Defaults to today.
+
+    Returns:
+        dict: ``date``, ``totals`` per bucket, and ``users`` (with ``team`` and
+            ``top``), ``teams`` and ``types`` rows of ``overdue`` / ``today`` /
+            ``planned`` counts, most overdue first.
+    """
+    today = today or date.today()
+    top_n = settings.activity_digest_top_n if top_n is None else top_n
+    base: list = []
+    if user_id:
+        base.append(["user_id", "=", user_id])
+    if res_model:
+        base.append(["res_model", "=", res_model])
+
+    totals = dict.fromkeys(DIGEST_STATES, 0)
+    users: dict[int, dict] = {}
+    types: dict[int, dict] = {}
+    groupby = ["user_id", "activity_type_id"]
+    for state, condition in _deadline_domains(today).items():
+        for group in odoo_client.read_group("mail.activity", [*base, *condition], groupby, groupby):
+            count = group.get("__count", 0)
+            totals[state] += count
+            _tally(users, _many2one(group.get("user_id"), "Unassigned"), state, count)
+            _tally(types, _many2one(group.get("activity_type_id"), "Other"), state, count)
+
+    user_teams = _user_teams() if users else {}
+    teams: dict[int, dict] = {}
+    for row in users.values():
+        team = user_teams.get(row["id"], (0, "No team"))
+        row["team"] = team[1]
+        for state in DIGEST_STATES:
+            _tally(teams, team, state, row[state])
+
+    user_rows = _by_urgency(users)
+    urgent = [row for row in user_rows if row["overdue"] or row["today"]] if top_n > 0 else []
+    if urgent:
+        workers = max(1, min(settings.activity_digest_concurrency, len(urgent)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                submit_routed(pool, _top_activities, base, row["id"], today, top_n)
+                for row in urgent
+            ]
+            for row, future in zip(urgent, futures, strict=True):
+                row["top"] = future.result()
+    return {
+        "date": today.isoformat(),
+        "totals": totals,
+        "users": user_rows,
+        "teams": _by_urgency(teams),
+        "types": _by_urgency(types),
+    }
@@ -1,6 +1,7 @@
 """Odoo 16 res.partner model helpers."""
 
 from app.odoo.client import odoo_client
+from app.odoo.unit_of_work import cached_record, record_write, remember
 
 FIELDS = [
     "id",
@@ -21,6 +22,10 @@ FIELDS = [
 def search_partners(query: str, limit: int = 20) -> list[dict]:
     """Search partners by name or email.
 
+    Answers from the local mirror (BM25-ranked over name, e-mail, phone and
+    address) while it is fresh, otherwise from Odoo. Mirror hits may lag Odoo,
+    so they are not added to the request's identity map.
+
     Args:
         query: Search string matched against name and email.
         limit: Maximum records to return.
@@ -28,8 +33,14 @@ def search_partners(query: str, limit: int = 20) -> list[dict]:
     Returns:
         list[dict]: Matching partner records.
     """
+    from app.odoo.mirror import mirror_search
+
+    partners = mirror_search("res.partner", query, limit)
+    if partners is not None:
+        return partners
     domain = ["|", ["name", "ilike", query], ["email", "ilike", query]]
-    return odoo_client.search_read("res.partner", domain, FIELDS, limit=limit)
+    partners = odoo_client.search_read("res.partner", domain, FIELDS, limit=limit)
+    return remember("res.partner", partners)
 
 
 def get_partner(partner_id: int) -> dict:
@@ -41,9 +52,13 @@ def get_partner(partner_id: int) -> dict:
     Returns:
         dict: Partner record, or empty dict if not found.
     """
+    cached = cached_record("res.partner", partner_id, FIELDS)
+    if cached is not None:
+        return cached
     results = odoo_client.search_read(
         "res.partner", [["id", "=", partner_id]], FIELDS, limit=1
     )
+    remember("res.partner", results)
     return results[0] if results else {}
 
 
@@ -69,4 +84,6 @@ def update_partner(partner_id: int, values: dict) -> bool:
     Returns:
         bool: True on success.
     """
-    return odoo_client.write("res.partner", [partner_id], values)
+    result = odoo_client.write("res.partner", [partner_id], values)
+    record_write("res.partner", [partner_id], values)
+    return result
@@ -0,0 +1,392 @@
+"""Adaptive concurrency limiting and circuit breaking for Odoo JSON-RPC calls.
+
+Every ``OdooClient._jsonrpc_call`` runs inside :meth:`CallGuard.call`:
+
+* :class:`AdaptiveLimiter` caps the calls in flight with AIMD — the limit
+  grows by one per ``limit`` fast successes and is cut by 30 % (at most once
+  per round trip) when a call is slower than ``settings.odoo_latency_target_ms``
+  or fails at the transport level.  Callers over the limit wait up to
+  ``settings.odoo_queue_timeout_seconds`` and then get
+  :class:`OdooOverloadedError`, so a slow Odoo makes threads queue briefly
+  instead of piling up on 10 s timeouts.
+* :class:`CircuitBreaker` opens when, over the last
+  ``settings.odoo_breaker_window_seconds`` (and at least
+  ``odoo_breaker_min_calls`` calls), the share of failed calls reaches
+  ``odoo_breaker_error_rate`` or the share of calls slower than
+  ``odoo_breaker_slow_call_ms`` reaches ``odoo_breaker_slow_rate``.  While
+  open, calls fail immediately with :class:`OdooCircuitOpenError`; after
+  ``odoo_breaker_open_seconds`` a few half-open probe calls decide whether it
+  closes again.
+
+Only transport failures (connection errors, timeouts, HTTP 5xx) count as
+failures; JSON-RPC errors such as validation or access errors are answers
+from a healthy server.  Guards registered with :func:`register_guard` are
+exported as metrics and reported by ``/health/ready``.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import httpx
+
+from app.config import settings
+from app.utils.logger import get_logger
+from app.utils.metrics import REGISTRY, Counter, Gauge
+
+logger = get_logger(__name__)
+
+
+class OdooUnavailableError(RuntimeError):
+    """Odoo call rejected locally because Odoo is failing or overloaded."""
+
+
+class OdooCircuitOpenError(OdooUnavailableError):
+    """The circuit breaker is open: Odoo is failing, calls fail fast."""
+
+
+class OdooOverloadedError(OdooUnavailableError):
+    """No concurrency slot became free within the queue timeout."""
+
+
+def is_transport_failure(exc: BaseException) -> bool:
+    """Whether an exception means Odoo (or the network) failed, not the request."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    if isinstance(exc, httpx.HTTPError):
+        return True
+    http_status = getattr(exc, "http_status", None)
+    return http_status is not None and http_status >= 500
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit driven by observed latency.
+
+    Args:
+        initial: Starting limit.
+        minimum: Lowest limit.
+        maximum: Highest limit.
+        target_latency: Seconds above which a call counts as congestion.
+        backoff: Multiplier applied to the limit on congestion.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        target_latency: float,
+        backoff: float = 0.7,
+    ) -> None:
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.in_flight = 0
+        self.rejected = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def current(self) -> int:
+        """The integer limit currently enforced."""
+        return max(self.minimum, math.floor(self.limit))
+
+    def acquire(self, timeout: float) -> None:
+        """Take a slot, waiting up to ``timeout`` seconds.
+
+        Raises:
+            OdooOverloadedError: If no slot frees up in time.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self.in_flight >= self.current:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    if self.in_flight < self.current:
+                        break
+                    self.rejected += 1
+                    raise OdooOverloadedError(
+                        f"Odoo concurrency limit {self.current} reached; "
+                        f"no slot within {timeout:.1f}s"
+                    )
+            self.in_flight += 1
+
+    def release(self, latency: float, congested: bool) -> None:
+        """Return a slot and adapt the limit.
+
+        Args:
+            latency: Seconds the call took.
+            congested: True for transport failures; slow calls count too.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if congested or latency > self.target_latency:
+                # one decrease per round trip, so a burst of slow calls counts once
+                if now - self._last_decrease >= max(latency, 0.05):
+                    self.limit = max(self.minimum, self.limit * self.backoff)
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify()
+
+    def snapshot(self) -> dict:
+        """Return the limit, calls in flight and rejections."""
+        with self._cond:
+            return {
+                "limit": self.current,
+                "in_flight": self.in_flight,
+                "rejected": self.rejected,
+            }
+
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+
+
+class CircuitBreaker:
+    """Error-rate / slow-call-rate circuit breaker with half-open probes.
+
+    Args:
+        error_rate: Failure share that opens the circuit.
+        slow_call_seconds: Latency above which a call counts as slow.
+        slow_rate: Slow-call share that opens the circuit.
+        min_calls: Calls needed in the window before it can open.
+        window_seconds: Length of the rolling window.
+        open_seconds: Time spent open before probing.
+        half_open_probes: Successful probes needed to close again.
+    """
+
+    def __init__(
+        self,
+        error_rate: float,
+        slow_call_seconds: float,
+        slow_rate: float,
+        min_calls: int,
+        window_seconds: float,
+        open_seconds: float,
+        half_open_probes: int,
+    ) -> None:
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_rate = slow_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_probes = max(1, half_open_probes)
+        self.state = CLOSED
+        self.rejected = 0
+        self.transitions = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._calls: deque[tuple[float, bool, bool]] = deque()
+        self._lock = threading.Lock()
+
+    def _transition(self, state: str, reason: str) -> None:
+        logger.warning("odoo_circuit_state", state=state, previous=self.state, reason=reason)
+        self.state = state
+        self.transitions += 1
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        self._probes_in_flight = self._probe_successes = 0
+        if state == CLOSED:
+            self._calls.clear()
+
+    def allow(self) -> bool:
+        """Admit a call, or raise if the circuit is open.
+
+        Returns:
+            bool: True if the call is a half-open probe.
+
+        Raises:
+            OdooCircuitOpenError: While open (or half-open with all probes busy).
+        """
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    self.rejected += 1
+                    raise OdooCircuitOpenError(
+                        "Odoo circuit breaker is open; failing fast until it recovers"
+                    )
+                self._transition(HALF_OPEN, "open timeout elapsed")
+            if self.state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_probes:
+                    self.rejected += 1
+                    raise OdooCircuitOpenError("Odoo circuit breaker is half-open; probing")
+                self._probes_in_flight += 1
+                return True
+            return False
+
+    def cancel(self, probe: bool) -> None:
+        """Forget an admitted call that never reached Odoo."""
+        if probe:
+            with self._lock:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def record(self, probe: bool, failed: bool, latency: float) -> None:
+        """Record the outcome of an admitted call."""
+        slow = latency > self.slow_call_seconds
+        now = time.monotonic()
+        with self._lock:
+            if probe and self.state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if failed or slow:
+                    self._transition(OPEN, "half-open probe failed")
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_probes:
+                        self._transition(CLOSED, "half-open probes succeeded")
+                return
+            if self.state != CLOSED:
+                return
+            self._calls.append((now, failed, slow))
+            while self._calls and now - self._calls[0][0] > self.window_seconds:
+                self._calls.popleft()
+            total = len(self._calls)
+            if total < self.min_calls:
+                return
+            failures = sum(1 for _, f, _ in self._calls if f)
+            slow_calls = sum(1 for _, _, s in self._calls if s)
+            if failures / total >= self.error_rate:
+                self._transition(OPEN, f"error rate {failures}/{total}")
+            elif slow_calls / total >= self.slow_rate:
+                self._transition(OPEN, f"slow-call rate {slow_calls}/{total}")
+
+    def snapshot(self) -> dict:
+        """Return the state and the rates over the current window."""
+        with self._lock:
+            total = len(self._calls)
+            failures = sum(1 for _, f, _ in self._calls if f)
+            slow_calls = sum(1 for _, _, s in self._calls if s)
+            return {
+                "state": self.state,
+                "window_calls": total,
+                "error_rate": round(failures / total, 3) if total else 0.0,
+                "slow_rate": round(slow_calls / total, 3) if total else 0.0,
+                "rejected": self.rejected,
+                "transitions": self.transitions,
+            }
+
+
+class CallGuard:
+    """Limiter plus breaker applied around each JSON-RPC call.
+
+    Args:
+        limiter: Concurrency limiter.
+        breaker: Circuit breaker.
+        queue_timeout: Seconds a call may wait for a concurrency slot.
+    """
+
+    def __init__(
+        self, limiter: AdaptiveLimiter, breaker: CircuitBreaker, queue_timeout: float
+    ) -> None:
+        self.limiter = limiter
+        self.breaker = breaker
+        self.queue_timeout = queue_timeout
+
+    @classmethod
+    def from_settings(cls) -> CallGuard:
+        """Build a guard from the ``odoo_concurrency_*`` / ``odoo_breaker_*`` settings."""
+        return cls(
+            AdaptiveLimiter(
+                initial=settings.odoo_concurrency_initial,
+                minimum=settings.odoo_concurrency_min,
+                maximum=settings.odoo_concurrency_max,
+                target_latency=settings.odoo_latency_target_ms / 1000,
+            ),
+            CircuitBreaker(
+                error_rate=settings.odoo_breaker_error_rate,
+                slow_call_seconds=settings.odoo_breaker_slow_call_ms / 1000,
+                slow_rate=settings.odoo_breaker_slow_rate,
+                min_calls=settings.odoo_breaker_min_calls,
+                window_seconds=settings.odoo_breaker_window_seconds,
+                open_seconds=settings.odoo_breaker_open_seconds,
+                half_open_probes=settings.odoo_breaker_half_open_probes,
+            ),
+            queue_timeout=settings.odoo_queue_timeout_seconds,
+        )
+
+    @contextmanager
+    def call(self) -> Iterator[None]:
+        """Run one call under the breaker and the limiter.
+
+        Raises:
+            OdooCircuitOpenError: If the breaker rejects the call.
+            OdooOverloadedError: If no concurrency slot frees up in time.
+        """
+        probe = self.breaker.allow()
+        try:
+            self.limiter.acquire(self.queue_timeout)
+        except OdooOverloadedError:
+            self.breaker.cancel(probe)
+            raise
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException as exc:
+            failed = is_transport_failure(exc)
+            raise
+        finally:
+            latency = time.perf_counter() - started
+            self.limiter.release(latency, congested=failed)
+            self.breaker.record(probe, failed, latency)
+
+    def snapshot(self) -> dict:
+        """Return the limiter and breaker state."""
+        return {"limiter": self.limiter.snapshot(), "breaker": self.breaker.snapshot()}
+
+
+_guards: dict[str, CallGuard] = {}
+
+
+def register_guard(name: str, guard: CallGuard) -> None:
+    """Export a guard's state as metrics and in ``/health/ready`` under ``name``."""
+    _guards[name] = guard
+
+
+def unregister_guard(name: str, guard: CallGuard) -> None:
+    """Stop exporting ``guard`` under ``name`` (a newer guard registered since is kept)."""
+    if _guards.get(name) is guard:
+        del _guards[name]
+
+
+def guard_states() -> dict[str, dict]:
+    """Return the snapshot of every registered guard."""
+    return {name: guard.snapshot() for name, guard in list(_guards.items())}
+
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+def _guard_metrics() -> list:
+    limit = Gauge("odoo_concurrency_limit", "Adaptive Odoo concurrency limit", ["client"])
+    in_flight = Gauge("odoo_concurrency_in_flight", "Odoo calls holding a slot", ["client"])
+    rejected = Counter(
+        "odoo_calls_rejected_total",
+        "Odoo calls rejected locally, by reason",
+        ["client", "reason"],
+    )
+    state = Gauge(
+        "odoo_circuit_state",
+        "Odoo circuit breaker state (0 closed, 1 half-open, 2 open)",
+        ["client"],
+    )
+    for name, snapshot in guard_states().items():
+        limiter, breaker = snapshot["limiter"], snapshot["breaker"]
+        limit.labels(client=name).set(limiter["limit"])
+        in_flight.labels(client=name).set(limiter["in_flight"])
+        rejected.labels(client=name, reason="overloaded").inc(limiter["rejected"])
+        rejected.labels(client=name, reason="circuit_open").inc(breaker["rejected"])
+        state.labels(client=name).set(_STATE_VALUES[breaker["state"]])
+    return [limit, in_flight, rejected, state]
+
+
+REGISTRY.add_collector(_guard_metrics)
@@ -0,0 +1,185 @@
+"""Retry, re-authentication and hedging policy for Odoo JSON-RPC calls.
+
+``OdooClient`` applies three layers on top of a single ``_jsonrpc_call``:
+
+* **Retries** — transient failures (connection errors, timeouts, dropped
+  connections, HTTP 429/502/503/504) are retried up to
+  ``settings.odoo_retry_attempts`` times with full-jitter exponential backoff,
+  but only for idempotent calls (:func:`is_idempotent`).  A write is retried
+  only when the request provably never reached Odoo (connect errors), since
+  replaying a ``create`` after a read timeout could duplicate the record.
+  Calls rejected by the circuit breaker are never retried.
+* **Re-authentication** — an ``AccessDenied`` / session-expired answer
+  clears the cached uid, logs in again and replays the call once.
+* **Hedged reads** — with ``settings.odoo_hedge_reads`` enabled, a
+  ``search_read`` / ``read`` / ``search_count`` that has not answered after
+  the p95 latency of its recent calls fires a second, identical request and
+  returns whichever answers first.  Hedges go through the concurrency limiter
+  like any other call, so they back off automatically when Odoo is loaded.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, TypeVar
+
+import httpx
+
+from app.config import settings
+from app.odoo.resilience import OdooUnavailableError
+from app.utils.logger import get_logger
+from app.utils.metrics import counter
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# execute_kw methods that do not change data and can safely be sent twice.
+READ_METHODS = frozenset(
+    {
+        "search",
+        "search_read",
+        "search_count",
+        "read",
+        "read_group",
+        "name_search",
+        "name_get",
+        "fields_get",
+        "default_get",
+        "check_access_rights",
+    }
+)
+HEDGED_METHODS = frozenset({"search_read", "read", "search_count"})
+RETRYABLE_STATUS = frozenset({429, 502, 503, 504})
+SESSION_ERRORS = frozenset({"odoo.exceptions.AccessDenied", "odoo.http.SessionExpiredException"})
+
+RPC_RETRIES = counter(
+    "odoo_rpc_retries_total", "Odoo JSON-RPC attempts retried, by error kind", ("kind",)
+)
+RPC_REAUTHENTICATIONS = counter(
+    "odoo_rpc_reauthentications_total", "Odoo calls replayed after re-authenticating"
+)
+RPC_HEDGES = counter(
+    "odoo_rpc_hedges_total",
+    "Hedged Odoo reads, by outcome (fired, won = the hedge answered first)",
+    ("outcome",),
+)
+
+
+def is_idempotent(service: str, method: str, args: list[Any]) -> bool:
+    """Whether a JSON-RPC call can be repeated without side effects."""
+    if service == "common":
+        return True
+    return service == "object" and len(args) >= 5 and args[4] in READ_METHODS
+
+
+def is_retryable(exc: BaseException, idempotent: bool) -> bool:
+    """Whether a failed attempt should be retried.
+
+    Args:
+        exc: The error of the attempt.
+        idempotent: Whether the call may be repeated (see :func:`is_idempotent`).
+    """
+    if isinstance(exc, OdooUnavailableError):
+        return False
+    if isinstance(exc, httpx.ConnectError | httpx.ConnectTimeout):
+        return True  # nothing reached Odoo
+    if not idempotent:
+        return False
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUS
+    return isinstance(exc, httpx.TransportError)
+
+
+def is_session_error(exc: BaseException) -> bool:
+    """Whether Odoo rejected the call's credentials (expired or revoked session)."""
+    data = getattr(exc, "data", None)
+    return isinstance(data, dict) and data.get("name") in SESSION_ERRORS
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in ``[0, min(cap, base * 2**attempt)]``."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class LatencyWindow:
+    """Recent latencies per call key, for percentile-based hedge delays.
+
+    Args:
+        size: Latencies kept per key.
+    """
+
+    def __init__(self, size: int = 200) -> None:
+        self.size = size
+        self._samples: dict[tuple, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: tuple, seconds: float) -> None:
+        """Add one latency sample for ``key``."""
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.size)
+            samples.append(seconds)
+
+    def percentile(self, key: tuple, q: float, min_samples: int) -> float | None:
+        """Return the ``q`` quantile for ``key``, or None with fewer than ``min_samples``."""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if not samples or len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+read_latencies = LatencyWindow()
+
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _hedge_pool() -> ThreadPoolExecutor:
+    """Return the process-wide thread pool that runs hedged reads."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=settings.odoo_hedge_max_workers, thread_name_prefix="odoo-hedge"
+                )
+    return _pool
+
+
+def hedged(call: Callable[[], T], delay: float) -> T:
+    """Run ``call``; if it has not finished after ``delay`` seconds, race a second one.
+
+    Args:
+        call: The read to perform; must be idempotent.
+        delay: Seconds to wait before firing the hedge.
+
+    Returns:
+        T: The result of whichever call succeeds first.
+
+    Raises:
+        Exception: The primary's error if both calls fail (or it fails
+            before the hedge fires).
+    """
+    pool = _hedge_pool()
+    primary = pool.submit(call)
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        return primary.result()
+    RPC_HEDGES.labels(outcome="fired").inc()
+    hedge = pool.submit(call)
+    pending: set[Future] = {primary, hedge}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is hedge:
+                    RPC_HEDGES.labels(outcome="won").inc()
+                return future.result()
+    return primary.result()
@@ -0,0 +1,356 @@
+"""Tenant-aware Odoo client registry.
+
+One deployment can serve several Odoo databases.  Tenants are declared in
+the JSON file named by ``settings.odoo_tenants_file``::
+
+    {
+        "acme": {"url": "https://acme.odoo.com", "db": "acme", "user": "bot@acme.com",
+                 "api_key": "..."},
+        "globex": {"db": "globex", "api_key": "..."}
+    }
+
+Missing keys fall back to the ``ODOO_*`` settings; the tenant ``"default"``
+is always the database configured in settings.
+
+:class:`TenantRegistry` keeps one :class:`~app.odoo.client.OdooClient` per
+``(url, db, user)`` — each with its own connection pool, cached uid and
+concurrency guard — and creates them on first use.  Each client's guard is
+registered under the tenant name, so its breaker and limiter show up in
+``/health/ready`` and ``/metrics``.  Clients unused for
+``settings.odoo_tenant_idle_seconds``, and the least recently used ones
+beyond ``settings.odoo_tenant_max_clients``, are closed so memory stays
+bounded with hundreds of tenants.  A client with calls in flight is never
+evicted, and one evicted while a :func:`use_tenant` block still holds it is
+closed when the last such block exits.
+
+:func:`use_tenant` makes a tenant's client active for the current context;
+the API selects it from the ``settings.odoo_tenant_header`` request header.
+A chat session is pinned to the tenant it was first used with, and a later
+turn under another tenant is rejected (:func:`session_tenant`).
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from app.config import settings
+from app.odoo.client import OdooClient, _normalize_odoo_url, default_odoo_client, use_client
+from app.odoo.resilience import register_guard, unregister_guard
+from app.utils.logger import get_logger
+from app.utils.metrics import REGISTRY, Counter, Gauge
+
+logger = get_logger(__name__)
+
+DEFAULT_TENANT = "default"
+
+
+class UnknownTenantError(LookupError):
+    """The requested tenant is not configured."""
+
+
+class TenantMismatchError(PermissionError):
+    """A chat session was used under a different tenant than the one it started with."""
+
+
+@dataclass(frozen=True)
+class Tenant:
+    """Connection settings of one Odoo database."""
+
+    name: str
+    url: str
+    db: str
+    user: str
+    api_key: str = field(repr=False)
+
+    @property
+    def key(self) -> tuple[str, str, str]:
+        """Registry key: clients are shared by tenants with the same url, db and user."""
+        return (_normalize_odoo_url(self.url), self.db, self.user)
+
+
+def load_tenants(path: str) -> dict[str, Tenant]:
+    """Read tenant definitions from a JSON file.
+
+    Args:
+        path: JSON file mapping tenant names to ``url`` / ``db`` / ``user`` /
+            ``api_key`` (each optional); empty for no extra tenants.
+
+    Returns:
+        dict[str, Tenant]: Tenants by name, without the default tenant.
+
+    Raises:
+        ValueError: If the file is not a JSON object of objects.
+    """
+    if not path:
+        return {}
+    raw = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(raw, dict) or not all(isinstance(v, dict) for v in raw.values()):
+        raise ValueError(f"{path}: expected an object mapping tenant names to objects")
+    return {
+        name: Tenant(
+            name=name,
+            url=entry.get("url", settings.odoo_url),
+            db=entry.get("db", settings.odoo_db),
+            user=entry.get("user", settings.odoo_user),
+            api_key=entry.get("api_key", settings.odoo_api_key),
+        )
+        for name, entry in raw.items()
+        if name != DEFAULT_TENANT
+    }
+
+
+@dataclass
+class _Entry:
+    name: str
+    client: OdooClient
+    last_used: float
+    users: int = 0
+
+
+class TenantRegistry:
+    """Per-tenant Odoo clients with LRU and idle eviction.
+
+    Args:
+        tenants: Tenants by name; defaults to ``settings.odoo_tenants_file``,
+            loaded on first use.
+        max_clients: Clients kept open (default ``settings.odoo_tenant_max_clients``).
+        idle_seconds: Idle time before a client is closed (default
+            ``settings.odoo_tenant_idle_seconds``).
+    """
+
+    def __init__(
+        self,
+        tenants: dict[str, Tenant] | None = None,
+        max_clients: int | None = None,
+        idle_seconds: float | None = None,
+    ) -> None:
+        self._tenants = tenants
+        self.max_clients = max(
+            1, settings.odoo_tenant_max_clients if max_clients is None else max_clients
+        )
+        self.idle_seconds = (
+            settings.odoo_tenant_idle_seconds if idle_seconds is None else idle_seconds
+        )
+        self.evictions = 0
+        self._clients: OrderedDict[tuple[str, str, str], _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    @property
+    def tenants(self) -> dict[str, Tenant]:
+        """Configured tenants by name (without ``"default"``)."""
+        if self._tenants is None:
+            self._tenants = load_tenants(settings.odoo_tenants_file)
+        return self._tenants
+
+    def tenant(self, name: str) -> Tenant:
+        """Return a configured tenant.
+
+        Raises:
+            UnknownTenantError: If no tenant has this name.
+        """
+        try:
+            return self.tenants[name]
+        except KeyError:
+            raise UnknownTenantError(f"Unknown Odoo tenant {name!r}") from None
+
+    def client(self, tenant: Tenant) -> OdooClient:
+        """Return the tenant's client, creating it (and evicting others) as needed.
+
+        The client may be closed by a later eviction; use :meth:`lease` to hold
+        it across several calls.
+        """
+        return self._acquire(tenant, lease=False).client
+
+    @contextmanager
+    def lease(self, tenant: Tenant) -> Iterator[OdooClient]:
+        """Hold the tenant's client for the duration of the block.
+
+        A leased client is not closed while the block runs; if it is evicted
+        meanwhile, the last lease to exit closes it.
+
+        Yields:
+            OdooClient: The tenant's client.
+        """
+        entry = self._acquire(tenant, lease=True)
+        try:
+            yield entry.client
+        finally:
+            with self._lock:
+                entry.users -= 1
+                orphaned = entry.users == 0 and self._clients.get(tenant.key) is not entry
+            if orphaned:
+                _close(entry)
+
+    def _acquire(self, tenant: Tenant, lease: bool) -> _Entry:
+        now = time.monotonic()
+        closed: list[_Entry] = []
+        with self._lock:
+            entry = self._clients.get(tenant.key)
+            if entry is None:
+                client = OdooClient(
+                    url=tenant.url, db=tenant.db, user=tenant.user, api_key=tenant.api_key
+                )
+                entry = self._clients[tenant.key] = _Entry(tenant.name, client, now)
+                register_guard(tenant.name, client._guard)
+                logger.info("odoo_tenant_client_created", tenant=tenant.name, db=tenant.db)
+            else:
+                self._clients.move_to_end(tenant.key)
+            entry.last_used = now
+            if lease:
+                entry.users += 1
+            if now - self._last_sweep >= min(self.idle_seconds, 60):
+                self._last_sweep = now
+                closed += self._evict_locked(lambda e: now - e.last_used >= self.idle_seconds)
+            if len(self._clients) > self.max_clients:
+                excess = len(self._clients) - self.max_clients
+                closed += self._evict_locked(lambda e: e is not entry, limit=excess)
+        for stale in closed:
+            _close(stale)
+        return entry
+
+    def evict_idle(self) -> int:
+        """Close clients idle for ``idle_seconds``; return how many were evicted."""
+        now = time.monotonic()
+        with self._lock:
+            self._last_sweep = now
+            before = self.evictions
+            closed = self._evict_locked(lambda e: now - e.last_used >= self.idle_seconds)
+            evicted = self.evictions - before
+        for entry in closed:
+            _close(entry)
+        return evicted
+
+    def _evict_locked(self, predicate, limit: int | None = None) -> list[_Entry]:
+        """Remove matching clients, least recently used first (lock held).
+
+        Clients with calls in flight are skipped.  Returns the removed entries
+        that nobody leases; leased ones are closed when their last lease exits.
+        """
+        removed = 0
+        closed: list[_Entry] = []
+        for key, entry in list(self._clients.items()):
+            if limit is not None and removed >= limit:
+                break
+            guard = entry.client._guard
+            if guard is not None and guard.limiter.in_flight:
+                continue
+            if predicate(entry):
+                del self._clients[key]
+                removed += 1
+                if not entry.users:
+                    closed.append(entry)
+        self.evictions += removed
+        if removed:
+            logger.info("odoo_tenant_clients_evicted", count=removed, open=len(self._clients))
+        return closed
+
+    def close_all(self) -> None:
+        """Close every tenant client."""
+        with self._lock:
+            entries = list(self._clients.values())
+            self._clients.clear()
+        for entry in entries:
+            _close(entry)
+
+    def stats(self) -> dict:
+        """Return the number of open clients and evictions so far."""
+        with self._lock:
+            return {"clients": len(self._clients), "evictions": self.evictions}
+
+
+def _close(entry: _Entry) -> None:
+    """Close an evicted client's pool and stop exporting its guard."""
+    unregister_guard(entry.name, entry.client._guard)
+    entry.client.close()
+
+
+tenant_registry = TenantRegistry()
+
+_current_tenant: ContextVar[str] = ContextVar("odoo_tenant", default=DEFAULT_TENANT)
+
+
+def current_tenant() -> str:
+    """Return the name of the tenant active in this context."""
+    return _current_tenant.get()
+
+
+@contextmanager
+def use_tenant(name: str | None) -> Iterator[OdooClient]:
+    """Route ``odoo_client`` to a tenant's client for the duration of the block.
+
+    Args:
+        name: Tenant name; None or ``"default"`` selects the settings database.
+
+    Yields:
+        OdooClient: The tenant's client.
+
+    Raises:
+        UnknownTenantError: If the tenant is not configured.
+    """
+    name = name or DEFAULT_TENANT
+    with ExitStack() as stack:
+        if name == DEFAULT_TENANT:
+            client = default_odoo_client
+        else:
+            client = stack.enter_context(tenant_registry.lease(tenant_registry.tenant(name)))
+        token = _current_tenant.set(name)
+        try:
+            with use_client(client):
+                yield client
+        finally:
+            _current_tenant.reset(token)
+
+
+_SESSION_LIMIT = 10000
+_session_tenants: OrderedDict[str, str] = OrderedDict()
+_session_lock = threading.Lock()
+
+
+@contextmanager
+def session_tenant(session_id: str) -> Iterator[str]:
+    """Pin a chat session to the tenant it was first used with.
+
+    The tenant of a session's first turn is remembered, in this process, for
+    the last ``10000`` sessions.  The remembered tenant is only checked, never
+    selected: a later turn runs under the tenant of its own request, and one
+    under a different tenant (including a request without the header) is
+    rejected.
+
+    Yields:
+        str: The tenant active for the session.
+
+    Raises:
+        TenantMismatchError: If the session belongs to another tenant.
+    """
+    name = current_tenant()
+    with _session_lock:
+        remembered = _session_tenants.setdefault(session_id, name)
+        _session_tenants.move_to_end(session_id)
+        while len(_session_tenants) > _SESSION_LIMIT:
+            _session_tenants.popitem(last=False)
+    if remembered != name:
+        raise TenantMismatchError(
+            f"Session {session_id!r} belongs to tenant {remembered!r}, not {name!r}"
+        )
+    yield name
+
+
+def _tenant_metrics() -> list:
+    stats = tenant_registry.stats()
+    clients = Gauge("odoo_tenant_clients", "Open per-tenant Odoo clients (connection pools)")
+    clients.set(stats["clients"])
+    evictions = Counter("odoo_tenant_evictions_total", "Per-tenant Odoo clients closed")
+    evictions.inc(stats["evictions"])
+    return [clients, evictions]
+
+
+REGISTRY.add_collector(_tenant_metrics)
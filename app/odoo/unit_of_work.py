@@ -0,0 +1,181 @@
+"""Request-scoped identity map for Odoo records.
+
+Within a unit of work (one chat turn or one workflow run) the model helpers in
+:mod:`app.odoo.models` record every row they read in an :class:`IdentityMap`
+held in a :class:`~contextvars.ContextVar`.  A later read of a record that is
+already loaded with all requested fields is served from memory instead of
+issuing another RPC; writes made through the helpers are applied to the map.
+The map is discarded when the unit of work ends, and the number of saved RPCs
+is logged.
+
+Usage::
+
+    from app.odoo.unit_of_work import unit_of_work
+
+    with unit_of_work("chat"):
+        lead = get_lead(42)   # RPC
+        lead = get_lead(42)   # served from the identity map
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class IdentityMap:
+    """Records loaded in the current unit of work, keyed by ``(model, id)``.
+
+    Args:
+        scope: Name of the unit of work (used in logs).
+    """
+
+    def __init__(self, scope: str) -> None:
+        self.scope = scope
+        self.saved_rpcs = 0
+        self._records: dict[tuple[str, int], dict] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, model: str, record_id: int, fields: Iterable[str]) -> dict | None:
+        """Return a copy of a loaded record if it has every requested field.
+
+        Args:
+            model: Odoo model name.
+            record_id: Record id.
+            fields: Field names the caller needs.
+
+        Returns:
+            dict | None: The record restricted to ``fields``, or None on a miss.
+        """
+        with self._lock:
+            record = self._records.get((model, record_id))
+            if record is None or any(name not in record for name in fields):
+                return None
+            self.saved_rpcs += 1
+            return {name: record[name] for name in fields}
+
+    def add(self, model: str, records: Iterable[dict]) -> None:
+        """Merge freshly read records into the map.
+
+        Args:
+            model: Odoo model name.
+            records: Records as returned by ``read``/``search_read``.
+        """
+        with self._lock:
+            for record in records:
+                if "id" not in record:
+                    continue
+                self._records.setdefault((model, record["id"]), {}).update(record)
+
+    def apply_write(self, model: str, record_ids: Iterable[int], values: dict) -> None:
+        """Apply written values to loaded records.
+
+        Relational fields are dropped rather than updated, because Odoo reads
+        them back as ``[id, name]`` pairs or id lists that the written value
+        does not carry; the next read of those fields goes to Odoo.
+
+        Args:
+            model: Odoo model name.
+            record_ids: Ids that were written.
+            values: Written field values.
+        """
+        with self._lock:
+            for record_id in record_ids:
+                record = self._records.get((model, record_id))
+                if record is None:
+                    continue
+                for name, value in values.items():
+                    if name.endswith(("_id", "_ids")) or isinstance(record.get(name), list):
+                        record.pop(name, None)
+                    else:
+                        record[name] = value
+
+    def evict(self, model: str, record_ids: Iterable[int]) -> None:
+        """Forget records whose server-side state changed in unknown ways.
+
+        Args:
+            model: Odoo model name.
+            record_ids: Ids to forget.
+        """
+        with self._lock:
+            for record_id in record_ids:
+                self._records.pop((model, record_id), None)
+
+
+_current_map: ContextVar[IdentityMap | None] = ContextVar("odoo_identity_map", default=None)
+
+
+def current_identity_map() -> IdentityMap | None:
+    """Return the identity map of the active unit of work, if any."""
+    return _current_map.get()
+
+
+@contextmanager
+def unit_of_work(scope: str = "request") -> Iterator[IdentityMap]:
+    """Open a unit of work; nested calls reuse the outer identity map.
+
+    Args:
+        scope: Name of the unit of work (e.g. ``"chat"``, a workflow name).
+
+    Yields:
+        IdentityMap: The active identity map.
+    """
+    existing = _current_map.get()
+    if existing is not None:
+        yield existing
+        return
+    identity_map = IdentityMap(scope)
+    token = _current_map.set(identity_map)
+    try:
+        yield identity_map
+    finally:
+        _current_map.reset(token)
+        if len(identity_map) or identity_map.saved_rpcs:
+            logger.info(
+                "odoo_unit_of_work",
+                scope=scope,
+                records=len(identity_map),
+                saved_rpcs=identity_map.saved_rpcs,
+            )
+
+
+# ----------------------------------------------------------------------
+# Helpers used by app.odoo.models (no-ops outside a unit of work)
+# ----------------------------------------------------------------------
+
+
+def cached_record(model: str, record_id: int, fields: Iterable[str]) -> dict | None:
+    """Return a record from the active identity map, or None."""
+    identity_map = _current_map.get()
+    return identity_map.get(model, record_id, fields) if identity_map is not None else None
+
+
+def remember(model: str, records: list[dict]) -> list[dict]:
+    """Add read records to the active identity map and return them unchanged."""
+    identity_map = _current_map.get()
+    if identity_map is not None:
+        identity_map.add(model, records)
+    return records
+
+
+def record_write(model: str, record_ids: Iterable[int], values: dict) -> None:
+    """Apply a write to the active identity map."""
+    identity_map = _current_map.get()
+    if identity_map is not None:
+        identity_map.apply_write(model, record_ids, values)
+
+
+def forget(model: str, record_ids: Iterable[int]) -> None:
+    """Evict records from the active identity map."""
+    identity_map = _current_map.get()
+    if identity_map is not None:
+        identity_map.evict(model, record_ids)
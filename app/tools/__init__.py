@@ -2,14 +2,19 @@
 
 from app.tools.kb_tools import search_knowledge_base
 from app.tools.odoo_activity_tools import (
+    get_activity_digest,
     get_overdue_activities_tool,
     list_lead_activities,
     mark_activity_done,
     schedule_activity,
 )
 from app.tools.odoo_crm_tools import (
+    bulk_mark_leads_lost,
+    bulk_mark_leads_won,
+    bulk_update_crm_leads,
     convert_lead_to_opportunity,
     create_crm_lead,
+    find_duplicate_records,
     get_crm_lead,
     mark_lead_lost,
     mark_lead_won,
@@ -22,11 +27,14 @@ from app.tools.odoo_partner_tools import (
     search_partners_tool,
 )
 from app.tools.odoo_pipeline_tools import (
+    bulk_move_leads_to_stage,
+    get_pipeline_analytics,
     get_pipeline_stages,
     get_pipeline_summary,
     move_lead_to_stage,
 )
 from app.tools.workflow_tools import list_available_workflows, run_workflow
+from app.utils import langchain_tracing  # noqa: F401  (registers the span callback)
 
 __all__ = [
     "search_knowledge_base",
@@ -34,19 +42,26 @@ __all__ = [
     "mark_activity_done",
     "list_lead_activities",
     "get_overdue_activities_tool",
+    "get_activity_digest",
     "search_crm_leads",
     "get_crm_lead",
     "create_crm_lead",
+    "find_duplicate_records",
     "update_crm_lead",
+    "bulk_update_crm_leads",
     "mark_lead_won",
     "mark_lead_lost",
+    "bulk_mark_leads_won",
+    "bulk_mark_leads_lost",
     "convert_lead_to_opportunity",
     "search_partners_tool",
     "get_partner_tool",
     "create_partner_tool",
     "get_pipeline_stages",
     "move_lead_to_stage",
+    "bulk_move_leads_to_stage",
     "get_pipeline_summary",
+    "get_pipeline_analytics",
     "list_available_workflows",
     "run_workflow",
 ]
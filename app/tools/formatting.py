@@ -0,0 +1,199 @@
+"""Compact text encoding of Odoo records for tool outputs.
+
+Tools used to return ``json.dumps(records)``, which repeats every key on
+every row and spells many2one values as ``[id, "name"]`` pairs.  The
+helpers here render the same information as a small table instead::
+
+    crm.lead: 3 records
+    id|name|stage_id|partner_id|expected_revenue
+    12|Website redesign|Qualified|Acme Corp|15000
+    15|ERP rollout|New||42000
+    17|Support renewal|Proposition|Globex|8000
+
+* one header row, then one ``|``-separated line per record;
+* ``False``/``None``/empty values are left blank and columns that are empty
+  for every record are dropped;
+* many2one ``[id, name]`` pairs are flattened to the name, x2many id lists
+  to ``;``-joined ids, long text cells are collapsed and shortened;
+* the output never exceeds a token budget — rows that do not fit are
+  replaced by a ``[more results available: …]`` marker.
+
+Token counts use ``tiktoken`` once :func:`load_encoding` has loaded its
+encoding (the application does so in a background thread at startup, as the
+first load may download the encoding file) and fall back to a
+4-characters-per-token estimate otherwise, so a tool call never waits on it.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MAX_CELL_CHARS = 160
+_TAGS = re.compile(r"<[^>]+>")
+_SPACES = re.compile(r"\s+")
+
+
+_loaded_encoding: Any = None
+
+
+def load_encoding() -> Any:
+    """Load the ``o200k_base`` tiktoken encoding used by :func:`count_tokens`.
+
+    The first load may download the encoding file, so call this at startup
+    off the event loop rather than from a tool.
+
+    Returns:
+        Any: The encoding, or None if tiktoken or its encoding file is unavailable.
+    """
+    global _loaded_encoding
+    if _loaded_encoding is None:
+        try:
+            import tiktoken
+        except ImportError:
+            logger.debug("tiktoken_unavailable")
+            return None
+        try:
+            _loaded_encoding = tiktoken.get_encoding("o200k_base")
+        except (OSError, ValueError) as exc:  # download failed (offline) or corrupt file
+            logger.warning("tiktoken_encoding_unavailable", error=str(exc))
+    return _loaded_encoding
+
+
+def _encoding() -> Any:
+    """Return the encoding if :func:`load_encoding` has loaded it, without loading it."""
+    return _loaded_encoding
+
+
+def count_tokens(text: str) -> int:
+    """Return the number of LLM tokens in ``text``.
+
+    Args:
+        text: Text to measure.
+
+    Returns:
+        int: Exact ``o200k_base`` count, or a ``len / 4`` estimate.
+    """
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return (len(text) + 3) // 4
+
+
+def format_value(value: Any) -> str:
+    """Render one field value as a compact table cell.
+
+    Args:
+        value: Raw value as returned by Odoo JSON-RPC.
+
+    Returns:
+        str: Cell text; empty for ``False``/``None``/empty values.
+    """
+    if value is None or value is False or value == "" or value == []:
+        return ""
+    if value is True:
+        return "yes"
+    if isinstance(value, float):
+        return f"{value:.2f}".rstrip("0").rstrip(".")
+    if isinstance(value, list | tuple):
+        if len(value) == 2 and isinstance(value[0], int) and isinstance(value[1], str):
+            value = value[1]  # many2one [id, display_name]
+        else:
+            return ";".join(str(item) for item in value)
+    text = _SPACES.sub(" ", _TAGS.sub(" ", str(value))).strip().replace("|", "/")
+    if len(text) > MAX_CELL_CHARS:
+        text = text[: MAX_CELL_CHARS - 1].rstrip() + "…"
+    return text
+
+
+def format_records(
+    records: Sequence[dict],
+    fields: Iterable[str] | None = None,
+    title: str = "records",
+    max_tokens: int | None = None,
+    has_more: bool = False,
+) -> str:
+    """Render records as a header row plus one line per record.
+
+    Args:
+        records: Records as returned by ``search_read``.
+        fields: Column order; defaults to the keys of the records in order of
+            first appearance.  Columns empty in every record are dropped.
+        title: Label of the first line (e.g. the model name).
+        max_tokens: Hard token budget for the whole output.  Defaults to
+            ``settings.tool_output_max_tokens``.
+        has_more: Whether the caller knows further matches exist beyond
+            ``records`` (e.g. the search hit its limit).
+
+    Returns:
+        str: The compact table.
+    """
+    if not records:
+        return f"{title}: 0 records"
+    budget = max_tokens or settings.tool_output_max_tokens
+    if fields is None:
+        fields = list(dict.fromkeys(name for record in records for name in record))
+    rows = [[format_value(record.get(name)) for name in fields] for record in records]
+    keep = [i for i, _ in enumerate(fields) if any(row[i] for row in rows)]
+    fields = [name for i, name in enumerate(fields) if i in keep]
+
+    header = f"{title}: {len(records)} records{' (more available)' if has_more else ''}"
+    lines = [header, "|".join(fields)]
+    used = count_tokens("\n".join(lines))
+    marker_reserve = 20
+    shown = 0
+    for row in rows:
+        line = "|".join(row[i] for i in keep)
+        cost = count_tokens(line) + 1
+        if used + cost > budget - marker_reserve:
+            break
+        lines.append(line)
+        used += cost
+        shown += 1
+    if shown < len(records):
+        lines.append(
+            f"[more results available: {len(records) - shown} of {len(records)} not shown; "
+            "narrow the query]"
+        )
+    return "\n".join(lines)
+
+
+def format_record(
+    record: dict,
+    fields: Iterable[str] | None = None,
+    max_tokens: int | None = None,
+) -> str:
+    """Render a single record as ``field: value`` lines, skipping empty fields.
+
+    Args:
+        record: The record; an empty dict renders as ``"not found"``.
+        fields: Fields to include, in order.  Defaults to all keys.
+        max_tokens: Hard token budget.  Defaults to
+            ``settings.tool_output_max_tokens``.
+
+    Returns:
+        str: The compact record.
+    """
+    if not record:
+        return "not found"
+    budget = max_tokens or settings.tool_output_max_tokens
+    lines: list[str] = []
+    used = 0
+    for name in fields or record:
+        cell = format_value(record.get(name))
+        if not cell:
+            continue
+        line = f"{name}: {cell}"
+        cost = count_tokens(line) + 1
+        if used + cost > budget - 10:
+            lines.append("[more fields available]")
+            break
+        lines.append(line)
+        used += cost
+    return "\n".join(lines)
@@ -3,6 +3,8 @@
 from langchain_core.tools import tool
 
 from app.knowledge_base.retriever import get_retriever
+from app.utils.cache import cached
+from app.utils.tracing import span
 
 
 @tool
@@ -18,8 +20,17 @@ def search_knowledge_base(question: str) -> str:
     Returns:
         str: Relevant knowledge base content joined by separators.
     """
+    # Served from the "retrieval" cache when enabled; re-ingesting invalidates it.
+    normalized = " ".join(question.lower().split())
+    return cached("retrieval", f"k4:{normalized}", lambda: _search(question))
+
+
+def _search(question: str) -> str:
+    """Run the vector search and format the matching chunks."""
     retriever = get_retriever(k=4)
-    docs = retriever.invoke(question)
+    with span("kb.vector_query", **{"kb.k": 4}) as query_span:
+        docs = retriever.invoke(question)
+        query_span.set_attribute("kb.results", len(docs))
     if not docs:
         return "No relevant information found in the knowledge base."
     parts = []
@@ -6,11 +6,13 @@ from langchain_core.tools import tool
 
 from app.odoo.client import odoo_client
 from app.odoo.models.mail_activity import (
+    activity_digest,
     create_activity,
     get_overdue_activities,
     list_activities,
     mark_done,
 )
+from app.tools.formatting import format_records
 
 # Default activity type ids for Odoo 16 (may vary per instance)
 _ACTIVITY_TYPE_MAP = {
@@ -89,18 +91,39 @@ def list_lead_activities(lead_id: int) -> str:
         lead_id: CRM lead record id.
 
     Returns:
-        str: JSON list of activity records.
+        str: Compact table of activity records.
     """
     results = list_activities("crm.lead", lead_id)
-    return json.dumps(results, default=str)
+    return format_records(results, title="mail.activity")
 
 
 @tool
 def get_overdue_activities_tool() -> str:
     """Return all overdue activities across the CRM.
 
+    For counts per user, team or activity type, use get_activity_digest.
+
     Returns:
-        str: JSON list of overdue activity records.
+        str: Compact table of overdue activity records.
     """
     results = get_overdue_activities()
-    return json.dumps(results, default=str)
+    return format_records(results, title="overdue mail.activity")
+
+
+@tool
+def get_activity_digest(user_id: int = 0, top_n: int = 3) -> str:
+    """Summarize overdue, due-today and planned activities per user, team and type.
+
+    Prefer this over get_overdue_activities_tool for "who is behind on
+    follow-ups" questions: it returns counts for everyone plus only the few
+    most overdue activities per user.
+
+    Args:
+        user_id: Restrict to one assigned user (0 = everyone).
+        top_n: Most overdue activities detailed per user (0 = counts only).
+
+    Returns:
+        str: JSON with ``totals``, ``users`` (counts, ``team`` and ``top``
+            activities), ``teams`` and ``types``.
+    """
+    return json.dumps(activity_digest(user_id=user_id or None, top_n=max(0, top_n)))
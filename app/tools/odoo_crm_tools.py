@@ -4,16 +4,22 @@ import json
 
 from langchain_core.tools import tool
 
+from app.odoo.dedup import DuplicateRecordError, Match, find_duplicates, get_index
 from app.odoo.models.crm_lead import (
     add_lead_note,
+    bulk_mark_lost,
+    bulk_mark_won,
+    bulk_update_leads,
+    bulk_write_leads,
     convert_to_opportunity,
     create_lead,
     get_lead,
     mark_lost,
     mark_won,
-    search_leads,
+    search_leads_text,
     update_lead,
 )
+from app.tools.formatting import format_record, format_records
 
 
 @tool
@@ -21,15 +27,15 @@ def search_crm_leads(query: str, limit: int = 10) -> str:
     """Search CRM leads and opportunities by name or description.
 
     Args:
-        query: Text to search for in lead names.
+        query: Text to search for in lead names, companies, contacts, e-mails
+            and descriptions.
         limit: Maximum number of results (default 10).
 
     Returns:
-        str: JSON list of matching lead records.
+        str: Compact table of matching leads (one line per record), best match first.
     """
-    domain = [["name", "ilike", query]]
-    results = search_leads(domain=domain, limit=limit)
-    return json.dumps(results, default=str)
+    results = search_leads_text(query, limit=limit)
+    return format_records(results, title="crm.lead", has_more=len(results) >= limit)
 
 
 @tool
@@ -40,9 +46,9 @@ def get_crm_lead(lead_id: int) -> str:
         lead_id: The Odoo record id of the lead.
 
     Returns:
-        str: JSON representation of the lead record.
+        str: The lead's non-empty fields, one ``field: value`` per line.
     """
-    return json.dumps(get_lead(lead_id), default=str)
+    return format_record(get_lead(lead_id))
 
 
 @tool
@@ -51,17 +57,23 @@ def create_crm_lead(
     email: str,
     contact_name: str,
     description: str = "",
+    allow_duplicate: bool = False,
 ) -> str:
-    """Create a new CRM lead.
+    """Create a new CRM lead, unless it duplicates existing leads.
 
     Args:
         name: Lead title / name.
         email: Contact e-mail address.
         contact_name: Full name of the contact person.
         description: Optional additional notes.
+        allow_duplicate: Create the lead even if similar leads exist (only
+            after the user confirmed it is not a duplicate).
 
     Returns:
-        str: JSON with the new lead id, e.g. ``{"id": 42}``.
+        str: JSON with the new lead id, e.g. ``{"id": 42}``, or
+            ``{"duplicates": [{"id", "score", "reasons"}, ...]}`` when the
+            duplicate check is enabled, similar leads exist and nothing was
+            created.
     """
     values = {
         "name": name,
@@ -70,7 +82,10 @@ def create_crm_lead(
         "description": description,
         "type": "lead",
     }
-    new_id = create_lead(values)
+    try:
+        new_id = create_lead(values, allow_duplicate=allow_duplicate)
+    except DuplicateRecordError as exc:
+        return json.dumps({"duplicates": [_match_dict(m) for m in exc.matches]})
     return json.dumps({"id": new_id})
 
 
@@ -119,6 +134,79 @@ def mark_lead_lost(lead_id: int, reason: str = "") -> str:
     return json.dumps({"success": bool(ok), "reason": reason})
 
 
+def _bulk(run, lead_ids: list[int] | None, domain_json: str, **kwargs) -> str:
+    """Run a bulk lead operation on ids or a JSON domain and return its JSON summary."""
+    try:
+        domain = json.loads(domain_json) if domain_json else None
+        return json.dumps(run(lead_ids=lead_ids, domain=domain, **kwargs))
+    except ValueError as exc:
+        return json.dumps({"error": str(exc)})
+
+
+@tool
+def bulk_update_crm_leads(
+    values_json: str, lead_ids: list[int] | None = None, domain_json: str = ""
+) -> str:
+    """Update many CRM leads in one call instead of calling update_crm_lead per lead.
+
+    Args:
+        values_json: JSON object of field-value pairs written to every matched
+            lead, or a JSON list of per-lead objects with an ``id`` key (e.g.
+            ``[{"id": 1, "priority": "2"}, {"id": 2, "priority": "3"}]``);
+            leads with identical values are written together.
+        lead_ids: Lead ids to update (ignored for a per-lead list).
+        domain_json: JSON Odoo domain selecting the leads when no ids are given,
+            e.g. ``[["partner_name", "ilike", "Acme"]]``.
+
+    Returns:
+        str: JSON summary ``{"matched", "updated", "failed", "calls", "errors"}``.
+    """
+    try:
+        values = json.loads(values_json)
+    except ValueError as exc:
+        return json.dumps({"error": str(exc)})
+    if isinstance(values, list):
+        try:
+            updates = {
+                int(row.pop("id")): row for row in values if isinstance(row, dict) and "id" in row
+            }
+            return json.dumps(bulk_write_leads(updates))
+        except ValueError as exc:
+            return json.dumps({"error": str(exc)})
+    return _bulk(bulk_update_leads, lead_ids, domain_json, values=values)
+
+
+@tool
+def bulk_mark_leads_won(lead_ids: list[int] | None = None, domain_json: str = "") -> str:
+    """Mark many CRM opportunities as Won in one call.
+
+    Args:
+        lead_ids: Lead ids to mark.
+        domain_json: JSON Odoo domain selecting the leads when no ids are given.
+
+    Returns:
+        str: JSON summary ``{"matched", "updated", "failed", "calls", "errors"}``.
+    """
+    return _bulk(bulk_mark_won, lead_ids, domain_json)
+
+
+@tool
+def bulk_mark_leads_lost(
+    lead_ids: list[int] | None = None, domain_json: str = "", lost_reason_id: int = 0
+) -> str:
+    """Mark many CRM opportunities as Lost (archived) in one call.
+
+    Args:
+        lead_ids: Lead ids to mark.
+        domain_json: JSON Odoo domain selecting the leads when no ids are given.
+        lost_reason_id: Optional crm.lost.reason record id.
+
+    Returns:
+        str: JSON summary ``{"matched", "updated", "failed", "calls", "errors"}``.
+    """
+    return _bulk(bulk_mark_lost, lead_ids, domain_json, lost_reason_id=lost_reason_id or None)
+
+
 @tool
 def convert_lead_to_opportunity(lead_id: int) -> str:
     """Convert a lead to an opportunity in the CRM pipeline.
@@ -146,3 +234,34 @@ def add_note_to_crm_lead(lead_id: int, note: str) -> str:
     """
     message_id = add_lead_note(lead_id, note)
     return json.dumps({"message_id": int(message_id)})
+
+
+def _match_dict(match: Match) -> dict:
+    return {"id": match.record_id, "score": match.score, "reasons": list(match.reasons)}
+
+
+@tool
+def find_duplicate_records(model: str = "crm.lead", record_id: int = 0, limit: int = 10) -> str:
+    """Find duplicate leads or partners (by similar name, same e-mail or phone).
+
+    Args:
+        model: "crm.lead" or "res.partner".
+        record_id: Record to find duplicates of; 0 lists the most similar
+            duplicate pairs of the whole model.
+        limit: Maximum number of matches or pairs (default 10).
+
+    Returns:
+        str: JSON ``{"duplicates": [{"id", "score", "reasons"}]}`` for a
+            record, or ``{"pairs": [{"ids", "score", "reasons"}]}``.
+    """
+    try:
+        index = get_index(model)
+    except ValueError as exc:
+        return json.dumps({"error": str(exc)})
+    if not record_id:
+        return json.dumps({"pairs": index.duplicate_pairs(limit=limit)})
+    record = index.features(record_id)
+    if record is None:
+        return json.dumps({"error": f"{model} {record_id} not found or archived"})
+    matches = find_duplicates(model, record, limit=limit)
+    return json.dumps({"duplicates": [_match_dict(m) for m in matches]})
@@ -9,6 +9,7 @@ from app.odoo.models.res_partner import (
     get_partner,
     search_partners,
 )
+from app.tools.formatting import format_record, format_records
 
 
 @tool
@@ -19,10 +20,10 @@ def search_partners_tool(query: str) -> str:
         query: Search string.
 
     Returns:
-        str: JSON list of matching partner records.
+        str: Compact table of matching partners (one line per record).
     """
     results = search_partners(query)
-    return json.dumps(results, default=str)
+    return format_records(results, title="res.partner", has_more=len(results) >= 20)
 
 
 @tool
@@ -33,9 +34,9 @@ def get_partner_tool(partner_id: int) -> str:
         partner_id: Odoo record id.
 
     Returns:
-        str: JSON partner record.
+        str: The partner's non-empty fields, one ``field: value`` per line.
     """
-    return json.dumps(get_partner(partner_id), default=str)
+    return format_record(get_partner(partner_id))
 
 
 @tool
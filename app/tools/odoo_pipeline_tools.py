@@ -4,8 +4,9 @@ import json
 
 from langchain_core.tools import tool
 
-from app.odoo.models.crm_lead import search_leads, update_lead
+from app.odoo.models.crm_lead import bulk_update_leads, search_leads, update_lead
 from app.odoo.models.crm_stage import get_all_stages, get_stage_by_name
+from app.tools.formatting import format_records
 
 
 @tool
@@ -13,10 +14,9 @@ def get_pipeline_stages() -> str:
     """Return all CRM pipeline stages configured in Odoo.
 
     Returns:
-        str: JSON list of stage records (id, name, sequence, probability).
+        str: Compact table of stages (id, name, sequence, ...).
     """
-    stages = get_all_stages()
-    return json.dumps(stages, default=str)
+    return format_records(get_all_stages(), title="crm.stage")
 
 
 @tool
@@ -37,6 +37,32 @@ def move_lead_to_stage(lead_id: int, stage_name: str) -> str:
     return json.dumps({"success": bool(ok), "stage_id": stage["id"]})
 
 
+@tool
+def bulk_move_leads_to_stage(
+    stage_name: str, lead_ids: list[int] | None = None, domain_json: str = ""
+) -> str:
+    """Move many CRM leads to a named pipeline stage with a single write.
+
+    Args:
+        stage_name: Human-readable stage name (e.g. "Qualified").
+        lead_ids: Lead ids to move.
+        domain_json: JSON Odoo domain selecting the leads when no ids are given,
+            e.g. ``[["partner_name", "ilike", "Acme"]]``.
+
+    Returns:
+        str: JSON summary ``{"stage_id", "matched", "updated", "failed", "calls", "errors"}``.
+    """
+    stage = get_stage_by_name(stage_name)
+    if not stage:
+        return json.dumps({"error": f"Stage '{stage_name}' not found"})
+    try:
+        domain = json.loads(domain_json) if domain_json else None
+        summary = bulk_update_leads({"stage_id": stage["id"]}, lead_ids=lead_ids, domain=domain)
+    except ValueError as exc:
+        return json.dumps({"error": str(exc)})
+    return json.dumps({"stage_id": stage["id"], **summary})
+
+
 @tool
 def get_pipeline_summary() -> str:
     """Return a high-level summary of the CRM pipeline by stage.
@@ -53,3 +79,26 @@ def get_pipeline_summary() -> str:
         )
         summary[stage["name"]] = len(count_results)
     return json.dumps(summary)
+
+
+@tool
+def get_pipeline_analytics(group_by: str = "team", months: int = 3) -> str:
+    """Return pipeline totals, weighted pipeline by month, win rates, forecast and funnel.
+
+    Use this instead of reading leads one by one for questions about weighted
+    pipeline, win rates, forecasts or conversion.
+
+    Args:
+        group_by: Group totals and win rates by "team", "user" or "stage".
+        months: Forecast horizon in months, starting with the current month.
+
+    Returns:
+        str: JSON object with ``leads``, ``totals``, ``by_month``, ``win_rates``,
+            ``forecast`` and ``funnel`` sections.
+    """
+    from app.odoo.analytics import pipeline_report
+
+    try:
+        return json.dumps(pipeline_report(group_by=group_by, months=months))
+    except ValueError as exc:
+        return json.dumps({"error": str(exc)})
@@ -0,0 +1,439 @@
+"""Pluggable cache backends for the reference-data, retrieval and response caches.
+
+Two backends implement :class:`CacheBackend`:
+
+* :class:`MemoryCache` — per-process LRU with TTL;
+* :class:`SharedCache` — one SQLite file (WAL mode) shared by every worker
+  on the host, with an ``expires_at`` index for TTL purges, fronted by a
+  short-lived in-process copy of recently read entries.
+
+Invalidations are broadcast: :meth:`CacheBackend.invalidate` deletes the
+entries and, for :class:`SharedCache`, appends to an invalidation log that
+every process polls (at most every ``settings.cache_invalidation_poll_seconds``)
+to drop its local copies and notify its subscribers.
+
+Caches are selected per use by ``settings.cache_backends``, e.g.
+``"reference=shared,retrieval=shared,response=memory"``; unlisted caches are
+disabled and :func:`get_cache` returns None for them.  Values must be JSON
+serializable and are returned as fresh copies.
+
+Usage::
+
+    from app.utils.cache import get_cache
+
+    cache = get_cache("reference")
+    stages = cache.get_or_set("stages", load_stages) if cache else load_stages()
+"""
+
+from __future__ import annotations
+
+import functools
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from app.config import settings
+from app.utils.logger import get_logger
+from app.utils.metrics import REGISTRY, Counter
+
+logger = get_logger(__name__)
+
+Subscriber = Callable[[str, str | None], None]
+
+_MISSING = object()
+
+
+class CacheBackend(ABC):
+    """Namespaced key/value store with per-entry TTL and invalidation broadcast."""
+
+    def __init__(self) -> None:
+        self._subscribers: list[Subscriber] = []
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def _get(self, namespace: str, key: str) -> bytes | None:
+        """Return the serialized value, or None if missing/expired."""
+
+    @abstractmethod
+    def _set(self, namespace: str, key: str, value: bytes, ttl: float | None) -> None:
+        """Store a serialized value."""
+
+    @abstractmethod
+    def _delete(self, namespace: str, key: str | None) -> None:
+        """Delete one key, or the whole namespace when ``key`` is None."""
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """Return the cached value, or ``default``."""
+        raw = self._get(namespace, key)
+        with self._stats_lock:
+            if raw is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return default if raw is None else orjson.loads(raw)
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store a JSON-serializable value for ``ttl`` seconds (None = no expiry)."""
+        self._set(namespace, key, orjson.dumps(value), ttl)
+
+    def get_or_set(
+        self, namespace: str, key: str, factory: Callable[[], Any], ttl: float | None = None
+    ) -> Any:
+        """Return the cached value, computing and storing it with ``factory`` on a miss."""
+        value = self.get(namespace, key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.set(namespace, key, value, ttl)
+        return value
+
+    def invalidate(self, namespace: str, key: str | None = None) -> None:
+        """Drop a key (or a whole namespace) here and in every other worker."""
+        self._delete(namespace, key)
+        self._notify(namespace, key)
+
+    def subscribe(self, callback: Subscriber) -> None:
+        """Call ``callback(namespace, key)`` for every applied invalidation."""
+        self._subscribers.append(callback)
+
+    def _notify(self, namespace: str, key: str | None) -> None:
+        for callback in list(self._subscribers):
+            try:
+                callback(namespace, key)
+            except Exception as exc:  # a broken subscriber must not break invalidation
+                logger.warning("cache_subscriber_failed", namespace=namespace, error=str(exc))
+
+    def stats(self) -> dict:
+        """Return hit/miss counters."""
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": type(self).__name__,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache with TTL.
+
+    Args:
+        max_entries: Entries kept across all namespaces before the least
+            recently used are evicted.
+    """
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        super().__init__()
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], tuple[bytes, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, namespace: str, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[(namespace, key)]
+                return None
+            self._entries.move_to_end((namespace, key))
+            return value
+
+    def _set(self, namespace: str, key: str, value: bytes, ttl: float | None) -> None:
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._entries[(namespace, key)] = (value, expires_at)
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _delete(self, namespace: str, key: str | None) -> None:
+        with self._lock:
+            if key is not None:
+                self._entries.pop((namespace, key), None)
+                return
+            for entry_key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[entry_key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entry (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_cache_entry_expires ON cache_entry (expires_at);
+CREATE TABLE IF NOT EXISTS cache_invalidation (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    namespace TEXT NOT NULL,
+    key TEXT,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class SharedCache(CacheBackend):
+    """Cache shared by all processes on a host through one SQLite WAL file.
+
+    Uses the stdlib ``sqlite3`` driver with one connection per thread: a
+    cache read is a primary-key lookup, and SQLAlchemy's per-call overhead
+    would be most of its cost.
+
+    Args:
+        path: SQLite file (created if missing).
+        local_ttl: Seconds a value read from SQLite is served from process
+            memory (0 disables the local copy); invalidations from other
+            processes drop it within ``poll_interval``.
+        poll_interval: Minimum seconds between invalidation-log polls.
+        purge_interval: Minimum seconds between deletions of expired rows.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        local_ttl: float = 5.0,
+        poll_interval: float = 1.0,
+        purge_interval: float = 60.0,
+    ) -> None:
+        super().__init__()
+        self.path = path
+        self.local_ttl = local_ttl
+        self.poll_interval = poll_interval
+        self.purge_interval = purge_interval
+        self._local = MemoryCache()
+        self._threads = threading.local()
+        self._poll_lock = threading.Lock()
+        self._last_poll = 0.0
+        self._last_purge = time.time()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._own_seqs: set[int] = set()
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        self._seq = conn.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM cache_invalidation"
+        ).fetchone()[0]
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._threads, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._threads.conn = conn
+        return conn
+
+    def poll_invalidations(self, force: bool = False) -> int:
+        """Apply invalidations broadcast by other processes; return how many."""
+        now = time.monotonic()
+        if not force and now - self._last_poll < self.poll_interval:
+            return 0
+        with self._poll_lock:
+            self._last_poll = now
+            rows = self._conn().execute(
+                "SELECT seq, namespace, key FROM cache_invalidation WHERE seq > ? ORDER BY seq",
+                (self._seq,),
+            ).fetchall()
+            if rows:
+                self._seq = rows[-1][0]
+            remote = [row for row in rows if row[0] not in self._own_seqs]
+            self._own_seqs.difference_update(row[0] for row in rows)
+        for _, namespace, key in remote:
+            self._local._delete(namespace, key)
+            self._notify(namespace, key)
+        return len(remote)
+
+    def _get(self, namespace: str, key: str) -> bytes | None:
+        self.poll_invalidations()
+        if self.local_ttl:
+            value = self._local._get(namespace, key)
+            if value is not None:
+                return value
+        row = self._conn().execute(
+            "SELECT value, expires_at FROM cache_entry WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        if self.local_ttl:
+            remaining = row[1] - time.time() if row[1] is not None else self.local_ttl
+            self._local._set(namespace, key, row[0], min(self.local_ttl, remaining))
+        return row[0]
+
+    def _set(self, namespace: str, key: str, value: bytes, ttl: float | None) -> None:
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entry (namespace, key, value, expires_at) "
+            "VALUES (?, ?, ?, ?)",
+            (namespace, key, value, now + ttl if ttl else None),
+        )
+        if self.local_ttl:
+            self._local._set(namespace, key, value, min(self.local_ttl, ttl or self.local_ttl))
+        if now - self._last_purge > self.purge_interval:
+            self._last_purge = now
+            conn.execute("DELETE FROM cache_entry WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "DELETE FROM cache_invalidation WHERE created_at < ?", (now - 3600,)
+            )
+
+    def _delete(self, namespace: str, key: str | None) -> None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if key is None:
+                conn.execute("DELETE FROM cache_entry WHERE namespace = ?", (namespace,))
+            else:
+                conn.execute(
+                    "DELETE FROM cache_entry WHERE namespace = ? AND key = ?", (namespace, key)
+                )
+            seq = conn.execute(
+                "INSERT INTO cache_invalidation (namespace, key, created_at) VALUES (?, ?, ?)",
+                (namespace, key, time.time()),
+            ).lastrowid
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        with self._poll_lock:
+            self._own_seqs.add(seq)  # already applied here; other processes pick it up
+        self._local._delete(namespace, key)
+
+
+class Cache:
+    """A backend bound to one namespace and default TTL (see :func:`get_cache`).
+
+    Args:
+        backend: Storage backend.
+        namespace: Key namespace (the cache name).
+        ttl: Default entry lifetime in seconds (None = no expiry).
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str, ttl: float | None) -> None:
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value, or ``default``."""
+        return self.backend.get(self.namespace, key, default)
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store a value (``ttl`` defaults to the cache's TTL)."""
+        self.backend.set(self.namespace, key, value, ttl or self.ttl)
+
+    def get_or_set(self, key: str, factory: Callable[[], Any], ttl: float | None = None) -> Any:
+        """Return the cached value, computing it with ``factory`` on a miss."""
+        return self.backend.get_or_set(self.namespace, key, factory, ttl or self.ttl)
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Drop a key, or every key of this cache, in all workers."""
+        self.backend.invalidate(self.namespace, key)
+
+
+@functools.lru_cache(maxsize=8)
+def parse_cache_backends(spec: str) -> dict[str, str]:
+    """Parse ``"name=backend,..."`` (backend ``memory`` or ``shared``)."""
+    backends = {}
+    for item in spec.split(","):
+        name, _, backend = item.partition("=")
+        name, backend = name.strip(), backend.strip().lower()
+        if name and backend in ("memory", "shared"):
+            backends[name] = backend
+        elif name:
+            logger.warning("cache_backend_ignored", cache=name, backend=backend)
+    return backends
+
+
+_backends: dict[str, CacheBackend] = {}
+_lock = threading.Lock()
+
+
+def get_backend(kind: str) -> CacheBackend:
+    """Return the process-wide ``"memory"`` or ``"shared"`` backend."""
+    backend = _backends.get(kind)
+    if backend is None:
+        with _lock:
+            backend = _backends.get(kind)
+            if backend is None:
+                if kind == "shared":
+                    backend = SharedCache(
+                        settings.cache_shared_path,
+                        local_ttl=settings.cache_local_ttl_seconds,
+                        poll_interval=settings.cache_invalidation_poll_seconds,
+                    )
+                else:
+                    backend = MemoryCache(settings.cache_max_entries)
+                _backends[kind] = backend
+    return backend
+
+
+def get_cache(name: str, ttl: float | None = None) -> Cache | None:
+    """Return the cache ``name`` if ``settings.cache_backends`` enables it.
+
+    Args:
+        name: Cache name, e.g. ``"reference"``, ``"retrieval"``, ``"response"``.
+        ttl: Default entry lifetime in seconds; defaults to the
+            ``<name>_cache_ttl_seconds`` setting when there is one.
+
+    Returns:
+        Cache | None: The namespaced cache, or None when disabled.
+    """
+    kind = parse_cache_backends(settings.cache_backends).get(name)
+    if kind is None:
+        return None
+    if ttl is None:
+        ttl = getattr(settings, f"{name}_cache_ttl_seconds", None)
+    return Cache(get_backend(kind), name, ttl)
+
+
+def cached(name: str, key: str, loader: Callable[[], Any]) -> Any:
+    """Return ``loader()`` through cache ``name``, or call it directly when disabled.
+
+    Args:
+        name: Cache name.
+        key: Key within the cache.
+        loader: Computes the (JSON-serializable) value on a miss.
+    """
+    cache = get_cache(name)
+    return loader() if cache is None else cache.get_or_set(key, loader)
+
+
+def invalidate(name: str, key: str | None = None) -> None:
+    """Invalidate a key (or all of cache ``name``) in every worker; no-op when disabled."""
+    cache = get_cache(name)
+    if cache is not None:
+        cache.invalidate(key)
+
+
+def cache_stats() -> dict:
+    """Return the counters of the backends created in this process."""
+    return {kind: backend.stats() for kind, backend in _backends.items()}
+
+
+def _cache_metrics() -> list:
+    lookups = Counter(
+        "cache_lookups_total", "Cache lookups by backend and result", ["backend", "result"]
+    )
+    for kind, backend in list(_backends.items()):
+        stats = backend.stats()
+        lookups.labels(backend=kind, result="hit").inc(stats["hits"])
+        lookups.labels(backend=kind, result="miss").inc(stats["misses"])
+    return [lookups]
+
+
+REGISTRY.add_collector(_cache_metrics)
@@ -0,0 +1,242 @@
+"""Background dependency health monitor.
+
+:class:`HealthMonitor` probes Odoo, ChromaDB, SQLite and the LLM provider
+every ``settings.health_check_interval_seconds`` in worker threads and keeps
+the latest result per dependency, so ``/health/live`` and ``/health/ready``
+answer from memory without touching the network and startup never waits
+for a slow or unreachable dependency.
+
+Readiness requires every dependency listed in
+``settings.health_ready_dependencies`` to have passed its last probe; the
+others are reported but do not gate traffic.  While the default Odoo
+client's circuit breaker (:mod:`app.odoo.resilience`) is open, a required
+``odoo`` counts as down even if its last probe passed; the limiter and
+breaker state of every registered client is included in the payload.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+
+from app.config import settings
+from app.odoo.resilience import OPEN, guard_states
+from app.utils.logger import get_logger
+from app.utils.metrics import gauge
+
+logger = get_logger(__name__)
+
+OPENAI_MODELS_URL = "https://api.openai.com/v1/models"
+
+DEPENDENCY_UP = gauge(
+    "dependency_up", "Whether the last health probe of a dependency passed", ["dependency"]
+)
+
+
+class ProbeError(RuntimeError):
+    """A dependency probe failed with a client-library error (wrapped as the cause)."""
+
+
+# Errors a failing probe may raise; anything else is a bug and propagates.
+PROBE_ERRORS = (RuntimeError, OSError, ValueError)
+
+
+@dataclass
+class DependencyStatus:
+    """Result of the latest probe of one dependency."""
+
+    name: str
+    ok: bool
+    latency_ms: float
+    checked_at: float
+    error: str | None = None
+    detail: dict = field(default_factory=dict)
+
+
+# ── probes (blocking; run in worker threads) ──────────────────────────────────
+
+
+def check_odoo(previous: DependencyStatus | None) -> dict:
+    """Probe Odoo.
+
+    The first probe, and every probe after a failure, runs the full
+    diagnostic :func:`app.odoo.auth.test_connection` (HTTP probe, version and
+    authentication, all logged); while healthy a cheap version call is used.
+    """
+    import httpx
+
+    from app.odoo.auth import test_connection
+    from app.odoo.client import odoo_client
+
+    if (previous is None or not previous.ok) and not test_connection():
+        raise ProbeError("connection or authentication failed (see odoo_connection_failed)")
+    try:
+        version = odoo_client.get_version()
+    except httpx.HTTPError as exc:
+        raise ProbeError(str(exc)) from exc
+    return {"server_version": version.get("server_version")}
+
+
+def check_sqlite(previous: DependencyStatus | None) -> dict:
+    """Run ``SELECT 1`` against the session database."""
+    import sqlalchemy as sa
+    from sqlalchemy.exc import SQLAlchemyError
+
+    engine = sa.create_engine(settings.database_url)
+    try:
+        with engine.connect() as conn:
+            conn.execute(sa.text("SELECT 1"))
+    except SQLAlchemyError as exc:
+        raise ProbeError(str(exc)) from exc
+    finally:
+        engine.dispose()
+    return {}
+
+
+def check_chroma(previous: DependencyStatus | None) -> dict:
+    """Heartbeat the application's persistent ChromaDB client."""
+    from chromadb.errors import ChromaError
+
+    from app.knowledge_base.vector_store import get_chroma_client
+
+    client = get_chroma_client()
+    try:
+        client.heartbeat()
+        return {"collections": client.count_collections()}
+    except ChromaError as exc:
+        raise ProbeError(str(exc)) from exc
+
+
+def check_llm(previous: DependencyStatus | None) -> dict:
+    """List models with the configured OpenAI key through the shared LLM pool."""
+    import httpx
+
+    from app.agents.llm_pool import llm_http_client
+
+    if not settings.openai_api_key:
+        raise ProbeError("OPENAI_API_KEY is not set")
+    try:
+        response = llm_http_client().get(
+            OPENAI_MODELS_URL,
+            headers={"Authorization": f"Bearer {settings.openai_api_key}"},
+            timeout=settings.health_check_timeout_seconds,
+        )
+        response.raise_for_status()
+    except httpx.HTTPError as exc:
+        raise ProbeError(str(exc)) from exc
+    return {}
+
+
+DEFAULT_CHECKS: dict[str, Callable[[DependencyStatus | None], dict]] = {
+    "odoo": check_odoo,
+    "sqlite": check_sqlite,
+    "chroma": check_chroma,
+    "llm": check_llm,
+}
+
+
+# ── monitor ───────────────────────────────────────────────────────────────────
+
+
+class HealthMonitor:
+    """Periodically probe dependencies and cache their status.
+
+    Args:
+        checks: Dependency name to probe; a probe receives the previous
+            status and returns extra detail, raising one of
+            :data:`PROBE_ERRORS` (e.g. :class:`ProbeError`) on failure.
+        required: Dependencies that must be healthy for readiness.
+        timeout: Seconds a probe may take before it counts as failed.
+    """
+
+    def __init__(
+        self,
+        checks: dict[str, Callable[[DependencyStatus | None], dict]] | None = None,
+        required: list[str] | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        self.checks = dict(DEFAULT_CHECKS if checks is None else checks)
+        if required is None:
+            required = [
+                name.strip()
+                for name in settings.health_ready_dependencies.split(",")
+                if name.strip()
+            ]
+        self.required = required
+        self.timeout = settings.health_check_timeout_seconds if timeout is None else timeout
+        self.statuses: dict[str, DependencyStatus] = {}
+        self.started_at = time.time()
+
+    async def _probe(self, name: str) -> DependencyStatus:
+        previous = self.statuses.get(name)
+        started = time.perf_counter()
+        try:
+            detail = await asyncio.wait_for(
+                asyncio.to_thread(self.checks[name], previous), self.timeout
+            )
+            status = DependencyStatus(name, True, 0.0, time.time(), detail=detail or {})
+        except TimeoutError:
+            status = DependencyStatus(
+                name, False, 0.0, time.time(), error=f"timed out after {self.timeout}s"
+            )
+        except PROBE_ERRORS as exc:
+            status = DependencyStatus(
+                name, False, 0.0, time.time(), error=f"{type(exc).__name__}: {exc}"
+            )
+        status.latency_ms = round((time.perf_counter() - started) * 1000, 1)
+        if previous is None or previous.ok != status.ok:
+            log = logger.info if status.ok else logger.warning
+            log("dependency_health", dependency=name, ok=status.ok, error=status.error)
+        DEPENDENCY_UP.labels(dependency=name).set(1 if status.ok else 0)
+        return status
+
+    async def check_all(self) -> dict[str, DependencyStatus]:
+        """Probe every dependency concurrently and store the results."""
+        results = await asyncio.gather(*(self._probe(name) for name in self.checks))
+        self.statuses.update({status.name: status for status in results})
+        return self.statuses
+
+    async def run_forever(self, interval: float) -> None:
+        """Probe every ``interval`` seconds until cancelled (once if ``interval`` <= 0)."""
+        while True:
+            await self.check_all()
+            if interval <= 0:
+                return
+            await asyncio.sleep(interval)
+
+    def is_ready(self) -> bool:
+        """Whether every required dependency passed its last probe."""
+        if "odoo" in self.required and self._odoo_circuit_open():
+            return False
+        return all(
+            name in self.statuses and self.statuses[name].ok
+            for name in self.required
+            if name in self.checks
+        )
+
+    @staticmethod
+    def _odoo_circuit_open() -> bool:
+        default = guard_states().get("default")
+        return default is not None and default["breaker"]["state"] == OPEN
+
+    def liveness(self) -> dict:
+        """Return the liveness payload (the process is up and serving)."""
+        return {"status": "ok", "uptime_seconds": round(time.time() - self.started_at, 1)}
+
+    def readiness(self) -> dict:
+        """Return the readiness payload built from the cached statuses."""
+        if not self.statuses:
+            state = "starting"
+        else:
+            state = "ready" if self.is_ready() else "not_ready"
+        return {
+            "status": state,
+            "required": self.required,
+            "dependencies": {name: asdict(status) for name, status in self.statuses.items()},
+            "odoo_calls": guard_states(),
+        }
+
+
+health_monitor = HealthMonitor()
@@ -0,0 +1,110 @@
+"""LangChain callback handler opening OpenTelemetry spans for LLM and tool runs.
+
+Importing this module registers :class:`LangChainTracingHandler` as an
+inheritable LangChain configure hook; :mod:`app.agents.base_agent` and
+:mod:`app.tools` import it, so every agent and tool run is traced.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextvars import ContextVar
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+from opentelemetry import context as otel_context
+from opentelemetry import trace
+from opentelemetry.trace import Span, Status, StatusCode
+
+from app.utils.tracing import tracer
+
+
+class LangChainTracingHandler(BaseCallbackHandler):
+    """Open spans for chat model and tool runs.
+
+    Tool spans become the current span while the tool runs, so the Odoo
+    RPCs it makes nest under it; LLM spans are leaves.
+    """
+
+    run_inline = True
+
+    def __init__(self) -> None:
+        self._spans: dict[UUID, tuple[Span, object | None]] = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id: UUID, name: str, attributes: dict, activate: bool) -> None:
+        current = tracer.start_span(name, attributes=attributes)
+        if not current.is_recording():
+            return
+        token = otel_context.attach(trace.set_span_in_context(current)) if activate else None
+        with self._lock:
+            self._spans[run_id] = (current, token)
+
+    def _end(self, run_id: UUID, error: BaseException | None = None, **attributes: Any) -> None:
+        with self._lock:
+            entry = self._spans.pop(run_id, None)
+        if entry is None:
+            return
+        current, token = entry
+        if token is not None:
+            try:
+                otel_context.detach(token)
+            except ValueError:  # ended in a different context (async tools)
+                pass
+        for key, value in attributes.items():
+            if value is not None:
+                current.set_attribute(key, value)
+        if error is not None:
+            current.record_exception(error)
+            current.set_status(Status(StatusCode.ERROR, type(error).__name__))
+        current.end()
+
+    def on_chat_model_start(self, serialized: dict, messages: list, *, run_id: UUID, **kw: Any):
+        params = kw.get("invocation_params") or {}
+        model = params.get("model_name") or params.get("model") or params.get("_type", "chat")
+        self._start(
+            run_id,
+            f"llm.{model}",
+            {"llm.model": str(model), "llm.messages": sum(len(m) for m in messages)},
+            activate=False,
+        )
+
+    def on_llm_start(self, serialized: dict, prompts: list[str], *, run_id: UUID, **kw: Any):
+        params = kw.get("invocation_params") or {}
+        model = params.get("model_name") or params.get("model") or "llm"
+        self._start(run_id, f"llm.{model}", {"llm.model": str(model)}, activate=False)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kw: Any) -> None:
+        usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+        self._end(
+            run_id,
+            **{
+                "llm.prompt_tokens": usage.get("prompt_tokens"),
+                "llm.completion_tokens": usage.get("completion_tokens"),
+            },
+        )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kw: Any) -> None:
+        self._end(run_id, error)
+
+    def on_tool_start(self, serialized: dict, input_str: str, *, run_id: UUID, **kw: Any):
+        name = (serialized or {}).get("name") or kw.get("name") or "tool"
+        self._start(run_id, f"tool.{name}", {"tool.name": name}, activate=True)
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kw: Any) -> None:
+        self._end(run_id)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kw: Any) -> None:
+        self._end(run_id, error)
+
+
+# One shared handler (spans are keyed by run_id under its lock). It is the
+# variable's default rather than a set() value so that threads started
+# without a copied context are traced too.
+_HANDLER = LangChainTracingHandler()
+_langchain_handler: ContextVar[LangChainTracingHandler | None] = ContextVar(
+    "langchain_tracing_handler", default=_HANDLER
+)
+register_configure_hook(_langchain_handler, inheritable=True)
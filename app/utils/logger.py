@@ -1,38 +1,256 @@
-"""Structured logging configuration using structlog."""
+"""Structured logging configuration using structlog.
 
+Two modes, selected by ``settings.app_env``:
+
+* development (default) — human-readable console output written
+  synchronously to stdout;
+* production (``APP_ENV`` = ``production``/``prod``/``staging``) — one JSON
+  object per line, serialized with orjson and handed to a bounded queue that
+  a background thread drains to stdout, so request threads never block on
+  I/O.  High-volume events can be sampled (``LOG_SAMPLE_RATES``); events
+  dropped because the queue is full or sampled out are counted (see
+  :func:`logging_stats`).  Warnings and errors are never sampled.
+"""
+
+import atexit
 import logging
+import queue
 import sys
+import threading
+from collections.abc import Callable
+from typing import IO, Any
 
+import orjson
 import structlog
 
+from app.utils.metrics import REGISTRY, Counter, Gauge
+
+PRODUCTION_ENVS = {"production", "prod", "staging"}
+
+
+class QueueWriter:
+    """Bounded queue of rendered log lines drained by a writer thread.
+
+    Args:
+        stream: Binary stream to write to; defaults to ``sys.stdout.buffer``
+            at write time.
+        max_size: Maximum queued lines; further lines are dropped and
+            counted in ``dropped``.
+        batch_size: Maximum lines written per flush.
+    """
+
+    def __init__(
+        self, stream: IO[bytes] | None = None, max_size: int = 10000, batch_size: int = 256
+    ) -> None:
+        self._stream = stream
+        self._queue: queue.Queue[bytes | None] = queue.Queue(maxsize=max_size)
+        self._batch_size = batch_size
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self.written = 0
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, line: bytes) -> None:
+        """Queue a line without blocking (drop it if the queue is full)."""
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = [line for line in batch if line is not None]
+            if lines:
+                stream = self._stream or sys.stdout.buffer
+                try:
+                    stream.write(b"\n".join(lines) + b"\n")
+                    stream.flush()
+                except (OSError, ValueError):  # closed stream during shutdown
+                    pass
+                self.written += len(lines)
+            for _ in batch:
+                self._queue.task_done()
+            if None in batch:
+                return
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Write what is queued and stop the writer thread."""
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
 
-def configure_logging(log_level: str = "INFO") -> None:
-    """Configure structlog with human-readable development output.
+
+class QueueLogger:
+    """structlog logger handing rendered events to a :class:`QueueWriter`."""
+
+    def __init__(self, writer: QueueWriter) -> None:
+        self._writer = writer
+
+    def msg(self, message: bytes | str) -> None:
+        """Queue one rendered event."""
+        self._writer.put(message if isinstance(message, bytes) else message.encode())
+
+    log = debug = info = warn = warning = error = err = critical = exception = fatal = msg
+
+
+class EventSampler:
+    """structlog processor keeping 1 in N events of sampled event names.
+
+    Args:
+        rates: Event name to kept fraction (``0.1`` keeps every 10th event).
+    """
+
+    def __init__(self, rates: dict[str, float]) -> None:
+        self._every = {name: max(1, round(1 / rate)) for name, rate in rates.items() if rate > 0}
+        self._dropped_names = {name for name, rate in rates.items() if rate <= 0}
+        self._seen: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.sampled_out = 0
+
+    def __call__(self, logger: Any, method_name: str, event_dict: dict) -> dict:
+        event = event_dict.get("event")
+        if method_name in ("warning", "warn", "error", "exception", "critical", "fatal"):
+            return event_dict
+        if event in self._dropped_names:
+            with self._lock:
+                self.sampled_out += 1
+            raise structlog.DropEvent
+        every = self._every.get(event)
+        if every is None or every == 1:
+            return event_dict
+        with self._lock:
+            seen = self._seen.get(event, 0)
+            self._seen[event] = seen + 1
+            if seen % every:
+                self.sampled_out += 1
+                raise structlog.DropEvent
+        event_dict["sample_rate"] = 1 / every
+        return event_dict
+
+
+def parse_sample_rates(spec: str) -> dict[str, float]:
+    """Parse ``"event=rate,event=rate"`` into a dict (invalid items are ignored)."""
+    rates = {}
+    for item in spec.split(","):
+        name, _, rate = item.partition("=")
+        try:
+            rates[name.strip()] = min(1.0, float(rate))
+        except ValueError:
+            continue
+    return {name: rate for name, rate in rates.items() if name}
+
+
+def _orjson_dumps(event_dict: dict, default: Callable[[Any], Any] | None = None) -> bytes:
+    return orjson.dumps(event_dict, default=default or str)
+
+
+_writer: QueueWriter | None = None
+_sampler: EventSampler | None = None
+
+
+def configure_logging(
+    log_level: str = "INFO",
+    app_env: str = "development",
+    sample_rates: str = "",
+    queue_size: int = 10000,
+    stream: IO[bytes] | None = None,
+) -> None:
+    """Configure structlog for the given environment.
 
     Args:
         log_level: Log level string (e.g. ``"INFO"``, ``"DEBUG"``).
+        app_env: Application environment; production-like values select the
+            JSON + background-writer mode.
+        sample_rates: Per-event sampling, e.g. ``"agent_invoke=0.1"``
+            (production mode only).
+        queue_size: Maximum queued log lines (production mode only).
+        stream: Binary stream for production mode (defaults to stdout).
     """
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=getattr(logging, log_level.upper(), logging.INFO),
-    )
-    structlog.configure(
-        processors=[
+    global _writer, _sampler
+    level = getattr(logging, log_level.upper(), logging.INFO)
+    logging.basicConfig(format="%(message)s", stream=sys.stdout, level=level)
+    if _writer is not None:
+        _writer.close()
+        _writer = None
+    _sampler = None
+
+    if app_env.lower() in PRODUCTION_ENVS:
+        _writer = QueueWriter(stream, max_size=queue_size)
+        _sampler = EventSampler(parse_sample_rates(sample_rates))
+        processors: list = [
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.add_log_level,
+            _sampler,
+            structlog.processors.TimeStamper(fmt="iso", utc=True),
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(serializer=_orjson_dumps),
+        ]
+        writer = _writer
+        logger_factory: Callable[..., Any] = lambda *args: QueueLogger(writer)
+    else:
+        processors = [
             structlog.contextvars.merge_contextvars,
             structlog.processors.add_log_level,
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.dev.ConsoleRenderer(),
-        ],
-        wrapper_class=structlog.make_filtering_bound_logger(
-            getattr(logging, log_level.upper(), logging.INFO)
-        ),
+        ]
+        logger_factory = structlog.PrintLoggerFactory()
+
+    structlog.configure(
+        processors=processors,
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
 
+def logging_stats() -> dict:
+    """Return the production pipeline counters (zeros in development mode)."""
+    return {
+        "written": _writer.written if _writer else 0,
+        "queued": _writer._queue.qsize() if _writer else 0,
+        "dropped_queue_full": _writer.dropped if _writer else 0,
+        "sampled_out": _sampler.sampled_out if _sampler else 0,
+    }
+
+
+def _logging_metrics() -> list:
+    stats = logging_stats()
+    dropped = Counter(
+        "log_events_dropped_total", "Log events not written, by reason", ["reason"]
+    )
+    dropped.labels(reason="queue_full").inc(stats["dropped_queue_full"])
+    dropped.labels(reason="sampled").inc(stats["sampled_out"])
+    written = Counter("log_events_written_total", "Log events written by the background writer")
+    written.inc(stats["written"])
+    queued = Gauge("log_queue_size", "Log events waiting for the background writer")
+    queued.set(stats["queued"])
+    return [dropped, written, queued]
+
+
+REGISTRY.add_collector(_logging_metrics)
+
+
+@atexit.register
+def _flush_logs() -> None:
+    if _writer is not None:
+        _writer.close()
+
+
 def get_logger(name: str) -> structlog.BoundLogger:
     """Return a structured logger bound to the given module name.
 
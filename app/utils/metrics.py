@@ -0,0 +1,283 @@
+"""Minimal Prometheus-compatible metrics registry.
+
+Provides labelled :class:`Counter`, :class:`Gauge` and :class:`Histogram`
+metrics, process metrics (CPU, memory, file descriptors, threads) and
+:func:`render_prometheus`, which returns everything in the Prometheus text
+exposition format (version 0.0.4) for the ``/metrics`` route.
+
+Usage::
+
+    from app.utils.metrics import counter
+
+    REQUESTS = counter("app_requests_total", "Requests", ["route"])
+    REQUESTS.labels(route="/chat").inc()
+"""
+
+from __future__ import annotations
+
+import bisect
+import gc
+import math
+import os
+import platform
+import resource
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_START_TIME = time.time()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class: a named metric family with fixed label names."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: dict[tuple[str, ...], object] = {}
+
+    def _key(self, labels: dict[str, object]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _child(self, key: tuple[str, ...]):
+        raise NotImplementedError
+
+    def labels(self, **labels: object):
+        """Return the child metric for the given label values."""
+        key = self._key(labels)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._child(key))
+        return child
+
+    def samples(self) -> Iterable[str]:
+        """Yield exposition lines for every child."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Return the metric family in text exposition format."""
+        header = f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n"
+        return header + "".join(f"{line}\n" for line in self.samples())
+
+
+class _Value:
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = value
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    kind = "counter"
+
+    def _child(self, key):
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabelled counter."""
+        self.labels().inc(amount)
+
+    def samples(self):
+        for key, child in sorted(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrement the unlabelled gauge."""
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        """Set the unlabelled gauge."""
+        self.labels().set(value)
+
+
+class _HistogramValue:
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed upper bounds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _child(self, key):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record a value in the unlabelled histogram."""
+        self.labels().observe(value)
+
+    def samples(self):
+        for key, child in sorted(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                labels = _format_labels(self.labelnames, key, le)
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Registry:
+    """Collection of metrics and callback collectors rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], Iterable[_Metric]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric; registering the same name twice returns the first one."""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def add_collector(self, collector: Callable[[], Iterable[_Metric]]) -> None:
+        """Add a callable producing metrics at render time."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Return all metrics in text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        for collector in collectors:
+            metrics.extend(collector())
+        return "".join(metric.render() for metric in metrics)
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    """Create (or return the already registered) counter."""
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    """Create (or return the already registered) gauge."""
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = DEFAULT_BUCKETS,
+) -> Histogram:
+    """Create (or return the already registered) histogram."""
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+def _process_metrics() -> list[_Metric]:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    cpu = Counter("process_cpu_seconds_total", "Total user and system CPU time in seconds")
+    cpu.inc(usage.ru_utime + usage.ru_stime)
+    resident = Gauge("process_resident_memory_bytes", "Resident memory size in bytes")
+    virtual = Gauge("process_virtual_memory_bytes", "Virtual memory size in bytes")
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            size, rss = (int(field) for field in statm.read().split()[:2])
+        page = os.sysconf("SC_PAGE_SIZE")
+        resident.set(rss * page)
+        virtual.set(size * page)
+    except OSError:  # not Linux: peak RSS is the best available figure
+        scale = 1 if platform.system() == "Darwin" else 1024
+        resident.set(usage.ru_maxrss * scale)
+    metrics: list[_Metric] = [cpu, resident, virtual]
+    try:
+        fds = Gauge("process_open_fds", "Number of open file descriptors")
+        fds.set(len(os.listdir("/proc/self/fd")))
+        metrics.append(fds)
+    except OSError:
+        pass
+    start = Gauge("process_start_time_seconds", "Start time of the process since epoch")
+    start.set(_START_TIME)
+    threads = Gauge("process_threads", "Number of Python threads")
+    threads.set(threading.active_count())
+    collections = Counter(
+        "python_gc_collections_total", "Garbage collections per generation", ["generation"]
+    )
+    for generation, stats in enumerate(gc.get_stats()):
+        collections.labels(generation=generation).inc(stats["collections"])
+    return [*metrics, start, threads, collections]
+
+
+REGISTRY.add_collector(_process_metrics)
+
+
+def render_prometheus() -> str:
+    """Return every registered metric plus process metrics as exposition text."""
+    return REGISTRY.render()
@@ -0,0 +1,251 @@
+"""OpenTelemetry tracing for requests, graph nodes, tools, Odoo RPCs and SQLite.
+
+Spans are created through the OpenTelemetry API, so any SDK exporter can be
+plugged in.  :func:`configure_tracing` installs an SDK ``TracerProvider``
+with the exporter selected by ``settings.tracing_exporter``:
+
+* ``none`` — spans are recorded only to build the per-request breakdown;
+* ``console`` — spans are also printed as JSON to stdout;
+* ``file`` — spans are appended as JSON lines to ``settings.tracing_file``.
+
+Instrumentation points:
+
+* :func:`request_span` — root span of a request (``/chat``, a workflow run);
+  when it ends, a ``request_timing`` log event lists the time spent per span
+  name inside it (LLM calls, tools, Odoo RPCs, DB writes, ...);
+* :func:`span` / :func:`traced` — nested spans around code blocks/functions;
+* :class:`~app.utils.langchain_tracing.LangChainTracingHandler` —
+  registered as a LangChain configure hook when the agents or tools are
+  imported, so every chat model call and tool call opens a span without
+  touching the agents (kept in its own module so that importing this one
+  does not load LangChain).
+
+Until :func:`configure_tracing` runs, the API hands out non-recording spans
+and all of this costs a few attribute lookups per call.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.trace import Span
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_TRACER_NAME = "langchain-poc"
+
+tracer = trace.get_tracer(_TRACER_NAME)
+
+
+# ── span helpers ──────────────────────────────────────────────────────────────
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """Open a span as the current span for the duration of the block.
+
+    Args:
+        name: Span name (low cardinality, e.g. ``"odoo.crm.lead.read"``).
+        **attributes: Span attributes; None values are dropped.
+
+    Yields:
+        Span: The active span.
+    """
+    attrs = {key: value for key, value in attributes.items() if value is not None}
+    with tracer.start_as_current_span(name, attributes=attrs) as current:
+        yield current
+
+
+def traced(name: str) -> Callable[[Callable], Callable]:
+    """Decorate a function so that every call runs in a span named ``name``."""
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with tracer.start_as_current_span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# ── per-request breakdown ─────────────────────────────────────────────────────
+
+
+class _Breakdown:
+    """Accumulated span durations of one request, keyed by span name."""
+
+    def __init__(self) -> None:
+        self.durations: dict[str, float] = defaultdict(float)
+        self.counts: dict[str, int] = defaultdict(int)
+
+    def add(self, name: str, duration_ms: float) -> None:
+        self.durations[name] += duration_ms
+        self.counts[name] += 1
+
+    def summary(self) -> dict[str, dict]:
+        ordered = sorted(self.durations.items(), key=lambda item: item[1], reverse=True)
+        return {name: {"ms": round(ms, 1), "count": self.counts[name]} for name, ms in ordered}
+
+
+class BreakdownProcessor(SpanProcessor):
+    """Span processor adding finished spans to their request's breakdown."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._active: dict[int, _Breakdown] = {}
+
+    def open(self, trace_id: int) -> None:
+        """Start collecting spans of ``trace_id``."""
+        with self._lock:
+            self._active[trace_id] = _Breakdown()
+
+    def close(self, trace_id: int) -> dict[str, dict]:
+        """Stop collecting ``trace_id`` and return its summary."""
+        with self._lock:
+            breakdown = self._active.pop(trace_id, None)
+        return breakdown.summary() if breakdown else {}
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if span.parent is None or span.start_time is None or span.end_time is None:
+            return
+        with self._lock:
+            breakdown = self._active.get(span.context.trace_id)
+            if breakdown is not None:
+                breakdown.add(span.name, (span.end_time - span.start_time) / 1e6)
+
+
+_breakdown_processor = BreakdownProcessor()
+_in_request: ContextVar[bool] = ContextVar("tracing_in_request", default=False)
+
+
+@contextmanager
+def request_span(name: str, **attributes: Any) -> Iterator[Span]:
+    """Open the root span of a request and log its timing breakdown.
+
+    Nested inside another request span (e.g. a workflow run started by
+    ``/workflows/run``), this is an ordinary child span.
+
+    Args:
+        name: Span name (e.g. ``"http.chat"``).
+        **attributes: Span attributes (also added to the log event).
+
+    Yields:
+        Span: The request span.
+    """
+    if _in_request.get():
+        with span(name, **attributes) as current:
+            yield current
+        return
+    token = _in_request.set(True)
+    started = time.perf_counter()
+    try:
+        with span(name, **attributes) as current:
+            trace_id = current.get_span_context().trace_id
+            recording = current.is_recording()
+            if recording:
+                _breakdown_processor.open(trace_id)
+            try:
+                yield current
+            finally:
+                if recording:
+                    logger.info(
+                        "request_timing",
+                        request=name,
+                        trace_id=f"{trace_id:032x}",
+                        total_ms=round((time.perf_counter() - started) * 1000, 1),
+                        spans=_breakdown_processor.close(trace_id),
+                        **{k: v for k, v in attributes.items() if v is not None},
+                    )
+    finally:
+        _in_request.reset(token)
+
+
+# ── exporters and setup ───────────────────────────────────────────────────────
+
+
+class JSONLinesSpanExporter(SpanExporter):
+    """Append finished spans to a file, one JSON object per line."""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, spans) -> SpanExportResult:
+        lines = "".join(
+            json.dumps(json.loads(item.to_json()), separators=(",", ":")) + "\n" for item in spans
+        )
+        with self._lock, self.path.open("a", encoding="utf-8") as handle:
+            handle.write(lines)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+_provider: TracerProvider | None = None
+
+
+def configure_tracing(exporter: str | None = None) -> TracerProvider:
+    """Install the SDK tracer provider (once per process).
+
+    Args:
+        exporter: ``"none"``, ``"console"`` or ``"file"``; defaults to
+            ``settings.tracing_exporter``.
+
+    Returns:
+        TracerProvider: The installed provider.
+    """
+    global _provider
+    if _provider is not None:
+        return _provider
+    kind = (exporter or settings.tracing_exporter).lower()
+    provider = TracerProvider(resource=Resource.create({"service.name": _TRACER_NAME}))
+    provider.add_span_processor(_breakdown_processor)
+    if kind == "console":
+        provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
+    elif kind == "file":
+        provider.add_span_processor(BatchSpanProcessor(JSONLinesSpanExporter(settings.tracing_file)))
+    elif kind != "none":
+        logger.warning("tracing_unknown_exporter", exporter=kind)
+    trace.set_tracer_provider(provider)
+    _provider = provider
+    logger.info("tracing_configured", exporter=kind)
+    return provider
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans to the exporter."""
+    if _provider is not None:
+        _provider.force_flush()
+
+
+def __getattr__(name: str):
+    if name == "LangChainTracingHandler":
+        from app.utils.langchain_tracing import LangChainTracingHandler
+
+        return LangChainTracingHandler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
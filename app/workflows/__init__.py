@@ -2,6 +2,7 @@
 
 from app.workflows.base_workflow import BaseWorkflow, WorkflowResult
 from app.workflows.customer_onboarding import CustomerOnboardingWorkflow
+from app.workflows.engine import GraphWorkflow, Step, StepContext, StepGraph, WorkflowHalt
 from app.workflows.lead_qualification import LeadQualificationWorkflow
 from app.workflows.lost_lead_recovery import LostLeadRecoveryWorkflow
 from app.workflows.opportunity_follow_up import OpportunityFollowUpWorkflow
@@ -10,6 +11,11 @@ from app.workflows.registry import WorkflowRegistry, workflow_registry
 __all__ = [
     "BaseWorkflow",
     "WorkflowResult",
+    "GraphWorkflow",
+    "Step",
+    "StepContext",
+    "StepGraph",
+    "WorkflowHalt",
     "LeadQualificationWorkflow",
     "OpportunityFollowUpWorkflow",
     "CustomerOnboardingWorkflow",
@@ -13,12 +13,15 @@ class WorkflowResult:
         steps_executed: List of step names that were run.
         message: Human-readable summary of the outcome.
         error: Error message if the workflow failed, otherwise None.
+        step_details: Per-step records (name, status, duration_ms, error)
+            for workflows run by the step-graph engine.
     """
 
     success: bool
     steps_executed: list[str] = field(default_factory=list)
     message: str = ""
     error: str | None = None
+    step_details: list[dict] = field(default_factory=list)
 
 
 class BaseWorkflow(ABC):
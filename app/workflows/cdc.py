@@ -0,0 +1,470 @@
+"""Change-data-capture (CDC) for Odoo records based on ``write_date`` watermarks.
+
+:class:`ChangePoller` reads records of one model whose ``(write_date, id)``
+is past a watermark persisted in SQLite, using keyset pagination ordered by
+``write_date, id`` so no page is skipped or repeated.  Each changed record is
+turned into a :class:`ChangeEvent`; for ``crm.lead`` the last seen state
+(open / won / lost) is remembered so transitions raise the same events the
+Odoo webhooks send (``lead.created``, ``lead.won``, ``lead.lost``).
+
+:class:`ChangeFeed` polls a set of pollers on an interval and hands events
+to subscribers; by default events listed in
+:data:`~app.workflows.registry.EVENT_WORKFLOW_MAP` run the mapped workflow.
+This gives near-real-time triggers where Odoo webhooks are not configured.
+Polling does not move the watermark: the feed commits it (and the record
+states) only up to the last event every subscriber handled, so delivery is
+at-least-once — a failed poll or subscriber is retried on the next tick.
+
+:func:`iter_scan_window` lets scan-style workflows process only the records
+whose ``write_date`` crossed their age cutoff since the previous run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+import httpx
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import settings
+from app.memory import cdc_state
+from app.odoo.client import OdooJSONRPCError, odoo_client
+from app.odoo.resilience import OdooUnavailableError
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Failures of one poll or dispatch that are logged without stopping the feed:
+# Odoo errors (including failed logins), transport errors and state-DB errors.
+FEED_ERRORS = (OdooJSONRPCError, OdooUnavailableError, httpx.HTTPError, SQLAlchemyError, ValueError)
+
+# Ticks an event is retried for before it is dropped so it cannot block its model.
+MAX_DELIVERY_ATTEMPTS = 5
+
+ODOO_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+LEAD_CDC_FIELDS = [
+    "id",
+    "name",
+    "type",
+    "active",
+    "probability",
+    "stage_id",
+    "user_id",
+    "create_date",
+    "write_date",
+]
+ACTIVITY_CDC_FIELDS = [
+    "id",
+    "res_model",
+    "res_id",
+    "activity_type_id",
+    "user_id",
+    "state",
+    "date_deadline",
+    "create_date",
+    "write_date",
+]
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """A change detected on an Odoo record.
+
+    Attributes:
+        event: Event name (e.g. ``"lead.won"``, ``"activity.updated"``).
+        model: Odoo model name.
+        record_id: Changed record id.
+        write_date: ``write_date`` of the change.
+        record: The polled record fields.
+        state: State to remember for the record once the event is delivered.
+    """
+
+    event: str
+    model: str
+    record_id: int
+    write_date: str
+    record: dict = field(default_factory=dict, compare=False)
+    state: str | None = field(default=None, compare=False)
+
+
+Classifier = Callable[[dict, str | None], tuple[str, str | None]]
+
+
+def _keyset_domain(after: tuple[str, int]) -> list:
+    """Return the domain selecting records strictly after ``(write_date, id)``."""
+    write_date, record_id = after
+    return [
+        "|",
+        ["write_date", ">", write_date],
+        "&",
+        ["write_date", "=", write_date],
+        ["id", ">", record_id],
+    ]
+
+
+def iter_keyset_pages(
+    model: str,
+    domain: list,
+    fields: list[str],
+    after: tuple[str, int],
+    page_size: int,
+) -> Iterator[list[dict]]:
+    """Yield pages of records ordered by ``(write_date, id)`` after a watermark.
+
+    Args:
+        model: Odoo model name.
+        domain: Extra domain terms ANDed with the keyset condition.
+        fields: Field names to read (must include ``id`` and ``write_date``).
+        after: Exclusive ``(write_date, id)`` lower bound.
+        page_size: Maximum records per page.
+
+    Yields:
+        list[dict]: One page of records.
+    """
+    while True:
+        page = odoo_client.search_read(
+            model,
+            list(domain) + _keyset_domain(after),
+            fields,
+            limit=page_size,
+            order="write_date asc, id asc",
+        )
+        if not page:
+            return
+        yield page
+        if len(page) < page_size:
+            return
+        after = (page[-1]["write_date"], page[-1]["id"])
+
+
+def classify_lead(record: dict, previous: str | None) -> tuple[str, str | None]:
+    """Map a changed ``crm.lead`` record to an event and its new state.
+
+    Transition events need a known previous state.  A lead seen for the first
+    time (after a state reset, or an old lead edited again) only has its
+    state recorded, so it never re-fires ``lead.won`` / ``lead.lost``;
+    ``lead.won`` is raised only for an open lead that became won.
+
+    Args:
+        record: Polled lead record.
+        previous: Last seen state (``"open"``, ``"won"``, ``"lost"``) or None.
+
+    Returns:
+        tuple[str, str | None]: Event name and the state to remember.
+    """
+    if not record.get("active", True):
+        state = "lost"
+    elif (record.get("probability") or 0) >= 100:
+        state = "won"
+    else:
+        state = "open"
+    if previous is None:
+        created = record.get("create_date") == record.get("write_date")
+        return ("lead.created" if created else "lead.updated"), state
+    if state == previous or (state == "won" and previous != "open"):
+        return "lead.updated", state
+    return f"lead.{state}" if state != "open" else "lead.reopened", state
+
+
+def classify_activity(record: dict, previous: str | None) -> tuple[str, str | None]:
+    """Map a changed ``mail.activity`` record to an event (no state tracking).
+
+    Args:
+        record: Polled activity record.
+        previous: Unused.
+
+    Returns:
+        tuple[str, str | None]: Event name and None.
+    """
+    created = record.get("create_date") == record.get("write_date")
+    return ("activity.created" if created else "activity.updated"), None
+
+
+class ChangePoller:
+    """Polls one Odoo model for records changed since a persisted watermark.
+
+    Args:
+        model: Odoo model name.
+        fields: Fields to read for each changed record.
+        classify: Callable mapping ``(record, previous_state)`` to
+            ``(event_name, new_state)``.  When it returns a state, states are
+            persisted per record to detect transitions.
+        domain: Extra domain terms (e.g. to include archived records).
+        page_size: Records per keyset page.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        fields: list[str],
+        classify: Classifier,
+        domain: list | None = None,
+        page_size: int | None = None,
+    ) -> None:
+        self.model = model
+        self.fields = fields
+        self.classify = classify
+        self.domain = domain or []
+        self.page_size = page_size or settings.cdc_page_size
+        self.watermark_name = f"cdc:{model}"
+
+    def _initial_watermark(self) -> tuple[str, int]:
+        start = datetime.now(UTC) - timedelta(minutes=settings.cdc_initial_lookback_minutes)
+        return start.strftime(ODOO_DATETIME_FORMAT), 0
+
+    def poll(self) -> list[ChangeEvent]:
+        """Fetch all changes since the watermark, without advancing it.
+
+        Call :meth:`commit` with the events once they are handled; until then
+        the next poll returns them again.
+
+        Returns:
+            list[ChangeEvent]: Events in ``(write_date, id)`` order.
+        """
+        after = cdc_state.get_watermark(self.watermark_name) or self._initial_watermark()
+        events: list[ChangeEvent] = []
+        for page in iter_keyset_pages(self.model, self.domain, self.fields, after, self.page_size):
+            previous = cdc_state.get_record_states(self.model, [r["id"] for r in page])
+            for record in page:
+                event_name, state = self.classify(record, previous.get(record["id"]))
+                events.append(
+                    ChangeEvent(
+                        event=event_name,
+                        model=self.model,
+                        record_id=record["id"],
+                        write_date=record["write_date"],
+                        record=record,
+                        state=state,
+                    )
+                )
+        if events:
+            logger.info("cdc_poll", model=self.model, changes=len(events))
+        return events
+
+    def commit(self, events: list[ChangeEvent]) -> None:
+        """Remember the states of handled events and move the watermark past the last one.
+
+        Args:
+            events: A prefix of what :meth:`poll` returned, in the same order.
+        """
+        if not events:
+            return
+        states = {e.record_id: e.state for e in events if e.state is not None}
+        cdc_state.set_record_states(self.model, states)
+        last = events[-1]
+        cdc_state.set_watermark(self.watermark_name, last.write_date, last.record_id)
+
+
+Subscriber = Callable[[ChangeEvent], Awaitable[None]]
+
+
+async def run_mapped_workflow(event: ChangeEvent) -> None:
+    """Run the workflow mapped to a CDC event, if any.
+
+    Args:
+        event: The change event.
+    """
+    from app.workflows.registry import EVENT_WORKFLOW_MAP, workflow_registry
+
+    workflow_name = EVENT_WORKFLOW_MAP.get(event.event)
+    workflow = workflow_registry.get(workflow_name) if workflow_name else None
+    if workflow is None:
+        return
+    result = await workflow.execute({"lead_id": event.record_id})
+    logger.info(
+        "cdc_workflow_run",
+        cdc_event=event.event,
+        workflow=workflow_name,
+        record_id=event.record_id,
+        success=result.success,
+    )
+
+
+class ChangeFeed:
+    """Runs a set of pollers and dispatches their events to subscribers.
+
+    Args:
+        pollers: Pollers to run on every tick.
+        subscribers: Async callbacks receiving each event.  Defaults to
+            :func:`run_mapped_workflow`.
+    """
+
+    def __init__(
+        self,
+        pollers: list[ChangePoller],
+        subscribers: list[Subscriber] | None = None,
+    ) -> None:
+        self.pollers = pollers
+        self.subscribers = list(subscribers) if subscribers is not None else [run_mapped_workflow]
+        self._attempts: dict[tuple[str, int, str], int] = {}
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        """Add an event subscriber.
+
+        Args:
+            subscriber: Async callback receiving each :class:`ChangeEvent`.
+        """
+        self.subscribers.append(subscriber)
+
+    async def tick(self) -> list[ChangeEvent]:
+        """Poll every model once, dispatch the events and commit the handled ones.
+
+        A model whose poll fails is skipped.  When a subscriber fails, the
+        model's events from that one on are left uncommitted and polled again
+        on the next tick (subscribers that already handled the failed event
+        see it again); after :data:`MAX_DELIVERY_ATTEMPTS` ticks the event is
+        dropped.
+
+        Returns:
+            list[ChangeEvent]: The events committed in this tick.
+        """
+        delivered: list[ChangeEvent] = []
+        for poller in self.pollers:
+            try:
+                events = await asyncio.to_thread(poller.poll)
+            except FEED_ERRORS as exc:
+                logger.warning("cdc_poll_failed", model=poller.model, error=str(exc))
+                continue
+            handled = await self._dispatch(events)
+            try:
+                await asyncio.to_thread(poller.commit, handled)
+            except FEED_ERRORS as exc:
+                logger.warning("cdc_commit_failed", model=poller.model, error=str(exc))
+                continue
+            delivered.extend(handled)
+        return delivered
+
+    async def _dispatch(self, events: list[ChangeEvent]) -> list[ChangeEvent]:
+        """Hand events to every subscriber in order; return those handled before a failure."""
+        for position, event in enumerate(events):
+            for subscriber in self.subscribers:
+                try:
+                    await subscriber(event)
+                except FEED_ERRORS as exc:
+                    key = (event.model, event.record_id, event.write_date)
+                    attempts = self._attempts[key] = self._attempts.get(key, 0) + 1
+                    if attempts < MAX_DELIVERY_ATTEMPTS:
+                        logger.warning(
+                            "cdc_dispatch_failed",
+                            cdc_event=event.event,
+                            record_id=event.record_id,
+                            attempt=attempts,
+                            error=str(exc),
+                        )
+                        return events[:position]
+                    logger.error(
+                        "cdc_event_dropped",
+                        cdc_event=event.event,
+                        record_id=event.record_id,
+                        attempts=attempts,
+                        error=str(exc),
+                    )
+            self._attempts.pop((event.model, event.record_id, event.write_date), None)
+        return events
+
+    async def run_forever(self, interval: float) -> None:
+        """Tick every ``interval`` seconds until cancelled.
+
+        Args:
+            interval: Seconds between polls.
+        """
+        logger.info("cdc_feed_started", interval=interval, models=[p.model for p in self.pollers])
+        try:
+            while True:
+                await self.tick()
+                await asyncio.sleep(interval)
+        except Exception:
+            logger.exception("cdc_feed_stopped")
+            raise
+
+
+def default_change_feed() -> ChangeFeed:
+    """Return a feed polling ``crm.lead`` (including archived) and ``mail.activity``.
+
+    Returns:
+        ChangeFeed: Feed dispatching to :func:`run_mapped_workflow`.
+    """
+    return ChangeFeed(
+        [
+            ChangePoller(
+                "crm.lead",
+                LEAD_CDC_FIELDS,
+                classify_lead,
+                domain=[["active", "in", [True, False]]],
+            ),
+            ChangePoller("mail.activity", ACTIVITY_CDC_FIELDS, classify_activity),
+        ]
+    )
+
+
+def iter_scan_window(
+    name: str,
+    model: str,
+    domain: list,
+    fields: list[str],
+    cutoff: str,
+    page_size: int | None = None,
+) -> Iterator[list[dict]]:
+    """Yield records whose ``write_date`` crossed ``cutoff`` since the last scan.
+
+    Scan-style workflows select records older than a moving cutoff.  Instead
+    of rescanning everything below the cutoff, this only reads records with
+    ``previous_cutoff <= write_date < cutoff``.  The new cutoff is persisted
+    with :func:`commit_scan_window` once the caller has processed the window.
+
+    Args:
+        name: Watermark name for the scan (unique per workflow and threshold).
+        model: Odoo model name.
+        domain: Workflow-specific domain terms.
+        fields: Fields to read (must include ``id`` and ``write_date``).
+        cutoff: Exclusive upper bound (``YYYY-MM-DD HH:MM:SS``).
+        page_size: Records per keyset page.
+
+    Yields:
+        list[dict]: One page of records in the window.
+    """
+    previous = cdc_state.get_watermark(name)
+    # (cutoff, 0) includes records written exactly at the previous cutoff,
+    # which that window excluded with its strict upper bound.
+    after = (previous[0], 0) if previous else ("1970-01-01 00:00:00", 0)
+    yield from iter_keyset_pages(
+        model,
+        list(domain) + [["write_date", "<", cutoff]],
+        fields,
+        after,
+        page_size or settings.cdc_page_size,
+    )
+
+
+def commit_scan_window(name: str, cutoff: str) -> None:
+    """Persist ``cutoff`` as the lower bound of the next scan window.
+
+    Args:
+        name: Watermark name used with :func:`iter_scan_window`.
+        cutoff: The cutoff of the window just processed.
+    """
+    cdc_state.set_watermark(name, cutoff, 0)
+
+
+def scan_window_records(
+    name: str, model: str, domain: list, fields: list[str], cutoff: str
+) -> list[dict]:
+    """Return every record of the current scan window as a flat list.
+
+    Args:
+        name: Watermark name for the scan.
+        model: Odoo model name.
+        domain: Workflow-specific domain terms.
+        fields: Fields to read.
+        cutoff: Exclusive upper bound of the window.
+
+    Returns:
+        list[dict]: Records in ``(write_date, id)`` order.
+    """
+    return [
+        record for page in iter_scan_window(name, model, domain, fields, cutoff) for record in page
+    ]
@@ -1,18 +1,33 @@
 """Customer Onboarding workflow — triggered after a lead is marked Won."""
 
+from typing import Any
+
 from app.odoo.models.crm_lead import get_lead
+from app.odoo.models.crm_team import get_team
 from app.odoo.models.res_partner import get_partner
-from app.workflows.base_workflow import BaseWorkflow, WorkflowResult
+from app.workflows.base_workflow import WorkflowResult
+from app.workflows.engine import GraphWorkflow, Step, StepContext, WorkflowHalt
+
+
+def _many2one_id(value: Any) -> int | None:
+    """Return the id of a many2one value (``[id, name]`` or ``False``)."""
+    if value and isinstance(value, (list, tuple)):
+        return value[0]
+    return value or None
 
 
-class CustomerOnboardingWorkflow(BaseWorkflow):
+class CustomerOnboardingWorkflow(GraphWorkflow):
     """Post-Won onboarding process for new customers.
 
     Steps:
-        1. validate_partner — ensure partner record is complete
-        2. assign_am — assign an account manager (from team)
-        3. create_activities — create onboarding activities
-        4. log_chatter — post a welcome message to the chatter
+        1. get_lead — retrieve the won lead
+        2. validate_partner — ensure partner record is complete
+        3. assign_am — look up the account manager (from context or team)
+        4. create_activities — create onboarding activities
+        5. log_chatter — post a welcome message to the chatter
+
+    ``validate_partner`` and ``assign_am`` only depend on ``get_lead`` and
+    run concurrently.
 
     Trigger: Lead/Opportunity marked as Won.
     """
@@ -20,55 +35,79 @@ class CustomerOnboardingWorkflow(BaseWorkflow):
     name = "customer_onboarding"
     description = "Post-won partner validation and onboarding activity creation"
 
-    async def execute(self, context: dict) -> WorkflowResult:
-        """Execute the customer onboarding workflow.
+    def validate(self, context: dict) -> WorkflowResult | None:
+        """Require ``lead_id``.
 
         Args:
             context: Must contain ``lead_id`` (int).  Optionally
                 ``account_manager_id`` (int).
 
         Returns:
-            WorkflowResult: Onboarding execution result.
+            WorkflowResult | None: Failure result if ``lead_id`` is missing.
         """
-        steps: list[str] = []
-        lead_id: int | None = context.get("lead_id")
-
-        if not lead_id:
+        if not context.get("lead_id"):
             return WorkflowResult(
                 success=False, message="lead_id is required", error="Missing lead_id"
             )
+        return None
 
-        # Step 1: Validate partner
-        lead = get_lead(lead_id)
-        if not lead:
-            return WorkflowResult(
-                success=False,
-                message=f"Lead {lead_id} not found",
-                error="Lead not found",
-            )
+    def build_steps(self, context: dict) -> list[Step]:
+        """Return the onboarding step graph.
 
-        partner_id = lead.get("partner_id")
-        if partner_id and isinstance(partner_id, (list, tuple)):
-            partner_id = partner_id[0]
+        Args:
+            context: Workflow input context.
 
-        partner = get_partner(partner_id) if partner_id else {}
-        missing = [f for f in ["email", "phone"] if not partner.get(f)]
-        steps.append("validate_partner")
+        Returns:
+            list[Step]: The workflow steps.
+        """
+        return [
+            Step("get_lead", self._get_lead),
+            Step("validate_partner", self._validate_partner, ("get_lead",)),
+            Step("assign_am", self._assign_am, ("get_lead",)),
+            # Stub — activity creation requires type_id lookup
+            Step("create_activities", lambda ctx: None, ("validate_partner", "assign_am")),
+            # Stub — requires mail.message creation
+            Step("log_chatter", lambda ctx: None, ("create_activities",)),
+        ]
+
+    def summarize(self, context: dict, results: dict[str, Any]) -> str:
+        """Describe the onboarding outcome.
 
-        # Step 2: Assign account manager (stub)
-        steps.append("assign_am")
+        Args:
+            context: Workflow input context.
+            results: Step outputs.
 
-        # Step 3: Create onboarding activities (stub)
-        steps.append("create_activities")
+        Returns:
+            str: Summary message.
+        """
+        missing = results["validate_partner"]["missing"]
+        return (
+            f"Onboarding initiated for lead '{results['get_lead'].get('name')}'. "
+            f"Partner fields missing: {missing or 'none'}."
+        )
 
-        # Step 4: Log chatter message (stub — requires mail.message creation)
-        steps.append("log_chatter")
+    @staticmethod
+    def _get_lead(ctx: StepContext) -> dict:
+        lead_id = ctx.context["lead_id"]
+        lead = get_lead(lead_id)
+        if not lead:
+            raise WorkflowHalt(f"Lead {lead_id} not found", success=False, error="Lead not found")
+        return lead
 
-        return WorkflowResult(
-            success=True,
-            steps_executed=steps,
-            message=(
-                f"Onboarding initiated for lead '{lead.get('name')}'. "
-                f"Partner fields missing: {missing or 'none'}."
-            ),
-        )
+    @staticmethod
+    def _validate_partner(ctx: StepContext) -> dict:
+        partner_id = _many2one_id(ctx.results["get_lead"].get("partner_id"))
+        partner = get_partner(partner_id) if partner_id else {}
+        return {
+            "partner_id": partner_id,
+            "missing": [f for f in ["email", "phone"] if not partner.get(f)],
+        }
+
+    @staticmethod
+    def _assign_am(ctx: StepContext) -> int | None:
+        if ctx.context.get("account_manager_id"):
+            return ctx.context["account_manager_id"]
+        lead = ctx.results["get_lead"]
+        team_id = _many2one_id(lead.get("team_id"))
+        team = get_team(team_id) if team_id else {}
+        return _many2one_id(team.get("user_id")) or _many2one_id(lead.get("user_id"))
@@ -0,0 +1,391 @@
+"""Declarative step-graph engine for CRM workflows.
+
+A workflow is described as a set of :class:`Step` objects with explicit
+dependencies.  :class:`StepGraph` runs every step as soon as its
+dependencies have completed, so independent steps execute concurrently
+(synchronous steps run in worker threads).  :class:`GraphWorkflow` wires a
+graph into :class:`~app.workflows.base_workflow.BaseWorkflow`: each run is
+recorded in ``workflow_log`` with per-step durations and outcomes, and the
+output of every completed step is checkpointed so that a failed run resumes
+where it stopped when it is re-run with the same context.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect
+import json
+import time
+from abc import abstractmethod
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import settings
+from app.memory import workflow_log
+from app.odoo.unit_of_work import unit_of_work
+from app.utils.logger import get_logger
+from app.utils.tracing import request_span, span
+from app.workflows.base_workflow import BaseWorkflow, WorkflowResult
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class StepContext:
+    """Input passed to every step function.
+
+    Attributes:
+        context: The workflow input context.
+        results: Outputs of the steps completed so far, keyed by step name.
+    """
+
+    context: dict
+    results: dict[str, Any]
+
+
+StepFunc = Callable[[StepContext], Any]
+
+
+@dataclass(frozen=True)
+class Step:
+    """A single node of a workflow step graph.
+
+    Attributes:
+        name: Unique step name (recorded in ``steps_executed``).
+        func: Sync or async callable receiving a :class:`StepContext`.  Its
+            return value must be JSON-serializable so it can be checkpointed.
+        depends_on: Names of the steps that must complete first.
+    """
+
+    name: str
+    func: StepFunc
+    depends_on: tuple[str, ...] = ()
+
+
+@dataclass
+class StepRecord:
+    """Outcome of one step within a run.
+
+    Attributes:
+        name: Step name.
+        status: ``"success"``, ``"resumed"``, ``"halted"``, ``"failed"`` or
+            ``"skipped"``.
+        duration_ms: Wall-clock duration of the step.
+        error: Error message for failed steps.
+    """
+
+    name: str
+    status: str
+    duration_ms: float = 0.0
+    error: str | None = None
+
+
+class WorkflowHalt(Exception):
+    """Raised by a step to end the workflow early with a final message.
+
+    Args:
+        message: Human-readable outcome returned to the caller.
+        success: Whether the early exit counts as a successful run.
+        error: Error message for unsuccessful halts.
+    """
+
+    def __init__(self, message: str, *, success: bool = True, error: str | None = None) -> None:
+        super().__init__(message)
+        self.message = message
+        self.success = success
+        self.error = error
+
+
+@dataclass
+class GraphRun:
+    """Result of :meth:`StepGraph.run`.
+
+    Attributes:
+        results: Outputs of all completed steps.
+        records: Per-step outcomes in completion order.
+        halt: The :class:`WorkflowHalt` raised by a step, if any.
+        error: The first unexpected step exception, if any.
+        failed_step: Name of the step that raised ``error``.
+    """
+
+    results: dict[str, Any] = field(default_factory=dict)
+    records: list[StepRecord] = field(default_factory=list)
+    halt: WorkflowHalt | None = None
+    error: BaseException | None = None
+    failed_step: str | None = None
+
+    @property
+    def steps_executed(self) -> list[str]:
+        """Names of the steps that ran (or were resumed) successfully."""
+        done = {"success", "resumed"} | ({"halted"} if self.halt and self.halt.success else set())
+        return [record.name for record in self.records if record.status in done]
+
+
+class StepGraph:
+    """Validated DAG of workflow steps.
+
+    Args:
+        steps: The workflow steps.
+
+    Raises:
+        ValueError: On duplicate names, unknown dependencies or cycles.
+    """
+
+    def __init__(self, steps: list[Step]) -> None:
+        self.steps: dict[str, Step] = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"Duplicate workflow step '{step.name}'")
+            self.steps[step.name] = step
+        for step in steps:
+            unknown = set(step.depends_on) - set(self.steps)
+            if unknown:
+                raise ValueError(f"Step '{step.name}' depends on unknown steps {sorted(unknown)}")
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        remaining = {name: set(step.depends_on) for name, step in self.steps.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Workflow steps contain a cycle: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    @staticmethod
+    async def _call(step: Step, step_context: StepContext) -> Any:
+        with span(f"workflow.step.{step.name}"):
+            if inspect.iscoroutinefunction(step.func):
+                return await step.func(step_context)
+            return await asyncio.to_thread(step.func, step_context)
+
+    async def run(
+        self,
+        context: dict,
+        completed: dict[str, Any] | None = None,
+        on_complete: Callable[[str, Any], Awaitable[None] | None] | None = None,
+    ) -> GraphRun:
+        """Run all steps, starting each one as soon as its dependencies finish.
+
+        Args:
+            context: Workflow input context.
+            completed: Outputs of steps already completed by a previous run;
+                these steps are not executed again.
+            on_complete: Callback (plain or async) invoked with
+                ``(step_name, output)`` after each step succeeds (used for
+                checkpointing).
+
+        Returns:
+            GraphRun: Step outputs, records and the halt/error outcome.
+        """
+        run = GraphRun()
+        for name, output in (completed or {}).items():
+            if name in self.steps:
+                run.results[name] = output
+                run.records.append(StepRecord(name=name, status="resumed"))
+
+        pending = {name: step for name, step in self.steps.items() if name not in run.results}
+        running: dict[asyncio.Task, tuple[Step, float]] = {}
+        stopping = False
+
+        while pending or running:
+            if not stopping:
+                for name, step in list(pending.items()):
+                    if all(dep in run.results for dep in step.depends_on):
+                        del pending[name]
+                        step_context = StepContext(context=context, results=dict(run.results))
+                        task = asyncio.create_task(self._call(step, step_context))
+                        running[task] = (step, time.perf_counter())
+            if not running:
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                step, started = running.pop(task)
+                duration_ms = round((time.perf_counter() - started) * 1000, 2)
+                exc = task.exception()
+                if exc is None:
+                    output = task.result()
+                    run.results[step.name] = output
+                    run.records.append(StepRecord(step.name, "success", duration_ms))
+                    if on_complete is not None:
+                        pending_callback = on_complete(step.name, output)
+                        if inspect.isawaitable(pending_callback):
+                            await pending_callback
+                elif isinstance(exc, WorkflowHalt):
+                    run.halt = run.halt or exc
+                    run.records.append(StepRecord(step.name, "halted", duration_ms, exc.error))
+                    stopping = True
+                else:
+                    if run.error is None:
+                        run.error, run.failed_step = exc, step.name
+                    run.records.append(StepRecord(step.name, "failed", duration_ms, str(exc)))
+                    stopping = True
+
+        run.records.extend(StepRecord(name, "skipped") for name in pending)
+        return run
+
+
+def checkpoint_key(context: dict) -> str:
+    """Return a stable key identifying a workflow run by its input context.
+
+    Args:
+        context: Workflow input context.
+
+    Returns:
+        str: Hex digest of the canonical JSON encoding of ``context``.
+    """
+    encoded = json.dumps(context, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+class GraphWorkflow(BaseWorkflow):
+    """Base class for workflows declared as a step graph.
+
+    Subclasses implement :meth:`build_steps` and :meth:`summarize`, and may
+    override :meth:`validate` to reject a context before anything runs.
+    """
+
+    @abstractmethod
+    def build_steps(self, context: dict) -> list[Step]:
+        """Return the steps of this workflow for the given context.
+
+        Args:
+            context: Workflow input context.
+
+        Returns:
+            list[Step]: The workflow steps.
+        """
+
+    @abstractmethod
+    def summarize(self, context: dict, results: dict[str, Any]) -> str:
+        """Build the final human-readable message of a completed run.
+
+        Args:
+            context: Workflow input context.
+            results: Outputs of all steps, keyed by step name.
+
+        Returns:
+            str: Summary message.
+        """
+
+    def validate(self, context: dict) -> WorkflowResult | None:
+        """Return a failed result if the context is unusable, otherwise None.
+
+        Args:
+            context: Workflow input context.
+
+        Returns:
+            WorkflowResult | None: Early failure result, or None to proceed.
+        """
+        return None
+
+    async def execute(self, context: dict) -> WorkflowResult:
+        """Run the step graph, resuming from checkpoints of a failed run.
+
+        The run is traced as a request span (a child span when started from
+        an already traced request such as ``/workflows/run``).
+
+        Args:
+            context: Workflow input context.
+
+        Returns:
+            WorkflowResult: Outcome with per-step records in ``step_details``.
+        """
+        with request_span(f"workflow.{self.name}", **{"workflow.name": self.name}):
+            return await self._execute(context)
+
+    async def _execute(self, context: dict) -> WorkflowResult:
+        invalid = self.validate(context)
+        if invalid is not None:
+            return invalid
+
+        graph = StepGraph(self.build_steps(context))
+        run_key = checkpoint_key(context)
+        completed = (
+            await self._persist(
+                "load_checkpoints",
+                workflow_log.load_checkpoints,
+                self.name,
+                run_key,
+                settings.workflow_checkpoint_ttl_seconds,
+            )
+            or {}
+        )
+        if completed:
+            logger.info("workflow_resume", name=self.name, steps=sorted(completed))
+        log_id = await self._persist(
+            "log_start", workflow_log.log_workflow_start, self.name, "manual", context
+        )
+
+        async def _checkpoint(step_name: str, output: Any) -> None:
+            await self._persist(
+                "save_checkpoint",
+                workflow_log.save_checkpoint,
+                self.name,
+                run_key,
+                step_name,
+                output,
+            )
+
+        with unit_of_work(self.name):
+            run = await graph.run(context, completed=completed, on_complete=_checkpoint)
+        details = [asdict(record) for record in run.records]
+
+        if run.error is not None:
+            logger.warning(
+                "workflow_step_failed", name=self.name, step=run.failed_step, error=str(run.error)
+            )
+            result = WorkflowResult(
+                success=False,
+                steps_executed=run.steps_executed,
+                message=(
+                    f"Workflow '{self.name}' failed at step '{run.failed_step}'. "
+                    "Completed steps were checkpointed; re-run with the same context to resume."
+                ),
+                error=str(run.error),
+                step_details=details,
+            )
+        else:
+            await self._persist(
+                "clear_checkpoints", workflow_log.clear_checkpoints, self.name, run_key
+            )
+            if run.halt is not None:
+                result = WorkflowResult(
+                    success=run.halt.success,
+                    steps_executed=run.steps_executed,
+                    message=run.halt.message,
+                    error=run.halt.error,
+                    step_details=details,
+                )
+            else:
+                result = WorkflowResult(
+                    success=True,
+                    steps_executed=run.steps_executed,
+                    message=self.summarize(context, run.results),
+                    step_details=details,
+                )
+
+        if log_id is not None:
+            await self._persist(
+                "log_complete",
+                workflow_log.log_workflow_complete,
+                log_id,
+                details,
+                "success" if result.success else "failed",
+            )
+        return result
+
+    async def _persist(self, action: str, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a workflow_log function in a thread, logging instead of failing on DB errors."""
+        try:
+            return await asyncio.to_thread(func, *args)
+        except SQLAlchemyError as exc:
+            logger.warning("workflow_persist_failed", name=self.name, action=action, error=str(exc))
+            return None
@@ -1,11 +1,68 @@
 """Lead Qualification workflow."""
 
-from app.odoo.models.crm_lead import get_lead, update_lead
+import time
+from collections import defaultdict
+from typing import Any
+
+import numpy as np
+
+from app.odoo.models.crm_lead import (
+    SCORING_FIELDS,
+    get_lead,
+    iter_lead_batches,
+    update_lead,
+    write_leads,
+)
 from app.odoo.models.crm_stage import get_stage_by_name
-from app.workflows.base_workflow import BaseWorkflow, WorkflowResult
+from app.utils.logger import get_logger
+from app.workflows.base_workflow import WorkflowResult
+from app.workflows.engine import GraphWorkflow, Step, StepContext, WorkflowHalt
 
+logger = get_logger(__name__)
 
-class LeadQualificationWorkflow(BaseWorkflow):
+# Score thresholds (inclusive) mapped to pipeline stage names, highest first
+STAGE_THRESHOLDS: list[tuple[int, str]] = [
+    (75, "Qualified"),
+    (50, "In Progress"),
+    (0, "New"),
+]
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def score_leads(leads: list[dict]) -> np.ndarray:
+    """Compute BANT scores for many leads in one vectorized pass.
+
+    Args:
+        leads: Lead records containing at least :data:`SCORING_FIELDS`.
+
+    Returns:
+        np.ndarray: Integer scores (0–100), one per lead, in input order.
+    """
+    count = len(leads)
+    columns = [
+        np.fromiter((bool(lead.get(name)) for lead in leads), dtype=bool, count=count)
+        for name in ("expected_revenue", "partner_id", "description", "date_deadline")
+    ]
+    return np.vstack(columns).sum(axis=0, dtype=np.int64) * 25
+
+
+def stage_name_for_score(score: int) -> str:
+    """Return the pipeline stage name a BANT score qualifies for.
+
+    Args:
+        score: BANT score (0–100).
+
+    Returns:
+        str: Stage name from :data:`STAGE_THRESHOLDS`.
+    """
+    for threshold, stage_name in STAGE_THRESHOLDS:
+        if score >= threshold:
+            return stage_name
+    return STAGE_THRESHOLDS[-1][1]
+
+
+class LeadQualificationWorkflow(GraphWorkflow):
     """Qualifies a lead using BANT scoring and assigns it to the correct stage.
 
     Steps:
@@ -19,71 +76,170 @@ class LeadQualificationWorkflow(BaseWorkflow):
         - Authority (partner_id set): +25
         - Need (description not empty): +25
         - Timeline (date_deadline set): +25
+
+    Bulk mode: pass ``lead_ids`` (list[int]) or ``domain`` (Odoo domain)
+    instead of ``lead_id`` to qualify many leads at once.  The graph then is
+    ``fetch_and_score`` → ``assign_stage``: leads are read in pages of
+    ``batch_size`` with only :data:`SCORING_FIELDS`, scored per page with
+    :func:`score_leads`, and written back with one ``write`` per
+    ``(stage, probability)`` group.
     """
 
     name = "lead_qualification"
     description = "Score a lead with BANT criteria and assign it to the correct pipeline stage"
 
-    async def execute(self, context: dict) -> WorkflowResult:
-        """Execute the lead qualification workflow.
+    @staticmethod
+    def _is_bulk(context: dict) -> bool:
+        return context.get("lead_ids") is not None or context.get("domain") is not None
+
+    def validate(self, context: dict) -> WorkflowResult | None:
+        """Require ``lead_id`` unless running in bulk mode.
 
         Args:
-            context: Must contain ``lead_id`` (int).
+            context: Must contain ``lead_id`` (int), or ``lead_ids``
+                (list[int]) / ``domain`` (list) for bulk mode, with an
+                optional ``batch_size`` (int, default 500).
 
         Returns:
-            WorkflowResult: Execution result with steps and BANT score.
+            WorkflowResult | None: Failure result if ``lead_id`` is missing.
         """
-        steps: list[str] = []
-        lead_id: int | None = context.get("lead_id")
-
-        if not lead_id:
+        if not self._is_bulk(context) and not context.get("lead_id"):
             return WorkflowResult(
                 success=False, message="lead_id is required", error="Missing lead_id"
             )
+        return None
+
+    def build_steps(self, context: dict) -> list[Step]:
+        """Return the single-lead or bulk step graph.
 
-        # Step 1: Get lead
+        Args:
+            context: Workflow input context.
+
+        Returns:
+            list[Step]: The workflow steps.
+        """
+        if self._is_bulk(context):
+            return [
+                Step("fetch_and_score", self._fetch_and_score),
+                Step("assign_stage", self._assign_stages, ("fetch_and_score",)),
+            ]
+        return [
+            Step("get_lead", self._get_lead),
+            Step("score", self._score, ("get_lead",)),
+            Step("assign_stage", self._assign_stage, ("score",)),
+            # Stub — activity creation requires type_id lookup
+            Step("schedule_call", lambda ctx: None, ("assign_stage",)),
+        ]
+
+    def summarize(self, context: dict, results: dict[str, Any]) -> str:
+        """Describe the qualification outcome.
+
+        Args:
+            context: Workflow input context.
+            results: Step outputs.
+
+        Returns:
+            str: Summary message.
+        """
+        if self._is_bulk(context):
+            fetched, assigned = results["fetch_and_score"], results["assign_stage"]
+            processed = fetched["processed"]
+            if not processed:
+                return "No leads matched for bulk qualification."
+            elapsed = fetched["seconds"] + assigned["seconds"]
+            throughput = processed / elapsed if elapsed > 0 else 0.0
+            breakdown = ", ".join(
+                f"{name}: {count}" for name, count in assigned["per_stage"].items()
+            )
+            return (
+                f"Qualified {processed} lead(s) with {assigned['writes']} grouped write(s) "
+                f"in {elapsed:.2f}s ({throughput:.1f} leads/s). Stages — {breakdown}."
+            )
+        score = results["score"]
+        return (
+            f"Lead '{results['get_lead'].get('name')}' scored {score}/100 (BANT) "
+            f"and moved to stage '{stage_name_for_score(score)}'."
+        )
+
+    # ------------------------------------------------------------------
+    # Single-lead steps
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _get_lead(ctx: StepContext) -> dict:
+        lead_id = ctx.context["lead_id"]
         lead = get_lead(lead_id)
         if not lead:
-            return WorkflowResult(
-                success=False,
-                message=f"Lead {lead_id} not found",
-                error="Lead not found",
-            )
-        steps.append("get_lead")
-
-        # Step 2: BANT score
-        score = 0
-        if lead.get("expected_revenue", 0):
-            score += 25
-        if lead.get("partner_id"):
-            score += 25
-        if lead.get("description"):
-            score += 25
-        if lead.get("date_deadline"):
-            score += 25
-        steps.append("score")
-
-        # Step 3: Assign stage based on score
-        if score >= 75:
-            stage_name = "Qualified"
-        elif score >= 50:
-            stage_name = "In Progress"
-        else:
-            stage_name = "New"
-
-        stage = get_stage_by_name(stage_name)
-        if stage:
-            update_lead(lead_id, {"stage_id": stage["id"], "probability": score})
-        steps.append("assign_stage")
-
-        # Step 4: Schedule a call (stub — activity creation requires type_id lookup)
-        steps.append("schedule_call")
-
-        return WorkflowResult(
-            success=True,
-            steps_executed=steps,
-            message=(
-                f"Lead '{lead.get('name')}' scored {score}/100 (BANT) "
-                f"and moved to stage '{stage_name}'."
-            ),
+            raise WorkflowHalt(f"Lead {lead_id} not found", success=False, error="Lead not found")
+        return lead
+
+    @staticmethod
+    def _score(ctx: StepContext) -> int:
+        return int(score_leads([ctx.results["get_lead"]])[0])
+
+    @staticmethod
+    def _assign_stage(ctx: StepContext) -> int | None:
+        score = ctx.results["score"]
+        stage = get_stage_by_name(stage_name_for_score(score))
+        if not stage:
+            return None
+        update_lead(ctx.context["lead_id"], {"stage_id": stage["id"], "probability": score})
+        return stage["id"]
+
+    # ------------------------------------------------------------------
+    # Bulk steps
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _fetch_and_score(ctx: StepContext) -> dict:
+        started = time.perf_counter()
+        lead_ids = ctx.context.get("lead_ids")
+        groups: dict[int, list[int]] = defaultdict(list)
+        processed = 0
+        for page in iter_lead_batches(
+            domain=ctx.context.get("domain"),
+            ids=list(lead_ids) if lead_ids is not None else None,
+            fields=SCORING_FIELDS,
+            batch_size=int(ctx.context.get("batch_size") or DEFAULT_BATCH_SIZE),
+        ):
+            for lead, score in zip(page, score_leads(page).tolist()):
+                groups[score].append(lead["id"])
+            processed += len(page)
+        return {
+            "processed": processed,
+            # List of [score, ids] pairs so the output survives a JSON checkpoint
+            "groups": sorted(groups.items(), reverse=True),
+            "seconds": time.perf_counter() - started,
+        }
+
+    @staticmethod
+    def _assign_stages(ctx: StepContext) -> dict:
+        started = time.perf_counter()
+        fetched = ctx.results["fetch_and_score"]
+        stage_ids: dict[str, int | None] = {}
+        per_stage: dict[str, int] = defaultdict(int)
+        writes = 0
+        for score, ids in fetched["groups"]:
+            stage_name = stage_name_for_score(score)
+            if stage_name not in stage_ids:
+                stage = get_stage_by_name(stage_name)
+                stage_ids[stage_name] = stage["id"] if stage else None
+            per_stage[stage_name] += len(ids)
+            if stage_ids[stage_name] is None:
+                continue
+            write_leads(ids, {"stage_id": stage_ids[stage_name], "probability": score})
+            writes += 1
+
+        elapsed = fetched["seconds"] + time.perf_counter() - started
+        logger.info(
+            "lead_qualification_bulk",
+            leads=fetched["processed"],
+            writes=writes,
+            seconds=round(elapsed, 3),
+            leads_per_second=round(fetched["processed"] / elapsed, 1) if elapsed > 0 else 0.0,
         )
+        return {
+            "writes": writes,
+            "per_stage": dict(per_stage),
+            "seconds": time.perf_counter() - started,
+        }
@@ -1,12 +1,14 @@
 """Lost Lead Recovery workflow."""
 
 from datetime import datetime, timedelta
+from typing import Any
 
-from app.odoo.models.crm_lead import get_lead, search_leads
-from app.workflows.base_workflow import BaseWorkflow, WorkflowResult
+from app.odoo.models.crm_lead import FIELDS, get_lead, search_leads
+from app.workflows.cdc import commit_scan_window, scan_window_records
+from app.workflows.engine import GraphWorkflow, Step, StepContext, WorkflowHalt
 
 
-class LostLeadRecoveryWorkflow(BaseWorkflow):
+class LostLeadRecoveryWorkflow(GraphWorkflow):
     """Re-engages lost leads that meet recovery criteria.
 
     Steps:
@@ -16,62 +18,89 @@ class LostLeadRecoveryWorkflow(BaseWorkflow):
         4. schedule_follow_up — create a follow-up activity
 
     Default cooling-off period: 30 days.
+
+    With ``incremental=True`` (and no ``lead_id``) only leads whose
+    cooling-off period ended since the previous incremental run are
+    processed (see :func:`~app.workflows.cdc.scan_window_records`), without the
+    20-record cap, and a final ``commit_window`` step advances the scan
+    watermark.
     """
 
     name = "lost_lead_recovery"
     description = "Re-engage lost leads that meet cooling-off and recovery criteria"
 
-    async def execute(self, context: dict) -> WorkflowResult:
-        """Execute the lost lead recovery workflow.
+    def build_steps(self, context: dict) -> list[Step]:
+        """Return the recovery step graph.
 
         Args:
             context: May contain ``lead_id`` (int) to target a specific lead,
-                or ``cooling_off_days`` (int, default 30) to scan all lost leads.
+                or ``cooling_off_days`` (int, default 30) to scan all lost leads,
+                and ``incremental`` (bool) to only scan newly eligible leads.
 
         Returns:
-            WorkflowResult: Recovery workflow execution result.
+            list[Step]: The workflow steps.
+        """
+        steps = [
+            Step("get_lost_lead", self._get_lost_leads),
+            Step("check_criteria", self._check_criteria, ("get_lost_lead",)),
+            # Stub — message drafting
+            Step("draft_reengagement", lambda ctx: None, ("check_criteria",)),
+            # Stub — activity creation requires type_id lookup
+            Step("schedule_follow_up", lambda ctx: None, ("draft_reengagement",)),
+        ]
+        if context.get("incremental") and not context.get("lead_id"):
+            steps.append(Step("commit_window", self._commit_window, ("schedule_follow_up",)))
+        return steps
+
+    def summarize(self, context: dict, results: dict[str, Any]) -> str:
+        """Describe how many lost leads are eligible for recovery.
+
+        Args:
+            context: Workflow input context.
+            results: Step outputs.
+
+        Returns:
+            str: Summary message.
         """
-        steps: list[str] = []
-        lead_id: int | None = context.get("lead_id")
         cooling_days: int = context.get("cooling_off_days", 30)
-        cutoff = (datetime.utcnow() - timedelta(days=cooling_days)).strftime("%Y-%m-%d %H:%M:%S")
+        return (
+            f"{len(results['check_criteria'])} lost lead(s) eligible for recovery after "
+            f"{cooling_days}-day cooling-off period."
+        )
+
+    @staticmethod
+    def _window_name(cooling_days: int) -> str:
+        return f"scan:lost_lead_recovery:{cooling_days}"
 
-        # Step 1: Get lost lead(s)
+    def _get_lost_leads(self, ctx: StepContext) -> dict:
+        lead_id: int | None = ctx.context.get("lead_id")
+        cooling_days: int = ctx.context.get("cooling_off_days", 30)
+        cutoff = (datetime.utcnow() - timedelta(days=cooling_days)).strftime("%Y-%m-%d %H:%M:%S")
         if lead_id:
-            leads = [get_lead(lead_id)] if get_lead(lead_id) else []
+            lead = get_lead(lead_id)
+            leads = [lead] if lead else []
+        elif ctx.context.get("incremental"):
+            window = self._window_name(cooling_days)
+            leads = scan_window_records(window, "crm.lead", [["active", "=", False]], FIELDS, cutoff)
+            if not leads:
+                commit_scan_window(window, cutoff)
         else:
             leads = search_leads(
                 domain=[["active", "=", False], ["write_date", "<", cutoff]],
                 limit=20,
             )
-        steps.append("get_lost_lead")
-
-        if not leads or (len(leads) == 1 and not leads[0]):
-            return WorkflowResult(
-                success=True,
-                steps_executed=steps,
-                message="No lost leads eligible for recovery.",
-            )
-
-        # Step 2: Check criteria
-        eligible = [
-            lead
-            for lead in leads
+        if not leads:
+            raise WorkflowHalt("No lost leads eligible for recovery.")
+        return {"leads": leads, "cutoff": cutoff}
+
+    @staticmethod
+    def _check_criteria(ctx: StepContext) -> list[int]:
+        return [
+            lead["id"]
+            for lead in ctx.results["get_lost_lead"]["leads"]
             if lead.get("expected_revenue", 0) > 0
         ]
-        steps.append("check_criteria")
-
-        # Step 3: Draft re-engagement message (stub)
-        steps.append("draft_reengagement")
 
-        # Step 4: Schedule follow-up (stub)
-        steps.append("schedule_follow_up")
-
-        return WorkflowResult(
-            success=True,
-            steps_executed=steps,
-            message=(
-                f"{len(eligible)} lost lead(s) eligible for recovery after "
-                f"{cooling_days}-day cooling-off period."
-            ),
-        )
+    def _commit_window(self, ctx: StepContext) -> None:
+        cooling_days: int = ctx.context.get("cooling_off_days", 30)
+        commit_scan_window(self._window_name(cooling_days), ctx.results["get_lost_lead"]["cutoff"])
@@ -1,12 +1,14 @@
 """Opportunity Follow-Up workflow."""
 
 from datetime import datetime, timedelta
+from typing import Any
 
 from app.odoo.models.crm_lead import search_leads
-from app.workflows.base_workflow import BaseWorkflow, WorkflowResult
+from app.workflows.cdc import commit_scan_window, scan_window_records
+from app.workflows.engine import GraphWorkflow, Step, StepContext, WorkflowHalt
 
 
-class OpportunityFollowUpWorkflow(BaseWorkflow):
+class OpportunityFollowUpWorkflow(GraphWorkflow):
     """Detects stale opportunities and schedules follow-up activities.
 
     Steps:
@@ -15,52 +17,76 @@ class OpportunityFollowUpWorkflow(BaseWorkflow):
         3. schedule_activity — create a follow-up activity for each stale opportunity
 
     Default stale threshold: 14 days without update.
+
+    With ``incremental=True`` only opportunities that became stale since the
+    previous incremental run are processed (see
+    :func:`~app.workflows.cdc.scan_window_records`), without the 50-record cap,
+    and a final ``commit_window`` step advances the scan watermark.
     """
 
     name = "opportunity_follow_up"
     description = "Detect stale opportunities and schedule follow-up activities"
 
-    async def execute(self, context: dict) -> WorkflowResult:
-        """Execute the opportunity follow-up workflow.
+    def build_steps(self, context: dict) -> list[Step]:
+        """Return the follow-up step graph.
+
+        Args:
+            context: Optional ``stale_days`` (int, default 14),
+                ``user_id`` (int) to filter by salesperson, and
+                ``incremental`` (bool) to only process newly stale records.
+
+        Returns:
+            list[Step]: The workflow steps.
+        """
+        steps = [
+            Step("detect_stale", self._detect_stale),
+            # Stub — message drafting
+            Step("draft_message", lambda ctx: None, ("detect_stale",)),
+            # Stub — requires activity_type_id resolution
+            Step("schedule_activity", lambda ctx: None, ("draft_message",)),
+        ]
+        if context.get("incremental"):
+            steps.append(Step("commit_window", self._commit_window, ("schedule_activity",)))
+        return steps
+
+    def summarize(self, context: dict, results: dict[str, Any]) -> str:
+        """Describe the stale opportunities found.
 
         Args:
-            context: Optional ``stale_days`` (int, default 14) and
-                ``user_id`` (int) to filter by salesperson.
+            context: Workflow input context.
+            results: Step outputs.
 
         Returns:
-            WorkflowResult: List of stale opportunities processed.
+            str: Summary message.
         """
-        steps: list[str] = []
         stale_days: int = context.get("stale_days", 14)
-        cutoff = (datetime.utcnow() - timedelta(days=stale_days)).strftime("%Y-%m-%d %H:%M:%S")
+        return (
+            f"Found {len(results['detect_stale']['ids'])} stale opportunities older than "
+            f"{stale_days} days. Follow-up activities scheduled."
+        )
 
-        # Step 1: Detect stale opportunities
+    @staticmethod
+    def _window_name(stale_days: int) -> str:
+        return f"scan:opportunity_follow_up:{stale_days}"
+
+    def _detect_stale(self, ctx: StepContext) -> dict:
+        stale_days: int = ctx.context.get("stale_days", 14)
+        cutoff = (datetime.utcnow() - timedelta(days=stale_days)).strftime("%Y-%m-%d %H:%M:%S")
         domain = [
             ["type", "=", "opportunity"],
             ["active", "=", True],
-            ["write_date", "<", cutoff],
         ]
-        stale = search_leads(domain=domain, limit=50)
-        steps.append("detect_stale")
-
+        if ctx.context.get("incremental"):
+            window = self._window_name(stale_days)
+            stale = scan_window_records(window, "crm.lead", domain, ["id", "write_date"], cutoff)
+            if not stale:
+                commit_scan_window(window, cutoff)
+        else:
+            stale = search_leads(domain=domain + [["write_date", "<", cutoff]], limit=50)
         if not stale:
-            return WorkflowResult(
-                success=True,
-                steps_executed=steps,
-                message=f"No stale opportunities found (threshold: {stale_days} days).",
-            )
-
-        # Step 2: Draft message (stub)
-        steps.append("draft_message")
-
-        # Step 3: Schedule activity (stub — requires activity_type_id resolution)
-        steps.append("schedule_activity")
-
-        return WorkflowResult(
-            success=True,
-            steps_executed=steps,
-            message=(
-                f"Found {len(stale)} stale opportunities older than {stale_days} days. "
-                "Follow-up activities scheduled."
-            ),
-        )
+            raise WorkflowHalt(f"No stale opportunities found (threshold: {stale_days} days).")
+        return {"ids": [lead["id"] for lead in stale], "cutoff": cutoff}
+
+    def _commit_window(self, ctx: StepContext) -> None:
+        stale_days: int = ctx.context.get("stale_days", 14)
+        commit_scan_window(self._window_name(stale_days), ctx.results["detect_stale"]["cutoff"])
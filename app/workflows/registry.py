@@ -2,6 +2,13 @@
 
 from app.workflows.base_workflow import BaseWorkflow
 
+# Mapping of Odoo record events (webhooks and CDC) to workflow names
+EVENT_WORKFLOW_MAP: dict[str, str] = {
+    "lead.won": "customer_onboarding",
+    "lead.lost": "lost_lead_recovery",
+    "lead.created": "lead_qualification",
+}
+
 
 class WorkflowRegistry:
     """Central registry for all available CRM workflows.
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""CLI script to bulk import leads into Odoo from a CSV or NDJSON file.
+
+Usage:
+    python scripts/import_leads.py leads.csv
+    python scripts/import_leads.py leads.ndjson --batch-size 500 --concurrency 8
+    python scripts/import_leads.py leads.csv --tenant acme --errors errors.ndjson
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.odoo.lead_import import ImportReport, LeadImporter, iter_rows
+from app.odoo.tenants import use_tenant
+
+
+def _print_progress(report: ImportReport) -> None:
+    print(
+        f"\r  {report.rows} rows read, {report.created} created, {report.failed} failed "
+        f"({report.rows_per_second:.0f} rows/s)",
+        end="",
+        flush=True,
+    )
+
+
+def main() -> None:
+    """Import the leads of a file and print progress and row errors."""
+    parser = argparse.ArgumentParser(description="Bulk import leads into Odoo")
+    parser.add_argument("path", type=Path, help="CSV file with a header row, or NDJSON file")
+    parser.add_argument(
+        "--format",
+        choices=["csv", "ndjson"],
+        help="Input format (default: from the file extension)",
+    )
+    parser.add_argument("--batch-size", type=int, help="Leads per Odoo create call")
+    parser.add_argument("--concurrency", type=int, help="Batches created concurrently")
+    parser.add_argument("--tenant", help="Odoo tenant (see ODOO_TENANTS_FILE)")
+    parser.add_argument("--errors", type=Path, help="Write row errors to this NDJSON file")
+    args = parser.parse_args()
+
+    fmt = args.format or ("ndjson" if args.path.suffix in (".ndjson", ".jsonl") else "csv")
+    importer = LeadImporter(args.batch_size, args.concurrency, on_progress=_print_progress)
+    print(f"Importing {args.path} ({fmt})...")
+    with use_tenant(args.tenant), args.path.open(encoding="utf-8-sig", newline="") as lines:
+        report = importer.run(iter_rows(lines, fmt))
+    _print_progress(report)
+    print(f"\nDone in {report.elapsed:.1f}s.")
+    if report.error:
+        print(f"Stopped early: {report.error}")
+
+    if args.errors:
+        with args.errors.open("w", encoding="utf-8") as out:
+            for error in report.errors:
+                out.write(json.dumps(error, ensure_ascii=False) + "\n")
+        print(f"Wrote {len(report.errors)} row errors to {args.errors}")
+    else:
+        for error in report.errors[:20]:
+            print(f"  row {error['row']}: {error['error']}")
+        if report.failed > 20:
+            print(f"  ... {report.failed - 20} more (use --errors FILE)")
+    sys.exit(1 if report.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
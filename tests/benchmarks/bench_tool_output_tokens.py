@@ -0,0 +1,67 @@
+"""Benchmark tool-output size: ``json.dumps`` vs the compact table encoding.
+
+Builds realistic ``crm.lead`` result sets (every field of
+:data:`app.odoo.models.crm_lead.FIELDS`, unset fields as ``False`` the way
+Odoo returns them) and compares token counts and encoding time of the old
+JSON output with :func:`app.tools.formatting.format_records`, with and
+without the per-tool token cap.
+
+Usage::
+
+    python -m tests.benchmarks.bench_tool_output_tokens --sizes 5 20 50 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from app.config import settings
+from app.odoo.models.crm_lead import FIELDS
+from app.tools.formatting import count_tokens, format_records, load_encoding
+from tests.support.odoo_stub import make_leads
+
+
+def realistic_leads(count: int) -> list[dict]:
+    """Return ``count`` leads carrying every field of ``FIELDS``."""
+    leads = []
+    for lead in make_leads(count):
+        record = {name: lead.get(name, False) for name in FIELDS}
+        record["country_id"] = [31, "Brazil"]
+        record["company_id"] = [1, "My Company"]
+        record["kanban_state"] = "normal"
+        leads.append(record)
+    return leads
+
+
+def main() -> None:
+    """Print a token/latency comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 20, 50, 100])
+    args = parser.parse_args()
+
+    counter = "tiktoken o200k_base" if load_encoding() is not None else "len/4 estimate"
+    cap = settings.tool_output_max_tokens
+    print(f"token counter: {counter}; cap {cap} tokens")
+    print(
+        f"{'records':>7} {'json tok':>9} {'compact tok':>12} {'ratio':>6} "
+        f"{'capped tok':>11} {'rows shown':>10} {'encode ms':>9}"
+    )
+    for size in args.sizes:
+        leads = realistic_leads(size)
+        json_tokens = count_tokens(json.dumps(leads, default=str))
+        compact_tokens = count_tokens(format_records(leads, title="crm.lead", max_tokens=10**9))
+        started = time.perf_counter()
+        capped = format_records(leads, title="crm.lead")
+        encode_ms = (time.perf_counter() - started) * 1000
+        rows = len(capped.splitlines()) - 2 - capped.count("[more results available")
+        print(
+            f"{size:7d} {json_tokens:9d} {compact_tokens:12d} "
+            f"{json_tokens / compact_tokens:5.1f}x {count_tokens(capped):11d} "
+            f"{rows:10d} {encode_ms:9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
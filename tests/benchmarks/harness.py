@@ -0,0 +1,227 @@
+"""Minimal micro-benchmark runner with JSON baselines.
+
+Benchmarks register with :func:`benchmark`; each registered function receives
+a shared :class:`BenchEnv` and returns the zero-argument callable to time.
+:func:`run_benchmarks` calibrates the number of iterations per round, runs a
+warm-up round and ``rounds`` measured rounds, and reports per-operation
+median / p95 / min times.  :func:`compare` checks a run against a stored
+baseline and flags every benchmark whose median slowed down by more than
+the threshold.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+BenchSetup = Callable[["BenchEnv"], Callable[[], Any]]
+
+
+@dataclass
+class Benchmark:
+    """A registered benchmark."""
+
+    name: str
+    group: str
+    setup: BenchSetup
+
+
+@dataclass
+class BenchmarkResult:
+    """Per-operation timings of one benchmark, in microseconds."""
+
+    name: str
+    group: str
+    rounds: int
+    iterations: int
+    median_us: float
+    p95_us: float
+    min_us: float
+
+
+@dataclass
+class Comparison:
+    """Baseline vs current median of one benchmark."""
+
+    name: str
+    baseline_us: float | None
+    current_us: float | None
+    ratio: float | None = None
+    regressed: bool = False
+
+
+@dataclass
+class BenchEnv:
+    """Shared state for benchmark setups (stub servers, temp dirs, patches).
+
+    ``resources`` caches objects built by one setup for reuse by others, and
+    ``stack`` closes servers and undoes patches when the run ends.
+    """
+
+    workdir: Path
+    stack: ExitStack = field(default_factory=ExitStack)
+    resources: dict[str, Any] = field(default_factory=dict)
+
+    def resource(self, key: str, factory: Callable[[], Any]) -> Any:
+        """Return ``resources[key]``, building it with ``factory`` on first use."""
+        if key not in self.resources:
+            self.resources[key] = factory()
+        return self.resources[key]
+
+
+REGISTRY: list[Benchmark] = []
+
+
+def benchmark(name: str, group: str) -> Callable[[BenchSetup], BenchSetup]:
+    """Register a benchmark setup function.
+
+    Args:
+        name: Unique dotted benchmark name (used as the baseline key).
+        group: Group label for reports.
+
+    Returns:
+        The decorator.
+    """
+
+    def register(setup: BenchSetup) -> BenchSetup:
+        REGISTRY.append(Benchmark(name, group, setup))
+        return setup
+
+    return register
+
+
+def _calibrate(func: Callable[[], Any], min_round_seconds: float) -> int:
+    iterations = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_round_seconds or iterations >= 1_000_000:
+            return iterations
+        iterations *= 2 if elapsed <= 0 else max(2, min(10, int(min_round_seconds / elapsed) + 1))
+
+
+def measure(
+    bench: Benchmark,
+    func: Callable[[], Any],
+    rounds: int,
+    min_round_seconds: float,
+) -> BenchmarkResult:
+    """Time ``func`` and return per-operation statistics.
+
+    Args:
+        bench: The benchmark being measured.
+        func: Callable to time.
+        rounds: Measured rounds.
+        min_round_seconds: Minimum duration of one round (sets iterations).
+
+    Returns:
+        BenchmarkResult: Timings in microseconds per operation.
+    """
+    iterations = _calibrate(func, min_round_seconds)
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        samples.append((time.perf_counter() - started) / iterations * 1e6)
+    samples.sort()
+    p95_index = min(len(samples) - 1, round(0.95 * (len(samples) - 1)))
+    return BenchmarkResult(
+        name=bench.name,
+        group=bench.group,
+        rounds=rounds,
+        iterations=iterations,
+        median_us=round(statistics.median(samples), 3),
+        p95_us=round(samples[p95_index], 3),
+        min_us=round(samples[0], 3),
+    )
+
+
+def run_benchmarks(
+    env: BenchEnv,
+    patterns: list[str] | None = None,
+    rounds: int = 15,
+    min_round_seconds: float = 0.05,
+    report: Callable[[BenchmarkResult], None] | None = None,
+) -> dict:
+    """Run the registered benchmarks matching ``patterns``.
+
+    Args:
+        env: Shared benchmark environment.
+        patterns: Glob patterns on benchmark names; all when empty.
+        rounds: Measured rounds per benchmark.
+        min_round_seconds: Minimum duration of one round.
+        report: Called with each result as soon as it is available.
+
+    Returns:
+        dict: ``{"meta": {...}, "results": {name: result-dict}}``.
+    """
+    results: dict[str, dict] = {}
+    for bench in REGISTRY:
+        if patterns and not any(fnmatch.fnmatch(bench.name, p) for p in patterns):
+            continue
+        func = bench.setup(env)
+        result = measure(bench, func, rounds, min_round_seconds)
+        results[bench.name] = asdict(result)
+        if report is not None:
+            report(result)
+    return {
+        "meta": {
+            "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "rounds": rounds,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[Comparison]:
+    """Compare medians of two runs.
+
+    Args:
+        baseline: Stored run (as returned by :func:`run_benchmarks`).
+        current: New run.
+        threshold: Allowed relative slowdown (``0.25`` = 25 %).
+
+    Returns:
+        list[Comparison]: One entry per benchmark present in either run;
+            ``regressed`` is set when the current median exceeds the
+            baseline median by more than ``threshold``.
+    """
+    base_results = baseline.get("results", {})
+    current_results = current.get("results", {})
+    comparisons = []
+    for name in sorted(set(base_results) | set(current_results)):
+        base = base_results.get(name, {}).get("median_us")
+        cur = current_results.get(name, {}).get("median_us")
+        comparison = Comparison(name=name, baseline_us=base, current_us=cur)
+        if base and cur:
+            comparison.ratio = round(cur / base, 3)
+            comparison.regressed = comparison.ratio > 1 + threshold
+        comparisons.append(comparison)
+    return comparisons
+
+
+def load_run(path: str | Path) -> dict:
+    """Load a JSON run/baseline file."""
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def save_run(run: dict, path: str | Path) -> None:
+    """Write a run to ``path`` as indented JSON."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(run, indent=2, sort_keys=True) + "\n", encoding="utf-8")
@@ -0,0 +1,482 @@
+"""Micro-benchmarks of the project's hot paths, with JSON baselines.
+
+Everything runs offline: Odoo is :class:`~tests.support.odoo_stub.StubOdooServer`
+(zero latency, so the numbers are the client-side cost of building, sending
+and decoding JSON-RPC calls), the knowledge base is the repo's
+``knowledge_base/`` ingested into a temporary Chroma store with
+``DeterministicFakeEmbedding``, and the agents talk to
+:class:`~tests.support.fake_llm.FakeChatModel`.  SQLite writes go to a
+temporary database.
+
+Usage::
+
+    # measure and write a run (optionally only some benchmarks)
+    python -m tests.benchmarks.hot_paths run --output current.json --filter "odoo.*"
+
+    # record / refresh the committed baseline
+    python -m tests.benchmarks.hot_paths run --output tests/benchmarks/baselines/hot_paths.json
+
+    # fail (exit code 1) if any median regressed by more than 25 %
+    python -m tests.benchmarks.hot_paths compare \\
+        tests/benchmarks/baselines/hot_paths.json current.json --threshold 0.25
+
+Baselines are machine-specific: compare runs taken on the same host.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import warnings
+from pathlib import Path
+from unittest.mock import patch
+
+from tests.benchmarks.harness import (
+    BenchEnv,
+    BenchmarkResult,
+    benchmark,
+    compare,
+    load_run,
+    run_benchmarks,
+    save_run,
+)
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "hot_paths.json"
+
+LEAD_COUNT = 1000
+
+
+# ── shared fixtures ────────────────────────────────────────────────────────────
+
+
+def _odoo(env: BenchEnv):
+    """Start the stub Odoo server with fixture data and point the client at it."""
+
+    def start():
+        from app.odoo.client import odoo_client
+        from tests.support.odoo_stub import StubOdooServer, make_leads
+
+        stub = env.stack.enter_context(StubOdooServer())
+        stub.add_records("crm.lead", make_leads(LEAD_COUNT))
+        stub.add_records(
+            "res.partner",
+            [
+                {"id": 1000 + i, "name": f"Partner {i}", "email": f"p{i}@example.com"}
+                for i in range(1, 51)
+            ],
+        )
+        stub.configure(odoo_client)
+        odoo_client.authenticate()
+        return odoo_client
+
+    return env.resource("odoo", start)
+
+
+def _database(env: BenchEnv) -> None:
+    """Create the SQLite tables in the temporary database."""
+
+    def init():
+        from app.memory.session_store import init_db
+
+        init_db()
+        return True
+
+    env.resource("database", init)
+
+
+def _fake_llm(env: BenchEnv):
+    """Route every agent's chat model to a FakeChatModel."""
+
+    def install():
+        from tests.support.fake_llm import FakeChatModel, last_human_text
+
+        def responder(messages):
+            text = last_human_text(messages)
+            if text.startswith("Classify the following"):
+                return "CRM_QUERY" if "lead" in text.lower() else "OTHER"
+            return "Done."
+
+        model = FakeChatModel(responder=responder)
+        env.stack.enter_context(
+            patch("app.agents.base_agent.get_chat_model", lambda *args, **kwargs: model)
+        )
+        return model
+
+    return env.resource("fake_llm", install)
+
+
+def _knowledge_base(env: BenchEnv) -> None:
+    """Ingest the repo knowledge base into a temporary Chroma store."""
+
+    def ingest():
+        from langchain_core.embeddings import DeterministicFakeEmbedding
+
+        from app.knowledge_base import ingestor, vector_store
+
+        embeddings = DeterministicFakeEmbedding(size=256)
+        env.stack.enter_context(patch.object(ingestor, "get_embeddings", lambda: embeddings))
+        env.stack.enter_context(patch.object(vector_store, "get_embeddings", lambda: embeddings))
+        vector_store.get_vector_store.cache_clear()
+        env.stack.callback(vector_store.get_vector_store.cache_clear)
+        return ingestor.ingest_knowledge_base()
+
+    env.resource("knowledge_base", ingest)
+
+
+# ── Odoo JSON-RPC and model helpers ───────────────────────────────────────────
+
+
+@benchmark("odoo.jsonrpc_call.version", group="odoo")
+def bench_jsonrpc_version(env: BenchEnv):
+    """Smallest round trip: ``common.version``."""
+    client = _odoo(env)
+    return lambda: client._jsonrpc_call("common", "version", [])
+
+
+@benchmark("odoo.jsonrpc_call.search_read_80", group="odoo")
+def bench_jsonrpc_search_read(env: BenchEnv):
+    """``search_read`` of 80 leads with the list fields (decode-heavy)."""
+    from app.odoo.models.crm_lead import FIELDS
+
+    client = _odoo(env)
+    args = [
+        client._db,
+        client._uid,
+        client._api_key,
+        "crm.lead",
+        "search_read",
+        [[]],
+        {"fields": FIELDS, "limit": 80},
+    ]
+    return lambda: client._jsonrpc_call("object", "execute_kw", args)
+
+
+@benchmark("odoo.models.get_lead", group="odoo")
+def bench_get_lead(env: BenchEnv):
+    """``crm_lead.get_lead`` outside a unit of work (one RPC per call)."""
+    from app.odoo.models.crm_lead import get_lead
+
+    _odoo(env)
+    return lambda: get_lead(42)
+
+
+@benchmark("odoo.models.search_leads_20", group="odoo")
+def bench_search_leads(env: BenchEnv):
+    """``crm_lead.search_leads`` with a domain filter."""
+    from app.odoo.models.crm_lead import search_leads
+
+    _odoo(env)
+    domain = [["type", "=", "lead"]]
+    return lambda: search_leads(domain, limit=20)
+
+
+@benchmark("odoo.models.iter_lead_batches_1000", group="odoo")
+def bench_iter_lead_batches(env: BenchEnv):
+    """Id-resolved, paged read of every fixture lead in batches of 250."""
+    from app.odoo.models.crm_lead import SCORING_FIELDS, iter_lead_batches
+
+    _odoo(env)
+    return lambda: sum(
+        len(batch) for batch in iter_lead_batches([], fields=SCORING_FIELDS, batch_size=250)
+    )
+
+
+@benchmark("odoo.models.get_partner", group="odoo")
+def bench_get_partner(env: BenchEnv):
+    """``res_partner.get_partner``."""
+    from app.odoo.models.res_partner import get_partner
+
+    _odoo(env)
+    return lambda: get_partner(1001)
+
+
+# ── knowledge base ─────────────────────────────────────────────────────────────
+
+
+@benchmark("kb.search_knowledge_base", group="kb")
+def bench_search_knowledge_base(env: BenchEnv):
+    """The ``search_knowledge_base`` tool over the ingested fixture KB."""
+    from app.tools.kb_tools import search_knowledge_base
+
+    _knowledge_base(env)
+    return lambda: search_knowledge_base.invoke({"question": "How do I qualify a lead?"})
+
+
+# ── BANT scoring ───────────────────────────────────────────────────────────────
+
+
+@benchmark("bant.score_leads_1000", group="bant")
+def bench_score_leads(env: BenchEnv):
+    """Vectorized BANT scoring of 1000 lead dicts."""
+    from app.workflows.lead_qualification import score_leads
+    from tests.support.odoo_stub import make_leads
+
+    leads = make_leads(LEAD_COUNT)
+    return lambda: score_leads(leads)
+
+
+# ── pipeline analytics ─────────────────────────────────────────────────────────
+
+ANALYTICS_LEAD_COUNT = 100_000
+
+
+def _analytics_leads(env: BenchEnv) -> list[dict]:
+    """100k synthetic leads, a tenth of them lost (archived)."""
+
+    def build():
+        from tests.support.odoo_stub import make_leads
+
+        leads = make_leads(ANALYTICS_LEAD_COUNT)
+        for lead in leads[::10]:
+            lead["active"] = False
+        return leads
+
+    return env.resource("analytics_leads", build)
+
+
+@benchmark("analytics.frame_100k", group="analytics")
+def bench_analytics_frame(env: BenchEnv):
+    """Columnar ``LeadFrame`` from 100k lead dicts."""
+    from app.odoo.analytics import LeadFrame
+
+    leads = _analytics_leads(env)
+    return lambda: LeadFrame.from_records(leads)
+
+
+@benchmark("analytics.report_100k", group="analytics")
+def bench_analytics_report(env: BenchEnv):
+    """Every ``pipeline_report`` section over a 100k-lead frame."""
+    from datetime import date
+
+    from app.odoo.analytics import LeadFrame, pipeline_report
+
+    frame = LeadFrame.from_records(_analytics_leads(env))
+    stages = [
+        {"id": i, "name": name, "sequence": i}
+        for i, name in enumerate(["New", "Qualified", "Proposition", "Won"], start=1)
+    ]
+    today = date(2026, 10, 1)
+    return lambda: pipeline_report("team", 6, frame=frame, stages=stages, today=today)
+
+
+# ── duplicate detection ────────────────────────────────────────────────────────
+
+DEDUP_RECORD_COUNT = 100_000
+
+
+def _dedup_leads(env: BenchEnv) -> list[dict]:
+    """100k leads with realistic name, company, e-mail and phone collisions."""
+
+    def build():
+        import random
+
+        rnd = random.Random(7)
+        first = ["Ana", "Bruno", "Carla", "Diego", "Elisa", "Felipe", "Gabriela", "Hugo"]
+        last = ["Silva", "Santos", "Oliveira", "Souza", "Lima", "Costa", "Ribeiro", "Alves"]
+        sectors = ["Tech", "Foods", "Logística", "Energia", "Saúde"]
+        leads = []
+        for i in range(1, DEDUP_RECORD_COUNT + 1):
+            company = f"{rnd.choice(last)} {rnd.choice(sectors)} {i % 5000}"
+            contact = f"{rnd.choice(first)} {rnd.choice(last)} {rnd.choice(last)}"
+            leads.append(
+                {
+                    "id": i,
+                    "name": f"Lead {i}",
+                    "contact_name": contact,
+                    "partner_name": company,
+                    "email_from": f"{contact.split()[0].lower()}.{i}@co{i % 5000}.com",
+                    "phone": f"+55 11 9{rnd.randrange(10**8):08d}",
+                    "mobile": False,
+                    "active": True,
+                }
+            )
+        return leads
+
+    return env.resource("dedup_leads", build)
+
+
+@benchmark("dedup.build_index_100k", group="dedup")
+def bench_dedup_build(env: BenchEnv):
+    """Blocking index (name trigrams, e-mail, domain, phone) of 100k leads."""
+    from app.odoo.dedup import DEDUP_SPECS, DedupIndex
+
+    leads = _dedup_leads(env)
+    return lambda: DedupIndex(DEDUP_SPECS["crm.lead"], max_block_size=500).add_many(leads)
+
+
+@benchmark("dedup.check_100k", group="dedup")
+def bench_dedup_check(env: BenchEnv):
+    """Pre-create duplicate check of one lead against a 100k-lead index."""
+    from app.odoo.dedup import DEDUP_SPECS, DedupIndex
+
+    leads = _dedup_leads(env)
+    index = DedupIndex(DEDUP_SPECS["crm.lead"], max_block_size=500)
+    index.add_many(leads)
+    probe = {
+        "contact_name": leads[41]["contact_name"],
+        "partner_name": leads[41]["partner_name"],
+        "email_from": "someone@example.org",
+        "phone": leads[41]["phone"],
+    }
+    return lambda: index.candidates(probe)
+
+
+# ── supervisor graph ───────────────────────────────────────────────────────────
+
+
+@benchmark("supervisor.route.supervisor", group="supervisor")
+def bench_route_supervisor(env: BenchEnv):
+    """classify → supervisor → persist_history with an instant fake LLM."""
+    from app.agents.supervisor import SupervisorAgent
+
+    _database(env)
+    _fake_llm(env)
+    supervisor = env.resource("supervisor", SupervisorAgent)
+    return lambda: supervisor.route("hello there", session_id="bench-supervisor")
+
+
+@benchmark("supervisor.route.odoo_api_agent", group="supervisor")
+def bench_route_odoo_agent(env: BenchEnv):
+    """classify → Odoo agent executor (final answer, no tools) → persist_history."""
+    from app.agents.supervisor import SupervisorAgent
+
+    _database(env)
+    _fake_llm(env)
+    supervisor = env.resource("supervisor", SupervisorAgent)
+    return lambda: supervisor.route("show lead 42", session_id="bench-odoo-agent")
+
+
+# ── SQLite writes ──────────────────────────────────────────────────────────────
+
+
+@benchmark("sqlite.history_append", group="sqlite")
+def bench_history_append(env: BenchEnv):
+    """``get_session_history`` + one user/AI message pair."""
+    from app.memory.session_store import get_session_history
+
+    _database(env)
+
+    def append():
+        history = get_session_history("bench-history")
+        history.add_user_message("hello")
+        history.add_ai_message("hi")
+
+    return append
+
+
+@benchmark("sqlite.workflow_log", group="sqlite")
+def bench_workflow_log(env: BenchEnv):
+    """``log_workflow_start`` + ``log_workflow_complete``."""
+    from app.memory.workflow_log import log_workflow_complete, log_workflow_start
+
+    _database(env)
+    steps = [{"name": "get_lead", "status": "success", "duration_ms": 1.0, "error": None}]
+
+    def log():
+        log_id = log_workflow_start("lead_qualification", "manual", {"lead_id": 1})
+        log_workflow_complete(log_id, steps)
+
+    return log
+
+
+@benchmark("sqlite.save_checkpoint", group="sqlite")
+def bench_save_checkpoint(env: BenchEnv):
+    """``save_checkpoint`` upsert of one step output."""
+    from app.memory.workflow_log import save_checkpoint
+
+    _database(env)
+    return lambda: save_checkpoint("lead_qualification", "lead:1", "score", {"score": 75})
+
+
+# ── CLI ────────────────────────────────────────────────────────────────────────
+
+
+def _isolate(workdir: Path) -> None:
+    """Point settings at temporary storage; must run before ``app`` is imported."""
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'sessions.db'}"
+    os.environ["CHROMA_PERSIST_DIR"] = str(workdir / "chroma")
+    os.environ["LLM_CACHE_AGENTS"] = ""
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+
+def _print_result(result: BenchmarkResult) -> None:
+    print(
+        f"{result.name:40} {result.median_us:12.1f} {result.p95_us:12.1f} "
+        f"{result.iterations:>8}x{result.rounds}"
+    )
+
+
+def _run(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        _isolate(Path(tmp))
+        from app.utils.logger import configure_logging
+
+        configure_logging("WARNING")
+        print(f"{'benchmark':40} {'median µs':>12} {'p95 µs':>12} {'iters':>10}")
+        env = BenchEnv(workdir=Path(tmp))
+        # record=True keeps third-party deprecation warnings out of the report
+        with env.stack, warnings.catch_warnings(record=True):
+            run = run_benchmarks(
+                env,
+                patterns=args.filter,
+                rounds=args.rounds,
+                min_round_seconds=args.min_round_time,
+                report=_print_result,
+            )
+    if args.output:
+        save_run(run, args.output)
+        print(f"wrote {args.output}")
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    comparisons = compare(load_run(args.baseline), load_run(args.current), args.threshold)
+    print(f"{'benchmark':40} {'baseline µs':>12} {'current µs':>12} {'ratio':>7}")
+    regressions = 0
+    for item in comparisons:
+        base = f"{item.baseline_us:12.1f}" if item.baseline_us else f"{'-':>12}"
+        cur = f"{item.current_us:12.1f}" if item.current_us else f"{'-':>12}"
+        ratio = f"{item.ratio:7.2f}" if item.ratio else f"{'-':>7}"
+        flag = "  REGRESSION" if item.regressed else ""
+        regressions += item.regressed
+        print(f"{item.name:40} {base} {cur} {ratio}{flag}")
+    if regressions:
+        print(f"{regressions} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+        return 1
+    print(f"no regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for ``python -m tests.benchmarks.hot_paths``."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmarks")
+    run.add_argument("--output", help="Write the results to this JSON file")
+    run.add_argument(
+        "--filter", action="append", help="Glob on benchmark names (repeatable)"
+    )
+    run.add_argument("--rounds", type=int, default=15, help="Measured rounds per benchmark")
+    run.add_argument(
+        "--min-round-time", type=float, default=0.05, help="Minimum seconds per round"
+    )
+    run.set_defaults(handler=_run)
+
+    cmp = commands.add_parser("compare", help="Compare a run against a baseline")
+    cmp.add_argument("baseline", help=f"Baseline JSON (normally {DEFAULT_BASELINE.name})")
+    cmp.add_argument("current")
+    cmp.add_argument(
+        "--threshold", type=float, default=0.25, help="Allowed median slowdown (0.25 = 25%%)"
+    )
+    cmp.set_defaults(handler=_compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""Cold import-time and memory profile of the app and CLI entry points.
+
+Imports each module in a fresh interpreter with ``python -X importtime`` and
+reports the wall time, the resident memory after the import and the most
+expensive imports: per module (cumulative, i.e. including everything it
+pulled in) and per top-level package (sum of self time).
+
+Usage::
+
+    python -m tests.benchmarks.imports                      # app.main
+    python -m tests.benchmarks.imports app.main app.odoo.client --top 15
+    python -m tests.benchmarks.imports app.main --json
+
+``tests/unit/test_import_budget.py`` uses :func:`profile_import` to keep
+``import app.main`` within its time and memory budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Dependencies that must only load on first use (an agent call, a KB query, ...).
+HEAVY_MODULES = (
+    "langchain",
+    "langchain_core",
+    "langchain_openai",
+    "langchain_community",
+    "langgraph",
+    "langsmith",
+    "openai",
+    "chromadb",
+    "tiktoken",
+)
+
+_PROBE = """
+import json, os, sys, time
+started = time.perf_counter()
+import {module}
+wall = time.perf_counter() - started
+with open("/proc/self/statm") as statm:
+    rss = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+print(json.dumps({{"wall": wall, "rss": rss, "modules": sorted(sys.modules)}}))
+"""
+
+
+@dataclass
+class ImportEntry:
+    """One line of ``-X importtime`` output (times in microseconds)."""
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportProfile:
+    """Cold import of one module in a fresh interpreter."""
+
+    module: str
+    wall_seconds: float
+    rss_bytes: int
+    entries: list[ImportEntry] = field(default_factory=list)
+    loaded: list[str] = field(default_factory=list)
+
+    def slowest(self, top: int = 20) -> list[ImportEntry]:
+        """Return the imports with the largest cumulative time."""
+        return sorted(self.entries, key=lambda e: e.cumulative_us, reverse=True)[:top]
+
+    def by_package(self, top: int = 20) -> list[tuple[str, int]]:
+        """Return ``(top-level package, summed self time in µs)`` pairs, slowest first."""
+        totals: dict[str, int] = defaultdict(int)
+        for entry in self.entries:
+            totals[entry.name.split(".")[0]] += entry.self_us
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+    def heavy_loaded(self) -> list[str]:
+        """Return the :data:`HEAVY_MODULES` that the import loaded."""
+        return [name for name in HEAVY_MODULES if name in self.loaded]
+
+
+def parse_importtime(stderr: str) -> list[ImportEntry]:
+    """Parse ``-X importtime`` output into entries (other lines are ignored)."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append(ImportEntry(name.strip(), int(parts[0]), int(parts[1]), depth))
+    return entries
+
+
+def profile_import(module: str, env: dict[str, str] | None = None) -> ImportProfile:
+    """Import ``module`` in a fresh interpreter and profile it.
+
+    Args:
+        module: Dotted module name.
+        env: Extra environment variables for the child process.
+
+    Returns:
+        ImportProfile: Wall time, RSS, per-module entries and loaded modules.
+
+    Raises:
+        RuntimeError: If the import fails.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module)],
+        cwd=REPO_ROOT,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1", **(env or {})},
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    payload = json.loads(result.stdout.strip().splitlines()[-1])
+    return ImportProfile(
+        module,
+        payload["wall"],
+        payload["rss"],
+        parse_importtime(result.stderr),
+        payload["modules"],
+    )
+
+
+def format_report(profile: ImportProfile, top: int = 20) -> str:
+    """Return a human-readable report of a profile."""
+    lines = [
+        (
+            f"import {profile.module}: {profile.wall_seconds * 1000:.0f} ms, "
+            f"RSS {profile.rss_bytes / 2**20:.1f} MiB, {len(profile.loaded)} modules"
+        ),
+        f"heavy dependencies loaded: {', '.join(profile.heavy_loaded()) or 'none'}",
+        "",
+        f"{'cumulative ms':>14} {'self ms':>8}  module",
+    ]
+    for entry in profile.slowest(top):
+        lines.append(
+            f"{entry.cumulative_us / 1000:14.1f} {entry.self_us / 1000:8.1f}  "
+            f"{'  ' * entry.depth}{entry.name}"
+        )
+    lines += ["", f"{'self ms':>14}  package"]
+    for package, self_us in profile.by_package(top):
+        lines.append(f"{self_us / 1000:14.1f}  {package}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for ``python -m tests.benchmarks.imports``."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=["app.main"], help="Modules to profile")
+    parser.add_argument("--top", type=int, default=20, help="Rows per table")
+    parser.add_argument("--json", action="store_true", help="Print the profiles as JSON")
+    args = parser.parse_args(argv)
+
+    profiles = [profile_import(module) for module in args.modules]
+    if args.json:
+        print(json.dumps([asdict(profile) for profile in profiles], indent=2))
+    else:
+        print("\n\n".join(format_report(profile, args.top) for profile in profiles))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
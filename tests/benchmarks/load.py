@@ -0,0 +1,408 @@
+"""End-to-end HTTP load test of the FastAPI app with a fake LLM and stub Odoo.
+
+Starts the real application under uvicorn in a background thread, with every
+agent's chat model replaced by :class:`~tests.support.fake_llm.FakeChatModel`
+(through ``app.agents.base_agent.get_chat_model``), Odoo served by
+:class:`~tests.support.odoo_stub.StubOdooServer` and SQLite in a temporary
+directory.  Each endpoint is then driven for ``--duration`` seconds, one
+endpoint after the other:
+
+* ``chat`` — ``POST /chat``; half the messages are routed to the supervisor,
+  half to the Odoo API agent, which answers after one ``get_crm_lead`` tool
+  call;
+* ``workflow`` — ``POST /workflows/run`` of ``lead_qualification``;
+* ``webhook`` — ``POST /webhooks/odoo`` ``lead.created`` (the workflow runs as
+  a background task after the response).
+
+With ``--rate`` requests arrive open-loop (Poisson) at that rate, at most
+``--concurrency`` in flight; latency is measured from the scheduled arrival,
+so queueing behind slow requests is included.  Without ``--rate`` the run is
+closed-loop: ``--concurrency`` clients send back to back.  A probe on the
+server's event loop records how late a 10 ms timer fires (event-loop lag).
+
+Usage::
+
+    python -m tests.benchmarks.load --concurrency 16 --rate 40 --duration 10 \\
+        --llm-latency 0.3 --llm-tps 60 --odoo-latency 0.02 --json load.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+import numpy as np
+
+from tests.support.fake_llm import FakeChatModel, last_human_text, tool_call_message
+from tests.support.odoo_stub import StubOdooServer, make_leads
+
+LAG_PROBE_INTERVAL = 0.01
+
+RequestFactory = Callable[[int], tuple[str, dict]]
+
+
+# ── workload ───────────────────────────────────────────────────────────────────
+
+
+def crm_responder(messages) -> object:
+    """Answer like the agents' LLM would, deterministically.
+
+    Classification prompts get ``CRM_QUERY`` for messages mentioning a lead
+    and ``OTHER`` otherwise; an agent turn asking about lead *N* first
+    requests ``get_crm_lead(N)`` and answers once the tool result is in.
+    """
+    text = last_human_text(messages)
+    if text.startswith("Classify the following"):
+        return "CRM_QUERY" if "lead" in text.lower() else "OTHER"
+    if messages and messages[-1].type == "tool":
+        return "Here is the lead you asked for: " + str(messages[-1].content)[:80]
+    words = text.split()
+    if "lead" in text.lower() and words[-1].isdigit():
+        return tool_call_message(("get_crm_lead", {"lead_id": int(words[-1])}))
+    return "Hello! How can I help you with your CRM today?"
+
+
+def _chat_request(i: int) -> tuple[str, dict]:
+    message = f"show me lead {1 + i % 200}" if i % 2 else "hello, what can you do?"
+    return "/chat", {"session_id": f"load-{i % 50}", "message": message}
+
+
+def _workflow_request(i: int) -> tuple[str, dict]:
+    return "/workflows/run", {
+        "workflow_name": "lead_qualification",
+        "context": {"lead_id": 1 + i % 200},
+    }
+
+
+def _webhook_request(i: int) -> tuple[str, dict]:
+    return "/webhooks/odoo", {
+        "event": "lead.created",
+        "model": "crm.lead",
+        "record_id": 1 + i % 200,
+    }
+
+
+ENDPOINTS: dict[str, RequestFactory] = {
+    "chat": _chat_request,
+    "workflow": _workflow_request,
+    "webhook": _webhook_request,
+}
+
+
+# ── measurement ────────────────────────────────────────────────────────────────
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "p50": round(float(p50), 2),
+        "p95": round(float(p95), 2),
+        "p99": round(float(p99), 2),
+        "max": round(max(values), 2),
+    }
+
+
+@dataclass
+class EndpointReport:
+    """Results of one endpoint phase (latencies in milliseconds)."""
+
+    endpoint: str
+    requests: int
+    errors: int
+    duration_s: float
+    latency_ms: dict[str, float]
+    loop_lag_ms: dict[str, float]
+    error_kinds: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        """Completed requests per second."""
+        return self.requests / self.duration_s if self.duration_s else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        """Share of requests that failed (non-2xx or transport error)."""
+        return self.errors / self.requests if self.requests else 0.0
+
+
+class LoopLagProbe:
+    """Measure how late a periodic timer fires on an event loop."""
+
+    def __init__(self, interval: float = LAG_PROBE_INTERVAL) -> None:
+        self.interval = interval
+        self.samples: list[tuple[float, float]] = []  # (monotonic time, lag ms)
+        self._running = True
+
+    async def run(self) -> None:
+        """Sample until :meth:`stop` is called."""
+        while self._running:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self.samples.append((now, max(0.0, (now - started - self.interval) * 1000)))
+
+    def stop(self) -> None:
+        """Stop sampling after the current tick."""
+        self._running = False
+
+    def between(self, start: float, end: float) -> list[float]:
+        """Return the lag samples (ms) taken in ``[start, end]``."""
+        return [lag for at, lag in list(self.samples) if start <= at <= end]
+
+
+async def drive(
+    base_url: str,
+    factory: RequestFactory,
+    duration: float,
+    concurrency: int,
+    rate: float | None,
+    seed: int = 0,
+) -> tuple[list[float], list[str]]:
+    """Send requests for ``duration`` seconds and collect their outcomes.
+
+    Args:
+        base_url: Server base URL.
+        factory: Returns ``(path, json_body)`` for request number *i*.
+        duration: Seconds to keep issuing requests.
+        concurrency: Maximum requests in flight.
+        rate: Open-loop arrival rate (requests/s); None for closed-loop.
+        seed: Seed of the Poisson arrival process.
+
+    Returns:
+        tuple[list[float], list[str]]: Latencies in ms of every request and
+            the error kinds of the failed ones.
+    """
+    latencies: list[float] = []
+    errors: list[str] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+
+        async def send(i: int, scheduled: float, slots: asyncio.Semaphore | None) -> None:
+            path, body = factory(i)
+            try:
+                response = await client.post(path, json=body)
+                if response.status_code >= 400:
+                    errors.append(f"http_{response.status_code}")
+            except httpx.HTTPError as exc:
+                errors.append(type(exc).__name__)
+            finally:
+                latencies.append((time.perf_counter() - scheduled) * 1000)
+                if slots is not None:
+                    slots.release()
+
+        deadline = time.perf_counter() + duration
+        if rate:
+            rng = random.Random(seed)
+            slots = asyncio.Semaphore(concurrency)
+            tasks = []
+            next_at = time.perf_counter()
+            i = 0
+            while next_at < deadline:
+                await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+                await slots.acquire()
+                tasks.append(asyncio.create_task(send(i, next_at, slots)))
+                i += 1
+                next_at += rng.expovariate(rate)
+            await asyncio.gather(*tasks)
+        else:
+            counter = iter(range(sys.maxsize))
+
+            async def worker() -> None:
+                while time.perf_counter() < deadline:
+                    await send(next(counter), time.perf_counter(), None)
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+# ── server ─────────────────────────────────────────────────────────────────────
+
+
+class AppServer:
+    """Run ``app.main:app`` under uvicorn on its own event loop thread."""
+
+    def __init__(self) -> None:
+        import uvicorn
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        from app.main import app
+
+        config = uvicorn.Config(
+            app, host="127.0.0.1", port=self.port, log_level="warning", loop="none"
+        )
+        self._server = uvicorn.Server(config)
+        self.loop = asyncio.new_event_loop()
+        self.probe = LoopLagProbe()
+        self._thread = threading.Thread(target=self._serve, name="load-app", daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        return f"http://127.0.0.1:{self.port}"
+
+    def _serve(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self._server.serve())
+
+    def start(self) -> AppServer:
+        """Start serving and the lag probe; wait until the app is up."""
+        self._thread.start()
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError("uvicorn failed to start")
+            time.sleep(0.01)
+        asyncio.run_coroutine_threadsafe(self.probe.run(), self.loop)
+        return self
+
+    def stop(self) -> None:
+        """Stop the probe and the server."""
+        self.probe.stop()
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
+
+
+def _isolate(workdir: Path, odoo: StubOdooServer) -> None:
+    """Configure the app through env vars; must run before ``app`` is imported."""
+    os.environ.update(
+        {
+            "DATABASE_URL": f"sqlite:///{workdir / 'sessions.db'}",
+            "CHROMA_PERSIST_DIR": str(workdir / "chroma"),
+            "ODOO_URL": odoo.url,
+            "ODOO_DB": "stub",
+            "ODOO_USER": "bot@example.com",
+            "ODOO_API_KEY": "stub-key",
+            "CDC_POLL_INTERVAL_SECONDS": "0",
+            "LLM_CACHE_AGENTS": "",
+        }
+    )
+    os.environ.setdefault("OPENAI_API_KEY", "sk-load-test")
+
+
+def run_load(args: argparse.Namespace) -> list[EndpointReport]:
+    """Start the stack, drive each selected endpoint and return the reports."""
+    reports = []
+    with (
+        tempfile.TemporaryDirectory(prefix="load-") as tmp,
+        StubOdooServer(latency=args.odoo_latency) as odoo,
+        warnings.catch_warnings(record=True),
+    ):
+        odoo.add_records("crm.lead", make_leads(200))
+        odoo.add_records(
+            "crm.stage",
+            [
+                {"id": 1, "name": "New", "sequence": 1},
+                {"id": 2, "name": "In Progress", "sequence": 2},
+                {"id": 3, "name": "Qualified", "sequence": 3},
+            ],
+        )
+        _isolate(Path(tmp), odoo)
+        from app.utils.logger import configure_logging
+
+        configure_logging("WARNING")
+        model = FakeChatModel(
+            responder=crm_responder,
+            latency=args.llm_latency,
+            tokens_per_second=args.llm_tps,
+        )
+        with patch("app.agents.base_agent.get_chat_model", lambda *a, **kw: model):
+            server = AppServer().start()
+            try:
+                for name in args.endpoints:
+                    started = time.perf_counter()
+                    latencies, errors = asyncio.run(
+                        drive(
+                            server.url,
+                            ENDPOINTS[name],
+                            args.duration,
+                            args.concurrency,
+                            args.rate,
+                            args.seed,
+                        )
+                    )
+                    ended = time.perf_counter()
+                    kinds: dict[str, int] = {}
+                    for kind in errors:
+                        kinds[kind] = kinds.get(kind, 0) + 1
+                    reports.append(
+                        EndpointReport(
+                            endpoint=name,
+                            requests=len(latencies),
+                            errors=len(errors),
+                            duration_s=round(ended - started, 3),
+                            latency_ms=_percentiles(latencies),
+                            loop_lag_ms=_percentiles(server.probe.between(started, ended)),
+                            error_kinds=kinds,
+                        )
+                    )
+            finally:
+                server.stop()
+    return reports
+
+
+def _print_reports(reports: list[EndpointReport]) -> None:
+    print(
+        f"{'endpoint':10} {'reqs':>6} {'req/s':>7} {'err %':>6} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'lag p99':>8} {'lag max':>8}"
+    )
+    for r in reports:
+        print(
+            f"{r.endpoint:10} {r.requests:6d} {r.throughput:7.1f} {r.error_rate * 100:6.1f} "
+            f"{r.latency_ms['p50']:8.1f} {r.latency_ms['p95']:8.1f} {r.latency_ms['p99']:8.1f} "
+            f"{r.loop_lag_ms['p99']:8.1f} {r.loop_lag_ms['max']:8.1f}"
+        )
+        if r.error_kinds:
+            print(f"{'':10} errors: {r.error_kinds}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for ``python -m tests.benchmarks.load``."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--endpoints",
+        default="chat,workflow,webhook",
+        type=lambda value: [name.strip() for name in value.split(",") if name.strip()],
+        help=f"Comma-separated phases to run ({', '.join(ENDPOINTS)})",
+    )
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="Max requests in flight")
+    parser.add_argument("--rate", type=float, help="Open-loop arrival rate (req/s)")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Fake LLM TTFT (s)")
+    parser.add_argument("--llm-tps", type=float, default=50, help="Fake LLM words per second")
+    parser.add_argument("--odoo-latency", type=float, default=0.01, help="Stub Odoo latency (s)")
+    parser.add_argument("--seed", type=int, default=0, help="Arrival process seed")
+    parser.add_argument("--json", help="Also write the reports to this JSON file")
+    args = parser.parse_args(argv)
+    unknown = set(args.endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+
+    reports = run_load(args)
+    _print_reports(reports)
+    if args.json:
+        data = [
+            {**asdict(r), "throughput": r.throughput, "error_rate": r.error_rate} for r in reports
+        ]
+        Path(args.json).write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,14 +9,14 @@ from fastapi.testclient import TestClient
 @pytest.fixture
 def client():
     """Return a FastAPI TestClient with mocked Odoo connection and agents."""
+    mock_sup = MagicMock()
+    mock_sup.route.return_value = ("Odoo CRM is a pipeline tool.", "kb_agent")
+    # The supervisor is imported and built on the first request, so the mock
+    # replaces the cached instance for as long as the client is used.
     with patch("app.odoo.auth.test_connection", return_value=True), \
-         patch("app.agents.supervisor.SupervisorAgent") as mock_sup_cls:
-        mock_sup = MagicMock()
-        mock_sup.route.return_value = ("Odoo CRM is a pipeline tool.", "kb_agent")
-        mock_sup_cls.return_value = mock_sup
-
+         patch("app.api.routes.chat._supervisor", mock_sup):
         from app.main import app
-        return TestClient(app)
+        yield TestClient(app)
 
 
 class TestChatEndpoint:
@@ -78,3 +78,20 @@ class TestWorkflowEndpoint:
         )
         # May return 200 (success or handled error) — workflow logic uses mock Odoo
         assert response.status_code in (200, 500)
+
+
+class TestWebhookEndpoint:
+    """Tests for POST /webhooks/odoo."""
+
+    def test_webhook_is_accepted(self, client):
+        """A mapped event should be acknowledged and its workflow queued."""
+        with patch("app.api.routes.webhooks._get_workflow_agent") as get_agent:
+            response = client.post(
+                "/webhooks/odoo",
+                json={"event": "lead.created", "model": "crm.lead", "record_id": 7},
+            )
+        assert response.status_code == 200
+        assert response.json() == {"status": "accepted", "event": "lead.created"}
+        get_agent.return_value.execute.assert_called_once_with(
+            "lead_qualification", {"lead_id": 7}, "webhook"
+        )
@@ -0,0 +1 @@
+"""Shared test and benchmark helpers (stub Odoo server, fake models)."""
@@ -0,0 +1,47 @@
+"""Scripted agents for exercising ``AgentExecutor`` without an LLM."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+from langchain.agents.agent import RunnableMultiActionAgent
+from langchain.agents.output_parsers.tools import ToolAgentAction
+from langchain_core.agents import AgentFinish
+from langchain_core.runnables import RunnableLambda
+
+
+def scripted_tool_agent(
+    steps: Sequence[Sequence[tuple[str, dict]]],
+    final_output: str = "done",
+) -> RunnableMultiActionAgent:
+    """Return an agent that emits the given tool calls, one list per step.
+
+    Args:
+        steps: For each agent step, the ``(tool_name, tool_input)`` calls the
+            model "emits" in parallel.
+        final_output: Output of the ``AgentFinish`` after the last step.
+
+    Returns:
+        RunnableMultiActionAgent: Agent usable with any ``AgentExecutor``.
+    """
+
+    def plan(inputs: dict[str, Any]):
+        calls_done = len(inputs["intermediate_steps"])
+        seen = 0
+        for number, step in enumerate(steps):
+            if calls_done == seen:
+                return [
+                    ToolAgentAction(
+                        tool=name,
+                        tool_input=tool_input,
+                        log=f"step {number} call {index}",
+                        message_log=[],
+                        tool_call_id=f"call_{number}_{index}",
+                    )
+                    for index, (name, tool_input) in enumerate(step)
+                ]
+            seen += len(step)
+        return AgentFinish(return_values={"output": final_output}, log=final_output)
+
+    return RunnableMultiActionAgent(runnable=RunnableLambda(plan), stream_runnable=False)
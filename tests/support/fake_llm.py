@@ -0,0 +1,206 @@
+"""Deterministic, scriptable chat model for tests, benchmarks and load runs.
+
+:class:`FakeChatModel` is a LangChain ``BaseChatModel`` that never touches the
+network.  Each call is answered by, in order of precedence:
+
+* ``responder(messages)`` — a callable returning an ``AIMessage`` or text;
+* ``responses`` — a script consumed in order (cycling when exhausted).
+
+Answers may carry tool calls (see :func:`tool_call_message`), so the model
+drives ``create_openai_tools_agent`` executors exactly like ChatOpenAI.
+``latency`` adds a fixed delay per call (time to first token) and
+``tokens_per_second`` paces the answer word by word: streamed chunks are
+spaced accordingly, and a non-streaming call also waits for the whole
+answer to be "generated".
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import threading
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import Field, PrivateAttr
+
+Responder = Callable[[list[BaseMessage]], "AIMessage | str"]
+
+
+def tool_call_message(*calls: tuple[str, dict], content: str = "") -> AIMessage:
+    """Return an ``AIMessage`` requesting the given tool calls.
+
+    Args:
+        *calls: ``(tool_name, arguments)`` pairs.
+        content: Optional text content.
+
+    Returns:
+        AIMessage: Message with ``tool_calls`` set.
+    """
+    return AIMessage(
+        content=content,
+        tool_calls=[
+            {"name": name, "args": args, "id": f"call_{uuid.uuid4().hex[:12]}"}
+            for name, args in calls
+        ],
+    )
+
+
+def last_human_text(messages: Sequence[BaseMessage]) -> str:
+    """Return the content of the last human message (or '')."""
+    for message in reversed(messages):
+        if message.type == "human":
+            return str(message.content)
+    return ""
+
+
+class FakeChatModel(BaseChatModel):
+    """Scriptable chat model with configurable latency and streaming.
+
+    Attributes:
+        responses: Scripted answers (``AIMessage`` or text), used in order.
+        responder: Callable producing the answer from the messages; takes
+            precedence over ``responses``.
+        latency: Seconds to wait before answering (time to first token).
+        tokens_per_second: Generation rate in words per second; 0 answers
+            without generation delay.
+        model_name: Reported model name.
+    """
+
+    responses: list[Any] = Field(default_factory=list)
+    responder: Responder | None = None
+    latency: float = 0.0
+    tokens_per_second: float = 0.0
+    model_name: str = "fake-chat"
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _script: Iterator[Any] | None = PrivateAttr(default=None)
+    _calls: int = PrivateAttr(default=0)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"model_name": self.model_name}
+
+    @property
+    def call_count(self) -> int:
+        """Number of calls answered so far."""
+        return self._calls
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        """Accept tools like ChatOpenAI does (they are not used to answer)."""
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _next_message(self, messages: list[BaseMessage]) -> AIMessage:
+        with self._lock:
+            self._calls += 1
+            if self.responder is not None:
+                answer = self.responder(messages)
+            elif self.responses:
+                if self._script is None:
+                    self._script = itertools.cycle(self.responses)
+                answer = next(self._script)
+            else:
+                answer = "ok"
+        if isinstance(answer, AIMessage):
+            return answer.model_copy(deep=True)
+        return AIMessage(content=str(answer))
+
+    def _generation_time(self, message: AIMessage) -> float:
+        if not self.tokens_per_second:
+            return 0.0
+        return len(self._chunks(message)) / self.tokens_per_second
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self._next_message(messages)
+        delay = self.latency + self._generation_time(message)
+        if delay:
+            time.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self._next_message(messages)
+        delay = self.latency + self._generation_time(message)
+        if delay:
+            await asyncio.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _chunks(self, message: AIMessage) -> list[AIMessageChunk]:
+        words = str(message.content).split(" ")
+        chunks = [
+            AIMessageChunk(content=word if i == 0 else f" {word}") for i, word in enumerate(words)
+        ]
+        if message.tool_calls:
+            chunks.append(
+                AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {
+                            "name": call["name"],
+                            "args": json.dumps(call["args"]),
+                            "id": call["id"],
+                            "index": index,
+                        }
+                        for index, call in enumerate(message.tool_calls)
+                    ],
+                )
+            )
+        return chunks
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        if self.latency:
+            time.sleep(self.latency)
+        delay = 1 / self.tokens_per_second if self.tokens_per_second else 0
+        for chunk in self._chunks(self._next_message(messages)):
+            if delay:
+                time.sleep(delay)
+            generation = ChatGenerationChunk(message=chunk)
+            if run_manager:
+                run_manager.on_llm_new_token(str(chunk.content), chunk=generation)
+            yield generation
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        delay = 1 / self.tokens_per_second if self.tokens_per_second else 0
+        for chunk in self._chunks(self._next_message(messages)):
+            if delay:
+                await asyncio.sleep(delay)
+            generation = ChatGenerationChunk(message=chunk)
+            if run_manager:
+                await run_manager.on_llm_new_token(str(chunk.content), chunk=generation)
+            yield generation
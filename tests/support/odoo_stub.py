@@ -0,0 +1,422 @@
+"""In-process stub of the Odoo 16 JSON-RPC endpoint for tests and benchmarks.
+
+:class:`StubOdooServer` serves ``POST /jsonrpc`` from a background thread and
+answers ``common.login``/``common.version`` and the ``object.execute_kw``
+methods used by :mod:`app.odoo` (``search_read``, ``read``, ``search``,
+``search_count``, ``read_group``, ``create``, ``write``, ``unlink``) against
+in-memory records.  Every call sleeps ``latency`` seconds to model the Odoo
+round-trip, and :meth:`StubOdooServer.inject_fault` queues failures for the
+next matching calls.
+
+Usage::
+
+    with StubOdooServer(latency=0.02) as odoo:
+        odoo.add_records("crm.lead", [{"id": 1, "name": "Acme"}])
+        client = odoo.client()
+        client.search_read("crm.lead", [], ["name"])
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import json
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Self
+
+UID = 2
+
+
+@dataclass
+class Fault:
+    """A queued failure for calls matching ``pattern`` (``"model.method"`` glob).
+
+    Attributes:
+        pattern: Glob matched against ``"<model>.<method>"`` (``"common.login"``
+            for the common service).
+        kind: ``"http_500"``, ``"http_503"``, ``"access_denied"``,
+            ``"missing_method"``, ``"rpc_error"``, ``"invalid_json"``,
+            ``"disconnect"`` or ``"delay"``.
+        times: Number of matching calls to affect.
+        delay: Extra seconds to sleep for ``"delay"`` faults.
+    """
+
+    pattern: str
+    kind: str
+    times: int = 1
+    delay: float = 0.0
+
+
+def _matches(record: dict, term: Any) -> bool:
+    if not isinstance(term, list | tuple) or len(term) != 3:
+        return True
+    field, operator, value = term
+    current = record.get(field)
+    if isinstance(current, list) and len(current) == 2 and isinstance(current[0], int):
+        current = current[0]
+    if operator == "=":
+        return current == value
+    if operator == "!=":
+        return current != value
+    if operator == "in":
+        return current in value
+    if operator == "not in":
+        return current not in value
+    if operator in (">", ">=", "<", "<="):
+        if current is None or current is False:
+            return False
+        return {
+            ">": current > value,
+            ">=": current >= value,
+            "<": current < value,
+            "<=": current <= value,
+        }[operator]
+    if operator == "ilike":
+        return str(value).lower() in str(current or "").lower()
+    return True
+
+
+def _evaluate(record: dict, domain: list) -> bool:
+    """Evaluate a prefix-notation Odoo domain against one record."""
+    stack: list[bool] = []
+    for term in reversed(domain):
+        if term == "&":
+            left, right = stack.pop(), stack.pop()
+            stack.append(left and right)
+        elif term == "|":
+            left, right = stack.pop(), stack.pop()
+            stack.append(left or right)
+        elif term == "!":
+            stack.append(not stack.pop())
+        else:
+            stack.append(_matches(record, term))
+    return all(stack)
+
+
+def _sort(records: list[dict], order: str | None) -> list[dict]:
+    for part in reversed([p.strip() for p in (order or "id asc").split(",") if p.strip()]):
+        name, _, direction = part.partition(" ")
+        records.sort(
+            key=lambda r, n=name: (r.get(n) is None, r.get(n) if r.get(n) is not False else ""),
+            reverse=direction.strip().lower() == "desc",
+        )
+    return records
+
+
+class StubOdooServer:
+    """Threaded stub Odoo JSON-RPC server.
+
+    Args:
+        latency: Seconds each call sleeps before answering.
+        host: Interface to bind.
+    """
+
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1") -> None:
+        self.latency = latency
+        self.records: dict[str, dict[int, dict]] = defaultdict(dict)
+        self.calls: list[tuple[str, str]] = []
+        self.faults: list[Fault] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> StubOdooServer:
+        """Start serving in a daemon thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and release the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def configure(self, client: Any) -> Any:
+        """Point an existing :class:`~app.odoo.client.OdooClient` at this server.
+
+        Args:
+            client: Client to reconfigure (e.g. the ``odoo_client`` singleton).
+
+        Returns:
+            The same client.
+        """
+        client._url = self.url
+        client._jsonrpc_endpoint = f"{self.url}/jsonrpc"
+        client._db = "stub"
+        client._user = "bot@example.com"
+        client._api_key = "stub-key"
+        client._uid = None
+        return client
+
+    def client(self, **overrides: Any):
+        """Return a new :class:`~app.odoo.client.OdooClient` pointed at this server.
+
+        Args:
+            **overrides: Attributes to set on the client after construction.
+        """
+        from app.odoo.client import OdooClient
+
+        client = self.configure(OdooClient())
+        for name, value in overrides.items():
+            setattr(client, name, value)
+        return client
+
+    # ------------------------------------------------------------------
+    # Data and faults
+    # ------------------------------------------------------------------
+
+    def add_records(self, model: str, records: Iterable[dict]) -> None:
+        """Store records (each must have an ``id``)."""
+        with self._lock:
+            for record in records:
+                self.records[model][record["id"]] = dict(record)
+
+    def inject_fault(self, pattern: str, kind: str, times: int = 1, delay: float = 0.0) -> None:
+        """Queue a failure for the next ``times`` calls matching ``pattern``."""
+        with self._lock:
+            self.faults.append(Fault(pattern, kind, times, delay))
+
+    def call_count(self, pattern: str = "*") -> int:
+        """Number of received calls whose ``"model.method"`` matches ``pattern``."""
+        with self._lock:
+            return sum(1 for call in self.calls if fnmatch.fnmatch(".".join(call), pattern))
+
+    def _take_fault(self, key: str) -> Fault | None:
+        with self._lock:
+            for fault in self.faults:
+                if fault.times > 0 and fnmatch.fnmatch(key, fault.pattern):
+                    fault.times -= 1
+                    return fault
+        return None
+
+    # ------------------------------------------------------------------
+    # JSON-RPC dispatch
+    # ------------------------------------------------------------------
+
+    def _dispatch(self, service: str, method: str, args: list) -> Any:
+        if service == "common":
+            if method == "login":
+                return UID
+            if method == "version":
+                return {"server_version": "16.0", "server_version_info": [16, 0, 0, "final", 0]}
+            raise ValueError(f"Unknown common method {method}")
+        _db, _uid, _key, model, rpc_method, rpc_args, kwargs = args
+        handler = getattr(self, f"_rpc_{rpc_method}", None)
+        if handler is None:
+            return True
+        with self._lock:
+            return handler(model, *rpc_args, **(kwargs or {}))
+
+    def _select(self, model: str, domain: list, order: str | None = None) -> list[dict]:
+        records = [r for r in self.records[model].values() if _evaluate(r, domain)]
+        return _sort(records, order)
+
+    @staticmethod
+    def _project(record: dict, fields: list[str] | None) -> dict:
+        if not fields:
+            return dict(record)
+        return {"id": record["id"], **{f: record.get(f, False) for f in fields}}
+
+    def _rpc_search_read(
+        self, model, domain=None, fields=None, limit=None, offset=0, order=None, **_
+    ):
+        selected = self._select(model, domain or [], order)[offset:]
+        if limit:
+            selected = selected[:limit]
+        return [self._project(r, fields) for r in selected]
+
+    def _rpc_search(self, model, domain=None, limit=None, offset=0, order=None, **_):
+        selected = self._select(model, domain or [], order)[offset:]
+        if limit:
+            selected = selected[:limit]
+        return [r["id"] for r in selected]
+
+    def _rpc_search_count(self, model, domain=None, **_):
+        return len(self._select(model, domain or []))
+
+    def _rpc_read(self, model, ids, fields=None, **_):
+        table = self.records[model]
+        return [self._project(table[i], fields) for i in ids if i in table]
+
+    def _rpc_read_group(self, model, domain, fields, groupby, lazy=True, **_):
+        group_fields = [groupby] if isinstance(groupby, str) else list(groupby)
+        if lazy:
+            group_fields = group_fields[:1]
+        groups: dict[tuple, dict] = {}
+        for record in self._select(model, domain or []):
+            key = tuple(
+                tuple(record.get(g)) if isinstance(record.get(g), list) else record.get(g)
+                for g in group_fields
+            )
+            group = groups.setdefault(
+                key,
+                {
+                    **{g: record.get(g, False) for g in group_fields},
+                    "__count": 0,
+                    "__domain": domain,
+                },
+            )
+            group["__count"] += 1
+            for spec in fields:
+                name, _, agg = spec.partition(":")
+                if agg == "sum" and name not in group_fields:
+                    group[name] = group.get(name, 0) + (record.get(name) or 0)
+        if lazy and group_fields:
+            for group in groups.values():
+                group[f"{group_fields[0]}_count"] = group.pop("__count")
+        return list(groups.values())
+
+    def _rpc_create(self, model, values, **_):
+        table = self.records[model]
+        rows = values if isinstance(values, list) else [values]
+        new_ids = []
+        for row in rows:
+            new_id = max(table, default=0) + 1
+            table[new_id] = {"id": new_id, **row}
+            new_ids.append(new_id)
+        return new_ids if isinstance(values, list) else new_ids[0]
+
+    def _rpc_write(self, model, ids, values, **_):
+        for record_id in ids:
+            if record_id in self.records[model]:
+                self.records[model][record_id].update(values)
+        return True
+
+    def _rpc_unlink(self, model, ids, **_):
+        for record_id in ids:
+            self.records[model].pop(record_id, None)
+        return True
+
+    # ------------------------------------------------------------------
+    # HTTP handler
+    # ------------------------------------------------------------------
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate small writes; with Nagle on, every
+            # keep-alive reply would wait ~40 ms for the client's delayed ACK.
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _reply(self, status: int, body: bytes) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                # Reachability probe of the web UI (app.odoo.auth.test_connection)
+                self._reply(200, b"{}")
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                params = payload.get("params", {})
+                service, method = params.get("service"), params.get("method")
+                args = params.get("args", [])
+                key = (
+                    (args[3], args[4])
+                    if service == "object" and len(args) >= 5
+                    else (service, method)
+                )
+                with stub._lock:
+                    stub.calls.append(key)
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                fault = stub._take_fault(".".join(key))
+                if fault is not None:
+                    if fault.kind == "delay":
+                        time.sleep(fault.delay)
+                    elif fault.kind == "disconnect":
+                        self.close_connection = True
+                        self.connection.close()
+                        return
+                    elif fault.kind.startswith("http_"):
+                        self._reply(int(fault.kind[5:]), b"Service unavailable")
+                        return
+                    elif fault.kind == "invalid_json":
+                        self._reply(200, b"<html>gateway error</html>")
+                        return
+                    else:
+                        name = {
+                            "access_denied": "odoo.exceptions.AccessDenied",
+                            "missing_method": "builtins.AttributeError",
+                        }.get(fault.kind, "builtins.ValueError")
+                        error = {
+                            "code": 200,
+                            "message": "Odoo Server Error",
+                            "data": {"name": name, "message": fault.kind},
+                        }
+                        body = {"jsonrpc": "2.0", "id": payload.get("id"), "error": error}
+                        self._reply(200, json.dumps(body).encode())
+                        return
+
+                try:
+                    result = stub._dispatch(service, method, args)
+                    body = {"jsonrpc": "2.0", "id": payload.get("id"), "result": result}
+                except Exception as exc:  # noqa: BLE001
+                    error = {
+                        "code": 200,
+                        "message": "Odoo Server Error",
+                        "data": {"name": type(exc).__name__, "message": str(exc)},
+                    }
+                    body = {"jsonrpc": "2.0", "id": payload.get("id"), "error": error}
+                self._reply(200, json.dumps(body).encode())
+
+        return Handler
+
+
+def make_leads(count: int, start: int = 1) -> list[dict]:
+    """Return ``count`` synthetic ``crm.lead`` records in Odoo read format."""
+    stages = [[1, "New"], [2, "Qualified"], [3, "Proposition"], [4, "Won"]]
+    return [
+        {
+            "id": i,
+            "name": f"Lead {i}",
+            "type": "opportunity" if i % 2 else "lead",
+            "stage_id": stages[i % len(stages)],
+            "user_id": [2 + i % 5, f"Salesperson {i % 5}"],
+            "team_id": [1 + i % 3, f"Team {i % 3}"],
+            "partner_id": [1000 + i, f"Partner {i}"] if i % 3 else False,
+            "email_from": f"contact{i}@example{i % 50}.com",
+            "phone": f"+55 11 9{i:08d}",
+            "expected_revenue": float((i * 137) % 50000),
+            "probability": float((i * 7) % 100),
+            "description": "Budget approved" if i % 4 == 0 else False,
+            "date_deadline": "2026-12-31" if i % 2 else False,
+            "active": True,
+            "priority": str(i % 4),
+            "tag_ids": [],
+            "create_date": "2026-01-01 00:00:00",
+            "write_date": f"2026-01-{1 + i % 28:02d} 12:00:00",
+        }
+        for i in range(start, start + count)
+    ]
@@ -0,0 +1,53 @@
+"""Shared fixtures for unit tests."""
+
+import contextlib
+import importlib
+from unittest.mock import patch
+
+import pytest
+import sqlalchemy as sa
+
+# test_kb_agent installs module stubs for LangChain packages that are not yet
+# imported.  Import the real packages first (when installed) so those stubs
+# cannot shadow them for test modules collected later.
+for _package in ("langchain_openai", "langchain_core.tools", "langchain.agents"):
+    with contextlib.suppress(ImportError):
+        importlib.import_module(_package)
+
+
+@pytest.fixture
+def odoo_stub():
+    """Return a factory that starts a seeded stub Odoo server used by the default client.
+
+    Call it with a mapping of model name to records; the server, its client
+    and the routing are torn down with the test.
+    """
+    from app.odoo.client import use_client
+    from tests.support.odoo_stub import StubOdooServer
+
+    with contextlib.ExitStack() as stack:
+
+        def start(records: dict[str, list[dict]]) -> StubOdooServer:
+            server = stack.enter_context(StubOdooServer())
+            for model, rows in records.items():
+                server.add_records(model, rows)
+            client = server.client()
+            stack.callback(client.close)
+            stack.enter_context(use_client(client))
+            return server
+
+        yield start
+
+
+@pytest.fixture
+def workflow_db(tmp_path):
+    """Point the workflow log, checkpoint and CDC helpers at a temporary SQLite file."""
+    from app.memory import cdc_state, session_store, workflow_log
+
+    url = f"sqlite:///{tmp_path / 'sessions.db'}"
+    engine = sa.create_engine(url)
+    with patch.object(session_store.settings, "database_url", url):
+        session_store.init_db()
+    with patch.object(workflow_log, "_engine", engine), patch.object(cdc_state, "_engine", engine):
+        yield engine
+    engine.dispose()
@@ -0,0 +1,118 @@
+"""Unit tests for the aggregated activity digest."""
+
+import json
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import activities as activities_route
+from app.odoo.models.mail_activity import activity_digest
+from app.tools.odoo_activity_tools import get_activity_digest
+
+TODAY = date.today()
+ALICE, BOB = [7, "Alice"], [8, "Bob"]
+CALL, EMAIL = [2, "Call"], [4, "Email"]
+
+
+def _activity(activity_id, user, kind, days, model="crm.lead"):
+    return {
+        "id": activity_id,
+        "res_model": model,
+        "res_id": 100 + activity_id,
+        "res_name": f"Lead {activity_id}",
+        "activity_type_id": kind,
+        "summary": f"Follow up {activity_id}",
+        "date_deadline": (TODAY + timedelta(days=days)).isoformat(),
+        "user_id": user,
+    }
+
+
+ACTIVITIES = [
+    _activity(1, ALICE, CALL, -5),
+    _activity(2, ALICE, CALL, -1),
+    _activity(3, ALICE, EMAIL, -3),
+    _activity(4, ALICE, EMAIL, 0),
+    _activity(5, ALICE, CALL, 4),
+    _activity(6, BOB, EMAIL, 0),
+    _activity(7, BOB, CALL, 2, model="res.partner"),
+    _activity(8, False, CALL, -2),
+]
+
+
+@pytest.fixture
+def stub(odoo_stub):
+    """A stub Odoo server with activities and one sales team."""
+    return odoo_stub(
+        {
+            "mail.activity": ACTIVITIES,
+            "crm.team": [
+                {"id": 1, "name": "Sales", "user_id": ALICE, "member_ids": [8], "active": True}
+            ],
+        }
+    )
+
+
+def _counts(rows):
+    return {row["name"]: (row["overdue"], row["today"], row["planned"]) for row in rows}
+
+
+class TestActivityDigest:
+    """Tests for the read_group based digest."""
+
+    def test_counts_per_user_team_and_type(self, stub):
+        """Buckets come from deadlines; counts cost three read_group calls."""
+        digest = activity_digest(top_n=2, today=TODAY)
+        assert digest["totals"] == {"overdue": 4, "today": 2, "planned": 2}
+        assert [row["name"] for row in digest["users"]] == ["Alice", "Unassigned", "Bob"]
+        assert _counts(digest["users"]) == {
+            "Alice": (3, 1, 1),
+            "Unassigned": (1, 0, 0),
+            "Bob": (0, 1, 1),
+        }
+        assert _counts(digest["teams"]) == {"Sales": (3, 2, 2), "No team": (1, 0, 0)}
+        assert _counts(digest["types"]) == {"Call": (3, 0, 2), "Email": (1, 2, 0)}
+        assert stub.call_count("mail.activity.read_group") == 3
+
+    def test_details_only_for_the_most_overdue(self, stub):
+        """Each urgent user gets their top-N oldest activities; nothing more is read."""
+        digest = activity_digest(top_n=2, today=TODAY)
+        alice, unassigned, bob = digest["users"]
+        assert [a["id"] for a in alice["top"]] == [1, 3]
+        assert alice["top"][0] == {
+            "id": 1,
+            "record": "crm.lead,101",
+            "name": "Lead 1",
+            "type": "Call",
+            "summary": "Follow up 1",
+            "due": (TODAY - timedelta(days=5)).isoformat(),
+        }
+        assert [a["id"] for a in unassigned["top"]] == [8]
+        assert [a["id"] for a in bob["top"]] == [6]
+        assert stub.call_count("mail.activity.search_read") == 3
+        assert "top" not in activity_digest(top_n=0, today=TODAY)["users"][0]
+
+    def test_filters(self, stub):
+        """User and model filters narrow every count."""
+        digest = activity_digest(user_id=8, res_model="crm.lead", top_n=0, today=TODAY)
+        assert digest["totals"] == {"overdue": 0, "today": 1, "planned": 0}
+        assert _counts(digest["users"]) == {"Bob": (0, 1, 0)}
+
+
+class TestDigestInterfaces:
+    """Tests for the agent tool and GET /activities/digest."""
+
+    def test_tool_and_endpoint(self, stub):
+        """Both return the same digest shape; the endpoint validates top_n."""
+        result = json.loads(get_activity_digest.invoke({"top_n": 1}))
+        assert [len(row.get("top", [])) for row in result["users"]] == [1, 1, 1]
+        app = FastAPI()
+        app.include_router(activities_route.router, prefix="/activities")
+        with patch("app.odoo.models.mail_activity.odoo_client", stub.client()):
+            client = TestClient(app)
+            response = client.get("/activities/digest", params={"user_id": 7})
+            invalid = client.get("/activities/digest", params={"top_n": -1})
+        assert response.json()["totals"] == {"overdue": 3, "today": 1, "planned": 1}
+        assert invalid.status_code == 422
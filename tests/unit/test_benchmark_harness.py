@@ -0,0 +1,45 @@
+"""Unit tests for the micro-benchmark harness (tests/benchmarks/harness.py)."""
+
+from tests.benchmarks.harness import Benchmark, compare, load_run, measure, save_run
+
+
+def _run(**medians: float) -> dict:
+    return {"meta": {}, "results": {name: {"median_us": us} for name, us in medians.items()}}
+
+
+class TestCompare:
+    """Tests for the regression gate."""
+
+    def test_flags_only_slowdowns_beyond_threshold(self):
+        """A 30 % slowdown should regress at 25 %, a 20 % one should not."""
+        baseline = _run(fast=100.0, slow=100.0, faster=100.0)
+        current = _run(fast=120.0, slow=130.0, faster=50.0)
+        result = {item.name: item for item in compare(baseline, current, threshold=0.25)}
+        assert not result["fast"].regressed
+        assert result["slow"].regressed and result["slow"].ratio == 1.3
+        assert not result["faster"].regressed
+
+    def test_missing_benchmarks_are_reported_not_failed(self):
+        """Benchmarks present on one side only should have no ratio."""
+        result = compare(_run(old=10.0), _run(new=10.0), threshold=0.25)
+        assert [(item.name, item.ratio, item.regressed) for item in result] == [
+            ("new", None, False),
+            ("old", None, False),
+        ]
+
+
+class TestMeasure:
+    """Tests for timing and persistence."""
+
+    def test_measure_reports_per_operation_times(self):
+        """Statistics should be positive and ordered min <= median <= p95."""
+        bench = Benchmark("noop", "unit", lambda env: lambda: None)
+        result = measure(bench, lambda: sum(range(100)), rounds=5, min_round_seconds=0.001)
+        assert result.iterations >= 1 and result.rounds == 5
+        assert 0 < result.min_us <= result.median_us <= result.p95_us
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        """A saved run should load back unchanged."""
+        run = _run(a=1.5)
+        save_run(run, tmp_path / "nested" / "run.json")
+        assert load_run(tmp_path / "nested" / "run.json") == run
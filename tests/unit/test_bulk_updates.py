@@ -0,0 +1,142 @@
+"""Unit tests for the bulk lead update helpers, tools and endpoint."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import leads as leads_route
+from app.odoo.models.crm_lead import (
+    bulk_mark_lost,
+    bulk_mark_won,
+    bulk_write_leads,
+    resolve_lead_ids,
+)
+from app.tools.odoo_crm_tools import bulk_update_crm_leads
+from app.tools.odoo_pipeline_tools import bulk_move_leads_to_stage
+
+LEADS = [
+    {"id": i, "name": f"Lead {i}", "partner_name": "Acme" if i <= 3 else "Globex", "active": True}
+    for i in range(1, 7)
+]
+
+
+@pytest.fixture
+def stub(odoo_stub):
+    """A stub Odoo server with six leads and two stages."""
+    return odoo_stub(
+        {
+            "crm.lead": LEADS,
+            "crm.stage": [{"id": 1, "name": "New"}, {"id": 2, "name": "Qualified"}],
+        }
+    )
+
+
+class TestBulkHelpers:
+    """Tests for grouping and the Won/Lost actions."""
+
+    def test_identical_values_share_one_write(self, stub):
+        """Leads are grouped by target values, one write per group."""
+        summary = bulk_write_leads(
+            {1: {"priority": "2"}, 2: {"priority": "3"}, 3: {"priority": "2"}, 4: {}}
+        )
+        assert summary == {"matched": 4, "updated": 3, "failed": 0, "calls": 2, "errors": []}
+        assert stub.call_count("crm.lead.write") == 2
+        assert [stub.records["crm.lead"][i].get("priority") for i in (1, 2, 3, 4)] == [
+            "2",
+            "3",
+            "2",
+            None,
+        ]
+
+    def test_failed_group_does_not_stop_the_others(self, stub):
+        """A rejected write is reported with its ids; other groups still land."""
+        stub.inject_fault("crm.lead.write", "rpc_error", times=1)
+        summary = bulk_write_leads({1: {"priority": "2"}, 2: {"priority": "3"}})
+        assert (summary["updated"], summary["failed"], summary["calls"]) == (1, 1, 2)
+        assert summary["errors"][0]["ids"] == [1]
+
+    def test_won_and_lost_act_on_id_lists(self, stub):
+        """Won/Lost are one action call each; the lost reason rides along."""
+        assert bulk_mark_won(domain=[["partner_name", "=", "Acme"]])["updated"] == 3
+        assert bulk_mark_lost(lead_ids=[4, 5, 4], lost_reason_id=7)["matched"] == 2
+        assert stub.call_count("crm.lead.action_set_won") == 1
+        assert stub.call_count("crm.lead.action_set_lost") == 1
+        assert stub.call_count("crm.lead.write") == 0
+
+    def test_won_lost_fall_back_only_for_a_missing_method(self, stub):
+        """A missing action falls back to a write; any other error is reported."""
+        stub.inject_fault("crm.lead.action_set_won", "missing_method", times=1)
+        assert bulk_mark_won(lead_ids=[1, 2])["updated"] == 2
+        assert stub.records["crm.lead"][1]["probability"] == 100
+        stub.inject_fault("crm.lead.action_set_lost", "rpc_error", times=1)
+        summary = bulk_mark_lost(lead_ids=[3, 4])
+        assert (summary["updated"], summary["failed"]) == (0, 2)
+        assert summary["errors"][0]["ids"] == [3, 4]
+        assert stub.call_count("crm.lead.write") == 1
+        assert stub.records["crm.lead"][3]["active"] is True
+
+    def test_target_is_required_and_capped(self, stub):
+        """Neither ids nor domain is an error, as is matching too many leads."""
+        with pytest.raises(ValueError):
+            resolve_lead_ids()
+        with (
+            patch("app.odoo.models.crm_lead.settings.bulk_update_max_records", 5),
+            pytest.raises(ValueError, match="More than 5"),
+        ):
+            resolve_lead_ids(domain=[])
+        with (
+            patch("app.odoo.models.crm_lead.settings.bulk_update_max_records", 2),
+            pytest.raises(ValueError, match="More than 2"),
+        ):
+            bulk_write_leads({1: {"priority": "1"}, 2: {"priority": "1"}, 3: {"priority": "1"}})
+
+
+class TestBulkTools:
+    """Tests for the agent tools and POST /leads/bulk."""
+
+    def test_move_by_domain_is_one_write(self, stub):
+        """Moving every Acme lead costs one search and one write."""
+        result = json.loads(
+            bulk_move_leads_to_stage.invoke(
+                {"stage_name": "qualified", "domain_json": '[["partner_name", "ilike", "acme"]]'}
+            )
+        )
+        assert (result["stage_id"], result["updated"], result["calls"]) == (2, 3, 1)
+        assert stub.call_count("crm.lead.write") == 1
+
+    def test_per_lead_updates_and_errors(self, stub):
+        """A list of per-lead objects is grouped; a missing target is reported."""
+        result = json.loads(
+            bulk_update_crm_leads.invoke(
+                {"values_json": '[{"id": 1, "priority": "1"}, {"id": 5, "priority": "1"}]'}
+            )
+        )
+        assert (result["updated"], result["calls"]) == (2, 1)
+        error = json.loads(bulk_update_crm_leads.invoke({"values_json": '{"priority": "1"}'}))
+        assert "error" in error
+        with patch("app.odoo.models.crm_lead.settings.bulk_update_max_records", 1):
+            capped = json.loads(
+                bulk_update_crm_leads.invoke(
+                    {"values_json": '[{"id": 1, "priority": "2"}, {"id": 2, "priority": "2"}]'}
+                )
+            )
+        assert "More than 1" in capped["error"]
+        assert stub.call_count("crm.lead.write") == 1
+
+    def test_endpoint(self, stub):
+        """The endpoint applies the action and maps bad requests to 400."""
+        app = FastAPI()
+        app.include_router(leads_route.router, prefix="/leads")
+        client = TestClient(app)
+        with patch("app.odoo.models.crm_lead.odoo_client", stub.client()):
+            ok = client.post("/leads/bulk", json={"ids": [1, 2], "values": {"priority": "3"}})
+            bad = client.post("/leads/bulk", json={"action": "won"})
+            with patch("app.odoo.models.crm_lead.settings.bulk_update_max_records", 1):
+                too_many = client.post(
+                    "/leads/bulk", json={"updates": {"1": {"priority": "1"}, "2": {}}}
+                )
+        assert ok.json()["updated"] == 2
+        assert bad.status_code == too_many.status_code == 400
@@ -0,0 +1,164 @@
+"""Unit tests for the pluggable cache backends (app/utils/cache.py)."""
+
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.outputs import Generation
+
+from app.agents import llm_cache
+from app.odoo.models import crm_stage, crm_team
+from app.utils import cache as cache_module
+from app.utils.cache import MemoryCache, SharedCache, get_cache
+from tests.benchmarks.imports import REPO_ROOT
+from tests.support.odoo_stub import StubOdooServer
+
+
+@pytest.fixture
+def backends(tmp_path):
+    """Fresh process-wide backends, with the shared one in a temporary file."""
+    with (
+        patch.object(cache_module, "_backends", {}),
+        patch.object(cache_module.settings, "cache_shared_path", str(tmp_path / "cache.db")),
+    ):
+        yield tmp_path / "cache.db"
+
+
+class TestMemoryCache:
+    """Tests for the in-process backend."""
+
+    def test_ttl_expiry(self):
+        """Entries should disappear once their TTL has passed."""
+        cache = MemoryCache()
+        cache.set("ns", "k", {"a": 1}, ttl=0.05)
+        assert cache.get("ns", "k") == {"a": 1}
+        time.sleep(0.06)
+        assert cache.get("ns", "k") is None
+
+    def test_lru_eviction_and_copies(self):
+        """The least recently used entry is evicted and values are returned as copies."""
+        cache = MemoryCache(max_entries=2)
+        cache.set("ns", "a", [1])
+        cache.set("ns", "b", [2])
+        cache.get("ns", "a").append(99)
+        cache.set("ns", "c", [3])
+        assert cache.get("ns", "a") == [1]
+        assert cache.get("ns", "b") is None
+
+    def test_cached_none_is_a_hit(self):
+        """get_or_set should not call the factory again for a cached None."""
+        cache = MemoryCache()
+        calls = []
+        for _ in range(2):
+            cache.get_or_set("ns", "missing", lambda: calls.append(1))
+        assert len(calls) == 1
+
+
+class TestSharedCache:
+    """Tests for the SQLite WAL backend shared between workers."""
+
+    def test_values_are_shared_between_instances(self, tmp_path):
+        """A value written by one worker should be read by another."""
+        path = str(tmp_path / "c.db")
+        worker_a, worker_b = SharedCache(path), SharedCache(path)
+        worker_a.set("reference", "stages", [{"id": 1}], ttl=60)
+        assert worker_b.get("reference", "stages") == [{"id": 1}]
+        assert worker_b.get("reference", "other") is None
+
+    def test_invalidation_is_broadcast(self, tmp_path):
+        """Invalidating in one worker should drop the other's local copy and notify once."""
+        path = str(tmp_path / "c.db")
+        worker_a = SharedCache(path, poll_interval=0)
+        worker_b = SharedCache(path, poll_interval=0)
+        seen_a, seen_b = [], []
+        worker_a.subscribe(lambda ns, key: seen_a.append((ns, key)))
+        worker_b.subscribe(lambda ns, key: seen_b.append((ns, key)))
+        worker_a.set("retrieval", "q", "old", ttl=60)
+        assert worker_b.get("retrieval", "q") == "old"  # now also in b's local copy
+        worker_a.invalidate("retrieval")
+        assert worker_b.get("retrieval", "q") is None
+        worker_a.poll_invalidations(force=True)
+        assert seen_a == seen_b == [("retrieval", None)]
+
+    def test_other_process_sees_values(self, tmp_path):
+        """A separate interpreter should read what this process wrote."""
+        path = str(tmp_path / "c.db")
+        SharedCache(path).set("reference", "teams", ["Sales"], ttl=60)
+        code = (
+            "from app.utils.cache import SharedCache;"
+            f"print(SharedCache({path!r}).get('reference', 'teams'))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            check=False,
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+        )
+        assert result.stdout.strip() == "['Sales']", result.stderr
+
+
+class TestConfiguration:
+    """Tests for selecting caches through settings.cache_backends."""
+
+    def test_unlisted_caches_are_disabled(self, backends):
+        """Caches not named in cache_backends should be None."""
+        with patch.object(cache_module.settings, "cache_backends", "reference=shared"):
+            assert get_cache("retrieval") is None
+            reference = get_cache("reference")
+        assert isinstance(reference.backend, SharedCache)
+        assert reference.ttl == cache_module.settings.reference_cache_ttl_seconds
+
+    def test_reference_data_is_cached(self, backends):
+        """Repeated stage lookups should reach Odoo once when the cache is enabled."""
+        with (
+            StubOdooServer() as stub,
+            patch.object(cache_module.settings, "cache_backends", "reference=memory"),
+        ):
+            stub.add_records("crm.stage", [{"id": 1, "name": "New"}, {"id": 2, "name": "Won"}])
+            with patch.object(crm_stage, "odoo_client", stub.client(_uid=2)):
+                assert crm_stage.get_stage_by_name("won")["id"] == 2
+                assert crm_stage.get_stage_by_name("Won ")["id"] == 2
+                assert len(crm_stage.get_all_stages()) == 2
+                crm_stage.get_all_stages()
+        assert stub.call_count("crm.stage.search_read") == 2
+
+    def test_team_lookup_hits_and_misses(self, backends):
+        """get_team should read Odoo once per team id and serve repeats from the cache."""
+        with (
+            StubOdooServer() as stub,
+            patch.object(cache_module.settings, "cache_backends", "reference=memory"),
+        ):
+            stub.add_records("crm.team", [{"id": 1, "name": "Sales"}, {"id": 2, "name": "EU"}])
+            with patch.object(crm_team, "odoo_client", stub.client(_uid=2)):
+                assert crm_team.get_team(1)["name"] == "Sales"
+                assert crm_team.get_team(1)["name"] == "Sales"
+                assert crm_team.get_team(2)["name"] == "EU"
+                assert crm_team.get_team(3) == {}
+        assert stub.call_count("crm.team.search_read") == 3
+
+    def test_response_cache_uses_backend(self, backends):
+        """With a response cache configured, LLM generations should use the backend."""
+        with (
+            patch.object(cache_module.settings, "cache_backends", "response=memory"),
+            patch.object(llm_cache, "_cache", None),
+        ):
+            cache = llm_cache.get_llm_cache()
+            model = FakeListChatModel(responses=["A", "B"], cache=cache)
+            assert model.invoke("hi").content == model.invoke("hi").content == "A"
+        assert isinstance(cache, llm_cache.BackendLLMCache)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_backend_cache_tracks_saved_latency(self, backends):
+        """A hit on the backend cache should credit the latency of the original call."""
+        with patch.object(cache_module.settings, "cache_backends", "response=memory"):
+            cache = llm_cache.BackendLLMCache(cache_module.get_cache("response", 60))
+        generations = [Generation(text="A")]
+        with patch.object(llm_cache.time, "perf_counter", side_effect=[10.0, 10.25]):
+            assert cache.lookup("hi", "model") is None
+            cache.update("hi", "model", generations)
+        assert cache.lookup("hi", "model") == generations
+        assert cache.stats()["saved_latency_ms"] == 250.0
@@ -0,0 +1,169 @@
+"""Unit tests for the write_date change-data-capture poller (app/workflows/cdc.py)."""
+
+import asyncio
+from unittest.mock import patch
+
+from app.memory import cdc_state
+from app.workflows.cdc import (
+    MAX_DELIVERY_ATTEMPTS,
+    ChangeFeed,
+    ChangePoller,
+    classify_lead,
+    scan_window_records,
+)
+
+
+def _lead(record_id, write_date, **values):
+    return {"id": record_id, "write_date": write_date, "create_date": "2026-01-01 00:00:00",
+            "active": True, "probability": 10, **values}
+
+
+class TestClassifyLead:
+    """Tests for crm.lead state transitions."""
+
+    def test_new_lead_is_created_event(self):
+        """An unseen lead whose create_date equals write_date is a creation."""
+        record = _lead(1, "2026-01-01 00:00:00")
+        assert classify_lead(record, None) == ("lead.created", "open")
+
+    def test_transitions_raise_won_and_lost(self):
+        """State changes map to the webhook event names."""
+        assert classify_lead(_lead(1, "2026-01-02 00:00:00", probability=100), "open")[0] == (
+            "lead.won"
+        )
+        assert classify_lead(_lead(1, "2026-01-02 00:00:00", active=False), "open")[0] == (
+            "lead.lost"
+        )
+        assert classify_lead(_lead(1, "2026-01-02 00:00:00"), "open")[0] == "lead.updated"
+
+    def test_unseen_or_lost_leads_do_not_fire_won(self):
+        """Only an open -> won transition is a win; unseen leads just record their state."""
+        won = _lead(1, "2026-01-02 00:00:00", probability=100)
+        assert classify_lead(won, None) == ("lead.updated", "won")
+        assert classify_lead(won, "won") == ("lead.updated", "won")
+        assert classify_lead(won, "lost") == ("lead.updated", "won")
+
+
+class TestChangePoller:
+    """Tests for keyset polling and watermark persistence."""
+
+    def test_poll_pages_and_advances_watermark(self, workflow_db):
+        """The poller should page by (write_date, id) and persist the last key."""
+        pages = [
+            [_lead(1, "2026-01-02 00:00:00"), _lead(2, "2026-01-02 00:00:00")],
+            [_lead(3, "2026-01-03 00:00:00", active=False)],
+        ]
+        cdc_state.set_watermark("cdc:crm.lead", "2026-01-01 00:00:00", 0)
+        cdc_state.set_record_states("crm.lead", {3: "open"})
+        with patch("app.workflows.cdc.odoo_client") as client:
+            client.search_read.side_effect = pages
+            poller = ChangePoller("crm.lead", ["id"], classify_lead, page_size=2)
+            events = poller.poll()
+        assert cdc_state.get_watermark("cdc:crm.lead") == ("2026-01-01 00:00:00", 0)
+        poller.commit(events)
+
+        assert [e.record_id for e in events] == [1, 2, 3]
+        assert events[2].event == "lead.lost"
+        second_domain = client.search_read.call_args_list[1].args[1]
+        assert ["write_date", "=", "2026-01-02 00:00:00"] in second_domain
+        assert ["id", ">", 2] in second_domain
+        assert client.search_read.call_args.kwargs["order"] == "write_date asc, id asc"
+        assert cdc_state.get_watermark("cdc:crm.lead") == ("2026-01-03 00:00:00", 3)
+        assert cdc_state.get_record_states("crm.lead", [1, 3]) == {1: "open", 3: "lost"}
+
+    def test_feed_dispatches_events_to_subscribers(self, workflow_db):
+        """ChangeFeed.tick should hand every polled event to each subscriber."""
+        received = []
+
+        async def subscriber(event):
+            received.append(event.event)
+
+        cdc_state.set_watermark("cdc:crm.lead", "2026-01-01 00:00:00", 0)
+        with patch("app.workflows.cdc.odoo_client") as client:
+            client.search_read.return_value = [_lead(5, "2026-01-01 00:00:00")]
+            poller = ChangePoller("crm.lead", ["id"], classify_lead, page_size=10)
+            asyncio.run(ChangeFeed([poller], [subscriber]).tick())
+
+        assert received == ["lead.created"]
+
+    def test_failed_page_is_delivered_on_the_next_tick(self, workflow_db):
+        """A poll failing on page 2 commits nothing; the next tick delivers page 1 too."""
+        received = []
+
+        async def subscriber(event):
+            received.append(event.record_id)
+
+        page1 = [_lead(1, "2026-01-02 00:00:00"), _lead(2, "2026-01-02 00:00:00")]
+        page2 = [_lead(3, "2026-01-03 00:00:00")]
+        cdc_state.set_watermark("cdc:crm.lead", "2026-01-01 00:00:00", 0)
+        poller = ChangePoller("crm.lead", ["id"], classify_lead, page_size=2)
+        feed = ChangeFeed([poller], [subscriber])
+        with patch("app.workflows.cdc.odoo_client") as client:
+            client.search_read.side_effect = [page1, ValueError("Odoo hiccup"), page1, page2]
+            assert asyncio.run(feed.tick()) == []
+            assert cdc_state.get_watermark("cdc:crm.lead") == ("2026-01-01 00:00:00", 0)
+            assert [e.record_id for e in asyncio.run(feed.tick())] == [1, 2, 3]
+
+        assert received == [1, 2, 3]
+        assert cdc_state.get_watermark("cdc:crm.lead") == ("2026-01-03 00:00:00", 3)
+
+    def test_failed_subscriber_is_retried_without_losing_the_transition(self, workflow_db):
+        """Events from a failed one on stay uncommitted, so lead.won is raised again."""
+        received = []
+        failures = [ValueError("workflow down")]
+
+        async def subscriber(event):
+            if event.record_id == 2 and failures:
+                raise failures.pop()
+            received.append((event.record_id, event.event))
+
+        records = [
+            _lead(1, "2026-01-02 00:00:00"),
+            _lead(2, "2026-01-03 00:00:00", probability=100),
+        ]
+        cdc_state.set_watermark("cdc:crm.lead", "2026-01-01 00:00:00", 0)
+        cdc_state.set_record_states("crm.lead", {1: "open", 2: "open"})
+        poller = ChangePoller("crm.lead", ["id"], classify_lead, page_size=10)
+        feed = ChangeFeed([poller], [subscriber])
+        with patch("app.workflows.cdc.odoo_client") as client:
+            client.search_read.side_effect = [records, records[1:]]
+            asyncio.run(feed.tick())
+            assert cdc_state.get_watermark("cdc:crm.lead") == ("2026-01-02 00:00:00", 1)
+            asyncio.run(feed.tick())
+
+        assert received == [(1, "lead.updated"), (2, "lead.won")]
+        assert cdc_state.get_record_states("crm.lead", [2]) == {2: "won"}
+
+    def test_poison_event_is_dropped_after_max_attempts(self, workflow_db):
+        """An event that always fails stops blocking its model after the retry budget."""
+
+        async def subscriber(event):
+            raise ValueError("always fails")
+
+        cdc_state.set_watermark("cdc:crm.lead", "2026-01-01 00:00:00", 0)
+        poller = ChangePoller("crm.lead", ["id"], classify_lead, page_size=10)
+        feed = ChangeFeed([poller], [subscriber])
+        with patch("app.workflows.cdc.odoo_client") as client:
+            client.search_read.return_value = [_lead(7, "2026-01-02 00:00:00")]
+            results = [asyncio.run(feed.tick()) for _ in range(MAX_DELIVERY_ATTEMPTS)]
+
+        assert [len(r) for r in results] == [0] * (MAX_DELIVERY_ATTEMPTS - 1) + [1]
+        assert cdc_state.get_watermark("cdc:crm.lead") == ("2026-01-02 00:00:00", 7)
+
+
+class TestScanWindow:
+    """Tests for incremental scan windows."""
+
+    def test_window_starts_at_previous_cutoff(self, workflow_db):
+        """Only records between the previous and the current cutoff are read."""
+        cdc_state.set_watermark("scan:test", "2026-01-10 00:00:00", 0)
+        with patch("app.workflows.cdc.odoo_client") as client:
+            client.search_read.return_value = [_lead(9, "2026-01-12 00:00:00")]
+            records = scan_window_records(
+                "scan:test", "crm.lead", [["active", "=", True]], ["id"], "2026-01-15 00:00:00"
+            )
+
+        domain = client.search_read.call_args.args[1]
+        assert ["write_date", "<", "2026-01-15 00:00:00"] in domain
+        assert ["write_date", ">", "2026-01-10 00:00:00"] in domain
+        assert [r["id"] for r in records] == [9]
@@ -0,0 +1,80 @@
+"""Unit tests for ConcurrentAgentExecutor (app/agents/concurrent_executor.py)."""
+
+import threading
+import time
+
+from langchain.agents import AgentExecutor
+from langchain_core.tools import tool
+
+from app.agents.concurrent_executor import ConcurrentAgentExecutor
+from tests.support.agents import scripted_tool_agent
+
+_barrier = threading.Barrier(3, timeout=2)
+
+
+@tool
+def slow_echo(value: str, delay: float = 0.1) -> str:
+    """Echo a value after a delay."""
+    time.sleep(delay)
+    return f"echo:{value}"
+
+
+@tool
+def rendezvous(value: str) -> str:
+    """Return once three calls are running at the same time."""
+    _barrier.wait()
+    return value
+
+
+def _run(executor_cls, steps, **kwargs):
+    executor = executor_cls(
+        agent=scripted_tool_agent(steps),
+        tools=[slow_echo, rendezvous],
+        return_intermediate_steps=True,
+        **kwargs,
+    )
+    return executor.invoke({"input": "go"})
+
+
+class TestConcurrentAgentExecutor:
+    """Tests for parallel dispatch of a step's tool calls."""
+
+    def test_calls_of_one_step_run_concurrently(self):
+        """Three calls waiting on a 3-party barrier should all complete."""
+        _barrier.reset()
+        steps = [[("rendezvous", {"value": str(i)}) for i in range(3)]]
+        result = _run(ConcurrentAgentExecutor, steps)
+        assert [obs for _, obs in result["intermediate_steps"]] == ["0", "1", "2"]
+
+    def test_observations_keep_model_order(self):
+        """Observations should follow the order of the emitted tool calls."""
+        steps = [
+            [
+                ("slow_echo", {"value": "a", "delay": 0.15}),
+                ("slow_echo", {"value": "b", "delay": 0.0}),
+                ("slow_echo", {"value": "c", "delay": 0.05}),
+            ],
+            [("slow_echo", {"value": "d", "delay": 0.0})],
+        ]
+        concurrent = _run(ConcurrentAgentExecutor, steps)
+        sequential = _run(AgentExecutor, steps)
+        observations = [obs for _, obs in concurrent["intermediate_steps"]]
+        assert observations == ["echo:a", "echo:b", "echo:c", "echo:d"]
+        assert observations == [obs for _, obs in sequential["intermediate_steps"]]
+        assert concurrent["output"] == "done"
+
+    def test_slow_call_times_out_with_error_observation(self):
+        """A call exceeding tool_timeout should yield a timeout observation."""
+        steps = [
+            [
+                ("slow_echo", {"value": "fast", "delay": 0.0}),
+                ("slow_echo", {"value": "slow", "delay": 1.0}),
+            ]
+        ]
+        started = time.perf_counter()
+        result = _run(ConcurrentAgentExecutor, steps, tool_timeout=0.2)
+        elapsed = time.perf_counter() - started
+        observations = [obs for _, obs in result["intermediate_steps"]]
+        assert observations[0] == "echo:fast"
+        assert "timed out" in observations[1]
+        assert elapsed < 0.9
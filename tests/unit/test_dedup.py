@@ -0,0 +1,167 @@
+"""Unit tests for duplicate lead/partner detection."""
+
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from app.odoo import dedup
+from app.odoo.client import use_client
+from app.odoo.dedup import (
+    DEDUP_SPECS,
+    DedupIndex,
+    DuplicateRecordError,
+    extract_features,
+    normalize_name,
+    phone_key,
+    score_pair,
+)
+from app.odoo.models.crm_lead import create_lead
+from app.tools.odoo_crm_tools import create_crm_lead, find_duplicate_records
+from tests.support.odoo_stub import StubOdooServer
+
+LEAD = DEDUP_SPECS["crm.lead"]
+
+
+def _lead(lead_id, contact, email="", phone="", partner=""):
+    return {
+        "id": lead_id,
+        "name": f"Inquiry {lead_id}",
+        "contact_name": contact,
+        "partner_name": partner,
+        "email_from": email,
+        "phone": phone,
+        "mobile": False,
+        "active": True,
+        "write_date": f"2026-01-01 00:00:{lead_id:02d}",
+    }
+
+
+LEADS = [
+    _lead(1, "João Silva", "joao@acme.com.br", "+55 (11) 98765-4321", "Acme Ltda"),
+    _lead(2, "Joao Silva", "jsilva@gmail.com", "11 987654321"),
+    _lead(3, "Maria Souza", "maria@globex.com"),
+    _lead(4, "Mariana Souza", "mariana@globex.com"),
+    _lead(5, "Peter Parker", "peter@acme.com.br"),
+]
+
+
+@pytest.fixture
+def index():
+    """An index of the fixture leads."""
+    index = DedupIndex(LEAD, max_block_size=100)
+    index.add_many(LEADS)
+    return index
+
+
+class TestMatching:
+    """Tests for normalization, scoring and blocking."""
+
+    def test_normalization(self):
+        """Names lose accents, case, punctuation and legal suffixes; phones keep 9 digits."""
+        assert normalize_name("  Açme Indústria LTDA. ") == "acme industria"
+        assert phone_key("+55 (11) 98765-4321") == phone_key("11 987654321") == "987654321"
+        assert phone_key("123") == ""
+
+    def test_scores_combine_name_email_and_phone(self):
+        """Same person with another e-mail but the same phone should be a duplicate."""
+        a, b = (extract_features(LEAD, lead) for lead in LEADS[:2])
+        score, reasons = score_pair(a, b)
+        assert score >= 0.6
+        assert "phone" in reasons
+        assert score_pair(a, extract_features(LEAD, LEADS[4]))[1] == ("domain",)
+
+    def test_candidates_are_ranked(self, index):
+        """The best match comes first and the record never matches itself."""
+        matches = index.candidates(LEADS[0], threshold=0.3)
+        assert [m.record_id for m in matches] == [2]
+        probe = {"contact_name": "Maria Souza", "email_from": "MARIA@globex.com "}
+        assert [m.record_id for m in index.candidates(probe)] == [3]
+
+    def test_index_is_incremental(self, index):
+        """Updates replace a record's keys; archiving removes it."""
+        index.add({**LEADS[2], "contact_name": "Zed", "email_from": "zed@initech.com"})
+        probe = {"contact_name": "Maria Souza", "email_from": "maria@globex.com"}
+        assert index.candidates(probe) == []
+        index.add({**LEADS[1], "active": False})
+        assert len(index) == 4
+        assert index.candidates(LEADS[0], threshold=0.3) == []
+
+    def test_oversized_blocks_are_skipped(self, index):
+        """Keys shared by more than max_block_size records do not produce candidates."""
+        index.max_block_size = 1
+        probe = {"contact_name": "Someone", "email_from": "x@acme.com.br"}
+        assert index._candidate_ids(extract_features(LEAD, probe)) == set()
+
+    def test_duplicate_pairs_compare_each_pair_once(self, index):
+        """Pairs across the index should be listed once, best first."""
+        pairs = index.duplicate_pairs(threshold=0.3)
+        assert [p["ids"] for p in pairs] == [[1, 2], [3, 4]]
+
+
+class TestCreateCheck:
+    """Tests for the pre-create check and the agent tool against the stub server."""
+
+    def test_create_lead_refuses_duplicates(self):
+        """A duplicate is refused unless allowed; new leads join the loaded index."""
+        with StubOdooServer() as stub:
+            stub.add_records("crm.lead", LEADS)
+            client = stub.client()
+            with (
+                use_client(client),
+                patch.dict(dedup._indexes, clear=True),
+                patch.object(dedup.settings, "dedup_check_on_create", True),
+            ):
+                dedup.get_index("crm.lead")
+                with pytest.raises(DuplicateRecordError) as error:
+                    create_lead({"contact_name": "J. Silva", "phone": "(11) 98765-4321"})
+                assert {m.record_id for m in error.value.matches} == {1, 2}
+                payload = create_crm_lead.invoke(
+                    {"name": "Demo", "email": "maria@globex.com", "contact_name": "Maria Souza"}
+                )
+                assert json.loads(payload)["duplicates"][0]["id"] == 3
+                new_id = create_lead({"contact_name": "Ana Lima", "email_from": "ana@lima.dev"})
+                assert stub.call_count("crm.lead.create") == 1
+                result = json.loads(
+                    find_duplicate_records.invoke({"model": "crm.lead", "record_id": new_id})
+                )
+                assert result == {"duplicates": []}
+                with pytest.raises(DuplicateRecordError):
+                    create_lead({"contact_name": "Ana Lima", "email_from": "ana@lima.dev"})
+                pairs = json.loads(find_duplicate_records.invoke({"model": "crm.lead"}))["pairs"]
+            client.close()
+        assert [p["ids"] for p in pairs] == [[1, 2]]
+        assert stub.call_count("crm.lead.search_read") == 1
+
+    def test_create_does_not_wait_for_the_index(self):
+        """Before the index is built a lead is created unchecked and the build starts."""
+        duplicate = {"contact_name": "Joao Silva", "phone": "11 987654321"}
+        with StubOdooServer() as stub:
+            stub.add_records("crm.lead", LEADS)
+            client = stub.client()
+            with (
+                use_client(client),
+                patch.dict(dedup._indexes, clear=True),
+                patch.object(dedup.settings, "dedup_check_on_create", True),
+            ):
+                create_lead(duplicate)
+                for thread in threading.enumerate():
+                    if thread.name == "dedup-index-crm.lead":
+                        thread.join(timeout=5)
+                assert len(dedup.ready_index("crm.lead")) == len(LEADS) + 1
+                with pytest.raises(DuplicateRecordError):
+                    create_lead(duplicate)
+            client.close()
+        assert stub.call_count("crm.lead.create") == 1
+
+    def test_check_is_off_by_default(self):
+        """Without the setting, create_lead neither checks nor builds the index."""
+        with StubOdooServer() as stub:
+            stub.add_records("crm.lead", LEADS)
+            client = stub.client()
+            with use_client(client), patch.dict(dedup._indexes, clear=True):
+                create_lead({"contact_name": "Joao Silva", "phone": "11 987654321"})
+                assert dedup.loaded_index("crm.lead") is None
+            client.close()
+        assert stub.call_count("crm.lead.search_read") == 0
@@ -0,0 +1,60 @@
+"""Unit tests for the scriptable fake chat model (tests/support/fake_llm.py)."""
+
+import time
+
+from langchain_core.messages import HumanMessage, ToolMessage
+
+from tests.benchmarks.load import crm_responder
+from tests.support.fake_llm import FakeChatModel, tool_call_message
+
+
+class TestFakeChatModel:
+    """Tests for scripted answers, tool calls, latency and streaming."""
+
+    def test_scripted_responses_cycle(self):
+        """Scripted answers should be returned in order, then repeat."""
+        model = FakeChatModel(responses=["one", "two"])
+        answers = [model.invoke("hi").content for _ in range(3)]
+        assert answers == ["one", "two", "one"]
+        assert model.call_count == 3
+
+    def test_emits_tool_calls(self):
+        """An AIMessage with tool calls should be returned as such."""
+        model = FakeChatModel(responses=[tool_call_message(("get_crm_lead", {"lead_id": 3}))])
+        message = model.invoke("lead 3")
+        assert [(call["name"], call["args"]) for call in message.tool_calls] == [
+            ("get_crm_lead", {"lead_id": 3})
+        ]
+
+    def test_stream_paces_words(self):
+        """Streaming should yield one chunk per word at tokens_per_second."""
+        model = FakeChatModel(responses=["a b c d"], tokens_per_second=100)
+        started = time.perf_counter()
+        chunks = [chunk.content for chunk in model.stream("hi")]
+        assert chunks == ["a", " b", " c", " d"]
+        assert time.perf_counter() - started >= 0.04
+
+    def test_invoke_includes_latency_and_generation_time(self):
+        """A non-streaming call should wait for TTFT plus the generated words."""
+        model = FakeChatModel(responses=["a b"], latency=0.02, tokens_per_second=100)
+        started = time.perf_counter()
+        model.invoke("hi")
+        assert time.perf_counter() - started >= 0.04
+
+
+class TestCRMResponder:
+    """Tests for the load-test conversation script."""
+
+    def test_classification(self):
+        """Messages about leads should classify as CRM_QUERY."""
+        prompt = "Classify the following user message:\n\nMessage: show me lead 4"
+        assert crm_responder([HumanMessage(content=prompt)]) == "CRM_QUERY"
+
+    def test_tool_call_then_answer(self):
+        """A lead question should call get_crm_lead first, then answer."""
+        first = crm_responder([HumanMessage(content="show me lead 4")])
+        assert first.tool_calls[0]["args"] == {"lead_id": 4}
+        answer = crm_responder(
+            [HumanMessage(content="show me lead 4"), first, ToolMessage("id: 4", tool_call_id="x")]
+        )
+        assert answer.startswith("Here is the lead")
@@ -0,0 +1,106 @@
+"""Unit tests for the background dependency health monitor."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.utils.health import HealthMonitor, check_odoo, check_sqlite
+from tests.support.odoo_stub import StubOdooServer
+
+
+def _ok(previous):
+    return {"version": 1}
+
+
+def _broken(previous):
+    raise ConnectionError("refused")
+
+
+class TestHealthMonitor:
+    """Tests for probing and readiness."""
+
+    def test_ready_only_when_required_dependencies_pass(self):
+        """Optional failures should be reported without blocking readiness."""
+        monitor = HealthMonitor({"odoo": _ok, "llm": _broken}, required=["odoo"], timeout=1)
+        assert monitor.readiness()["status"] == "starting"
+        asyncio.run(monitor.check_all())
+        payload = monitor.readiness()
+        assert payload["status"] == "ready"
+        assert payload["dependencies"]["odoo"]["detail"] == {"version": 1}
+        assert payload["dependencies"]["llm"]["error"] == "ConnectionError: refused"
+
+    def test_required_failure_is_not_ready(self):
+        """A failing required dependency should make the service not ready."""
+        monitor = HealthMonitor({"odoo": _broken}, required=["odoo"], timeout=1)
+        asyncio.run(monitor.check_all())
+        assert monitor.readiness()["status"] == "not_ready"
+
+    def test_slow_probe_times_out(self):
+        """A probe exceeding the timeout should fail without waiting for it."""
+        release = threading.Event()
+        monitor = HealthMonitor(
+            {"odoo": lambda previous: release.wait(5)}, required=["odoo"], timeout=0.05
+        )
+
+        async def timed() -> float:
+            started = time.perf_counter()
+            await monitor.check_all()
+            release.set()
+            return time.perf_counter() - started
+
+        assert asyncio.run(timed()) < 1
+        assert "timed out" in monitor.statuses["odoo"].error
+
+    def test_odoo_probe_against_stub(self):
+        """The Odoo probe should authenticate first, then use version calls only."""
+        with StubOdooServer() as stub:
+            client = stub.client()
+            with (
+                patch("app.odoo.client.odoo_client", client),
+                patch("app.odoo.auth.odoo_client", client),
+            ):
+                assert check_odoo(None)["server_version"]
+                calls = stub.call_count()
+                monitor = HealthMonitor({"odoo": check_odoo}, required=["odoo"], timeout=5)
+                asyncio.run(monitor.check_all())
+                asyncio.run(monitor.check_all())
+        assert monitor.is_ready()
+        assert stub.call_count() - calls <= 4
+
+    def test_sqlite_probe(self, tmp_path):
+        """The SQLite probe should pass against a writable database URL."""
+        with patch("app.utils.health.settings.database_url", f"sqlite:///{tmp_path}/h.db"):
+            assert check_sqlite(None) == {}
+
+
+class TestHealthRoutes:
+    """Tests for /health/live and /health/ready."""
+
+    def test_routes_answer_from_cached_state(self):
+        """Startup must not wait for probes, and readiness reflects the cache."""
+        from app.main import app
+        from app.utils.health import health_monitor
+
+        release = threading.Event()
+        slow = {"odoo": lambda previous: release.wait(5) and {}}
+        with (
+            patch.object(health_monitor, "checks", slow),
+            patch.object(health_monitor, "statuses", {}),
+            patch.object(health_monitor, "required", ["odoo"]),
+            patch("app.main.init_db"),
+        ):
+            started = time.perf_counter()
+            with TestClient(app) as client:
+                assert time.perf_counter() - started < 2
+                assert client.get("/health/live").json()["status"] == "ok"
+                response = client.get("/health/ready")
+                assert response.status_code == 503
+                assert response.json()["status"] == "starting"
+                release.set()
+                deadline = time.monotonic() + 5
+                while client.get("/health/ready").status_code != 200:
+                    assert time.monotonic() < deadline
+                    time.sleep(0.02)
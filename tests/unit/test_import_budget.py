@@ -0,0 +1,48 @@
+"""Budget tests for cold import time and resident memory of the entry points.
+
+Which modules load is deterministic and always checked.  The wall-time and
+RSS budgets depend on the host, so they are benchmarks: they only run with
+``RUN_IMPORT_BUDGET=1`` (on a quiet machine), not in the regular unit run.
+"""
+
+import os
+
+import pytest
+
+from tests.benchmarks.imports import ImportEntry, parse_importtime, profile_import
+
+# Measured at ~1.0 s / 79 MiB (app.main) and ~0.45 s / 48 MiB (app.odoo.client)
+# on the reference container; the budgets leave headroom for slower CI hosts.
+# Before lazy loading, ``import app.main`` took ~3 s and 143 MiB.
+BUDGETS = {
+    "app.main": (2.5, 120),
+    "app.odoo.client": (1.5, 80),
+}
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_heavy_dependencies_load_lazily(module):
+    """Importing an entry point must not load LangChain, OpenAI or Chroma."""
+    profile = profile_import(module)
+    assert profile.heavy_loaded() == [], "LangChain/OpenAI/Chroma must load on first use"
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_cold_import_within_budget(module):
+    """A fresh worker importing the module should stay within time/RSS budgets."""
+    if not os.getenv("RUN_IMPORT_BUDGET"):
+        pytest.skip("Set RUN_IMPORT_BUDGET=1 to check host-dependent import time/RSS budgets.")
+    seconds, rss_mib = BUDGETS[module]
+    profile = profile_import(module)
+    assert profile.wall_seconds < seconds, f"import {module} took {profile.wall_seconds:.2f}s"
+    assert profile.rss_bytes < rss_mib * 2**20, f"RSS {profile.rss_bytes / 2**20:.0f} MiB"
+
+
+def test_parse_importtime():
+    """Header lines should be skipped and nesting depth derived from indentation."""
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:        10 |         10 |     b\n"
+        "import time:         5 |         15 |   a\n"
+    )
+    assert parse_importtime(stderr) == [ImportEntry("b", 10, 10, 2), ImportEntry("a", 5, 15, 1)]
@@ -0,0 +1,201 @@
+"""Unit tests for the streaming bulk lead import."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import ClientDisconnect
+
+from app.api.routes import leads as leads_route
+from app.odoo.lead_import import (
+    LeadImporter,
+    ReferenceMaps,
+    RowError,
+    decode_lines,
+    iter_rows,
+    validate_row,
+)
+
+CSV = """﻿name,contact_name,email,expected_revenue,stage,tags,partner_email
+Deal A,Ann,ann@a.com,1000,New,"hot, vip",Buyer@Acme.com
+Deal B,Bob,bob@b.com,2000,qualified,,
+Bad email,Cy,not-an-email,,,,
+Deal C,,,abc,,,
+Deal D,,,,Nowhere,,
+,Dan,dan@d.com,,,,
+Deal E,,,,,,
+"""
+
+
+@pytest.fixture
+def stub(odoo_stub):
+    """A stub Odoo server with stages, tags and one partner."""
+    return odoo_stub(
+        {
+            "crm.stage": [{"id": 1, "name": "New"}, {"id": 2, "name": "Qualified"}],
+            "crm.tag": [{"id": 5, "name": "Hot"}, {"id": 6, "name": "VIP"}],
+            "res.partner": [
+                {
+                    "id": 9,
+                    "name": "Acme",
+                    "email": "BUYER@acme.com",
+                    "email_normalized": "buyer@acme.com",
+                }
+            ],
+        }
+    )
+
+
+class TestParsing:
+    """Tests for decoding and row validation."""
+
+    def test_decode_lines_across_chunks(self):
+        """Lines and multi-byte characters split across chunks are reassembled."""
+        data = "﻿name\nJosé\nZoë".encode()
+        chunks = [data[i : i + 3] for i in range(0, len(data), 3)]
+        assert list(decode_lines(chunks)) == ["name\n", "José\n", "Zoë"]
+
+    def test_ndjson_rows_report_bad_lines(self):
+        """Unparseable NDJSON lines become row errors without stopping the stream."""
+        rows = list(iter_rows(['{"name": "A"}\n', "\n", "{oops\n", "[1]\n"], "ndjson"))
+        assert rows[0] == (1, {"name": "A"})
+        assert [n for n, row in rows if isinstance(row, RowError)] == [2, 3]
+
+    def test_validate_row(self):
+        """Columns are aliased, typed and checked."""
+        values, partner = validate_row(
+            {"Email": "x@y.io", "contact_name": "X", "revenue": "12.5", "deadline": "2026-12-01"},
+            ReferenceMaps(),
+        )
+        assert values == {
+            "name": "X",
+            "contact_name": "X",
+            "email_from": "x@y.io",
+            "expected_revenue": 12.5,
+            "date_deadline": "2026-12-01",
+            "type": "lead",
+        }
+        assert partner is None
+        for row in ({"name": "A", "probability": "120"}, {"name": "A", "type": "deal"}, {}):
+            with pytest.raises(RowError):
+                validate_row(row, ReferenceMaps())
+
+    def test_wrong_types_are_row_errors(self):
+        """NDJSON values of the wrong JSON type are rejected, not crashed on."""
+        for row in (
+            {"name": "A", "tags": 5},
+            {"name": {"en": "A"}},
+            {"name": "A", "probability": True},
+            {"name": "A", "stage": ["New"]},
+            {"name": "A", "partner_email": None, "tags": [["hot"]]},
+        ):
+            with pytest.raises(RowError, match="must be"):
+                validate_row(row, ReferenceMaps())
+
+
+class TestImporter:
+    """Tests for batched creation against the stub server."""
+
+    def test_import_reports_row_errors_and_isolates_rejected_batches(self, stub):
+        """Invalid rows are reported; a rejected batch is split instead of lost."""
+        stub.inject_fault("crm.lead.create", "rpc_error", times=1)
+        progress = []
+        importer = LeadImporter(batch_size=2, concurrency=2, on_progress=progress.append)
+        report = importer.run(iter_rows(CSV.lstrip("﻿").splitlines(keepends=True), "csv"))
+
+        assert (report.rows, report.created, report.failed) == (7, 4, 3)
+        assert [(e["row"], e["error"].split()[0]) for e in report.errors] == [
+            (3, "invalid"),
+            (4, "expected_revenue"),
+            (5, "unknown"),
+        ]
+        assert progress and report.rows_per_second > 0
+        leads = {lead["name"]: lead for lead in stub.records["crm.lead"].values()}
+        assert sorted(leads) == ["Dan", "Deal A", "Deal B", "Deal E"]
+        assert leads["Deal A"]["partner_id"] == 9
+        assert leads["Deal A"]["tag_ids"] == [[6, 0, [5, 6]]]
+        assert leads["Deal B"]["stage_id"] == 2
+        assert stub.call_count("crm.lead.create") == 4  # 2 batches + 2 halves of the rejected one
+        assert stub.call_count("crm.stage.search_read") == 1
+        assert stub.call_count("res.partner.search_read") == 1
+
+    def test_reference_lookup_failure_returns_a_partial_report(self, stub):
+        """Odoo failing while reading stages stops the import with what was done so far."""
+        stub.inject_fault("crm.stage.search_read", "rpc_error", times=1)
+        rows = [(1, {"name": "One"}), (2, {"name": "Two", "stage": "New"}), (3, {"name": "Three"})]
+        report = LeadImporter(batch_size=10).run(iter(rows))
+        assert (report.rows, report.created, report.failed) == (2, 1, 1)
+        assert report.error.startswith("reference lookup failed at row 2")
+        assert report.as_dict()["error"] == report.error
+
+    def test_partner_lookup_failure_fails_its_batch(self, stub):
+        """A failed partner search fails the rows of its batch; other batches still land."""
+        stub.inject_fault("res.partner.search_read", "rpc_error", times=1)
+        rows = [(1, {"name": "One", "partner_email": "a@b.co"}), (2, {"name": "Two"})]
+        report = LeadImporter(batch_size=1, concurrency=1).run(iter(rows))
+        assert (report.created, report.failed) == (1, 1)
+        assert report.errors[0]["row"] == 1
+        assert report.errors[0]["error"].startswith("partner lookup failed")
+
+
+class TestEndpoint:
+    """Tests for POST /leads/import."""
+
+    def test_ndjson_upload(self, stub):
+        """The endpoint streams the body and returns the report."""
+        app = FastAPI()
+        app.include_router(leads_route.router, prefix="/leads")
+        body = b'{"name": "One"}\n{"name": "Two", "type": "opportunity"}\nnot json\n'
+        with patch("app.odoo.lead_import.odoo_client", stub.client()):
+            response = TestClient(app).post(
+                "/leads/import",
+                content=body,
+                headers={"Content-Type": "application/x-ndjson"},
+                params={"batch_size": 1},
+            )
+        report = response.json()
+        assert (report["rows"], report["created"], report["failed"]) == (3, 2, 1)
+        assert report["errors"][0]["row"] == 3
+        assert stub.call_count("crm.lead.create") == 2
+
+    def test_client_disconnect_aborts_the_import(self, stub):
+        """A body cut off by a disconnect is not imported as if the file had ended."""
+        app = FastAPI()
+        app.include_router(leads_route.router, prefix="/leads")
+        messages = [
+            {
+                "type": "http.request",
+                "body": b"name,email\nAcme,bob@acme.com\nGlobex Co",
+                "more_body": True,
+            },
+            {"type": "http.disconnect"},
+        ]
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": "/leads/import",
+            "raw_path": b"/leads/import",
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"content-type", b"text/csv")],
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+        }
+
+        async def receive() -> dict:
+            return messages.pop(0)
+
+        async def send(message: dict) -> None:
+            pass
+
+        with (
+            patch("app.odoo.lead_import.odoo_client", stub.client()),
+            pytest.raises(ClientDisconnect),
+        ):
+            asyncio.run(app(scope, receive, send))
+        assert stub.call_count("crm.lead.create") == 0
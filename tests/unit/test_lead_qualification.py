@@ -0,0 +1,80 @@
+"""Unit tests for BANT scoring and bulk lead qualification."""
+
+import asyncio
+from unittest.mock import patch
+
+
+class TestScoreLeads:
+    """Tests for the vectorized BANT scorer."""
+
+    def test_scores_match_bant_rules(self):
+        """Each satisfied BANT criterion should add 25 points."""
+        from app.workflows.lead_qualification import score_leads
+
+        leads = [
+            {"expected_revenue": 1000, "partner_id": [3, "Acme"], "description": "x",
+             "date_deadline": "2026-01-01"},
+            {"expected_revenue": 0, "partner_id": False, "description": "", "date_deadline": False},
+            {"expected_revenue": 50, "partner_id": [4, "Bright"]},
+        ]
+        assert score_leads(leads).tolist() == [100, 0, 50]
+
+    def test_empty_input_returns_empty_array(self):
+        """Scoring no leads should return an empty array."""
+        from app.workflows.lead_qualification import score_leads
+
+        assert score_leads([]).tolist() == []
+
+
+class TestBulkQualification:
+    """Tests for LeadQualificationWorkflow bulk mode."""
+
+    def test_bulk_groups_writes_by_stage_and_probability(self, workflow_db):
+        """Leads with the same score should be written in a single call."""
+        from app.workflows.lead_qualification import LeadQualificationWorkflow
+
+        pages = [
+            [
+                {"id": 1, "expected_revenue": 10, "partner_id": [1, "A"]},
+                {"id": 2, "expected_revenue": 10, "partner_id": [1, "A"]},
+            ],
+            [{"id": 3}, {"id": 4, "expected_revenue": 5, "partner_id": [2, "B"]}],
+        ]
+        stages = {"In Progress": {"id": 20}, "New": {"id": 10}}
+        with (
+            patch(
+                "app.workflows.lead_qualification.iter_lead_batches", return_value=iter(pages)
+            ) as mock_iter,
+            patch(
+                "app.workflows.lead_qualification.get_stage_by_name",
+                side_effect=lambda name: stages.get(name),
+            ) as mock_stage,
+            patch("app.workflows.lead_qualification.write_leads") as mock_write,
+        ):
+            result = asyncio.run(
+                LeadQualificationWorkflow().execute({"lead_ids": [1, 2, 3, 4], "batch_size": 2})
+            )
+
+        assert result.success
+        assert "4 lead(s)" in result.message and "leads/s" in result.message
+        assert mock_iter.call_args.kwargs["batch_size"] == 2
+        assert mock_stage.call_count == 2
+        mock_write.assert_any_call([1, 2, 4], {"stage_id": 20, "probability": 50})
+        mock_write.assert_any_call([3], {"stage_id": 10, "probability": 0})
+        assert mock_write.call_count == 2
+
+    def test_bulk_with_no_matches(self, workflow_db):
+        """A domain matching nothing should succeed without writes."""
+        from app.workflows.lead_qualification import LeadQualificationWorkflow
+
+        with (
+            patch("app.workflows.lead_qualification.iter_lead_batches", return_value=iter([])),
+            patch("app.workflows.lead_qualification.write_leads") as mock_write,
+        ):
+            result = asyncio.run(
+                LeadQualificationWorkflow().execute({"domain": [["type", "=", "lead"]]})
+            )
+
+        assert result.success
+        assert "No leads matched" in result.message
+        mock_write.assert_not_called()
@@ -0,0 +1,100 @@
+"""Unit tests for the SQLite LLM response cache (app/agents/llm_cache.py)."""
+
+from unittest.mock import patch
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.load import dumps
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration
+
+from app.agents import llm_cache
+from app.agents.llm_cache import SQLiteLLMCache, cache_for_agent, cache_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """A cache backed by a temporary SQLite file."""
+    return SQLiteLLMCache(f"sqlite:///{tmp_path / 'llm.db'}", ttl_seconds=3600, max_entries=100)
+
+
+def _generation(text: str) -> list[ChatGeneration]:
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+class TestSQLiteLLMCache:
+    """Tests for lookup/update, keys and eviction."""
+
+    def test_repeated_prompt_hits_cache(self, cache):
+        """The second identical call should be served from the cache."""
+        model = FakeListChatModel(responses=["KB_QUESTION", "CRM_QUERY"], cache=cache)
+        first = model.invoke("Classify: what is a lead?")
+        second = model.invoke("Classify: what is a lead?")
+        assert first.content == second.content == "KB_QUESTION"
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+
+    def test_run_specific_ids_do_not_change_key(self):
+        """Message and tool-call ids should be normalized away."""
+
+        def scratchpad(call_id: str, message_id: str) -> str:
+            return dumps(
+                [
+                    HumanMessage(content="get lead 7"),
+                    AIMessage(
+                        content="",
+                        id=message_id,
+                        tool_calls=[{"name": "get_crm_lead", "args": {"lead_id": 7}, "id": call_id}],
+                    ),
+                    ToolMessage(content="id: 7\nname: Acme", tool_call_id=call_id),
+                ]
+            )
+
+        llm_string = '{"kwargs": {"model_name": "gpt-4o-mini"}}---[]'
+        first, model = cache_key(scratchpad("call_abc", "run-1"), llm_string)
+        second, _ = cache_key(scratchpad("call_xyz", "run-2"), llm_string)
+        assert first == second
+        assert model == "gpt-4o-mini"
+
+    def test_tool_schemas_are_part_of_key(self):
+        """Different bound tools (call parameters) should produce different keys."""
+        prompt = dumps([HumanMessage(content="hi")])
+        config = '{"kwargs": {"model_name": "gpt-4o"}}'
+        with_tools, _ = cache_key(prompt, config + "---[('tools', [{'name': 'a'}])]")
+        without_tools, _ = cache_key(prompt, config + "---[]")
+        assert with_tools != without_tools
+
+    def test_size_eviction_keeps_most_recently_used(self, tmp_path):
+        """Entries beyond max_entries should be evicted least recently used first."""
+        cache = SQLiteLLMCache(f"sqlite:///{tmp_path / 'llm.db'}", ttl_seconds=0, max_entries=2)
+        for text in ("a", "b", "c"):
+            cache.update(text, "cfg", _generation(text))
+        assert cache.lookup("a", "cfg") is None
+        assert cache.lookup("c", "cfg")[0].message.content == "c"
+        assert cache.stats()["evictions"] == 1
+
+    def test_expired_entries_miss(self, cache):
+        """Entries older than the TTL should not be returned."""
+        cache.update("p", "cfg", _generation("old"))
+        cache.ttl_seconds = 1
+        with patch.object(llm_cache.time, "time", return_value=llm_cache.time.time() + 5):
+            assert cache.lookup("p", "cfg") is None
+
+
+class TestCacheForAgent:
+    """Tests for the per-agent opt-in flag."""
+
+    def test_disabled_by_default(self):
+        """No agent should get a cache when LLM_CACHE_AGENTS is empty."""
+        with patch.object(llm_cache.settings, "llm_cache_agents", ""):
+            assert cache_for_agent("supervisor") is None
+
+    def test_enabled_for_listed_agent(self, cache):
+        """Listed agents should receive the shared cache."""
+        with (
+            patch.object(llm_cache.settings, "llm_cache_agents", "supervisor, kb_agent"),
+            patch.object(llm_cache, "_cache", cache),
+        ):
+            assert cache_for_agent("kb_agent") is cache
+            assert cache_for_agent("odoo_api_agent") is None
@@ -0,0 +1,81 @@
+"""Unit tests for the shared LLM client registry (app/agents/llm_pool.py)."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.agents import llm_pool
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fresh_pool(monkeypatch):
+    """Isolate the module-level registry, clients and counters."""
+    monkeypatch.setattr(llm_pool, "_stats", llm_pool.LLMPoolStats())
+    monkeypatch.setattr(llm_pool, "_models", {})
+    monkeypatch.setattr(llm_pool, "_http_client", None)
+    monkeypatch.setattr(llm_pool, "_async_http_client", None)
+    yield
+    if llm_pool._http_client is not None:
+        llm_pool._http_client.close()
+
+
+class TestGetChatModel:
+    """Tests for get_chat_model()."""
+
+    def test_same_model_and_params_share_instance(self, fresh_pool):
+        """Identical (model, params) should return the same ChatOpenAI."""
+        with patch.object(llm_pool, "ChatOpenAI", side_effect=lambda **kw: MagicMock()) as cls:
+            first = llm_pool.get_chat_model("gpt-4o-mini", temperature=0)
+            second = llm_pool.get_chat_model("gpt-4o-mini", temperature=0)
+            other = llm_pool.get_chat_model("gpt-4o-mini", temperature=0.5)
+        assert first is second
+        assert other is not first
+        assert cls.call_count == 2
+
+    def test_models_share_http_clients(self, fresh_pool):
+        """Every chat model should be bound to the same sync and async clients."""
+        with patch.object(llm_pool, "ChatOpenAI", side_effect=lambda **kw: MagicMock()) as cls:
+            llm_pool.get_chat_model("gpt-4o")
+            llm_pool.get_chat_model("gpt-4o-mini")
+        first, second = (call.kwargs for call in cls.call_args_list)
+        assert first["http_client"] is second["http_client"]
+        assert first["http_async_client"] is second["http_async_client"]
+
+
+class TestPoolStats:
+    """Tests for the connection-reuse and latency counters."""
+
+    def test_keep_alive_connection_is_reused(self, fresh_pool):
+        """Sequential requests should reuse one connection."""
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            client = llm_pool.llm_http_client()
+            for _ in range(3):
+                client.get(f"http://127.0.0.1:{server.server_port}/").raise_for_status()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        stats = llm_pool.llm_pool_stats()
+        assert stats["requests"] == 3
+        assert stats["connections_opened"] == 1
+        assert stats["reused_connections"] == 2
+        assert stats["errors"] == 0
+        assert stats["max_latency_ms"] >= stats["avg_latency_ms"] > 0
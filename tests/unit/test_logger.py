@@ -0,0 +1,110 @@
+"""Unit tests for the logging pipeline."""
+
+import io
+import threading
+
+import orjson
+import pytest
+import structlog
+
+from app.utils.logger import (
+    EventSampler,
+    QueueWriter,
+    configure_logging,
+    logging_stats,
+    parse_sample_rates,
+)
+from app.utils.metrics import render_prometheus
+
+
+class _BlockingStream(io.BytesIO):
+    """Stream whose writes wait until ``release`` is set."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, data):
+        self.release.wait(5)
+        return super().write(data)
+
+
+@pytest.fixture
+def production_logs():
+    """Configure production logging into a buffer; restore development afterwards."""
+    stream = io.BytesIO()
+    configure_logging("INFO", "production", sample_rates="noisy=0.25,muted=0", stream=stream)
+
+    def lines() -> list[dict]:
+        configure_logging("INFO", "production", stream=io.BytesIO())  # flushes the writer
+        return [orjson.loads(line) for line in stream.getvalue().splitlines()]
+
+    yield lines
+    configure_logging("INFO", "development")
+
+
+class TestProductionLogging:
+    """Tests for the JSON + background writer mode."""
+
+    def test_events_are_written_as_json_lines(self, production_logs):
+        """Each event should be one JSON object with level, timestamp and fields."""
+        structlog.get_logger("t").info("lead_scored", lead_id=7, score=80)
+        [event] = production_logs()
+        assert event["event"] == "lead_scored"
+        assert event["level"] == "info"
+        assert event["lead_id"] == 7
+        assert event["timestamp"].endswith("Z")
+
+    def test_sampling_keeps_one_in_n_and_never_drops_warnings(self, production_logs):
+        """Sampled events should keep 1 in N info events but every warning."""
+        log = structlog.get_logger("t")
+        for _ in range(8):
+            log.info("noisy")
+        log.warning("noisy")
+        log.info("muted")
+        assert logging_stats()["sampled_out"] == 7
+        events = production_logs()
+        assert [e["level"] for e in events] == ["info", "info", "warning"]
+        assert events[0]["sample_rate"] == 0.25
+
+    def test_development_mode_has_no_pipeline(self):
+        """Development mode should write synchronously and report zero counters."""
+        configure_logging("INFO", "development")
+        assert logging_stats() == {
+            "written": 0,
+            "queued": 0,
+            "dropped_queue_full": 0,
+            "sampled_out": 0,
+        }
+
+
+class TestQueueWriter:
+    """Tests for the bounded writer queue."""
+
+    def test_full_queue_drops_and_counts(self):
+        """Lines past the queue bound should be dropped, not block the caller."""
+        stream = _BlockingStream()
+        writer = QueueWriter(stream, max_size=2)
+        for index in range(10):
+            writer.put(str(index).encode())
+        assert writer.dropped >= 7
+        stream.release.set()
+        writer.close()
+        assert writer.written + writer.dropped == 10
+
+    def test_drop_counters_are_exported(self, production_logs):
+        """The /metrics output should include the log drop counters."""
+        assert 'log_events_dropped_total{reason="queue_full"}' in render_prometheus()
+
+
+class TestSampling:
+    """Tests for sample-rate parsing."""
+
+    def test_parse_sample_rates(self):
+        """Invalid entries should be ignored and rates capped at 1."""
+        assert parse_sample_rates("a=0.1, b=2,c=x,=0.5") == {"a": 0.1, "b": 1.0}
+
+    def test_unlisted_events_pass(self):
+        """Events without a rate should never be sampled."""
+        sampler = EventSampler({"a": 0.5})
+        assert sampler(None, "info", {"event": "b"}) == {"event": "b"}
@@ -0,0 +1,111 @@
+"""Unit tests for the metrics registry and Odoo RPC metrics."""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.odoo import metrics as odoo_metrics
+from app.odoo.client import OdooJSONRPCError
+from app.odoo.metrics import SlowCallLog, normalize_domain, query_shape
+from app.utils.metrics import Counter, Histogram, render_prometheus
+from tests.support.odoo_stub import StubOdooServer, make_leads
+
+
+class TestRegistry:
+    """Tests for metric rendering."""
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Bucket counts should accumulate and end with +Inf, sum and count."""
+        hist = Histogram("t_seconds", "test", ["route"], buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            hist.labels(route="/a").observe(value)
+        lines = hist.render().splitlines()
+        assert 't_seconds_bucket{route="/a",le="0.1"} 1' in lines
+        assert 't_seconds_bucket{route="/a",le="1"} 2' in lines
+        assert 't_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+        assert 't_seconds_count{route="/a"} 3' in lines
+        assert 't_seconds_sum{route="/a"} 5.55' in lines
+
+    def test_label_values_are_escaped(self):
+        """Quotes and newlines in label values should be escaped."""
+        total = Counter("t_total", "test", ["name"])
+        total.labels(name='a"b\nc').inc(2)
+        assert 't_total{name="a\\"b\\nc"} 2' in total.render()
+
+    def test_wrong_labels_are_rejected(self):
+        """Using undeclared label names should raise ValueError."""
+        with pytest.raises(ValueError):
+            Counter("t_total", "test", ["name"]).labels(other="x")
+
+    def test_process_metrics_are_rendered(self):
+        """Process metrics should be part of every scrape."""
+        text = render_prometheus()
+        assert "# TYPE process_resident_memory_bytes gauge" in text
+        assert "process_cpu_seconds_total" in text
+
+
+class TestQueryShape:
+    """Tests for domain normalization and fingerprints."""
+
+    def test_values_do_not_change_fingerprint(self):
+        """Same fields/operators with different values should share a fingerprint."""
+
+        def args(domain):
+            return ["db", 2, "key", "crm.lead", "search_read", [domain], {"limit": 5}]
+
+        first, domain = query_shape("object", "execute_kw", args([["stage_id", "=", 3]]))
+        second, _ = query_shape("object", "execute_kw", args([["stage_id", "=", 7]]))
+        other, _ = query_shape("object", "execute_kw", args([["stage_id", "!=", 3]]))
+        assert first == second != other
+        assert domain == [["stage_id", "=", "?"]]
+
+    def test_normalize_keeps_operators(self):
+        """Logical operators stay, list values become ['?']."""
+        assert normalize_domain(["|", ["id", "in", [1, 2]], ["active", "=", True]]) == [
+            "|",
+            ["id", "in", ["?"]],
+            ["active", "=", "?"],
+        ]
+
+    def test_slow_log_ranks_by_total_time(self):
+        """The report should list the fingerprint with the most total time first."""
+        log = SlowCallLog(max_entries=10)
+        for fingerprint, ms in (("a", 100.0), ("b", 300.0), ("a", 150.0)):
+            log.record(fingerprint, {"model": "m", "method": "x", "domain": [], "duration_ms": ms})
+        worst = log.report()["worst"]
+        assert [(item["fingerprint"], item["count"]) for item in worst] == [("b", 1), ("a", 2)]
+
+
+class TestRPCMetrics:
+    """Tests for the instrumentation inside OdooClient._jsonrpc_call."""
+
+    def test_records_latency_bytes_errors_and_slow_calls(self):
+        """Calls should update histogram/byte counters; failures the error counter."""
+        labels = {"service": "object", "model": "crm.lead", "method": "search_read"}
+        with (
+            StubOdooServer() as stub,
+            patch.object(odoo_metrics.settings, "odoo_slow_call_ms", 1e-6),
+        ):
+            stub.add_records("crm.lead", make_leads(3))
+            client = stub.client(_uid=2)
+            before = odoo_metrics.RPC_DURATION.labels(**labels).counts[:]
+            client.search_read("crm.lead", [["type", "=", "lead"]], ["name"])
+            stub.inject_fault("crm.lead.search_read", "rpc_error")
+            with pytest.raises(OdooJSONRPCError):
+                client.search_read("crm.lead", [], ["name"])
+        assert sum(odoo_metrics.RPC_DURATION.labels(**labels).counts) == sum(before) + 2
+        assert odoo_metrics.RPC_REQUEST_BYTES.labels(**labels).value > 0
+        assert odoo_metrics.RPC_RESPONSE_BYTES.labels(**labels).value > 0
+        assert odoo_metrics.RPC_ERRORS.labels(**labels, kind="OdooJSONRPCError").value >= 1
+        recent = odoo_metrics.slow_call_report()["recent"]
+        assert recent[-2]["domain"] == [["type", "=", "?"]]
+
+    def test_metrics_route_serves_exposition_format(self):
+        """GET /metrics should return Prometheus text including Odoo metrics."""
+        from app.main import app
+
+        response = TestClient(app).get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE odoo_rpc_duration_seconds histogram" in response.text
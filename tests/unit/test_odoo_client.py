@@ -132,6 +132,6 @@ class TestOdooClientJSONRPCOnly:
 
         request = httpx.Request("POST", client._jsonrpc_endpoint)
         response_404 = httpx.Response(404, request=request)
-        with patch("app.odoo.client.httpx.post", return_value=response_404):
+        with patch("app.odoo.client.httpx.Client.post", return_value=response_404):
             with pytest.raises(httpx.HTTPStatusError):
                 client._jsonrpc_call("common", "version", [])
@@ -0,0 +1,151 @@
+"""Unit tests for the local SQLite FTS5 mirror of crm.lead and res.partner."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.odoo import mirror as mirror_module
+from app.odoo import tenants
+from app.odoo.mirror import RecordMirror, fts_query, sync_all
+from app.odoo.models.crm_lead import get_lead, search_leads_text
+from app.odoo.models.res_partner import get_partner, search_partners
+from app.odoo.unit_of_work import unit_of_work
+from tests.support.odoo_stub import make_leads
+
+
+@pytest.fixture
+def stub(odoo_stub):
+    """A stub Odoo server with leads and partners, used by the default client."""
+    leads = make_leads(30)
+    leads[4].update(name="Solar panels for São Paulo plant", contact_name="Ana Souza")
+    leads[9].update(name="Solar roof", description="Customer wants a solar quote")
+    return odoo_stub(
+        {
+            "crm.lead": leads,
+            "res.partner": [
+                {
+                    "id": 1,
+                    "name": "Acme Corp",
+                    "email": "sales@acme.example",
+                    "city": "Lisbon",
+                    "active": True,
+                    "write_date": "2026-01-01 10:00:00",
+                },
+                {
+                    "id": 2,
+                    "name": "Globex",
+                    "email": "info@globex.example",
+                    "city": "Porto",
+                    "active": True,
+                    "write_date": "2026-01-02 10:00:00",
+                },
+            ],
+        }
+    )
+
+
+@pytest.fixture
+def mirror(tmp_path, stub):
+    """A synced mirror of the stub's records, used by the search helpers."""
+    mirror = RecordMirror(str(tmp_path / "mirror.db"))
+    mirror.sync("crm.lead", page_size=7)
+    mirror.sync("res.partner")
+    with patch("app.odoo.mirror.get_mirror", return_value=mirror):
+        yield mirror
+
+
+class TestSync:
+    """Tests for incremental sync and webhook refreshes."""
+
+    def test_initial_sync_copies_everything_in_pages(self, mirror, stub):
+        """The first sync should copy every record with keyset pagination."""
+        assert mirror.count("crm.lead") == 30
+        assert mirror.count("res.partner") == 2
+        assert stub.call_count("crm.lead.search_read") == 5
+
+    def test_incremental_sync_only_reads_changes(self, mirror, stub):
+        """Later syncs should only copy records written after the watermark."""
+        assert mirror.sync("crm.lead") == 0
+        stub.records["crm.lead"][3].update(name="Wind farm", write_date="2026-02-01 00:00:00")
+        assert mirror.sync("crm.lead") == 1
+        assert [lead["id"] for lead in mirror.search("crm.lead", "wind")] == [3]
+
+    def test_interrupted_sync_keeps_the_cursor_but_not_freshness(self, tmp_path, stub):
+        """A failed first sync resumes from its last page and stays stale until complete."""
+        mirror = RecordMirror(str(tmp_path / "partial.db"))
+        pages = []
+        original = mirror.upsert
+
+        def upsert(model, records):
+            pages.append(len(records))
+            if len(pages) == 2:
+                raise OSError("disk full")
+            original(model, records)
+
+        with patch.object(mirror, "upsert", side_effect=upsert), pytest.raises(OSError):
+            mirror.sync("crm.lead", page_size=7)
+        assert mirror.count("crm.lead") == 7
+        assert mirror.watermark("crm.lead")[2] == 0
+        assert not mirror.is_fresh("crm.lead")
+        assert mirror.sync("crm.lead", page_size=7) == 23
+        assert mirror.is_fresh("crm.lead") and mirror.count("crm.lead") == 30
+
+    def test_sync_all_skips_failing_tenants(self, tmp_path, stub):
+        """An unknown tenant is logged and skipped; the other tenants still sync."""
+        with (
+            patch.object(mirror_module.settings, "mirror_tenants", "initech,default"),
+            patch.object(mirror_module.settings, "mirror_path", str(tmp_path / "m.db")),
+            patch.object(mirror_module, "_mirrors", {}),
+            patch.object(tenants, "default_odoo_client", stub.client()),
+        ):
+            assert sync_all() == 32
+
+    def test_refresh_updates_and_deletes(self, mirror, stub):
+        """A webhook refresh should re-read changed records and drop deleted ones."""
+        stub.records["crm.lead"][5]["active"] = False
+        del stub.records["crm.lead"][10]
+        mirror.refresh("crm.lead", [5, 10])
+        assert mirror.count("crm.lead") == 29
+        assert mirror.search("crm.lead", "solar") == []
+
+
+class TestSearch:
+    """Tests for ranked search and the Odoo fallback."""
+
+    def test_fts_query_quotes_prefix_terms(self):
+        """Words become quoted prefix terms; punctuation cannot inject syntax."""
+        assert fts_query('sol "OR pa*') == '"sol"* "OR"* "pa"*'
+        assert fts_query("  ") is None
+
+    def test_search_is_ranked_and_accent_insensitive(self, mirror):
+        """Results should match every word, ignore accents and rank by BM25."""
+        assert [lead["id"] for lead in mirror.search("crm.lead", "solar")] == [10, 5]
+        assert [lead["id"] for lead in mirror.search("crm.lead", "sao paulo sol")] == [5]
+        assert mirror.search("crm.lead", "souza")[0]["contact_name"] == "Ana Souza"
+
+    def test_helpers_answer_from_the_mirror(self, mirror, stub):
+        """Fresh mirrors should answer lead and partner searches without Odoo."""
+        calls = len(stub.calls)
+        assert [p["id"] for p in search_partners("acme.example")] == [1]
+        assert [lead["id"] for lead in search_leads_text("solar", limit=1)] == [10]
+        assert len(stub.calls) == calls
+
+    def test_mirror_hits_do_not_shadow_odoo_reads(self, mirror, stub):
+        """A lagging mirror copy must not be served to later reads in the same request."""
+        stub.records["crm.lead"][10]["expected_revenue"] = 99_000.0
+        stub.records["res.partner"][1]["city"] = "Madrid"
+        with unit_of_work():
+            assert search_leads_text("solar", limit=1)[0]["expected_revenue"] != 99_000.0
+            assert search_partners("acme.example")[0]["city"] == "Lisbon"
+            assert get_lead(10)["expected_revenue"] == 99_000.0
+            assert get_partner(1)["city"] == "Madrid"
+
+    def test_stale_mirror_falls_back_to_odoo(self, mirror, stub):
+        """A mirror past its staleness limit should defer to Odoo."""
+        with patch("app.odoo.mirror.settings.mirror_max_staleness_seconds", 0):
+            time.sleep(0.01)
+            assert mirror.search("crm.lead", "solar") is None
+            leads = search_leads_text("Ana Souza")
+        assert [lead["id"] for lead in leads] == [5]
+        assert stub.call_count("crm.lead.search_read") == 6
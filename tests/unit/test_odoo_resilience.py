@@ -0,0 +1,177 @@
+"""Unit tests for the adaptive Odoo concurrency limiter and circuit breaker."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.odoo.client import OdooClient, OdooJSONRPCError
+from app.odoo.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    AdaptiveLimiter,
+    CallGuard,
+    CircuitBreaker,
+    OdooCircuitOpenError,
+    OdooOverloadedError,
+    register_guard,
+)
+from app.utils.health import HealthMonitor
+from app.utils.metrics import render_prometheus
+from tests.support.odoo_stub import StubOdooServer
+
+
+def _breaker(**overrides) -> CircuitBreaker:
+    options = {
+        "error_rate": 0.5,
+        "slow_call_seconds": 1.0,
+        "slow_rate": 0.8,
+        "min_calls": 4,
+        "window_seconds": 30,
+        "open_seconds": 0.1,
+        "half_open_probes": 2,
+    }
+    return CircuitBreaker(**{**options, **overrides})
+
+
+def _guard(limiter: AdaptiveLimiter | None = None, **breaker) -> CallGuard:
+    limiter = limiter or AdaptiveLimiter(initial=4, minimum=1, maximum=8, target_latency=1.0)
+    return CallGuard(limiter, _breaker(**breaker), queue_timeout=0.1)
+
+
+class TestAdaptiveLimiter:
+    """Tests for the AIMD limit."""
+
+    def test_fast_calls_increase_limit_additively(self):
+        """Each fast success should add 1/limit, i.e. ~1 per limit's worth of calls."""
+        limiter = AdaptiveLimiter(initial=4, minimum=1, maximum=8, target_latency=1.0)
+        for _ in range(4):
+            limiter.acquire(1)
+            limiter.release(0.01, congested=False)
+        assert limiter.current == 4
+        assert 4.9 < limiter.limit < 5.0
+        for _ in range(200):
+            limiter.acquire(1)
+            limiter.release(0.01, congested=False)
+        assert limiter.current == 8
+
+    def test_slow_or_failed_calls_decrease_multiplicatively_once_per_round_trip(self):
+        """A burst of congested releases should cut the limit once, not per call."""
+        limiter = AdaptiveLimiter(initial=10, minimum=2, maximum=20, target_latency=0.5)
+        for _ in range(5):
+            limiter.acquire(1)
+        for _ in range(5):
+            limiter.release(0.6, congested=False)
+        assert limiter.current == 7
+        limiter._last_decrease = 0.0
+        limiter.acquire(1)
+        limiter.release(0.01, congested=True)
+        assert limiter.limit == pytest.approx(4.9)
+        for _ in range(10):
+            limiter._last_decrease = 0.0
+            limiter.acquire(1)
+            limiter.release(0.01, congested=True)
+        assert limiter.current == 2
+
+    def test_waits_for_a_slot_then_rejects(self):
+        """Callers over the limit should wait, get a freed slot, or be rejected."""
+        limiter = AdaptiveLimiter(initial=1, minimum=1, maximum=1, target_latency=1.0)
+        limiter.acquire(1)
+        threading.Timer(0.05, limiter.release, (0.01, False)).start()
+        limiter.acquire(1)
+        started = time.perf_counter()
+        with pytest.raises(OdooOverloadedError):
+            limiter.acquire(0.05)
+        assert time.perf_counter() - started < 1
+        assert limiter.snapshot() == {"limit": 1, "in_flight": 1, "rejected": 1}
+
+
+class TestCircuitBreaker:
+    """Tests for tripping, failing fast and half-open recovery."""
+
+    def test_business_errors_do_not_trip(self):
+        """JSON-RPC errors from a healthy server are not failures."""
+        guard = _guard()
+        for _ in range(10):
+            with pytest.raises(OdooJSONRPCError), guard.call():
+                raise OdooJSONRPCError("Access Denied", http_status=200)
+        assert guard.breaker.state == CLOSED
+
+    def test_slow_calls_trip(self):
+        """A high share of slow calls should open the breaker."""
+        breaker = _breaker()
+        for _ in range(4):
+            breaker.record(breaker.allow(), failed=False, latency=2.0)
+        assert breaker.state == OPEN
+
+    def test_trips_fails_fast_and_recovers_against_stub(self):
+        """HTTP 5xx should open the circuit; probes after the open period close it."""
+        guard = _guard()
+        with StubOdooServer() as stub, patch("app.odoo.client.settings.odoo_retry_attempts", 1):
+            client = stub.client(_guard=guard)
+            stub.inject_fault("common.version", "http_503", times=4)
+            for _ in range(4):
+                with pytest.raises(httpx.HTTPStatusError):
+                    client.get_version()
+            assert guard.breaker.state == OPEN
+
+            calls = stub.call_count()
+            with pytest.raises(OdooCircuitOpenError):
+                client.get_version()
+            assert stub.call_count() == calls, "open circuit must not reach Odoo"
+
+            time.sleep(0.15)
+            client.get_version()
+            assert guard.breaker.state == HALF_OPEN
+            client.get_version()
+            assert guard.breaker.state == CLOSED
+
+    def test_failed_probe_reopens(self):
+        """A failing half-open probe should reopen the circuit."""
+        breaker = _breaker(min_calls=1)
+        breaker.record(breaker.allow(), failed=True, latency=0.01)
+        time.sleep(0.15)
+        probe = breaker.allow()
+        assert probe and breaker.state == HALF_OPEN
+        breaker.record(probe, failed=True, latency=0.01)
+        assert breaker.state == OPEN
+        with pytest.raises(OdooCircuitOpenError):
+            breaker.allow()
+
+    def test_connection_errors_trip(self):
+        """Transport errors raised from httpx should count as failures."""
+        guard = _guard()
+        client = OdooClient(guard)
+        with (
+            patch("app.odoo.client.httpx.Client.post", side_effect=httpx.ConnectError("refused")),
+            patch("app.odoo.client.settings.odoo_retry_attempts", 1),
+        ):
+            for _ in range(4):
+                with pytest.raises(httpx.ConnectError):
+                    client.get_version()
+        assert guard.breaker.state == OPEN
+        assert guard.limiter.in_flight == 0
+
+
+class TestExposure:
+    """Tests for metrics and readiness."""
+
+    def test_metrics_and_readiness_report_open_circuit(self):
+        """Registered guards should be scraped and gate readiness of Odoo."""
+        guard = _guard(min_calls=1)
+        guard.breaker.record(guard.breaker.allow(), failed=True, latency=0.01)
+        monitor = HealthMonitor({"odoo": lambda previous: {}}, required=["odoo"], timeout=1)
+        asyncio.run(monitor.check_all())
+        with patch.dict("app.odoo.resilience._guards", clear=True):
+            register_guard("default", guard)
+            text = render_prometheus()
+            assert 'odoo_circuit_state{client="default"} 2' in text
+            assert 'odoo_concurrency_limit{client="default"} 4' in text
+            payload = monitor.readiness()
+        assert payload["status"] == "not_ready", "passing probe, but the breaker is open"
+        assert payload["odoo_calls"]["default"]["breaker"]["state"] == OPEN
+        assert monitor.readiness()["status"] == "ready"
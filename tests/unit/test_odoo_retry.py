@@ -0,0 +1,154 @@
+"""Unit tests for Odoo retries, re-authentication and hedged reads."""
+
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.odoo.client import OdooJSONRPCError
+from app.odoo.resilience import OdooCircuitOpenError
+from app.odoo.retry import LatencyWindow, backoff_delay, is_idempotent, is_retryable
+from tests.support.odoo_stub import StubOdooServer, make_leads
+
+
+@pytest.fixture
+def stub():
+    """A stub server with leads and near-zero retry backoff."""
+    with (
+        StubOdooServer() as server,
+        patch("app.odoo.client.settings.odoo_retry_base_delay_ms", 1),
+        patch("app.odoo.client.settings.odoo_retry_max_delay_ms", 5),
+    ):
+        server.add_records("crm.lead", make_leads(5))
+        yield server
+
+
+class TestPolicy:
+    """Tests for the retry classification helpers."""
+
+    def test_only_reads_are_idempotent(self):
+        """Reads and common calls may be repeated; writes may not."""
+        args = ["db", 2, "key", "crm.lead"]
+        assert is_idempotent("common", "version", [])
+        assert is_idempotent("object", "execute_kw", [*args, "search_read", [], {}])
+        assert not is_idempotent("object", "execute_kw", [*args, "create", [{}], {}])
+
+    def test_retryable_errors(self):
+        """Writes are retried only when the request never reached Odoo."""
+        request = httpx.Request("POST", "http://odoo/jsonrpc")
+        unavailable = httpx.HTTPStatusError(
+            "503", request=request, response=httpx.Response(503, request=request)
+        )
+        timeout = httpx.ReadTimeout("slow", request=request)
+        assert is_retryable(unavailable, idempotent=True)
+        assert is_retryable(timeout, idempotent=True)
+        assert not is_retryable(timeout, idempotent=False)
+        assert is_retryable(httpx.ConnectError("refused"), idempotent=False)
+        assert not is_retryable(OdooJSONRPCError("boom", http_status=200), idempotent=True)
+        assert not is_retryable(OdooCircuitOpenError("open"), idempotent=True)
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Delays should stay within [0, min(cap, base * 2**attempt)]."""
+        delays = [backoff_delay(attempt, 0.1, 0.5) for attempt in range(6) for _ in range(50)]
+        assert all(0 <= delay <= 0.5 for delay in delays)
+        assert len(set(delays)) > 1
+
+    def test_latency_percentile_needs_samples(self):
+        """No percentile is reported until enough samples exist."""
+        window = LatencyWindow()
+        for ms in range(1, 101):
+            window.record(("k",), ms / 1000)
+        assert window.percentile(("k",), 0.95, min_samples=200) is None
+        assert window.percentile(("k",), 0.95, min_samples=20) == pytest.approx(0.096)
+
+
+class TestRetries:
+    """Tests for retries against the fault-injecting stub."""
+
+    def test_transient_read_failures_are_retried(self, stub):
+        """HTTP 503 and dropped connections on reads should be retried."""
+        client = stub.client()
+        stub.inject_fault("crm.lead.search_read", "http_503")
+        stub.inject_fault("crm.lead.read", "disconnect")
+        assert len(client.search_read("crm.lead", [], ["name"])) == 5
+        assert client.read("crm.lead", [1], ["name"])[0]["id"] == 1
+        assert stub.call_count("crm.lead.search_read") == 2
+        assert stub.call_count("crm.lead.read") == 2
+
+    def test_attempts_are_bounded(self, stub):
+        """A persistent failure should surface after the configured attempts."""
+        client = stub.client()
+        stub.inject_fault("crm.lead.search_count", "http_503", times=10)
+        with pytest.raises(httpx.HTTPStatusError):
+            client.execute("crm.lead", "search_count", [])
+        assert stub.call_count("crm.lead.search_count") == 3
+
+    def test_writes_are_not_retried(self, stub):
+        """A failed create must not be replayed (it may have been applied)."""
+        client = stub.client()
+        stub.inject_fault("crm.lead.create", "http_503")
+        with pytest.raises(httpx.HTTPStatusError):
+            client.create("crm.lead", {"name": "Once"})
+        assert stub.call_count("crm.lead.create") == 1
+
+    def test_business_errors_are_not_retried(self, stub):
+        """JSON-RPC errors are answers, not transient failures."""
+        client = stub.client()
+        stub.inject_fault("crm.lead.search_read", "rpc_error")
+        with pytest.raises(OdooJSONRPCError):
+            client.search_read("crm.lead", [], ["name"])
+        assert stub.call_count("crm.lead.search_read") == 1
+
+
+class TestReauthentication:
+    """Tests for transparent re-authentication."""
+
+    def test_access_denied_reauthenticates_and_replays(self, stub):
+        """An expired session should trigger one login and a replay."""
+        client = stub.client()
+        client.authenticate()
+        stub.inject_fault("crm.lead.write", "access_denied")
+        assert client.write("crm.lead", [1], {"name": "Renamed"}) is True
+        assert stub.call_count("common.login") == 2
+        assert stub.call_count("crm.lead.write") == 2
+        assert stub.records["crm.lead"][1]["name"] == "Renamed"
+
+    def test_replay_happens_once(self, stub):
+        """A second access-denied answer should surface instead of looping."""
+        client = stub.client()
+        stub.inject_fault("crm.lead.read", "access_denied", times=2)
+        with pytest.raises(OdooJSONRPCError):
+            client.read("crm.lead", [1], ["name"])
+        assert stub.call_count("crm.lead.read") == 2
+
+
+class TestHedgedReads:
+    """Tests for hedged search_read/read/search_count."""
+
+    def test_slow_read_is_hedged(self, stub):
+        """A read outlasting the p95 should be answered by the hedge."""
+        client = stub.client()
+        with (
+            patch("app.odoo.client.settings.odoo_hedge_reads", True),
+            patch("app.odoo.client.settings.odoo_hedge_min_samples", 5),
+        ):
+            for _ in range(5):
+                client.search_read("crm.lead", [], ["name"])
+            stub.inject_fault("crm.lead.search_read", "delay", delay=1)
+            started = time.perf_counter()
+            assert len(client.search_read("crm.lead", [], ["name"])) == 5
+            assert time.perf_counter() - started < 0.6
+        assert stub.call_count("crm.lead.search_read") == 7
+
+    def test_writes_are_never_hedged(self, stub):
+        """Only the listed read methods may be sent twice."""
+        client = stub.client()
+        with (
+            patch("app.odoo.client.settings.odoo_hedge_reads", True),
+            patch("app.odoo.client.settings.odoo_hedge_min_samples", 1),
+        ):
+            client.write("crm.lead", [1], {"name": "A"})
+            stub.inject_fault("crm.lead.write", "delay", delay=0.3)
+            client.write("crm.lead", [1], {"name": "B"})
+        assert stub.call_count("crm.lead.write") == 2
@@ -0,0 +1,189 @@
+"""Unit tests for tenant-aware Odoo client routing."""
+
+import contextvars
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.tenancy import TenantMiddleware
+from app.odoo import tenants
+from app.odoo.client import default_odoo_client, odoo_client
+from app.odoo.models.crm_lead import get_lead
+from app.odoo.resilience import guard_states
+from app.odoo.tenants import (
+    Tenant,
+    TenantMismatchError,
+    TenantRegistry,
+    UnknownTenantError,
+    current_tenant,
+    load_tenants,
+    session_tenant,
+    use_tenant,
+)
+from tests.support.odoo_stub import StubOdooServer, make_leads
+
+
+def _tenant(name: str, stub: StubOdooServer) -> Tenant:
+    return Tenant(name, stub.url, "stub", "bot@example.com", "stub-key")
+
+
+@pytest.fixture
+def two_tenants():
+    """Two stub Odoo servers registered as tenants ``acme`` and ``globex``."""
+    with StubOdooServer() as acme, StubOdooServer() as globex:
+        acme.add_records("crm.lead", make_leads(2))
+        globex.add_records("crm.lead", make_leads(1, start=100))
+        registry = TenantRegistry(
+            {"acme": _tenant("acme", acme), "globex": _tenant("globex", globex)},
+            max_clients=10,
+            idle_seconds=600,
+        )
+        with patch.object(tenants, "tenant_registry", registry):
+            yield acme, globex, registry
+        registry.close_all()
+
+
+class TestRouting:
+    """Tests for use_tenant and the routed odoo_client."""
+
+    def test_helpers_follow_the_active_tenant(self, two_tenants):
+        """Model helpers should query the tenant's server with its own session."""
+        acme, globex, _ = two_tenants
+        with use_tenant("acme"):
+            assert current_tenant() == "acme"
+            assert get_lead(1)["id"] == 1
+            with use_tenant("globex"):
+                assert get_lead(100)["id"] == 100
+            assert odoo_client.execute("crm.lead", "search_count", []) == 2
+        assert current_tenant() == "default"
+        assert odoo_client._jsonrpc_endpoint == default_odoo_client._jsonrpc_endpoint
+        assert acme.call_count("common.login") == globex.call_count("common.login") == 1
+
+    def test_tenant_propagates_to_copied_contexts(self, two_tenants):
+        """Worker threads started with a copied context should see the tenant."""
+        _, globex, _ = two_tenants
+        seen = []
+        with use_tenant("globex"):
+            ctx = contextvars.copy_context()
+        worker = threading.Thread(target=ctx.run, args=(lambda: seen.append(get_lead(100)),))
+        worker.start()
+        worker.join()
+        assert seen[0]["id"] == 100
+        assert globex.call_count("crm.lead.search_read") == 1
+
+    def test_unknown_tenant(self, two_tenants):
+        """Only configured tenants may be selected."""
+        with pytest.raises(UnknownTenantError), use_tenant("initech"):
+            pass
+
+    def test_session_is_pinned_to_its_tenant(self, two_tenants):
+        """A session should be rejected under any tenant other than its first one."""
+        with use_tenant("acme"), session_tenant("s-1") as name:
+            assert name == "acme"
+        with use_tenant("acme"), session_tenant("s-1") as name:
+            assert name == current_tenant() == "acme"
+        with pytest.raises(TenantMismatchError), session_tenant("s-1"):
+            pass
+        with session_tenant("s-2") as name:
+            assert name == "default"
+        with pytest.raises(TenantMismatchError), use_tenant("globex"), session_tenant("s-2"):
+            pass
+
+
+class TestRegistry:
+    """Tests for pooling and eviction."""
+
+    def test_clients_are_shared_per_url_db_user(self, two_tenants):
+        """The same tenant should reuse its client (pool and uid)."""
+        acme, _, registry = two_tenants
+        tenant = registry.tenant("acme")
+        assert registry.client(tenant) is registry.client(tenant)
+        alias = Tenant("acme-alias", acme.url, "stub", "bot@example.com", "stub-key")
+        assert registry.client(alias) is registry.client(tenant)
+
+    def test_lru_clients_beyond_the_limit_are_closed(self):
+        """Opening more tenants than max_clients should close the least recently used."""
+        registry = TenantRegistry({}, max_clients=2, idle_seconds=600)
+        t0, t1, t2 = (Tenant(f"t{i}", "http://odoo:8069", f"db{i}", "u", "k") for i in range(3))
+        first, second = registry.client(t0), registry.client(t1)
+        first._http_client(), second._http_client()
+        assert registry.client(t0) is first  # t1 is now least recently used
+        registry.client(t2)
+        assert registry.stats() == {"clients": 2, "evictions": 1}
+        assert second._http is None and first._http is not None
+        assert registry.client(t0) is first
+        registry.close_all()
+
+    def test_idle_clients_are_closed_unless_busy(self):
+        """Idle eviction should skip clients with calls in flight."""
+        registry = TenantRegistry({}, max_clients=10, idle_seconds=600)
+        idle = registry.client(Tenant("a", "http://odoo:8069", "a", "u", "k"))
+        busy = registry.client(Tenant("b", "http://odoo:8069", "b", "u", "k"))
+        busy._guard.limiter.in_flight = 1
+        registry.idle_seconds = 0
+        assert registry.evict_idle() == 1
+        registry.idle_seconds = 600
+        assert registry.stats()["clients"] == 1
+        assert registry.client(Tenant("b", "http://odoo:8069", "b", "u", "k")) is busy
+        assert registry.client(Tenant("a", "http://odoo:8069", "a", "u", "k")) is not idle
+
+    def test_guards_are_registered_while_open(self):
+        """Each tenant client's guard should be exported until the client is closed."""
+        registry = TenantRegistry({}, max_clients=1, idle_seconds=600)
+        registry.client(Tenant("t0", "http://odoo:8069", "db0", "u", "k"))
+        assert "t0" in guard_states()
+        registry.client(Tenant("t1", "http://odoo:8069", "db1", "u", "k"))
+        assert "t0" not in guard_states() and "t1" in guard_states()
+        registry.close_all()
+        assert "t1" not in guard_states()
+
+    def test_leased_client_is_closed_after_its_last_user(self):
+        """A client evicted inside use_tenant should be closed when the block exits."""
+        t0, t1 = (Tenant(f"t{i}", "http://odoo:8069", f"db{i}", "u", "k") for i in range(2))
+        registry = TenantRegistry({"t0": t0, "t1": t1}, max_clients=1, idle_seconds=600)
+        with patch.object(tenants, "tenant_registry", registry), use_tenant("t0") as leased:
+            registry.client(t1)
+            assert registry.stats() == {"clients": 1, "evictions": 1}
+            leased._http_client()
+            assert leased._http is not None
+        assert leased._http is None
+        assert "t0" not in guard_states()
+        registry.close_all()
+
+    def test_load_tenants_defaults_to_settings(self, tmp_path):
+        """Missing keys should fall back to the ODOO_* settings."""
+        path = tmp_path / "tenants.json"
+        path.write_text(json.dumps({"acme": {"db": "acme", "api_key": "secret"}}))
+        with patch("app.odoo.tenants.settings.odoo_url", "https://odoo.example.com"):
+            tenant = load_tenants(str(path))["acme"]
+        assert (tenant.url, tenant.db, tenant.api_key) == (
+            "https://odoo.example.com",
+            "acme",
+            "secret",
+        )
+        assert "secret" not in repr(tenant)
+
+
+class TestMiddleware:
+    """Tests for selecting the tenant from the request header."""
+
+    def test_header_selects_tenant(self, two_tenants):
+        """The header should route the request; unknown tenants get 400."""
+        app = FastAPI()
+        app.add_middleware(TenantMiddleware)
+
+        @app.get("/whoami")
+        def whoami() -> dict:
+            return {"tenant": current_tenant(), "endpoint": odoo_client._jsonrpc_endpoint}
+
+        acme, _, _ = two_tenants
+        client = TestClient(app)
+        payload = client.get("/whoami", headers={"X-Odoo-Tenant": "acme"}).json()
+        assert payload == {"tenant": "acme", "endpoint": f"{acme.url}/jsonrpc"}
+        assert client.get("/whoami").json()["tenant"] == "default"
+        response = client.get("/whoami", headers={"X-Odoo-Tenant": "initech"})
+        assert response.status_code == 400
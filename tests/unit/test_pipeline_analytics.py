@@ -0,0 +1,137 @@
+"""Unit tests for the vectorized pipeline analytics."""
+
+from datetime import date
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import analytics as analytics_route
+from app.odoo.analytics import (
+    LeadFrame,
+    conversion_funnel,
+    forecast,
+    group_totals,
+    pipeline_report,
+    weighted_pipeline_by_month,
+    win_rates,
+)
+from app.odoo.client import use_client
+from tests.support.odoo_stub import StubOdooServer
+
+STAGES = [
+    {"id": 1, "name": "New", "sequence": 1},
+    {"id": 2, "name": "Qualified", "sequence": 2},
+    {"id": 3, "name": "Won", "sequence": 3},
+]
+
+
+def _lead(lead_id, stage, team, revenue, probability, deadline=False, active=True):
+    return {
+        "id": lead_id,
+        "type": "opportunity",
+        "stage_id": [stage, STAGES[stage - 1]["name"]],
+        "team_id": [team, f"Team {team}"] if team else False,
+        "user_id": [7, "Alice"],
+        "expected_revenue": revenue,
+        "probability": probability,
+        "date_deadline": deadline,
+        "create_date": "2026-01-05 09:00:00",
+        "date_closed": "2026-02-01 00:00:00" if probability == 100 or not active else False,
+        "active": active,
+    }
+
+
+LEADS = [
+    _lead(1, 1, 1, 1000.0, 10, "2026-03-10"),
+    _lead(2, 2, 1, 2000.0, 50, "2026-03-20"),
+    _lead(3, 2, 2, 4000.0, 50, "2026-05-02"),
+    _lead(4, 1, 2, 500.0, 20),
+    _lead(5, 2, 1, 800.0, 40, "2026-01-15"),  # overdue in March
+    _lead(6, 3, 1, 3000.0, 100, "2026-02-01"),  # won
+    _lead(7, 1, 1, 900.0, 0, "2026-02-01", active=False),  # lost
+    _lead(8, 2, 2, 700.0, 0, "2026-02-01", active=False),  # lost
+]
+
+
+@pytest.fixture
+def frame():
+    """A frame of the fixture leads."""
+    return LeadFrame.from_records(LEADS)
+
+
+class TestAggregates:
+    """Tests for the grouped aggregates."""
+
+    def test_group_totals_cover_open_opportunities(self, frame):
+        """Totals should sum open revenue and weighted revenue per team."""
+        totals = group_totals(frame, "team")
+        assert totals == [
+            {"id": 2, "name": "Team 2", "count": 2, "revenue": 4500.0, "weighted": 2100.0},
+            {"id": 1, "name": "Team 1", "count": 3, "revenue": 3800.0, "weighted": 1420.0},
+        ]
+
+    def test_weighted_pipeline_by_month(self, frame):
+        """Open pipeline should be bucketed by deadline month, undated last."""
+        months = [
+            (m["month"], m["count"], m["weighted"]) for m in weighted_pipeline_by_month(frame)
+        ]
+        assert months == [
+            ("2026-01", 1, 320.0),
+            ("2026-03", 2, 1100.0),
+            ("2026-05", 1, 2000.0),
+            ("none", 1, 100.0),
+        ]
+
+    def test_win_rates(self, frame):
+        """Win rate is won over won + lost per group."""
+        rates = {r["name"]: (r["won"], r["lost"], r["win_rate"]) for r in win_rates(frame)}
+        assert rates == {"Team 1": (1, 1, 0.5), "Team 2": (0, 1, 0.0)}
+
+    def test_unknown_grouping(self, frame):
+        """Only stage, team and user are valid groupings."""
+        with pytest.raises(ValueError):
+            group_totals(frame, "country")
+
+
+class TestForecastAndFunnel:
+    """Tests for the forecast and the conversion funnel."""
+
+    def test_forecast_rolls_overdue_into_the_current_month(self, frame):
+        """Overdue deals count now; historical uses the team win rate."""
+        months = forecast(frame, months=3, today=date(2026, 3, 1))
+        assert [m["month"] for m in months] == ["2026-03", "2026-04", "2026-05"]
+        march, april, may = months
+        assert (march["count"], march["pipeline"], march["weighted"]) == (3, 3800.0, 1420.0)
+        assert march["historical"] == 1900.0  # team 1 wins half its closed leads
+        assert april["count"] == 0
+        assert (may["weighted"], may["historical"]) == (2000.0, 0.0)
+
+    def test_conversion_funnel(self, frame):
+        """Won leads reach every stage; others reach up to their current one."""
+        funnel = conversion_funnel(frame, STAGES)
+        assert [(s["name"], s["reached"], s["conversion"]) for s in funnel] == [
+            ("New", 8, 1.0),
+            ("Qualified", 5, 0.625),
+            ("Won", 1, 0.2),
+        ]
+
+
+class TestEndpoint:
+    """Tests for the report loader and GET /analytics."""
+
+    def test_report_reads_archived_leads_too(self):
+        """The report should load every lead, lost ones included; the API validates input."""
+        with StubOdooServer() as stub:
+            stub.add_records("crm.lead", LEADS)
+            stub.add_records("crm.stage", STAGES)
+            client = stub.client()
+            app = FastAPI()
+            app.include_router(analytics_route.router, prefix="/analytics")
+            with use_client(client):
+                report = pipeline_report(group_by="stage", today=date(2026, 3, 1))
+                response = TestClient(app).get("/analytics", params={"group_by": "country"})
+            client.close()
+        assert report["leads"] == {"total": 8, "open": 5, "won": 1, "lost": 2}
+        assert [s["reached"] for s in report["funnel"]] == [8, 5, 1]
+        assert response.status_code == 422
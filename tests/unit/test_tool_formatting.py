@@ -0,0 +1,65 @@
+"""Unit tests for the compact tool-output encoding (app/tools/formatting.py)."""
+
+from app.tools.formatting import count_tokens, format_record, format_records, format_value
+from tests.support.odoo_stub import make_leads
+
+
+class TestFormatValue:
+    """Tests for format_value()."""
+
+    def test_many2one_is_flattened_to_name(self):
+        """[id, name] pairs should render as the name."""
+        assert format_value([7, "Qualified"]) == "Qualified"
+
+    def test_empty_values_render_blank(self):
+        """False, None, empty strings and empty lists should render as ''."""
+        assert [format_value(v) for v in (False, None, "", [])] == ["", "", "", ""]
+
+    def test_floats_and_html_are_compacted(self):
+        """Floats should drop trailing zeros and HTML should be stripped."""
+        assert format_value(15000.0) == "15000"
+        assert format_value("<p>Budget | approved</p>") == "Budget / approved"
+
+
+class TestFormatRecords:
+    """Tests for format_records()."""
+
+    def test_header_then_one_line_per_record(self):
+        """Output should hold a title, a header row and one line per record."""
+        records = [
+            {"id": 1, "name": "Acme", "stage_id": [1, "New"], "phone": False},
+            {"id": 2, "name": "Globex", "stage_id": [2, "Won"], "phone": False},
+        ]
+        lines = format_records(records, title="crm.lead").splitlines()
+        assert lines == ["crm.lead: 2 records", "id|name|stage_id", "1|Acme|New", "2|Globex|Won"]
+
+    def test_token_cap_truncates_with_marker(self):
+        """Rows beyond the token cap should be replaced by a marker."""
+        output = format_records(make_leads(200), title="crm.lead", max_tokens=400)
+        assert count_tokens(output) <= 400
+        assert output.splitlines()[-1].startswith("[more results available:")
+
+    def test_compact_output_is_smaller_than_json(self):
+        """The table should use far fewer tokens than the JSON dump."""
+        import json
+
+        leads = make_leads(20)
+        compact = format_records(leads, max_tokens=100_000)
+        assert count_tokens(compact) < count_tokens(json.dumps(leads)) / 2
+
+    def test_empty_result(self):
+        """No records should render a zero count."""
+        assert format_records([], title="res.partner") == "res.partner: 0 records"
+
+
+class TestFormatRecord:
+    """Tests for format_record()."""
+
+    def test_skips_empty_fields(self):
+        """Only non-empty fields should be listed."""
+        record = {"id": 3, "name": "Acme", "email": False, "country_id": [31, "Brazil"]}
+        assert format_record(record) == "id: 3\nname: Acme\ncountry_id: Brazil"
+
+    def test_missing_record(self):
+        """An empty dict should render as 'not found'."""
+        assert format_record({}) == "not found"
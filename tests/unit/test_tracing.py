@@ -0,0 +1,131 @@
+"""Unit tests for OpenTelemetry tracing (app/utils/tracing.py)."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from app.agents.concurrent_executor import ConcurrentAgentExecutor
+from app.tools.odoo_crm_tools import get_crm_lead
+from app.utils import tracing
+from app.utils.tracing import JSONLinesSpanExporter, configure_tracing, request_span, span
+from tests.support.agents import scripted_tool_agent
+from tests.support.fake_llm import FakeChatModel
+from tests.support.odoo_stub import StubOdooServer, make_leads
+
+
+@pytest.fixture(scope="module")
+def exporter():
+    """Collect finished spans in memory (the provider is process-wide)."""
+    memory = InMemorySpanExporter()
+    configure_tracing("none").add_span_processor(SimpleSpanProcessor(memory))
+    return memory
+
+
+@pytest.fixture
+def spans(exporter):
+    """Return a function listing the spans finished during the test."""
+    exporter.clear()
+    return lambda: {item.name: item for item in exporter.get_finished_spans()}
+
+
+@pytest.fixture
+def odoo():
+    """A stub Odoo server with a few leads."""
+    with StubOdooServer() as stub:
+        stub.add_records("crm.lead", make_leads(3))
+        yield stub
+
+
+class TestSpans:
+    """Tests for span nesting and attributes."""
+
+    def test_rpc_span_nests_under_tool_span(self, spans, odoo):
+        """A tool's Odoo RPC should be a child of the tool span."""
+        client = odoo.client()
+        client._uid = 2
+        executor = ConcurrentAgentExecutor(
+            agent=scripted_tool_agent([[("get_crm_lead", {"lead_id": 1})]]),
+            tools=[get_crm_lead],
+        )
+        with (
+            patch("app.odoo.models.crm_lead.odoo_client", client),
+            request_span("test.request"),
+        ):
+            executor.invoke({"input": "lead 1"})
+        finished = spans()
+        rpc, tool = finished["odoo.crm.lead.search_read"], finished["tool.get_crm_lead"]
+        assert rpc.parent.span_id == tool.context.span_id
+        assert tool.context.trace_id == finished["test.request"].context.trace_id
+        assert rpc.attributes["odoo.model"] == "crm.lead"
+        assert rpc.attributes["odoo.method"] == "search_read"
+
+    def test_supervisor_nodes_and_llm_calls_are_spans(self, spans):
+        """Each graph node and each chat model call should open a span."""
+        from app.agents.supervisor import SupervisorAgent
+
+        model = FakeChatModel(responses=["OTHER", "Hello!"])
+        with (
+            patch("app.agents.base_agent.get_chat_model", return_value=model),
+            patch("app.agents.supervisor.get_session_history", return_value=MagicMock()),
+        ):
+            SupervisorAgent().route("hi", session_id="s1")
+        finished = spans()
+        for name in (
+            "supervisor.classify_intent",
+            "supervisor.supervisor",
+            "supervisor.persist_history",
+            "db.chat_history.write",
+            "llm.fake-chat",
+        ):
+            assert name in finished
+        llm = finished["llm.fake-chat"]
+        assert llm.parent.span_id in {
+            finished["supervisor.classify_intent"].context.span_id,
+            finished["supervisor.supervisor"].context.span_id,
+        }
+
+
+class TestRequestTiming:
+    """Tests for the per-request breakdown log event."""
+
+    def test_breakdown_sums_spans_by_name(self, spans):
+        """request_timing should report time and count per child span name."""
+        with (
+            patch.object(tracing.logger, "info") as log_info,
+            request_span("http.test", route="/x"),
+        ):
+            for _ in range(2):
+                with span("db.write"):
+                    pass
+        event = log_info.call_args
+        assert event.args == ("request_timing",)
+        assert event.kwargs["request"] == "http.test"
+        assert event.kwargs["route"] == "/x"
+        assert event.kwargs["spans"]["db.write"]["count"] == 2
+
+    def test_nested_request_span_is_plain_child(self, spans):
+        """Only the outermost request span should log a breakdown."""
+        with (
+            patch.object(tracing.logger, "info") as log_info,
+            request_span("outer"),
+            request_span("inner"),
+        ):
+            pass
+        assert [c.kwargs["request"] for c in log_info.call_args_list] == ["outer"]
+        assert spans()["inner"].parent.span_id == spans()["outer"].context.span_id
+
+
+class TestJSONLinesSpanExporter:
+    """Tests for the file exporter."""
+
+    def test_writes_one_json_object_per_span(self, tmp_path, spans, exporter):
+        """Each exported span should be one parseable line."""
+        with span("a"), span("b"):
+            pass
+        path = tmp_path / "traces.jsonl"
+        JSONLinesSpanExporter(str(path)).export(exporter.get_finished_spans())
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["name"] for line in lines] == ["b", "a"]
@@ -0,0 +1,74 @@
+"""Unit tests for the request-scoped Odoo identity map (app/odoo/unit_of_work.py)."""
+
+from unittest.mock import patch
+
+from app.odoo.models import crm_lead
+from app.odoo.unit_of_work import current_identity_map, unit_of_work
+
+
+def _lead(lead_id: int, **values) -> dict:
+    record = {name: False for name in crm_lead.FIELDS}
+    record.update(id=lead_id, name=f"Lead {lead_id}", stage_id=[1, "New"], **values)
+    return record
+
+
+class TestUnitOfWork:
+    """Tests for unit_of_work() and the model helpers that consult it."""
+
+    def test_repeated_get_lead_is_served_from_map(self):
+        """A second get_lead() for the same id should not issue an RPC."""
+        with patch.object(crm_lead, "odoo_client") as client:
+            client.search_read.return_value = [_lead(7)]
+            with unit_of_work("test") as identity_map:
+                first = crm_lead.get_lead(7)
+                second = crm_lead.get_lead(7)
+        assert first == second
+        assert client.search_read.call_count == 1
+        assert identity_map.saved_rpcs == 1
+
+    def test_no_caching_outside_unit_of_work(self):
+        """Without an active unit of work every call should go to Odoo."""
+        with patch.object(crm_lead, "odoo_client") as client:
+            client.search_read.return_value = [_lead(7)]
+            crm_lead.get_lead(7)
+            crm_lead.get_lead(7)
+        assert client.search_read.call_count == 2
+        assert current_identity_map() is None
+
+    def test_search_results_populate_map(self):
+        """Records returned by search_leads() should satisfy later get_lead() calls."""
+        with patch.object(crm_lead, "odoo_client") as client:
+            client.search_read.return_value = [_lead(1), _lead(2)]
+            with unit_of_work("test"):
+                crm_lead.search_leads()
+                lead = crm_lead.get_lead(2)
+        assert lead["name"] == "Lead 2"
+        assert client.search_read.call_count == 1
+
+    def test_write_updates_scalars_and_drops_relational_fields(self):
+        """update_lead() should merge scalar values and force a re-read of relations."""
+        with patch.object(crm_lead, "odoo_client") as client:
+            client.search_read.return_value = [_lead(3)]
+            with unit_of_work("test") as identity_map:
+                crm_lead.get_lead(3)
+                crm_lead.update_lead(3, {"priority": "2"})
+                assert identity_map.get("crm.lead", 3, ["priority"]) == {"priority": "2"}
+                crm_lead.update_lead(3, {"stage_id": 5})
+                crm_lead.get_lead(3)
+        assert client.search_read.call_count == 2
+
+    def test_mark_won_evicts_record(self):
+        """Server-side actions should evict the record from the map."""
+        with patch.object(crm_lead, "odoo_client") as client:
+            client.search_read.return_value = [_lead(4)]
+            with unit_of_work("test"):
+                crm_lead.get_lead(4)
+                crm_lead.mark_won(4)
+                crm_lead.get_lead(4)
+        assert client.search_read.call_count == 2
+
+    def test_nested_unit_of_work_reuses_outer_map(self):
+        """A nested unit_of_work() should share the outer identity map."""
+        with unit_of_work("outer") as outer, unit_of_work("inner") as inner:
+            assert inner is outer
+        assert current_identity_map() is None
@@ -0,0 +1,125 @@
+"""Unit tests for the step-graph workflow engine (app/workflows/engine.py)."""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.workflows.engine import GraphWorkflow, Step, StepGraph, WorkflowHalt
+
+
+class TestStepGraph:
+    """Tests for StepGraph validation and scheduling."""
+
+    def test_rejects_unknown_dependency(self):
+        """A step depending on an undeclared step should be rejected."""
+        with pytest.raises(ValueError, match="unknown"):
+            StepGraph([Step("a", lambda ctx: 1, ("missing",))])
+
+    def test_rejects_cycles(self):
+        """Cyclic dependencies should be rejected."""
+        with pytest.raises(ValueError, match="cycle"):
+            StepGraph([Step("a", lambda ctx: 1, ("b",)), Step("b", lambda ctx: 1, ("a",))])
+
+    def test_independent_steps_run_concurrently(self):
+        """Two independent sync steps should overlap in time."""
+
+        def slow(ctx):
+            time.sleep(0.2)
+            return "done"
+
+        graph = StepGraph(
+            [
+                Step("root", lambda ctx: 1),
+                Step("left", slow, ("root",)),
+                Step("right", slow, ("root",)),
+                Step("join", lambda ctx: sorted(ctx.results), ("left", "right")),
+            ]
+        )
+        started = time.perf_counter()
+        run = asyncio.run(graph.run({}))
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.35
+        assert run.results["join"] == ["left", "right", "root"]
+        assert {r.name: r.status for r in run.records} == {
+            "root": "success", "left": "success", "right": "success", "join": "success",
+        }
+
+    def test_halt_skips_remaining_steps(self):
+        """WorkflowHalt should stop the graph and mark later steps skipped."""
+
+        def halt(ctx):
+            raise WorkflowHalt("nothing to do")
+
+        run = asyncio.run(StepGraph([Step("a", halt), Step("b", lambda ctx: 1, ("a",))]).run({}))
+        assert run.halt is not None and run.halt.message == "nothing to do"
+        assert run.steps_executed == ["a"]
+        assert [r.status for r in run.records] == ["halted", "skipped"]
+
+
+class _FlakyWorkflow(GraphWorkflow):
+    name = "flaky"
+    description = "Fails once in the second step"
+
+    def __init__(self):
+        self.calls = {"first": 0, "second": 0}
+        self.fail = True
+
+    def build_steps(self, context):
+        return [
+            Step("first", self._first),
+            Step("second", self._second, ("first",)),
+        ]
+
+    def summarize(self, context, results):
+        return f"total={results['second']}"
+
+    def _first(self, ctx):
+        self.calls["first"] += 1
+        return {"value": 20}
+
+    def _second(self, ctx):
+        self.calls["second"] += 1
+        if self.fail:
+            raise RuntimeError("odoo down")
+        return ctx.results["first"]["value"] + 1
+
+
+class TestGraphWorkflowCheckpoints:
+    """Tests for per-step logging and checkpoint/resume."""
+
+    def test_failed_run_resumes_from_checkpoint(self, workflow_db):
+        """A re-run with the same context should skip already-completed steps."""
+        workflow = _FlakyWorkflow()
+
+        failed = asyncio.run(workflow.execute({"lead_id": 1}))
+        assert not failed.success
+        assert failed.error == "odoo down"
+        assert failed.steps_executed == ["first"]
+
+        workflow.fail = False
+        resumed = asyncio.run(workflow.execute({"lead_id": 1}))
+        assert resumed.success
+        assert resumed.message == "total=21"
+        assert workflow.calls == {"first": 1, "second": 2}
+        assert [d["status"] for d in resumed.step_details] == ["resumed", "success"]
+
+        with workflow_db.connect() as conn:
+            rows = conn.exec_driver_sql(
+                "SELECT status, steps_json FROM workflow_log ORDER BY id"
+            ).fetchall()
+            leftover = conn.exec_driver_sql("SELECT COUNT(*) FROM workflow_checkpoint").scalar()
+        assert [row[0] for row in rows] == ["failed", "success"]
+        steps = json.loads(rows[1][1])
+        assert steps[1]["name"] == "second" and steps[1]["duration_ms"] >= 0
+        assert leftover == 0
+
+    def test_different_context_does_not_resume(self, workflow_db):
+        """Checkpoints are keyed by context, so other inputs start fresh."""
+        workflow = _FlakyWorkflow()
+        asyncio.run(workflow.execute({"lead_id": 1}))
+        workflow.fail = False
+        asyncio.run(workflow.execute({"lead_id": 2}))
+        assert workflow.calls["first"] == 2